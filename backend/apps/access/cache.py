@@ -0,0 +1,177 @@
+"""
+RBAC authorization cache.
+
+Resolved role keys and permission codes for a user are looked up in three tiers:
+
+1. Request scope: loaded at most once per HTTP request (see RBACRequestCacheMiddleware).
+2. In-process: short-lived dict per worker (RBAC_LOCAL_CACHE_TIMEOUT seconds).
+3. Shared: Django cache (Redis when CACHE_REDIS_URL is set), RBAC_CACHE_TIMEOUT seconds.
+   When the default cache is per process (LocMemCache without CACHE_REDIS_URL), a
+   revocation on one worker would not reach the others, so entries there live no longer
+   than the in-process tier.
+
+Role and permission changes bump a shared generation number so every cached entry
+becomes unreachable at once; user role assignment changes drop only that user's entry.
+"""
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+
+GENERATION_CACHE_KEY = "access:rbac:generation"
+LOCAL_CACHE_MAX_ENTRIES = 10_000
+PROCESS_LOCAL_BACKENDS = (
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+)
+
+_request_scope: ContextVar[dict | None] = ContextVar("rbac_request_scope", default=None)
+_local_entries: dict[tuple, tuple[float, dict]] = {}
+_local_lock = threading.Lock()
+
+
+def _shared_timeout() -> int:
+    timeout = getattr(settings, "RBAC_CACHE_TIMEOUT", 300)
+    if settings.CACHES.get("default", {}).get("BACKEND") in PROCESS_LOCAL_BACKENDS:
+        return min(timeout, _local_timeout())
+    return timeout
+
+
+def _local_timeout() -> int:
+    return getattr(settings, "RBAC_LOCAL_CACHE_TIMEOUT", 5)
+
+
+def _user_identity(user) -> tuple:
+    """Cache identity for a user; date_joined guards against a recycled primary key inheriting grants."""
+    joined = getattr(user, "date_joined", None)
+    return (user.pk, joined.timestamp() if joined else 0)
+
+
+def _get_generation() -> int:
+    try:
+        generation = cache.get(GENERATION_CACHE_KEY)
+        if generation is None:
+            cache.add(GENERATION_CACHE_KEY, 1, timeout=None)
+            generation = cache.get(GENERATION_CACHE_KEY, 1)
+        return generation
+    except Exception:
+        logger.warning("RBAC cache generation lookup failed; using database.", exc_info=True)
+        return 0
+
+
+def _shared_key(user_id: int, generation: int) -> str:
+    return f"access:rbac:{generation}:user:{user_id}"
+
+
+@contextmanager
+def rbac_request_scope():
+    """Memoize authorization lookups for the duration of one request."""
+    token = _request_scope.set({})
+    try:
+        yield
+    finally:
+        _request_scope.reset(token)
+
+
+def get_cached_authorization(user, loader) -> dict:
+    """
+    Return {"role_keys": frozenset, "permission_codes": frozenset} for user.
+    loader(user) is called on a full miss and must return the same shape.
+    """
+    identity = _user_identity(user)
+    scope = _request_scope.get()
+    if scope is not None and identity in scope:
+        return scope[identity]
+
+    now = time.monotonic()
+    local = _local_entries.get(identity)
+    if local is not None and local[0] > now:
+        entry = local[1]
+    else:
+        entry = None
+        generation = _get_generation()
+        key = _shared_key(identity[0], generation)
+        if generation:
+            try:
+                cached = cache.get(key)
+            except Exception:
+                logger.warning("RBAC shared cache read failed; using database.", exc_info=True)
+                cached = None
+            if cached is not None and cached.get("joined") == identity[1]:
+                entry = {
+                    "role_keys": frozenset(cached["role_keys"]),
+                    "permission_codes": frozenset(cached["permission_codes"]),
+                }
+        if entry is None:
+            entry = loader(user)
+            if generation:
+                try:
+                    cache.set(
+                        key,
+                        {
+                            "joined": identity[1],
+                            "role_keys": sorted(entry["role_keys"]),
+                            "permission_codes": sorted(entry["permission_codes"]),
+                        },
+                        timeout=_shared_timeout(),
+                    )
+                except Exception:
+                    logger.warning("RBAC shared cache write failed.", exc_info=True)
+        with _local_lock:
+            if len(_local_entries) >= LOCAL_CACHE_MAX_ENTRIES:
+                _local_entries.clear()
+            _local_entries[identity] = (now + _local_timeout(), entry)
+
+    if scope is not None:
+        scope[identity] = entry
+    return entry
+
+
+def _drop_user_entries(user_id: int):
+    scope = _request_scope.get()
+    if scope is not None:
+        for identity in [identity for identity in scope if identity[0] == user_id]:
+            scope.pop(identity, None)
+    with _local_lock:
+        for identity in [identity for identity in _local_entries if identity[0] == user_id]:
+            _local_entries.pop(identity, None)
+
+
+def _invalidate_user_now(user_id: int):
+    _drop_user_entries(user_id)
+    try:
+        cache.delete(_shared_key(user_id, _get_generation()))
+    except Exception:
+        logger.warning("RBAC shared cache delete failed for user %s.", user_id, exc_info=True)
+
+
+def _invalidate_all_now():
+    scope = _request_scope.get()
+    if scope is not None:
+        scope.clear()
+    with _local_lock:
+        _local_entries.clear()
+    try:
+        if not cache.add(GENERATION_CACHE_KEY, 2, timeout=None):
+            cache.incr(GENERATION_CACHE_KEY)
+    except Exception:
+        logger.warning("RBAC cache generation bump failed.", exc_info=True)
+
+
+def invalidate_user_authorization(user_id: int):
+    """Drop cached authorization for one user (now and again once the transaction commits)."""
+    _invalidate_user_now(user_id)
+    transaction.on_commit(lambda: _invalidate_user_now(user_id))
+
+
+def invalidate_all_authorization():
+    """Make every cached authorization entry stale (role or permission definitions changed)."""
+    _invalidate_all_now()
+    transaction.on_commit(_invalidate_all_now)
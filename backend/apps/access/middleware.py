@@ -0,0 +1,12 @@
+from apps.access.cache import rbac_request_scope
+
+
+class RBACRequestCacheMiddleware:
+    """Resolve each user's role keys and permission codes at most once per request."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with rbac_request_scope():
+            return self.get_response(request)
@@ -0,0 +1,41 @@
+# Generated migration for audit trail and timeline list permissions
+
+from django.db import migrations
+
+
+def create_permissions(apps, schema_editor):
+    Permission = apps.get_model("access", "Permission")
+    Permission.objects.get_or_create(
+        code="notifications.audit.view",
+        defaults={
+            "name": "View audit trail",
+            "resource": "notifications.audit",
+            "action": "view",
+            "description": "List audit log entries for mutating API requests.",
+        },
+    )
+    Permission.objects.get_or_create(
+        code="notifications.timeline.view",
+        defaults={
+            "name": "View timeline events",
+            "resource": "notifications.timeline",
+            "action": "view",
+            "description": "List workflow timeline events.",
+        },
+    )
+
+
+def remove_permissions(apps, schema_editor):
+    Permission = apps.get_model("access", "Permission")
+    Permission.objects.filter(code__in=["notifications.audit.view", "notifications.timeline.view"]).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("access", "0013_add_evidence_crud_permissions"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_permissions, remove_permissions),
+    ]
@@ -0,0 +1,38 @@
+# Generated migration for the bulk case import permission
+
+from django.db import migrations
+
+IMPORT_ROLE_KEYS = ["admin", "captain"]
+
+
+def create_permission(apps, schema_editor):
+    Permission = apps.get_model("access", "Permission")
+    Role = apps.get_model("access", "Role")
+    RolePermission = apps.get_model("access", "RolePermission")
+    permission, _ = Permission.objects.get_or_create(
+        code="cases.imports.create",
+        defaults={
+            "name": "Import cases",
+            "resource": "cases.imports",
+            "action": "create",
+            "description": "Bulk import legacy scene cases and complaints from CSV or JSON Lines files.",
+        },
+    )
+    for role in Role.objects.filter(key__in=IMPORT_ROLE_KEYS):
+        RolePermission.objects.get_or_create(role=role, permission=permission)
+
+
+def remove_permission(apps, schema_editor):
+    Permission = apps.get_model("access", "Permission")
+    Permission.objects.filter(code="cases.imports.create").delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("access", "0014_add_notifications_view_permissions"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_permission, remove_permission),
+    ]
@@ -1,6 +1,7 @@
 from django.contrib.auth import get_user_model
 from rest_framework import serializers
 
+from apps.access.cache import invalidate_all_authorization
 from apps.access.models import Permission, Role, RolePermission, UserRoleAssignment
 
 
@@ -29,7 +30,14 @@ class RoleSerializer(serializers.ModelSerializer):
         return value.lower()
 
     def get_permissions(self, obj):
-        permissions = Permission.objects.filter(permission_roles__role=obj).order_by("code")
+        if "role_permissions" in getattr(obj, "_prefetched_objects_cache", {}):
+            # List views prefetch role_permissions__permission; avoid a query per role.
+            permissions = sorted(
+                (link.permission for link in obj.role_permissions.all()),
+                key=lambda permission: permission.code,
+            )
+        else:
+            permissions = Permission.objects.filter(permission_roles__role=obj).order_by("code")
         return PermissionSerializer(permissions, many=True).data
 
     def create(self, validated_data):
@@ -52,6 +60,8 @@ class RoleSerializer(serializers.ModelSerializer):
         role_permissions = [RolePermission(role=role, permission=permission) for permission in permissions]
         if role_permissions:
             RolePermission.objects.bulk_create(role_permissions)
+            # bulk_create skips post_save, so the RolePermission signal never sees these rows.
+            invalidate_all_authorization()
 
 
 class UserSummarySerializer(serializers.ModelSerializer):
@@ -1,18 +1,34 @@
+from apps.access.cache import get_cached_authorization
 from apps.access.models import Permission, UserRoleAssignment
 
 
+def load_user_authorization(user) -> dict:
+    """Resolve active role keys and granted permission codes for user in a single query."""
+    rows = UserRoleAssignment.objects.filter(
+        user=user,
+        role__is_active=True,
+    ).values_list("role__key", "role__role_permissions__permission__code")
+    role_keys = set()
+    permission_codes = set()
+    for role_key, permission_code in rows:
+        if role_key:
+            role_keys.add(role_key.lower())
+        if permission_code:
+            permission_codes.add(permission_code)
+    return {"role_keys": frozenset(role_keys), "permission_codes": frozenset(permission_codes)}
+
+
+def get_user_authorization(user) -> dict:
+    """Cached {"role_keys", "permission_codes"} for an authenticated user (see apps.access.cache)."""
+    if not user or not user.is_authenticated:
+        return {"role_keys": frozenset(), "permission_codes": frozenset()}
+    return get_cached_authorization(user, load_user_authorization)
+
+
 def get_user_role_keys(user) -> set[str]:
     if not user or not user.is_authenticated:
         return set()
-    values = UserRoleAssignment.objects.filter(
-        user=user,
-        role__is_active=True,
-    ).exclude(
-        role__key__isnull=True,
-    ).exclude(
-        role__key="",
-    ).values_list("role__key", flat=True)
-    return {value.lower() for value in values}
+    return set(get_user_authorization(user)["role_keys"])
 
 
 def user_has_any_role_key(user, role_keys: list[str] | tuple[str, ...] | set[str]) -> bool:
@@ -21,7 +37,7 @@ def user_has_any_role_key(user, role_keys: list[str] | tuple[str, ...] | set[str
     required = {key.lower() for key in role_keys if key}
     if not required:
         return True
-    current = get_user_role_keys(user)
+    current = get_user_authorization(user)["role_keys"]
     return any(key in current for key in required)
 
 
@@ -37,13 +53,7 @@ def user_has_permission_codes(
     required = {code for code in permission_codes if code}
     if not required:
         return True
-    found = set(
-        Permission.objects.filter(
-            permission_roles__role__user_assignments__user=user,
-            permission_roles__role__is_active=True,
-            code__in=required,
-        ).values_list("code", flat=True)
-    )
+    found = get_user_authorization(user)["permission_codes"]
     if match_all:
         return required.issubset(found)
     return bool(required.intersection(found))
@@ -56,11 +66,4 @@ def get_user_permission_codes(user) -> set[str]:
         )
     if not user or not user.is_authenticated:
         return set()
-    return set(
-        Permission.objects.filter(
-            permission_roles__role__user_assignments__user=user,
-            permission_roles__role__is_active=True,
-        )
-        .distinct()
-        .values_list("code", flat=True)
-    )
+    return set(get_user_authorization(user)["permission_codes"])
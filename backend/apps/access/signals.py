@@ -0,0 +1,33 @@
+"""
+Clear cached RBAC authorization when roles, grants or assignments change.
+"""
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.access.cache import invalidate_all_authorization, invalidate_user_authorization
+from apps.access.models import Permission, Role, RolePermission, UserRoleAssignment
+
+
+@receiver(post_save, sender=UserRoleAssignment)
+@receiver(post_delete, sender=UserRoleAssignment)
+def user_role_assignment_changed(sender, instance, **kwargs):
+    invalidate_user_authorization(instance.user_id)
+
+
+@receiver(post_save, sender=RolePermission)
+@receiver(post_delete, sender=RolePermission)
+def role_permission_changed(sender, instance, **kwargs):
+    invalidate_all_authorization()
+
+
+@receiver(post_save, sender=Role)
+@receiver(post_delete, sender=Role)
+def role_changed(sender, instance, **kwargs):
+    """is_active and key both feed resolved authorization; role edits are rare, so clear on any save."""
+    invalidate_all_authorization()
+
+
+@receiver(post_save, sender=Permission)
+@receiver(post_delete, sender=Permission)
+def permission_changed(sender, instance, **kwargs):
+    invalidate_all_authorization()
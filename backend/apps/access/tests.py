@@ -3,7 +3,9 @@ from rest_framework import status
 from rest_framework.authtoken.models import Token
 from rest_framework.test import APITestCase
 
+from apps.access.cache import _shared_timeout, rbac_request_scope
 from apps.access.models import Permission, Role, RolePermission, UserRoleAssignment
+from apps.access.services import get_user_role_keys, user_has_any_role_key, user_has_permission_codes
 
 
 class AccessAuthorizationApiTests(APITestCase):
@@ -171,3 +173,88 @@ class AccessAuthorizationApiTests(APITestCase):
         self.assertEqual(response.data["data"]["user"]["id"], self.user.id)
         self.assertEqual(len(response.data["data"]["roles"]), 1)
         self.assertEqual(len(response.data["data"]["permissions"]), 1)
+
+
+class RBACAuthorizationCacheTests(APITestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            username="cached01",
+            email="cached01@example.com",
+            password="StrongPass123!",
+            phone="09120001101",
+            national_id="1000000101",
+            full_name="Cached User",
+        )
+        self.permission, _ = Permission.objects.get_or_create(
+            code="cases.cases.view",
+            defaults={"name": "View Cases", "resource": "cases.cases", "action": "view"},
+        )
+        self.role = Role.objects.create(key="detective", name="Detective")
+        RolePermission.objects.create(role=self.role, permission=self.permission)
+
+    def test_lookups_within_request_scope_hit_database_once(self):
+        UserRoleAssignment.objects.create(user=self.user, role=self.role)
+
+        with rbac_request_scope():
+            with self.assertNumQueries(1):
+                self.assertTrue(user_has_permission_codes(self.user, ["cases.cases.view"]))
+                self.assertEqual(get_user_role_keys(self.user), {"detective"})
+                self.assertTrue(user_has_any_role_key(self.user, {"detective"}))
+
+    def test_cached_across_requests_until_assignment_changes(self):
+        with rbac_request_scope():
+            self.assertFalse(user_has_permission_codes(self.user, ["cases.cases.view"]))
+        with rbac_request_scope():
+            with self.assertNumQueries(0):
+                self.assertFalse(user_has_permission_codes(self.user, ["cases.cases.view"]))
+
+        assignment = UserRoleAssignment.objects.create(user=self.user, role=self.role)
+        self.assertTrue(user_has_permission_codes(self.user, ["cases.cases.view"]))
+
+        assignment.delete()
+        self.assertFalse(user_has_permission_codes(self.user, ["cases.cases.view"]))
+
+    def test_per_process_cache_does_not_keep_grants_longer_than_local_tier(self):
+        with self.settings(RBAC_CACHE_TIMEOUT=300, RBAC_LOCAL_CACHE_TIMEOUT=5):
+            self.assertEqual(_shared_timeout(), 5)
+            redis = {"default": {"BACKEND": "django.core.cache.backends.redis.RedisCache", "LOCATION": "redis://cache:6379/0"}}
+            with self.settings(CACHES=redis):
+                self.assertEqual(_shared_timeout(), 300)
+
+    def test_role_deactivation_and_grant_removal_clear_cache(self):
+        UserRoleAssignment.objects.create(user=self.user, role=self.role)
+        self.assertEqual(get_user_role_keys(self.user), {"detective"})
+
+        self.role.is_active = False
+        self.role.save()
+        self.assertEqual(get_user_role_keys(self.user), set())
+        self.assertFalse(user_has_permission_codes(self.user, ["cases.cases.view"]))
+
+        self.role.is_active = True
+        self.role.save()
+        self.assertTrue(user_has_permission_codes(self.user, ["cases.cases.view"]))
+        RolePermission.objects.filter(role=self.role).delete()
+        self.assertFalse(user_has_permission_codes(self.user, ["cases.cases.view"]))
+
+    def test_role_permission_sync_through_api_clears_cache(self):
+        admin = get_user_model().objects.create_superuser(
+            username="cacheadmin",
+            email="cacheadmin@example.com",
+            password="StrongPass123!",
+            phone="09120001102",
+            national_id="1000000102",
+            full_name="Cache Admin",
+        )
+        role = Role.objects.create(key="sergeant", name="Sergeant")
+        UserRoleAssignment.objects.create(user=self.user, role=role)
+        self.assertFalse(user_has_permission_codes(self.user, ["cases.cases.view"]))
+
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {Token.objects.create(user=admin).key}")
+        response = self.client.patch(
+            f"/api/v1/access/roles/{role.id}/",
+            {"permission_ids": [self.permission.id]},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(user_has_permission_codes(self.user, ["cases.cases.view"]))
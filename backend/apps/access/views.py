@@ -125,7 +125,7 @@ class RoleListCreateAPIView(APIView):
     permission_classes = [IsAdminUser]
 
     def get(self, request):
-        roles = Role.objects.order_by("name")
+        roles = Role.objects.prefetch_related("role_permissions__permission").order_by("name")
         serializer = RoleSerializer(roles, many=True)
         return success_response({"results": serializer.data}, status_code=status.HTTP_200_OK)
 
@@ -207,6 +207,7 @@ class UserRoleAssignmentListCreateAPIView(APIView):
         assignments = (
             UserRoleAssignment.objects.filter(user=user)
             .select_related("assigned_by", "role")
+            .prefetch_related("role__role_permissions__permission")
             .order_by("assigned_at")
         )
         serializer = UserRoleAssignmentSerializer(assignments, many=True)
@@ -282,7 +283,11 @@ class CurrentAuthorizationAPIView(APIView):
 
     def get(self, request):
         assignments = UserRoleAssignment.objects.filter(user=request.user).select_related("role")
-        roles = Role.objects.filter(id__in=assignments.values_list("role_id", flat=True)).order_by("name")
+        roles = (
+            Role.objects.filter(id__in=assignments.values_list("role_id", flat=True))
+            .prefetch_related("role_permissions__permission")
+            .order_by("name")
+        )
         role_data = RoleSerializer(roles, many=True).data
         permissions = Permission.objects.filter(
             permission_roles__role_id__in=assignments.values_list("role_id", flat=True)
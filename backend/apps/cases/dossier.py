@@ -0,0 +1,199 @@
+"""
+Precomputed per-case dossier document.
+
+CaseDetailAPIView and the judiciary referral package used to assemble overlapping case data
+on every read: five joined relations, a participants prefetch, the latest timeline events
+by case_reference, the evidence list. CaseDossier stores it once as JSON:
+
+    {"detail": <CaseDetailSerializer data>, "referral": <build_referral_package data>}
+
+and a read is one primary-key lookup. Writes to the case or to anything the document shows
+(DOSSIER_SOURCES, connected in apps.cases.signals) only bump pending_changes with one UPDATE.
+The document is rebuilt:
+- asynchronously, when CASE_DOSSIER_ASYNC_REBUILD is on: the first change in a
+  CASE_DOSSIER_DEBOUNCE_SECONDS window enqueues one rebuild task with that countdown, and a
+  cache.add key absorbs the rest of the burst;
+- by the scheduled rebuild_case_dossiers command, for anything still stale;
+- on read, when a request finds the document stale or missing, so a reader never sees data
+  older than its own writes.
+
+A rebuild remembers pending_changes from when it started and clears it only if no write
+arrived in the meantime (compare-and-swap), so a change made during a rebuild is not lost.
+"""
+import json
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import IntegrityError, transaction
+from django.db.models import F, Q, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from django.utils.http import parse_etags
+from rest_framework import status
+from rest_framework.response import Response
+
+from apps.cases.models import Case, CaseDossier
+from apps.identity.services import success_response
+
+logger = logging.getLogger(__name__)
+
+# Model label -> attribute naming the case a row belongs to (subclasses are included).
+# "case_reference" holds a case number; every other attribute holds a case id. A
+# "<foreign key>__<attribute>" path reads the attribute from the related row (evidence media
+# and reviews name their evidence, not the case), at one extra query per write.
+DOSSIER_SOURCES = {
+    "cases.Case": "pk",
+    "cases.CaseParticipant": "case_id",
+    "cases.SceneCaseReport": "case_id",
+    "evidence.Evidence": "case_id",
+    "evidence.WitnessTestimonyAttachment": "witness_testimony__case_id",
+    "evidence.BiologicalMedicalMediaReference": "biological_medical_evidence__case_id",
+    "evidence.EvidenceReview": "biological_medical_evidence__case_id",
+    "investigation.ArrestOrder": "case_id",
+    "investigation.InterrogationOrder": "case_id",
+    "judiciary.CaseVerdict": "case_id",
+    "notifications.TimelineEvent": "case_reference",
+}
+REBUILD_CACHE_KEY = "cases:dossier-rebuild:{case_id}"
+
+
+def build_dossier_document(case_id):
+    """The document for case_id as stored (JSON round-tripped), or None when the case is gone."""
+    from apps.cases.serializers import CaseDetailSerializer
+    from apps.judiciary.services import build_referral_package
+
+    case = (
+        Case.objects.select_related(
+            "created_by",
+            "assigned_to",
+            "scene_report_detail",
+            "scene_report_detail__reported_by",
+            "scene_report_detail__superior_approved_by",
+        )
+        .prefetch_related("participants")
+        .filter(pk=case_id)
+        .first()
+    )
+    if case is None:
+        return None
+    document = {"detail": CaseDetailSerializer(case).data, "referral": build_referral_package(case)}
+    # Return exactly what a later read of the JSONField will return.
+    return json.loads(json.dumps(document, cls=DjangoJSONEncoder))
+
+
+def _create_pending_dossier(case_id):
+    """
+    Store an empty, stale row before the first build, so writes made while building are
+    counted on it and the first build goes through the same compare-and-swap as a rebuild.
+    False when the case does not exist.
+    """
+    if not Case.objects.filter(pk=case_id).exists():
+        return False
+    now = timezone.now()
+    try:
+        with transaction.atomic():
+            CaseDossier.objects.create(case_id=case_id, document={}, pending_changes=1, stale_since=now, built_at=now)
+    except IntegrityError:
+        pass  # created by a concurrent reader
+    return True
+
+
+def rebuild_case_dossier(case_id):
+    """Build and store the document; returns the CaseDossier, or None when the case is gone."""
+    rows = CaseDossier.objects.filter(case_id=case_id)
+    seen = rows.values_list("pending_changes", flat=True).first()
+    if seen is None:
+        if not _create_pending_dossier(case_id):
+            return None
+        seen = rows.values_list("pending_changes", flat=True).first()
+    document = build_dossier_document(case_id)
+    if document is None:
+        return None
+    now = timezone.now()
+
+    fresh = rows.filter(pending_changes=seen).update(
+        document=document,
+        version=F("version") + 1,
+        pending_changes=0,
+        stale_since=None,
+        built_at=now,
+    )
+    if not fresh:
+        # A write arrived while building: store this newer document but leave it marked stale.
+        rows.update(document=document, version=F("version") + 1, built_at=now)
+    return rows.first()
+
+
+def get_case_dossier(case_id):
+    """Current dossier for case_id (one lookup when fresh); None when the case does not exist."""
+    dossier = CaseDossier.objects.filter(case_id=case_id).first()
+    if dossier is not None and not dossier.pending_changes:
+        return dossier
+    return rebuild_case_dossier(case_id)
+
+
+def mark_case_dossiers_stale(*, case_ids=(), case_numbers=()):
+    """Record a change to the given cases' sources (call for writes that bypass signals)."""
+    case_ids = [case_id for case_id in case_ids if case_id]
+    case_numbers = [number for number in case_numbers if number]
+    if not case_ids and not case_numbers:
+        return
+    now = timezone.now()
+    match = Q(case_id__in=case_ids) if case_ids else Q()
+    if case_numbers:
+        match |= Q(case__case_number__in=case_numbers)
+    rows = CaseDossier.objects.filter(match)
+    rows.update(pending_changes=F("pending_changes") + 1, stale_since=Coalesce(F("stale_since"), Value(now)))
+    if settings.CASE_DOSSIER_ASYNC_REBUILD:
+        if case_numbers:
+            case_ids = [*case_ids, *Case.objects.filter(case_number__in=case_numbers).values_list("id", flat=True)]
+        for case_id in set(case_ids):
+            _schedule_rebuild(case_id)
+
+
+def _enqueue_rebuild(case_id, countdown):
+    from apps.cases.tasks import rebuild_case_dossier_task
+
+    try:
+        rebuild_case_dossier_task.apply_async((case_id,), countdown=countdown)
+    except Exception:
+        # The write has committed; a stale document is rebuilt on read or by rebuild_case_dossiers.
+        logger.warning("Dossier rebuild could not be queued for case %s.", case_id, exc_info=True)
+
+
+def _schedule_rebuild(case_id):
+    debounce = settings.CASE_DOSSIER_DEBOUNCE_SECONDS
+    try:
+        first_in_window = cache.add(REBUILD_CACHE_KEY.format(case_id=case_id), 1, timeout=debounce)
+    except Exception:
+        logger.warning("Dossier rebuild debounce key failed for case %s.", case_id, exc_info=True)
+        first_in_window = True
+    if first_in_window:
+        transaction.on_commit(lambda: _enqueue_rebuild(case_id, debounce))
+
+
+def rebuild_stale_case_dossiers(*, include_missing=False, dry_run=False) -> int:
+    """Rebuild dossiers stale for longer than the debounce window (and, optionally, unbuilt ones)."""
+    cutoff = timezone.now() - timedelta(seconds=settings.CASE_DOSSIER_DEBOUNCE_SECONDS)
+    stale = CaseDossier.objects.filter(stale_since__lte=cutoff).order_by("stale_since").values_list("case_id", flat=True)
+    case_ids = list(stale)
+    if include_missing:
+        case_ids += list(Case.objects.filter(dossier__isnull=True).order_by("id").values_list("id", flat=True))
+    if not dry_run:
+        for case_id in case_ids:
+            rebuild_case_dossier(case_id)
+    return len(case_ids)
+
+
+def dossier_response(request, dossier, data):
+    """success_response with the dossier ETag; 304 without a body when If-None-Match matches."""
+    etags = {tag.removeprefix("W/") for tag in parse_etags(request.headers.get("If-None-Match", ""))}
+    if dossier.etag in etags or "*" in etags:
+        response = Response(status=status.HTTP_304_NOT_MODIFIED)
+    else:
+        response = success_response(data, status_code=status.HTTP_200_OK)
+    response["ETag"] = dossier.etag
+    return response
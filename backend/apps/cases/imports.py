@@ -0,0 +1,432 @@
+"""
+Bulk import of legacy complaints and scene reports from JSONL or CSV.
+
+Each record has a `kind`:
+- "scene_case": title, summary, level, priority, status, closed_at, scene_occurred_at and
+  witnesses (a list of {full_name, phone, national_id, notes}; a JSON string in CSV).
+- "complaint": description, complainant_national_id (an existing user) and case_number
+  (an existing complaint case), both optional.
+
+The file is first decoded once end to end (check_encoding), so a file that is not UTF-8 is
+rejected before anything is written. Rows are then read lazily and handled in chunks of
+CASE_IMPORT_BATCH_SIZE. Every row is checked with apps.cases.validators; a row that fails
+is reported with its line number and skipped, the rest of the chunk is still written. A
+chunk's cases, scene reports, participants, complaints and timeline events are written with
+one bulk_create per table in one transaction. If the chunk hits an integrity error it is
+retried row by row so only the offending rows are reported.
+
+bulk_create skips Case.save and the post_save handlers, so the import applies their effects
+itself: priority and the lifecycle timestamp of the initial status, the SQLite search index
+(index_cases), the "cases" StatCounter deltas and the staleness of the dossiers whose timeline
+gained events (complaints imported against existing cases). Imported cases have no suspects,
+so no Wanted rows are involved.
+"""
+import codecs
+import csv
+import json
+from datetime import datetime
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from apps.cases.dossier import mark_case_dossiers_stale
+from apps.cases.models import Case, CaseParticipant, Complaint, SceneCaseReport
+from apps.cases.search import index_cases
+from apps.cases.services import resolve_scene_case_creator_role, resolve_scene_case_superior_role_key
+from apps.cases.validators import (
+    validate_case_closed_requires_closed_at,
+    validate_case_not_closed_or_invalid,
+    validate_national_id,
+    validate_non_blank,
+    validate_participant_user_or_full_name,
+    validate_phone,
+)
+from apps.identity.services import validation_error_to_details
+from apps.notifications.models import TimelineEvent
+from apps.reports.stats import apply_counter_deltas, row_deltas, tracked_models
+
+KIND_SCENE_CASE = "scene_case"
+KIND_COMPLAINT = "complaint"
+IMPORT_KINDS = (KIND_SCENE_CASE, KIND_COMPLAINT)
+IMPORT_FORMATS = ("jsonl", "csv")
+ENCODING_CHECK_READ_SIZE = 64 * 1024
+
+
+def detect_format(filename: str, requested: str = "") -> str:
+    requested = (requested or "").strip().lower()
+    if requested:
+        return requested
+    return "csv" if (filename or "").lower().endswith(".csv") else "jsonl"
+
+
+def _decoded_lines(source):
+    """Text lines from a text stream or from an uploaded (binary) file."""
+    if hasattr(source, "chunks"):
+        return codecs.iterdecode(source, "utf-8-sig")
+    return source
+
+
+def check_encoding(source):
+    """
+    Decode the whole source once, before any chunk is written, and rewind it. Chunks commit
+    one by one, so a bad byte found halfway through the import would leave the earlier
+    chunks committed and the report lost. Raises UnicodeDecodeError.
+    """
+    if hasattr(source, "chunks"):
+        decoder = codecs.getincrementaldecoder("utf-8-sig")()
+        for chunk in source.chunks():
+            decoder.decode(chunk)
+        decoder.decode(b"", final=True)
+    elif source.seekable():
+        while source.read(ENCODING_CHECK_READ_SIZE):
+            pass
+    else:
+        return
+    source.seek(0)
+
+
+def read_jsonl(source):
+    """Yield (line, record, error) for every non-blank line."""
+    for line_number, line in enumerate(_decoded_lines(source), start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as exc:
+            yield line_number, None, {"non_field_errors": [f"Invalid JSON: {exc}"]}
+            continue
+        if not isinstance(record, dict):
+            yield line_number, None, {"non_field_errors": ["Each line must be a JSON object."]}
+            continue
+        yield line_number, record, None
+
+
+def read_csv(source):
+    """Yield (line, record, error); blank cells are treated as missing and witnesses is JSON."""
+    reader = csv.DictReader(_decoded_lines(source))
+    for row in reader:
+        record = {key.strip(): value for key, value in row.items() if key and value not in {"", None}}
+        witnesses = record.get("witnesses")
+        if isinstance(witnesses, str):
+            try:
+                record["witnesses"] = json.loads(witnesses)
+            except ValueError:
+                yield reader.line_num, None, {"witnesses": ["Enter the witnesses as a JSON list."]}
+                continue
+        yield reader.line_num, record, None
+
+
+def read_records(source, file_format: str):
+    if file_format == "csv":
+        return read_csv(source)
+    return read_jsonl(source)
+
+
+def _text(record, field, max_length=None):
+    value = str(record.get(field) or "").strip()
+    if max_length and len(value) > max_length:
+        raise ValidationError({field: [f"Ensure this field has no more than {max_length} characters."]})
+    return value
+
+
+def _choice(record, field, choices, default=""):
+    value = _text(record, field) or default
+    if value and value not in choices.values:
+        raise ValidationError({field: [f'"{value}" is not a valid choice.']})
+    return value
+
+
+def _datetime(record, field, required=False):
+    value = record.get(field)
+    if value in {None, ""}:
+        if required:
+            raise ValidationError({field: ["This field is required."]})
+        return None
+    parsed = value if isinstance(value, datetime) else parse_datetime(str(value).strip())
+    if parsed is None:
+        raise ValidationError({field: ["Enter a valid ISO 8601 date/time."]})
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    if parsed > timezone.now():
+        raise ValidationError({field: ["Date/time cannot be in the future."]})
+    return parsed
+
+
+class CaseImport:
+    """
+    Import records on behalf of `actor`. run() returns a report:
+    {"rows", "failed", "created": {"cases", "complaints", "participants"}, "errors": [{"line", "errors"}]}
+    with at most CASE_IMPORT_MAX_REPORTED_ERRORS entries in "errors".
+    """
+
+    def __init__(self, actor, batch_size=None, dry_run=False):
+        self.actor = actor
+        self.batch_size = batch_size or settings.CASE_IMPORT_BATCH_SIZE
+        self.dry_run = dry_run
+        self.now = timezone.now()
+        self.creator_role = resolve_scene_case_creator_role(actor)
+        self.superior_role_key = resolve_scene_case_superior_role_key(actor)
+        self.counter_fields = tracked_models()["cases"][1]
+        self.report = {
+            "rows": 0,
+            "failed": 0,
+            "created": {"cases": 0, "complaints": 0, "participants": 0},
+            "errors": [],
+        }
+
+    def run(self, records):
+        chunk = []
+        for line, record, error in records:
+            self.report["rows"] += 1
+            if error:
+                self._fail(line, error)
+                continue
+            chunk.append((line, record))
+            if len(chunk) >= self.batch_size:
+                self._import_chunk(chunk)
+                chunk = []
+        if chunk:
+            self._import_chunk(chunk)
+        return self.report
+
+    def _fail(self, line, errors):
+        self.report["failed"] += 1
+        if len(self.report["errors"]) < settings.CASE_IMPORT_MAX_REPORTED_ERRORS:
+            self.report["errors"].append({"line": line, "errors": errors})
+
+    # -- validation -----------------------------------------------------------------------
+
+    def _import_chunk(self, chunk):
+        users_by_national_id = self._users_by_national_id(chunk)
+        cases_by_number = self._cases_by_number(chunk)
+        plans = []
+        for line, record in chunk:
+            try:
+                kind = _text(record, "kind")
+                if kind == KIND_SCENE_CASE:
+                    plans.append(self._plan_scene_case(line, record))
+                elif kind == KIND_COMPLAINT:
+                    plans.append(self._plan_complaint(line, record, users_by_national_id, cases_by_number))
+                else:
+                    raise ValidationError({"kind": [f"Expected one of: {', '.join(IMPORT_KINDS)}."]})
+            except ValidationError as exc:
+                self._fail(line, validation_error_to_details(exc))
+        if not plans:
+            return
+        if self.dry_run:
+            for plan in plans:
+                self._count(plan)
+            return
+        try:
+            self._write(plans)
+        except IntegrityError:
+            for plan in plans:
+                try:
+                    self._write([plan])
+                except IntegrityError:
+                    self._fail(plan["line"], {"non_field_errors": ["Row violates data integrity rules."]})
+
+    def _users_by_national_id(self, chunk):
+        national_ids = {_text(record, "complainant_national_id") for _, record in chunk} - {""}
+        if not national_ids:
+            return {}
+        users = get_user_model().objects.filter(national_id__in=national_ids)
+        return {user.national_id: user for user in users}
+
+    def _cases_by_number(self, chunk):
+        numbers = {_text(record, "case_number") for _, record in chunk} - {""}
+        if not numbers:
+            return {}
+        cases = Case.objects.filter(case_number__in=numbers, source_type=Case.SourceType.COMPLAINT)
+        return {case.case_number: case for case in cases}
+
+    def _plan_scene_case(self, line, record):
+        title = _text(record, "title", max_length=200)
+        validate_non_blank(title, "title")
+        level = _choice(record, "level", Case.Level)
+        validate_non_blank(level, "level")
+        case_status = _choice(record, "status", Case.Status, default=Case.Status.UNDER_REVIEW)
+        closed_at = _datetime(record, "closed_at")
+        validate_case_closed_requires_closed_at(case_status, closed_at)
+        witnesses = self._witnesses(record.get("witnesses"))
+
+        case_fields = {
+            "title": title,
+            "summary": _text(record, "summary"),
+            "level": level,
+            "priority": _choice(record, "priority", Case.Priority) or Case.priority_for_level(level),
+            "source_type": Case.SourceType.SCENE_REPORT,
+            "status": case_status,
+            "closed_at": closed_at,
+            "assigned_by": self.actor,
+            "assigned_role_key": self.superior_role_key,
+            "created_by": self.actor,
+        }
+        timestamp_field = Case.status_to_timestamp_field(case_status)
+        if timestamp_field and case_fields.get(timestamp_field) is None:
+            case_fields[timestamp_field] = self.now
+        return {
+            "line": line,
+            "kind": KIND_SCENE_CASE,
+            "case": case_fields,
+            "scene_occurred_at": _datetime(record, "scene_occurred_at", required=True),
+            "witnesses": witnesses,
+        }
+
+    def _witnesses(self, witnesses):
+        if not isinstance(witnesses, list) or not witnesses:
+            raise ValidationError({"witnesses": ["At least one witness is required."]})
+        cleaned = []
+        national_ids = set()
+        for witness in witnesses:
+            if not isinstance(witness, dict):
+                raise ValidationError({"witnesses": ["Each witness must be an object."]})
+            full_name = _text(witness, "full_name", max_length=255)
+            validate_participant_user_or_full_name(
+                None, full_name, CaseParticipant.ParticipantKind.CIVILIAN, CaseParticipant.RoleInCase.WITNESS
+            )
+            national_id = validate_national_id(witness.get("national_id", ""))
+            if national_id in national_ids:
+                raise ValidationError({"witnesses": ["Witness national_id values must be unique."]})
+            national_ids.add(national_id)
+            cleaned.append(
+                {
+                    "full_name": full_name,
+                    "phone": validate_phone(witness.get("phone", "")),
+                    "national_id": national_id,
+                    "notes": _text(witness, "notes", max_length=500),
+                }
+            )
+        return cleaned
+
+    def _plan_complaint(self, line, record, users_by_national_id, cases_by_number):
+        description = _text(record, "description", max_length=5000)
+        validate_non_blank(description, "description")
+
+        complainant = None
+        national_id = _text(record, "complainant_national_id")
+        if national_id:
+            complainant = users_by_national_id.get(national_id)
+            if complainant is None:
+                raise ValidationError({"complainant_national_id": ["No user has this national ID."]})
+
+        case = None
+        case_number = _text(record, "case_number")
+        if case_number:
+            case = cases_by_number.get(case_number)
+            if case is None:
+                raise ValidationError({"case_number": ["No complaint case has this case number."]})
+            validate_case_not_closed_or_invalid(case)
+
+        return {
+            "line": line,
+            "kind": KIND_COMPLAINT,
+            "complaint": {"description": description, "complainant": complainant, "case": case},
+        }
+
+    # -- writing --------------------------------------------------------------------------
+
+    def _count(self, plan):
+        created = self.report["created"]
+        if plan["kind"] == KIND_SCENE_CASE:
+            created["cases"] += 1
+            created["participants"] += 1 + len(plan["witnesses"])
+        else:
+            created["complaints"] += 1
+
+    def _write(self, plans):
+        actor = self.actor
+        scene_plans = [plan for plan in plans if plan["kind"] == KIND_SCENE_CASE]
+        complaint_plans = [plan for plan in plans if plan["kind"] == KIND_COMPLAINT]
+
+        with transaction.atomic():
+            cases = Case.objects.bulk_create([Case(**plan["case"]) for plan in scene_plans])
+            reports = []
+            participants = []
+            events = []
+            for plan, case in zip(scene_plans, cases):
+                reports.append(
+                    SceneCaseReport(case=case, reported_by=actor, scene_occurred_at=plan["scene_occurred_at"])
+                )
+                participants.append(
+                    CaseParticipant(
+                        case=case,
+                        participant_kind=CaseParticipant.ParticipantKind.PERSONNEL,
+                        role_in_case=self.creator_role,
+                        user=actor,
+                        full_name=actor.full_name,
+                        phone=actor.phone,
+                        national_id=actor.national_id,
+                        added_by=actor,
+                    )
+                )
+                participants.extend(
+                    CaseParticipant(
+                        case=case,
+                        participant_kind=CaseParticipant.ParticipantKind.CIVILIAN,
+                        role_in_case=CaseParticipant.RoleInCase.WITNESS,
+                        added_by=actor,
+                        **witness,
+                    )
+                    for witness in plan["witnesses"]
+                )
+                events.append(
+                    TimelineEvent(
+                        actor=actor,
+                        event_type="cases.scene_case.created",
+                        case_reference=case.case_number,
+                        target_type="cases.case",
+                        target_id=str(case.id),
+                        summary="Scene-based case imported.",
+                        payload_summary={
+                            "source_type": case.source_type,
+                            "level": case.level,
+                            "witness_count": len(plan["witnesses"]),
+                            "imported": True,
+                        },
+                    )
+                )
+            SceneCaseReport.objects.bulk_create(reports)
+            CaseParticipant.objects.bulk_create(participants)
+
+            complaints = Complaint.objects.bulk_create(
+                [Complaint(**plan["complaint"]) for plan in complaint_plans]
+            )
+            events.extend(
+                TimelineEvent(
+                    actor=actor,
+                    event_type="cases.complaint.submitted",
+                    case_reference=complaint.case.case_number if complaint.case_id else "",
+                    target_type="cases.complaint",
+                    target_id=str(complaint.id),
+                    summary="Complaint imported.",
+                    payload_summary={"status": complaint.status, "imported": True},
+                )
+                for complaint in complaints
+            )
+            TimelineEvent.objects.bulk_create(events)
+            mark_case_dossiers_stale(case_numbers={event.case_reference for event in events})
+
+            index_cases(cases)
+            deltas = {}
+            for case in cases:
+                values = {field: getattr(case, field) for field in self.counter_fields}
+                for key, delta in row_deltas(None, values).items():
+                    deltas[key] = deltas.get(key, 0) + delta
+            apply_counter_deltas("cases", deltas)
+
+        for plan in plans:
+            self._count(plan)
+
+
+def import_cases(source, *, actor, file_format="jsonl", batch_size=None, dry_run=False):
+    """Import records from a text stream or uploaded file; returns the CaseImport report."""
+    if file_format not in IMPORT_FORMATS:
+        raise ValidationError({"format": [f"Expected one of: {', '.join(IMPORT_FORMATS)}."]})
+    check_encoding(source)
+    importer = CaseImport(actor, batch_size=batch_size, dry_run=dry_run)
+    return importer.run(read_records(source, file_format))
@@ -0,0 +1,137 @@
+"""
+Measure lock waits vs optimistic conflicts for concurrent writes to a few hot cases.
+
+Each worker thread (own database connection) updates a random hot case `--writes` times:
+- lock:       SELECT ... FOR UPDATE, modify, save (time spent in the SELECT is the lock wait),
+- optimistic: plain read, modify, version-checked save, retried by retry_on_conflict.
+Run it against PostgreSQL; SQLite ignores FOR UPDATE and serialises all writers.
+"""
+import random
+import statistics
+import threading
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DatabaseError, connection, connections, transaction
+
+from apps.cases.models import Case
+from config.concurrency import ConcurrentUpdateError, retry_on_conflict
+
+BENCHMARK_TITLE_PREFIX = "Benchmark hot case"
+
+
+def _percentile(values, fraction):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class Command(BaseCommand):
+    help = "Benchmark row-lock vs optimistic (version column) case writes under concurrent load."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--mode", choices=["lock", "optimistic", "both"], default="both")
+        parser.add_argument("--workers", type=int, default=8, help="Concurrent writer threads.")
+        parser.add_argument("--writes", type=int, default=50, help="Writes per worker.")
+        parser.add_argument("--cases", type=int, default=1, help="Number of hot cases the writers share.")
+
+    def handle(self, *args, **options):
+        if options["workers"] < 1 or options["writes"] < 1 or options["cases"] < 1:
+            raise CommandError("--workers, --writes and --cases must be positive.")
+        if connection.vendor == "sqlite":
+            self.stdout.write(
+                self.style.WARNING("SQLite ignores SELECT ... FOR UPDATE and serialises writers; use PostgreSQL.")
+            )
+
+        creator = get_user_model().objects.filter(is_superuser=True).order_by("id").first()
+        case_ids = [
+            Case.objects.create(
+                title=f"{BENCHMARK_TITLE_PREFIX} {index}",
+                level=Case.Level.LEVEL_3,
+                source_type=Case.SourceType.SCENE_REPORT,
+                created_by=creator,
+            ).pk
+            for index in range(options["cases"])
+        ]
+        try:
+            modes = ["lock", "optimistic"] if options["mode"] == "both" else [options["mode"]]
+            for mode in modes:
+                self._report(mode, self._run(mode, case_ids, options["workers"], options["writes"]))
+        finally:
+            Case.objects.filter(pk__in=case_ids).delete()
+
+    def _run(self, mode, case_ids, workers, writes):
+        stats = {"latencies": [], "lock_waits": [], "conflicts": 0, "failures": 0}
+        stats_lock = threading.Lock()
+
+        def locked_write(case_id, sequence):
+            started = time.perf_counter()
+            with transaction.atomic():
+                case = Case.objects.select_for_update().get(pk=case_id)
+                waited = time.perf_counter() - started
+                case.assignment_notes = f"benchmark write {sequence}"
+                case.save(update_fields=["assignment_notes", "updated_at"])
+            with stats_lock:
+                stats["lock_waits"].append(waited)
+
+        def optimistic_attempt(case_id, sequence):
+            try:
+                with transaction.atomic():
+                    case = Case.objects.get(pk=case_id)
+                    case.assignment_notes = f"benchmark write {sequence}"
+                    case.save(update_fields=["assignment_notes", "updated_at"])
+            except ConcurrentUpdateError:
+                with stats_lock:
+                    stats["conflicts"] += 1
+                raise
+
+        def worker(worker_index):
+            try:
+                for write in range(writes):
+                    case_id = random.choice(case_ids)
+                    sequence = f"{worker_index}.{write}"
+                    started = time.perf_counter()
+                    try:
+                        if mode == "lock":
+                            locked_write(case_id, sequence)
+                        else:
+                            retry_on_conflict(optimistic_attempt, case_id, sequence)
+                    except (ConcurrentUpdateError, DatabaseError):
+                        with stats_lock:
+                            stats["failures"] += 1
+                        continue
+                    with stats_lock:
+                        stats["latencies"].append(time.perf_counter() - started)
+            finally:
+                connections.close_all()
+
+        threads = [threading.Thread(target=worker, args=(index,)) for index in range(workers)]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        stats["elapsed"] = time.perf_counter() - started
+        return stats
+
+    def _report(self, mode, stats):
+        latencies = stats["latencies"]
+        done = len(latencies)
+        throughput = done / stats["elapsed"] if stats["elapsed"] else 0.0
+        lines = [
+            f"{mode}: {done} write(s) in {stats['elapsed']:.2f}s ({throughput:.0f}/s), {stats['failures']} failed",
+            f"  latency ms: p50 {_percentile(latencies, 0.5) * 1000:.1f}, "
+            f"p95 {_percentile(latencies, 0.95) * 1000:.1f}, max {max(latencies, default=0) * 1000:.1f}",
+        ]
+        if mode == "lock":
+            waits = stats["lock_waits"]
+            lines.append(
+                f"  lock wait ms: mean {statistics.fmean(waits) * 1000 if waits else 0:.1f}, "
+                f"p95 {_percentile(waits, 0.95) * 1000:.1f}, total {sum(waits) * 1000:.0f}"
+            )
+        else:
+            lines.append(f"  version conflicts retried: {stats['conflicts']}")
+        self.stdout.write("\n".join(lines))
+        self.stdout.write(self.style.SUCCESS(f"Finished {mode} benchmark."))
@@ -0,0 +1,50 @@
+"""Bulk import legacy complaints and scene reports from a JSONL or CSV file."""
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.cases.imports import IMPORT_FORMATS, detect_format, import_cases
+
+
+class Command(BaseCommand):
+    help = (
+        "Import complaints and scene cases from JSONL/CSV in bulk_create chunks; "
+        "rows that fail validation are reported and skipped."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="JSONL or CSV file (format taken from the extension unless --format is given).")
+        parser.add_argument("--actor", required=True, help="Username recorded as creator/reporter of the imported rows.")
+        parser.add_argument("--format", choices=IMPORT_FORMATS, default="", help="Input format.")
+        parser.add_argument("--batch-size", type=int, default=None, help="Rows per chunk (default CASE_IMPORT_BATCH_SIZE).")
+        parser.add_argument("--dry-run", action="store_true", help="Validate and count rows without writing.")
+
+    def handle(self, *args, **options):
+        actor = get_user_model().objects.filter(username=options["actor"]).first()
+        if actor is None:
+            raise CommandError(f"No user named {options['actor']!r}.")
+        file_format = detect_format(options["path"], options["format"])
+        try:
+            with open(options["path"], encoding="utf-8-sig", newline="") as source:
+                report = import_cases(
+                    source,
+                    actor=actor,
+                    file_format=file_format,
+                    batch_size=options["batch_size"],
+                    dry_run=options["dry_run"],
+                )
+        except OSError as exc:
+            raise CommandError(str(exc)) from exc
+        except UnicodeDecodeError as exc:
+            raise CommandError(f"File must be UTF-8 encoded: {exc}") from exc
+
+        for error in report["errors"]:
+            self.stdout.write(f"line {error['line']}: {error['errors']}")
+        created = report["created"]
+        summary = (
+            f"{report['rows']} row(s): {created['cases']} case(s), {created['complaints']} complaint(s), "
+            f"{created['participants']} participant(s); {report['failed']} failed."
+        )
+        if options["dry_run"]:
+            self.stdout.write(self.style.WARNING(f"Would import {summary}"))
+        else:
+            self.stdout.write(self.style.SUCCESS(f"Imported {summary}"))
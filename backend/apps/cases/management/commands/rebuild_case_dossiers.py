@@ -0,0 +1,20 @@
+"""Scheduled task: rebuild case dossier documents that are still stale after the debounce window."""
+from django.core.management.base import BaseCommand
+
+from apps.cases.dossier import rebuild_stale_case_dossiers
+
+
+class Command(BaseCommand):
+    help = "Rebuild stale case dossiers (scheduler task); --all also builds dossiers for cases that have none."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--all", action="store_true", help="Also build dossiers for cases without one.")
+        parser.add_argument("--dry-run", action="store_true", help="Only count dossiers that would be rebuilt.")
+
+    def handle(self, *args, **options):
+        dry_run = options["dry_run"]
+        count = rebuild_stale_case_dossiers(include_missing=options["all"], dry_run=dry_run)
+        if dry_run:
+            self.stdout.write(self.style.WARNING(f"Would rebuild {count} case dossier(s)."))
+        else:
+            self.stdout.write(self.style.SUCCESS(f"Rebuilt {count} case dossier(s)."))
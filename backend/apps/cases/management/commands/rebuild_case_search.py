@@ -0,0 +1,17 @@
+"""Rebuild the case full-text search index (tsvector column or SQLite FTS5 table)."""
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from apps.cases.search import rebuild_search_index
+
+
+class Command(BaseCommand):
+    help = "Recompute the full-text search entry of every case (after bulk loads or restores)."
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            backend = rebuild_search_index()
+        if backend == "none":
+            self.stdout.write(self.style.WARNING("No full-text search index on this database; nothing rebuilt."))
+            return
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt case search index ({backend})."))
@@ -0,0 +1,90 @@
+# Generated by Django 6.0.9 on 2026-10-17 22:50
+
+import django.contrib.postgres.search
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+POSTGRES_VECTOR = (
+    "setweight(to_tsvector('simple', coalesce({row}case_number, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce({row}title, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce({row}summary, '')), 'B')"
+)
+
+POSTGRES_FORWARD = [
+    f"""
+    CREATE OR REPLACE FUNCTION cases_case_search_vector_update() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector := {POSTGRES_VECTOR.format(row="NEW.")};
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER cases_case_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF case_number, title, summary ON cases_case
+    FOR EACH ROW EXECUTE FUNCTION cases_case_search_vector_update()
+    """,
+    f"UPDATE cases_case SET search_vector = {POSTGRES_VECTOR.format(row='')}",
+    "CREATE INDEX cases_case_search_vector_gin ON cases_case USING gin (search_vector)",
+    "CREATE INDEX cases_case_case_number_trgm ON cases_case USING gin (case_number gin_trgm_ops)",
+]
+
+POSTGRES_BACKWARD = [
+    "DROP INDEX IF EXISTS cases_case_case_number_trgm",
+    "DROP INDEX IF EXISTS cases_case_search_vector_gin",
+    "DROP TRIGGER IF EXISTS cases_case_search_vector_trigger ON cases_case",
+    "DROP FUNCTION IF EXISTS cases_case_search_vector_update()",
+]
+
+SQLITE_FORWARD = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS cases_case_fts USING fts5("
+    "case_number, title, summary, tokenize = 'unicode61 remove_diacritics 2')",
+    "INSERT INTO cases_case_fts (rowid, case_number, title, summary) "
+    "SELECT id, case_number, title, summary FROM cases_case",
+]
+
+SQLITE_BACKWARD = ["DROP TABLE IF EXISTS cases_case_fts"]
+
+
+def _run(schema_editor, statements):
+    for statement in statements:
+        schema_editor.execute(statement)
+
+
+def create_search_structures(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "postgresql":
+        _run(schema_editor, POSTGRES_FORWARD)
+    elif vendor == "sqlite":
+        with schema_editor.connection.cursor() as cursor:
+            try:
+                cursor.execute("CREATE VIRTUAL TABLE temp.cases_fts5_probe USING fts5(probe)")
+                cursor.execute("DROP TABLE temp.cases_fts5_probe")
+            except Exception:
+                return  # SQLite built without FTS5: search falls back to icontains.
+        _run(schema_editor, SQLITE_FORWARD)
+
+
+def drop_search_structures(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "postgresql":
+        _run(schema_editor, POSTGRES_BACKWARD)
+    elif vendor == "sqlite":
+        _run(schema_editor, SQLITE_BACKWARD)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cases', '0006_case_created_at_id_index'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddField(
+            model_name='case',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(create_search_structures, drop_search_structures),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 6.0.9 on 2026-10-17 23:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cases', '0007_case_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='case',
+            name='version',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='complaint',
+            name='version',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
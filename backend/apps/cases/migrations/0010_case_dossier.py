@@ -0,0 +1,29 @@
+# Generated by Django 6.0.9 on 2026-10-17 23:22
+
+import django.core.serializers.json
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cases', '0009_complaint_review_lease'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CaseDossier',
+            fields=[
+                ('case', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='dossier', serialize=False, to='cases.case')),
+                ('document', models.JSONField(encoder=django.core.serializers.json.DjangoJSONEncoder)),
+                ('version', models.PositiveIntegerField(default=1)),
+                ('pending_changes', models.PositiveIntegerField(default=0)),
+                ('stale_since', models.DateTimeField(blank=True, null=True)),
+                ('built_at', models.DateTimeField()),
+            ],
+            options={
+                'indexes': [models.Index(fields=['stale_since'], name='cases_dossier_stale_idx')],
+            },
+        ),
+    ]
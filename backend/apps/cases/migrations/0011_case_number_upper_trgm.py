@@ -0,0 +1,39 @@
+from django.db import migrations
+
+# Django compiles case_number__icontains to UPPER("cases_case"."case_number"::text) LIKE
+# UPPER(%s) on PostgreSQL; a trigram index on the bare column cannot serve that expression.
+POSTGRES_FORWARD = [
+    "DROP INDEX IF EXISTS cases_case_case_number_trgm",
+    "CREATE INDEX cases_case_case_number_upper_trgm ON cases_case USING gin ((UPPER(case_number)) gin_trgm_ops)",
+]
+
+POSTGRES_BACKWARD = [
+    "DROP INDEX IF EXISTS cases_case_case_number_upper_trgm",
+    "CREATE INDEX cases_case_case_number_trgm ON cases_case USING gin (case_number gin_trgm_ops)",
+]
+
+
+def _run(schema_editor, statements):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for statement in statements:
+        schema_editor.execute(statement)
+
+
+def create_upper_index(apps, schema_editor):
+    _run(schema_editor, POSTGRES_FORWARD)
+
+
+def restore_column_index(apps, schema_editor):
+    _run(schema_editor, POSTGRES_BACKWARD)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cases', '0010_case_dossier'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_upper_index, restore_column_index),
+    ]
@@ -2,17 +2,22 @@ import uuid
 
 from django.core.exceptions import ValidationError
 from django.conf import settings
+from django.contrib.postgres.search import SearchVectorField
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
 from django.db import transaction
 from django.db.models import Q
 from django.utils import timezone
 
+from config.concurrency import VersionedModelMixin
+from config.tracking import TrackedFieldsMixin
+
 
 def generate_case_number():
     return f"CASE-{uuid.uuid4().hex[:12].upper()}"
 
 
-class Case(models.Model):
+class Case(VersionedModelMixin, TrackedFieldsMixin, models.Model):
     class Level(models.TextChoices):
         LEVEL_1 = "1", "Level 1"
         LEVEL_2 = "2", "Level 2"
@@ -83,6 +88,11 @@ class Case(models.Model):
 
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # Optimistic concurrency: bumped on every save (config.concurrency).
+    version = models.PositiveIntegerField(default=0)
+
+    # PostgreSQL only: maintained by a database trigger (see apps.cases.search).
+    search_vector = SearchVectorField(null=True, editable=False)
 
     class Meta:
         indexes = [
@@ -91,6 +101,7 @@ class Case(models.Model):
             models.Index(fields=["priority"]),
             models.Index(fields=["source_type"]),
             models.Index(fields=["assigned_to"]),
+            models.Index(fields=["created_at", "id"]),
         ]
         constraints = [
             models.CheckConstraint(
@@ -132,8 +143,11 @@ class Case(models.Model):
         return mapping.get(status)
 
     def _previous_status(self):
-        if not self.pk:
+        """Status the row had when loaded; read from the database only if status was deferred."""
+        if self._state.adding or not self.pk:
             return None
+        if self.is_tracked("status"):
+            return self.loaded_value("status")
         return type(self).objects.filter(pk=self.pk).values_list("status", flat=True).first()
 
     def save(self, *args, **kwargs):
@@ -150,6 +164,9 @@ class Case(models.Model):
             timestamp_field = self.status_to_timestamp_field(self.status)
             if timestamp_field and getattr(self, timestamp_field) is None:
                 setattr(self, timestamp_field, timezone.now())
+                update_fields = kwargs.get("update_fields")
+                if update_fields is not None and "status" in update_fields:
+                    kwargs["update_fields"] = {*update_fields, timestamp_field}
 
         super().save(*args, **kwargs)
 
@@ -283,7 +300,7 @@ class SceneCaseReport(models.Model):
         super().save(*args, **kwargs)
 
 
-class Complaint(models.Model):
+class Complaint(VersionedModelMixin, TrackedFieldsMixin, models.Model):
     class Status(models.TextChoices):
         SUBMITTED = "submitted", "Submitted"
         CADET_REVIEW = "cadet_review", "Cadet Review"
@@ -311,13 +328,27 @@ class Complaint(models.Model):
     reviewed_at = models.DateTimeField(null=True, blank=True)
     validated_at = models.DateTimeField(null=True, blank=True)
     invalidated_at = models.DateTimeField(null=True, blank=True)
+    # Cadet review work queue lease (apps.cases.queue).
+    review_claimed_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="complaint_review_claims",
+    )
+    review_claimed_at = models.DateTimeField(null=True, blank=True)
+    review_lease_expires_at = models.DateTimeField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # Optimistic concurrency: bumped on every save (config.concurrency).
+    version = models.PositiveIntegerField(default=0)
 
     class Meta:
         indexes = [
             models.Index(fields=["case", "status"]),
             models.Index(fields=["complainant"]),
+            models.Index(fields=["status", "created_at", "id"], name="cases_complaint_queue_idx"),
+            models.Index(fields=["review_lease_expires_at"], name="cases_complaint_lease_idx"),
         ]
         constraints = [
             models.CheckConstraint(
@@ -389,6 +420,10 @@ class Complaint(models.Model):
                 self.status = self.Status.REJECTED
 
         self.reviewed_at = now
+        # A decision ends the review lease, whoever held it.
+        self.review_claimed_by = None
+        self.review_claimed_at = None
+        self.review_lease_expires_at = None
         self.save()
 
 
@@ -415,6 +450,14 @@ class ComplaintValidationCounter(models.Model):
         return f"{self.complaint_id}:{self.invalid_attempt_count}"
 
 
+class ReviewLeaseHeld(ValidationError):
+    """The complaint is leased to another reviewer (apps.cases.queue)."""
+
+    def __init__(self, expires_at):
+        super().__init__({"complaint": "Complaint is claimed by another reviewer."})
+        self.expires_at = expires_at
+
+
 class ComplaintReview(models.Model):
     class Decision(models.TextChoices):
         APPROVED = "approved", "Approved"
@@ -458,7 +501,50 @@ class ComplaintReview(models.Model):
             complaint = Complaint.objects.select_for_update().get(pk=self.complaint_id)
             if is_create and complaint.status == Complaint.Status.FINAL_INVALID:
                 raise ValidationError({"complaint": "Complaint is already terminally invalidated."})
+            # Checked again on the locked row: the lease may have changed hands since the caller looked.
+            lease_expires_at = complaint.review_lease_expires_at
+            if (
+                is_create
+                and lease_expires_at
+                and lease_expires_at > timezone.now()
+                and complaint.review_claimed_by_id != self.reviewer_id
+            ):
+                raise ReviewLeaseHeld(lease_expires_at)
             super().save(*args, **kwargs)
             if is_create:
                 complaint.apply_review_decision(self.decision, self.rejection_reason)
 
+
+
+class CaseDossier(models.Model):
+    """
+    Denormalised read document for one case (see apps.cases.dossier).
+
+    pending_changes counts source writes since the document was built; a non-zero value means
+    the document is stale and is rebuilt on the next read or by the debounced rebuild.
+    version is bumped on every rebuild and is the ETag clients send back in If-None-Match.
+    """
+
+    case = models.OneToOneField(
+        Case,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="dossier",
+    )
+    document = models.JSONField(encoder=DjangoJSONEncoder)
+    version = models.PositiveIntegerField(default=1)
+    pending_changes = models.PositiveIntegerField(default=0)
+    stale_since = models.DateTimeField(null=True, blank=True)
+    built_at = models.DateTimeField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["stale_since"], name="cases_dossier_stale_idx"),
+        ]
+
+    def __str__(self):
+        return f"Dossier {self.case_id} v{self.version}"
+
+    @property
+    def etag(self) -> str:
+        return f'"case-{self.case_id}-v{self.version}"'
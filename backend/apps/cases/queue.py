@@ -0,0 +1,125 @@
+"""
+Work queue for cadet complaint review.
+
+Instead of listing complaints and racing each other to review the same one, cadets call
+"claim next": the oldest complaint waiting for review is leased to them for
+COMPLAINT_REVIEW_LEASE_SECONDS and moved to cadet_review. The candidate row is selected with
+SELECT ... FOR UPDATE SKIP LOCKED, so concurrent claimers each lock a different row and
+never wait on one another. The lease is written with the Complaint version check, which
+also covers backends without row locks (SQLite): a lost race is retried on the next row.
+
+A reviewer extends the lease with heartbeats. A lease that expires (reviewer gone) makes the
+complaint claimable again. A review decision or an explicit release ends the lease.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, F, Min, Q
+from django.utils import timezone
+
+from apps.cases.models import Complaint
+from config.concurrency import retry_on_conflict
+
+QUEUE_STATUSES = (Complaint.Status.SUBMITTED, Complaint.Status.CADET_REVIEW)
+
+
+def lease_duration() -> timedelta:
+    return timedelta(seconds=settings.COMPLAINT_REVIEW_LEASE_SECONDS)
+
+
+def _unleased(now) -> Q:
+    return Q(review_lease_expires_at__isnull=True) | Q(review_lease_expires_at__lte=now)
+
+
+def claimable_complaints(now=None):
+    """Complaints waiting for review with no live lease, oldest first."""
+    now = now or timezone.now()
+    return Complaint.objects.filter(_unleased(now), status__in=QUEUE_STATUSES).order_by("created_at", "id")
+
+
+def has_live_lease(complaint: Complaint, now=None) -> bool:
+    now = now or timezone.now()
+    return bool(complaint.review_lease_expires_at and complaint.review_lease_expires_at > now)
+
+
+def claim_next_complaint(reviewer):
+    """Lease the oldest waiting complaint to reviewer (or return the one they already hold); None when empty."""
+    return retry_on_conflict(_claim_next_complaint, reviewer)
+
+
+def _claim_next_complaint(reviewer):
+    now = timezone.now()
+    held = (
+        Complaint.objects.filter(
+            review_claimed_by=reviewer,
+            review_lease_expires_at__gt=now,
+            status=Complaint.Status.CADET_REVIEW,
+        )
+        .order_by("review_claimed_at", "id")
+        .first()
+    )
+    if held is not None:
+        return held
+
+    with transaction.atomic():
+        complaint = claimable_complaints(now).select_for_update(skip_locked=True).first()
+        if complaint is None:
+            return None
+        complaint.status = Complaint.Status.CADET_REVIEW
+        complaint.review_claimed_by = reviewer
+        complaint.review_claimed_at = now
+        complaint.review_lease_expires_at = now + lease_duration()
+        complaint.save()
+        return complaint
+
+
+def _held_by(reviewer, complaint_id, now):
+    return Complaint.objects.filter(
+        pk=complaint_id,
+        review_claimed_by=reviewer,
+        review_lease_expires_at__gt=now,
+        status=Complaint.Status.CADET_REVIEW,
+    )
+
+
+def heartbeat_complaint_lease(reviewer, complaint_id):
+    """Extend reviewer's live lease; returns the new expiry, or None when the lease was lost."""
+    now = timezone.now()
+    expires_at = now + lease_duration()
+    updated = _held_by(reviewer, complaint_id, now).update(
+        review_lease_expires_at=expires_at,
+        version=F("version") + 1,
+        updated_at=now,
+    )
+    return expires_at if updated else None
+
+
+def release_complaint_lease(reviewer, complaint_id) -> bool:
+    """Give a leased complaint back to the queue unreviewed."""
+    now = timezone.now()
+    updated = _held_by(reviewer, complaint_id, now).update(
+        status=Complaint.Status.SUBMITTED,
+        review_claimed_by=None,
+        review_claimed_at=None,
+        review_lease_expires_at=None,
+        version=F("version") + 1,
+        updated_at=now,
+    )
+    return bool(updated)
+
+
+def complaint_queue_metrics(now=None) -> dict:
+    """Queue depth, live and expired leases and the age of the oldest waiting complaint (one query)."""
+    now = now or timezone.now()
+    unleased = _unleased(now)
+    totals = Complaint.objects.filter(status__in=QUEUE_STATUSES).aggregate(
+        depth=Count("id", filter=unleased),
+        leased=Count("id", filter=Q(review_lease_expires_at__gt=now)),
+        expired_leases=Count("id", filter=Q(review_lease_expires_at__lte=now)),
+        oldest_created_at=Min("created_at", filter=unleased),
+    )
+    oldest = totals.pop("oldest_created_at")
+    totals["oldest_age_seconds"] = int((now - oldest).total_seconds()) if oldest else 0
+    totals["lease_seconds"] = settings.COMPLAINT_REVIEW_LEASE_SECONDS
+    return totals
@@ -0,0 +1,119 @@
+"""
+Full-text search over cases (case_number, title, summary).
+
+PostgreSQL: Case.search_vector ('simple' config; case_number and title weighted A, summary
+B) is filled by a BEFORE INSERT/UPDATE trigger and GIN-indexed. case_number substrings are
+matched with icontains, which Django compiles to UPPER(case_number) LIKE UPPER(%s); the
+pg_trgm GIN index is on UPPER(case_number) so it serves that expression, and the OR with the
+tsvector match can run as a BitmapOr of both indexes. Rank is ts_rank plus trigram similarity.
+
+SQLite: an FTS5 table (cases_case_fts, rowid = case id) is kept in step by the post_save /
+post_delete handlers in apps.cases.signals, and ranked with bm25. Rows written with
+bulk_create or queryset.update() are picked up by the `rebuild_case_search` command.
+
+Other backends, or SQLite without FTS5, fall back to icontains with a constant rank.
+"""
+import re
+
+from django.contrib.postgres.search import SearchQuery, SearchRank, TrigramSimilarity
+from django.db import connection
+from django.db.models import F, FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Coalesce
+
+FTS_TABLE = "cases_case_fts"
+SEARCH_CONFIG = "simple"
+INDEXED_FIELDS = ("case_number", "title", "summary")
+MAX_SEARCH_TOKENS = 8
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+POSTGRES_VECTOR_SQL = (
+    "setweight(to_tsvector('simple', coalesce({row}case_number, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce({row}title, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce({row}summary, '')), 'B')"
+)
+
+
+def search_tokens(term: str) -> list[str]:
+    return _TOKEN_RE.findall(term.lower())[:MAX_SEARCH_TOKENS]
+
+
+def uses_postgres_search() -> bool:
+    return connection.vendor == "postgresql"
+
+
+def uses_sqlite_fts() -> bool:
+    if connection.vendor != "sqlite":
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s", [FTS_TABLE])
+        return cursor.fetchone() is not None
+
+
+def apply_case_search(queryset, term: str):
+    """Filter to cases matching term and annotate search_rank (higher ranks first)."""
+    term = term.strip()
+    tokens = search_tokens(term)
+    case_number_match = Q(case_number__icontains=term)
+
+    if tokens and uses_postgres_search():
+        query = SearchQuery(" & ".join(f"{token}:*" for token in tokens), search_type="raw", config=SEARCH_CONFIG)
+        return queryset.filter(Q(search_vector=query) | case_number_match).annotate(
+            search_rank=Coalesce(SearchRank(F("search_vector"), query), Value(0.0))
+            + TrigramSimilarity("case_number", term),
+        )
+
+    if tokens and uses_sqlite_fts():
+        match = " ".join(f'"{token}"*' for token in tokens)
+        table = queryset.model._meta.db_table
+        matched_ids = RawSQL(f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", (match,))
+        rank = RawSQL(
+            f"SELECT -bm25({FTS_TABLE}, 10.0, 10.0, 1.0) FROM {FTS_TABLE} "
+            f"WHERE {FTS_TABLE} MATCH %s AND rowid = {table}.id",
+            (match,),
+            output_field=FloatField(),
+        )
+        return queryset.filter(Q(pk__in=matched_ids) | case_number_match).annotate(
+            search_rank=Coalesce(rank, Value(0.0)),
+        )
+
+    fallback = Q(title__icontains=term) | Q(summary__icontains=term) | case_number_match
+    return queryset.filter(fallback).annotate(search_rank=Value(0.0, output_field=FloatField()))
+
+
+def index_cases(cases):
+    """Refresh the SQLite FTS rows for the given cases (PostgreSQL uses its trigger)."""
+    if not uses_sqlite_fts():
+        return
+    rows = [(case.pk, case.case_number, case.title, case.summary) for case in cases]
+    if not rows:
+        return
+    with connection.cursor() as cursor:
+        cursor.executemany(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [(row[0],) for row in rows])
+        cursor.executemany(
+            f"INSERT INTO {FTS_TABLE} (rowid, case_number, title, summary) VALUES (%s, %s, %s, %s)",
+            rows,
+        )
+
+
+def remove_cases_from_index(case_ids):
+    if not case_ids or not uses_sqlite_fts():
+        return
+    with connection.cursor() as cursor:
+        cursor.executemany(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [(case_id,) for case_id in case_ids])
+
+
+def rebuild_search_index() -> str:
+    """Recompute every case's search entry; returns the backend that was rebuilt."""
+    with connection.cursor() as cursor:
+        if uses_postgres_search():
+            cursor.execute(f"UPDATE cases_case SET search_vector = {POSTGRES_VECTOR_SQL.format(row='')}")
+            return "postgresql"
+        if uses_sqlite_fts():
+            cursor.execute(f"DELETE FROM {FTS_TABLE}")
+            cursor.execute(
+                f"INSERT INTO {FTS_TABLE} (rowid, case_number, title, summary) "
+                "SELECT id, case_number, title, summary FROM cases_case"
+            )
+            return "sqlite-fts5"
+    return "none"
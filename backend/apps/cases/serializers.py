@@ -4,6 +4,7 @@ from django.utils import timezone
 from rest_framework import serializers
 
 from apps.cases.models import Case, CaseParticipant, Complaint, ComplaintReview, SceneCaseReport
+from apps.cases.services import MAX_BATCH_TRANSITIONS
 from apps.cases.validators import (
     validate_case_not_closed_or_invalid,
     validate_national_id,
@@ -119,10 +120,22 @@ class SceneCaseSerializer(serializers.ModelSerializer):
         ]
 
     def get_witnesses(self, obj):
-        queryset = obj.participants.filter(
-            role_in_case=CaseParticipant.RoleInCase.WITNESS,
-            participant_kind=CaseParticipant.ParticipantKind.CIVILIAN,
-        ).order_by("id")
+        if "participants" in getattr(obj, "_prefetched_objects_cache", {}):
+            # Lists prefetch participants; filter them here instead of a query per case.
+            queryset = sorted(
+                (
+                    participant
+                    for participant in obj.participants.all()
+                    if participant.role_in_case == CaseParticipant.RoleInCase.WITNESS
+                    and participant.participant_kind == CaseParticipant.ParticipantKind.CIVILIAN
+                ),
+                key=lambda participant: participant.id,
+            )
+        else:
+            queryset = obj.participants.filter(
+                role_in_case=CaseParticipant.RoleInCase.WITNESS,
+                participant_kind=CaseParticipant.ParticipantKind.CIVILIAN,
+            ).order_by("id")
         return SceneCaseWitnessSerializer(queryset, many=True).data
 
 
@@ -144,6 +157,8 @@ class ComplaintSerializer(serializers.ModelSerializer):
             "reviewed_at",
             "validated_at",
             "invalidated_at",
+            "review_claimed_by",
+            "review_lease_expires_at",
             "created_at",
             "updated_at",
         ]
@@ -242,6 +257,14 @@ class CaseStatusTransitionSerializer(serializers.Serializer):
         return value
 
 
+class CaseBatchStatusTransitionItemSerializer(CaseStatusTransitionSerializer):
+    case_id = serializers.IntegerField(min_value=1)
+
+
+class CaseBatchStatusTransitionSerializer(serializers.Serializer):
+    transitions = CaseBatchStatusTransitionItemSerializer(many=True, min_length=1, max_length=MAX_BATCH_TRANSITIONS)
+
+
 class CaseParticipantSerializer(serializers.ModelSerializer):
     class Meta:
         model = CaseParticipant
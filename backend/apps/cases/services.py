@@ -11,6 +11,7 @@ from django.utils import timezone
 
 from apps.access.services import get_user_role_keys, user_has_any_role_key
 from apps.cases.models import Case, CaseParticipant, Complaint, SceneCaseReport
+from config.concurrency import retry_on_conflict
 
 ROLE_KEY_CADET = "cadet"
 ASSIGNED_ROLE_KEY_POLICE_OFFICER = "police_officer"
@@ -58,6 +59,16 @@ CASE_TERMINAL_STATES = {Case.Status.CLOSED, Case.Status.FINAL_INVALID}
 
 CASE_INITIAL_STATES = {Case.Status.SUBMITTED, Case.Status.UNDER_REVIEW}
 
+# Timeline event (event_type, summary) written when a case is moved to a status.
+CASE_TRANSITION_EVENTS = {
+    Case.Status.SUSPECT_ASSESSMENT: ("cases.case.suspect_assessment", "Case moved to suspect assessment."),
+    Case.Status.REFERRAL_READY: ("cases.case.referral", "Case referred to judiciary."),
+    Case.Status.IN_TRIAL: ("cases.case.trial_started", "Case trial started."),
+    Case.Status.CLOSED: ("cases.case.verdict", "Case verdict recorded, case closed."),
+}
+DEFAULT_TRANSITION_EVENT = ("cases.case.status_changed", "Case status changed.")
+MAX_BATCH_TRANSITIONS = 200
+
 
 def is_valid_case_status_transition(from_status: str, to_status: str) -> bool:
     """Check if transition from from_status to to_status is valid per state machine."""
@@ -82,12 +93,13 @@ def can_cadet_review_complaint(user):
 
 
 def create_case_for_complaint_if_missing(complaint: Complaint, actor):
+    """Create the complaint's case once; a concurrent creator wins the version check and is reused."""
+    return retry_on_conflict(_create_case_for_complaint_if_missing, complaint, actor)
+
+
+def _create_case_for_complaint_if_missing(complaint: Complaint, actor):
     with transaction.atomic():
-        complaint_locked = (
-            Complaint.objects.select_for_update()
-            .select_related("complainant", "case")
-            .get(pk=complaint.pk)
-        )
+        complaint_locked = Complaint.objects.select_related("complainant", "case").get(pk=complaint.pk)
         if complaint_locked.case_id:
             return complaint_locked.case, False
 
@@ -102,6 +114,7 @@ def create_case_for_complaint_if_missing(complaint: Complaint, actor):
             created_by=actor,
         )
 
+        # Compare-and-swap on Complaint.version: a concurrent writer rolls this attempt back.
         complaint_locked.case = case
         complaint_locked.save(update_fields=["case", "updated_at"])
 
@@ -240,10 +253,14 @@ def can_approve_scene_case(user, case: Case, scene_report: SceneCaseReport):
 
 
 def approve_scene_case(*, actor, case: Case):
+    return retry_on_conflict(_approve_scene_case, actor, case)
+
+
+def _approve_scene_case(actor, case: Case):
     with transaction.atomic():
-        locked_case = Case.objects.select_for_update().select_related("scene_report_detail").get(pk=case.pk)
-        scene_report = locked_case.scene_report_detail
-        allowed, message = can_approve_scene_case(actor, locked_case, scene_report)
+        current = Case.objects.select_related("scene_report_detail").get(pk=case.pk)
+        scene_report = current.scene_report_detail
+        allowed, message = can_approve_scene_case(actor, current, scene_report)
         if not allowed:
             return None, message
 
@@ -252,9 +269,10 @@ def approve_scene_case(*, actor, case: Case):
         scene_report.superior_approved_at = approved_at
         scene_report.save(update_fields=["superior_approved_by", "superior_approved_at", "updated_at"])
 
-        locked_case.status = Case.Status.ACTIVE_INVESTIGATION
-        locked_case.save()
-        return locked_case, None
+        # The case version check guards the scene report write too: both roll back on conflict.
+        current.status = Case.Status.ACTIVE_INVESTIGATION
+        current.save()
+        return current, None
 
 
 def can_mark_suspect(user):
@@ -268,7 +286,7 @@ def can_mark_suspect(user):
     return False, "Only detective or police roles can mark suspects."
 
 
-def can_transition_case_status(user, case: Case, new_status: str):
+def can_transition_case_status(user, case: Case, new_status: str, role_keys=None):
     """Check if user can transition case to new_status. Uses centralized state machine."""
     if not is_valid_case_status_transition(case.status, new_status):
         allowed = get_allowed_next_statuses(case.status)
@@ -277,7 +295,8 @@ def can_transition_case_status(user, case: Case, new_status: str):
             f"Allowed next: {sorted(allowed) or 'none (terminal state)'}."
         )
 
-    role_keys = get_user_role_keys(user)
+    if role_keys is None:
+        role_keys = get_user_role_keys(user)
     captain_or_chief = "captain" in role_keys or "chief" in role_keys
     judge_role = "judge" in role_keys
     detective_or_sergeant = "detective" in role_keys or "sergeant" in role_keys
@@ -301,11 +320,117 @@ def transition_case_status(*, actor, case: Case, new_status: str):
     allowed, message = can_transition_case_status(actor, case, new_status)
     if not allowed:
         return None, message
+    return retry_on_conflict(_transition_case_status, actor, case.pk, new_status)
+
 
+def _transition_case_status(actor, case_id, new_status):
+    """One attempt: re-read the case, re-check the transition and compare-and-swap its version."""
+    with transaction.atomic():
+        current = Case.objects.get(pk=case_id)
+        allowed, message = can_transition_case_status(actor, current, new_status)
+        if not allowed:
+            return None, message
+        current.status = new_status
+        current.save()
+        return current, None
+
+
+def transition_policy_error_code(message: str) -> str:
+    return "ROLE_POLICY_VIOLATION" if "Only " in (message or "") else "WORKFLOW_POLICY_VIOLATION"
+
+
+def transition_case_statuses(*, actor, transitions: list[dict]) -> list[dict]:
+    """
+    Apply [{"case_id", "new_status"}, ...] in one transaction and return one result per item,
+    in request order: {"case_id", "ok", "status"} or {"case_id", "ok": False, "code", "message"}.
+
+    All target cases are locked with one SELECT ... FOR UPDATE in primary-key order (so two
+    batches over overlapping cases cannot deadlock), checked against the state machine and
+    role policy in memory, then written with one bulk_update. Items that fail are reported
+    and do not stop the others. bulk_update skips Case.save and post_save, so lifecycle
+    timestamps, report counters, wanted rankings, timeline events and the dossier stale mark
+    are applied here.
+    """
+    from apps.cases.dossier import mark_case_dossiers_stale
+    from apps.notifications.models import TimelineEvent
+    from apps.reports.stats import apply_counter_deltas, row_deltas, tracked_models
+    from apps.wanted.ranking import refresh_case_rankings
+
+    role_keys = get_user_role_keys(actor)
+    counter_fields = tracked_models()["cases"][1]
+    results = []
     with transaction.atomic():
-        locked = Case.objects.select_for_update().get(pk=case.pk)
-        if locked.status != case.status:
-            return None, "Case status changed; retry."
-        locked.status = new_status
-        locked.save()
-        return locked, None
+        case_ids = sorted({item["case_id"] for item in transitions})
+        cases = {case.pk: case for case in Case.objects.select_for_update().filter(pk__in=case_ids).order_by("pk")}
+
+        now = timezone.now()
+        changed = []
+        write_fields = {"status", "updated_at", "version"}
+        deltas = {}
+        seen = set()
+        for item in transitions:
+            case_id, new_status = item["case_id"], item["new_status"]
+            case = cases.get(case_id)
+            if case is None:
+                results.append({"case_id": case_id, "ok": False, "code": "NOT_FOUND", "message": "Case not found."})
+                continue
+            if case_id in seen:
+                results.append(
+                    {
+                        "case_id": case_id,
+                        "ok": False,
+                        "code": "VALIDATION_ERROR",
+                        "message": "Case appears more than once in this batch.",
+                    }
+                )
+                continue
+            seen.add(case_id)
+            allowed, message = can_transition_case_status(actor, case, new_status, role_keys=role_keys)
+            if not allowed:
+                results.append(
+                    {
+                        "case_id": case_id,
+                        "ok": False,
+                        "code": transition_policy_error_code(message),
+                        "message": message,
+                    }
+                )
+                continue
+
+            previous = {field: getattr(case, field) for field in counter_fields}
+            case.status = new_status
+            timestamp_field = Case.status_to_timestamp_field(new_status)
+            if timestamp_field and getattr(case, timestamp_field) is None:
+                setattr(case, timestamp_field, now)
+                write_fields.add(timestamp_field)
+            case.updated_at = now
+            # Rows are locked; bump version so optimistic writers holding an older copy conflict.
+            case.version += 1
+            changed.append(case)
+            for key, delta in row_deltas(previous, {field: getattr(case, field) for field in counter_fields}).items():
+                deltas[key] = deltas.get(key, 0) + delta
+            results.append({"case_id": case_id, "ok": True, "status": new_status})
+
+        if changed:
+            Case.objects.bulk_update(changed, sorted(write_fields))
+            apply_counter_deltas("cases", deltas)
+            for case in changed:
+                if case.status == Case.Status.CLOSED:
+                    refresh_case_rankings(case, now=now)
+            events = []
+            for case in changed:
+                event_type, summary = CASE_TRANSITION_EVENTS.get(case.status, DEFAULT_TRANSITION_EVENT)
+                events.append(
+                    TimelineEvent(
+                        actor=actor,
+                        event_type=event_type,
+                        summary=summary,
+                        target_type="cases.case",
+                        target_id=str(case.id),
+                        case_reference=case.case_number,
+                        payload_summary={"status": case.status, "batch": True},
+                    )
+                )
+            TimelineEvent.objects.bulk_create(events)
+            mark_case_dossiers_stale(case_ids=[case.pk for case in changed])
+    return results
@@ -0,0 +1,50 @@
+from django.apps import apps
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.cases.dossier import DOSSIER_SOURCES, mark_case_dossiers_stale
+from apps.cases.models import Case
+from apps.cases.search import INDEXED_FIELDS, index_cases, remove_cases_from_index
+
+
+@receiver(post_save, sender=Case)
+def refresh_case_search_entry(sender, instance, raw=False, update_fields=None, **kwargs):
+    """Keep the SQLite FTS row current; PostgreSQL updates search_vector in a trigger."""
+    if raw:
+        return
+    if update_fields is not None and not set(update_fields).intersection(INDEXED_FIELDS):
+        return
+    index_cases([instance])
+
+
+@receiver(post_delete, sender=Case)
+def drop_case_search_entry(sender, instance, **kwargs):
+    remove_cases_from_index([instance.pk])
+
+
+def _connect_dossier_source(model, case_attr):
+    def mark_dossier_stale(sender, instance, raw=False, **kwargs):
+        if raw:
+            return
+        if "__" in case_attr:
+            relation, attr = case_attr.split("__", 1)
+            field = instance._meta.get_field(relation)
+            related_id = getattr(instance, field.attname)
+            value = field.related_model.objects.filter(pk=related_id).values_list(attr, flat=True).first()
+        else:
+            value = getattr(instance, case_attr)
+        if case_attr == "case_reference":
+            mark_case_dossiers_stale(case_numbers=[value])
+        else:
+            mark_case_dossiers_stale(case_ids=[value])
+
+    dispatch_uid = f"cases.dossier.{model._meta.label}"
+    post_save.connect(mark_dossier_stale, sender=model, weak=False, dispatch_uid=f"{dispatch_uid}.post_save")
+    post_delete.connect(mark_dossier_stale, sender=model, weak=False, dispatch_uid=f"{dispatch_uid}.post_delete")
+
+
+for _label, _case_attr in DOSSIER_SOURCES.items():
+    _source = apps.get_model(_label)
+    for _model in apps.get_models():
+        if issubclass(_model, _source):
+            _connect_dossier_source(_model, _case_attr)
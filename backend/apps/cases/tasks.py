@@ -0,0 +1,10 @@
+"""Celery tasks for the cases app."""
+from celery import shared_task
+
+from apps.cases.dossier import rebuild_case_dossier
+
+
+@shared_task(name="apps.cases.tasks.rebuild_case_dossier")
+def rebuild_case_dossier_task(case_id):
+    """Debounced dossier rebuild enqueued by apps.cases.dossier.mark_case_dossiers_stale."""
+    rebuild_case_dossier(case_id)
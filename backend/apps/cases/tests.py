@@ -1,13 +1,32 @@
+import json
+import os
+import tempfile
+from datetime import timedelta
+from importlib import import_module
+from io import StringIO
+from unittest import mock, skipUnless
+
+from django.apps import apps as django_apps
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.core.exceptions import ValidationError
-from django.db import IntegrityError
-from django.test import TestCase
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.utils import timezone
+from django.db import IntegrityError, connection, transaction
+from django.db.models import F
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from rest_framework import status
 from rest_framework.authtoken.models import Token
 from rest_framework.test import APITestCase
 
 from apps.access.models import Permission, Role, RolePermission, UserRoleAssignment
-from apps.cases.models import Case, CaseParticipant, Complaint, ComplaintReview, SceneCaseReport
+from apps.cases import dossier as dossier_module
+from apps.cases.models import Case, CaseDossier, CaseParticipant, Complaint, ComplaintReview, SceneCaseReport
+from apps.notifications.models import TimelineEvent
+from apps.reports.models import StatCounter
+from config.concurrency import ConcurrentUpdateError, retry_on_conflict
 
 
 class CaseModelTests(TestCase):
@@ -106,6 +125,108 @@ class CaseModelTests(TestCase):
         case.save()
         self.assertIsNone(case.assigned_at)
 
+    def _case_queries(self, case):
+        with CaptureQueriesContext(connection) as queries:
+            case.save()
+        return [query["sql"] for query in queries.captured_queries if '"cases_case"' in query["sql"]]
+
+    def test_status_change_is_detected_from_loaded_state(self):
+        created = Case.objects.create(
+            title="Tracked case",
+            summary="Tracked",
+            level=Case.Level.LEVEL_2,
+            source_type=Case.SourceType.COMPLAINT,
+            created_by=self.creator,
+        )
+        case = Case.objects.get(pk=created.pk)
+        case.status = Case.Status.UNDER_REVIEW
+
+        statements = self._case_queries(case)
+
+        self.assertFalse([sql for sql in statements if sql.startswith("SELECT")])
+        self.assertEqual(len(statements), 1)
+        update = statements[0]
+        for column in ("status", "under_review_at", "updated_at"):
+            self.assertIn(f'"{column}"', update)
+        for column in ("title", "summary", "level", "case_number"):
+            self.assertNotIn(f'"{column}" =', update)
+        self.assertIsNotNone(case.under_review_at)
+        self.assertEqual(case.changed_fields(), [])
+
+    def test_unchanged_case_only_touches_updated_at(self):
+        case = Case.objects.create(
+            title="Untouched case",
+            summary="Nothing changes",
+            level=Case.Level.LEVEL_3,
+            source_type=Case.SourceType.COMPLAINT,
+            created_by=self.creator,
+        )
+        statements = self._case_queries(case)
+        self.assertEqual(len(statements), 1)
+        self.assertNotIn('"status" =', statements[0])
+        self.assertIn('"updated_at" =', statements[0])
+
+    def test_explicit_update_fields_with_status_writes_its_timestamp(self):
+        case = Case.objects.create(
+            title="Explicit fields case",
+            summary="Explicit",
+            level=Case.Level.LEVEL_1,
+            source_type=Case.SourceType.COMPLAINT,
+            created_by=self.creator,
+        )
+        case.status = Case.Status.UNDER_REVIEW
+        case.save(update_fields=["status"])
+        case.refresh_from_db()
+        self.assertIsNotNone(case.under_review_at)
+        self.assertFalse(case.has_changed("status"))
+
+    def test_stale_case_save_raises_concurrent_update_error(self):
+        case = Case.objects.create(
+            title="Versioned case",
+            level=Case.Level.LEVEL_2,
+            source_type=Case.SourceType.COMPLAINT,
+            created_by=self.creator,
+        )
+        first = Case.objects.get(pk=case.pk)
+        second = Case.objects.get(pk=case.pk)
+
+        first.assignment_notes = "First writer"
+        first.save()
+        self.assertEqual(first.version, 1)
+
+        second.assignment_notes = "Second writer"
+        with self.assertRaises(ConcurrentUpdateError), transaction.atomic():
+            second.save(update_fields=["assignment_notes"])
+        self.assertEqual(second.version, 0)
+        case.refresh_from_db()
+        self.assertEqual((case.assignment_notes, case.version), ("First writer", 1))
+
+    def test_retry_on_conflict_rereads_and_applies_change(self):
+        case = Case.objects.create(
+            title="Retried case",
+            level=Case.Level.LEVEL_2,
+            source_type=Case.SourceType.COMPLAINT,
+            created_by=self.creator,
+        )
+        attempts = []
+
+        def append_note():
+            current = Case.objects.get(pk=case.pk)
+            if not attempts:
+                # Another writer commits between this attempt's read and its write.
+                Case.objects.filter(pk=case.pk).update(assignment_notes="Concurrent", version=F("version") + 1)
+            attempts.append(current.version)
+            with transaction.atomic():
+                current.assignment_notes = f"{current.assignment_notes}+retry"
+                current.save()
+            return current
+
+        updated = retry_on_conflict(append_note, base_delay_ms=0)
+
+        self.assertEqual(attempts, [0, 1])
+        self.assertEqual(updated.assignment_notes, "Concurrent+retry")
+        self.assertEqual(Case.objects.get(pk=case.pk).version, 2)
+
 
 class CaseParticipantModelTests(TestCase):
     def setUp(self):
@@ -381,6 +502,90 @@ class ComplaintIntakeApiTests(APITestCase):
         self.assertEqual(response.data["data"]["status"], Complaint.Status.SUBMITTED)
         self.assertIsNone(response.data["data"]["case"])
 
+    def test_review_is_refused_when_the_lease_is_taken_after_the_view_checked_it(self):
+        complaint = Complaint.objects.create(complainant=self.complainant_user, description="Contested complaint")
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {self.cadet_token.key}")
+
+        def claimed_by_another_cadet_meanwhile(complaint, now=None):
+            Complaint.objects.filter(pk=complaint.pk).update(
+                status=Complaint.Status.CADET_REVIEW,
+                review_claimed_by=self.other_user,
+                review_lease_expires_at=timezone.now() + timedelta(minutes=5),
+            )
+            return False
+
+        with mock.patch("apps.cases.views.has_live_lease", side_effect=claimed_by_another_cadet_meanwhile):
+            response = self.client.post(
+                f"/api/v1/cases/complaints/{complaint.id}/review/",
+                {"decision": ComplaintReview.Decision.APPROVED},
+                format="json",
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(response.data["error"]["code"], "LEASE_HELD")
+        complaint.refresh_from_db()
+        self.assertEqual((complaint.status, complaint.case_id), (Complaint.Status.CADET_REVIEW, None))
+        self.assertFalse(ComplaintReview.objects.filter(complaint=complaint).exists())
+
+    def test_review_queue_leases_each_complaint_to_one_cadet(self):
+        second_cadet = get_user_model().objects.create_user(
+            username="cadet_api02",
+            email="cadet_api02@example.com",
+            password="StrongPass123!",
+            phone="09120040005",
+            national_id="9400000005",
+            full_name="Cadet Api Two",
+        )
+        UserRoleAssignment.objects.create(user=second_cadet, role=self.role_cadet, assigned_by=self.admin_user)
+        second_token = Token.objects.create(user=second_cadet)
+        older = Complaint.objects.create(complainant=self.complainant_user, description="Older complaint")
+        newer = Complaint.objects.create(complainant=self.complainant_user, description="Newer complaint")
+
+        def as_cadet(token, method, url, payload=None):
+            self.client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+            return getattr(self.client, method)(url, payload or {}, format="json")
+
+        claim_url = "/api/v1/cases/complaints/queue/claim/"
+        first = as_cadet(self.cadet_token, "post", claim_url)
+        second = as_cadet(second_token, "post", claim_url)
+        again = as_cadet(self.cadet_token, "post", claim_url)
+        self.assertEqual(first.data["data"]["complaint"]["id"], older.id)
+        self.assertEqual(second.data["data"]["complaint"]["id"], newer.id)
+        self.assertEqual(again.data["data"]["complaint"]["id"], older.id)
+        self.assertEqual(first.data["data"]["complaint"]["status"], Complaint.Status.CADET_REVIEW)
+
+        blocked = as_cadet(
+            second_token, "post", f"/api/v1/cases/complaints/{older.id}/review/",
+            {"decision": ComplaintReview.Decision.APPROVED},
+        )
+        self.assertEqual(blocked.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(blocked.data["error"]["code"], "LEASE_HELD")
+        stats = as_cadet(self.cadet_token, "get", "/api/v1/cases/complaints/queue/stats/").data["data"]
+        self.assertEqual((stats["depth"], stats["leased"]), (0, 2))
+
+        heartbeat_url = f"/api/v1/cases/complaints/{older.id}/queue/heartbeat/"
+        self.assertEqual(as_cadet(self.cadet_token, "post", heartbeat_url).status_code, status.HTTP_200_OK)
+        self.assertEqual(as_cadet(second_token, "post", heartbeat_url).status_code, status.HTTP_409_CONFLICT)
+        release = as_cadet(second_token, "post", f"/api/v1/cases/complaints/{newer.id}/queue/release/")
+        self.assertEqual(release.status_code, status.HTTP_200_OK)
+        newer.refresh_from_db()
+        self.assertEqual((newer.status, newer.review_claimed_by), (Complaint.Status.SUBMITTED, None))
+
+        # The first cadet goes quiet: once the lease expires the complaint is claimable again.
+        Complaint.objects.filter(pk=older.pk).update(review_lease_expires_at=timezone.now() - timedelta(seconds=1))
+        stats = as_cadet(self.cadet_token, "get", "/api/v1/cases/complaints/queue/stats/").data["data"]
+        self.assertEqual((stats["depth"], stats["leased"], stats["expired_leases"]), (2, 0, 1))
+        reclaimed = as_cadet(second_token, "post", claim_url)
+        self.assertEqual(reclaimed.data["data"]["complaint"]["id"], older.id)
+        reviewed = as_cadet(
+            second_token, "post", f"/api/v1/cases/complaints/{older.id}/review/",
+            {"decision": ComplaintReview.Decision.REJECTED, "rejection_reason": "Not enough detail."},
+        )
+        self.assertEqual(reviewed.status_code, status.HTTP_200_OK)
+        older.refresh_from_db()
+        self.assertEqual(older.status, Complaint.Status.REJECTED)
+        self.assertIsNone(older.review_lease_expires_at)
+
     def test_cadet_approval_creates_case_for_valid_complaint(self):
         complaint = Complaint.objects.create(
             complainant=self.complainant_user,
@@ -921,3 +1126,481 @@ class CaptainChiefReferralFlowTests(APITestCase):
         self.assertTrue(response.data["success"])
         self.critical_case.refresh_from_db()
         self.assertEqual(self.critical_case.status, Case.Status.REFERRAL_READY)
+
+    def test_captain_batch_transition_reports_each_case(self):
+        extra_case = Case.objects.create(
+            title="Second normal case",
+            level=Case.Level.LEVEL_3,
+            source_type=Case.SourceType.COMPLAINT,
+            status=Case.Status.SUSPECT_ASSESSMENT,
+            created_by=self.admin_user,
+        )
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {self.captain_token.key}")
+        transitions = [
+            {"case_id": extra_case.id, "new_status": Case.Status.REFERRAL_READY},
+            {"case_id": self.critical_case.id, "new_status": Case.Status.REFERRAL_READY},
+            {"case_id": self.normal_case.id, "new_status": Case.Status.REFERRAL_READY},
+            {"case_id": 999999, "new_status": Case.Status.REFERRAL_READY},
+        ]
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post("/api/v1/cases/cases/transition-status/", {"transitions": transitions}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.data["data"]
+        self.assertEqual((data["applied"], data["failed"]), (2, 2))
+        self.assertEqual(
+            [(result["case_id"], result["ok"], result.get("code")) for result in data["results"]],
+            [
+                (extra_case.id, True, None),
+                (self.critical_case.id, False, "ROLE_POLICY_VIOLATION"),
+                (self.normal_case.id, True, None),
+                (999999, False, "NOT_FOUND"),
+            ],
+        )
+        case_updates = [query["sql"] for query in queries.captured_queries if query["sql"].startswith('UPDATE "cases_case"')]
+        self.assertEqual(len(case_updates), 1)
+        for case in (self.normal_case, extra_case):
+            case.refresh_from_db()
+            self.assertEqual(case.status, Case.Status.REFERRAL_READY)
+            self.assertIsNotNone(case.referral_ready_at)
+        self.critical_case.refresh_from_db()
+        self.assertEqual(self.critical_case.status, Case.Status.SUSPECT_ASSESSMENT)
+        self.assertEqual(
+            TimelineEvent.objects.filter(event_type="cases.case.referral", payload_summary__batch=True).count(), 2
+        )
+        self.assertEqual(StatCounter.objects.get(scope="cases", dimension="status", value="referral_ready").count, 2)
+
+
+class CaseListCursorPaginationTests(APITestCase):
+    def setUp(self):
+        self.admin_user = get_user_model().objects.create_superuser(
+            username="admin_cursor",
+            email="admin_cursor@example.com",
+            password="StrongPass123!",
+            phone="09120006001",
+            national_id="6000000001",
+            full_name="Admin Cursor",
+        )
+        token = Token.objects.create(user=self.admin_user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+        statuses = [
+            Case.Status.SUBMITTED,
+            Case.Status.UNDER_REVIEW,
+            Case.Status.SUBMITTED,
+            Case.Status.SUBMITTED,
+            Case.Status.UNDER_REVIEW,
+        ]
+        self.cases = [
+            Case.objects.create(
+                title=f"Cursor case {index}",
+                level=Case.Level.LEVEL_3,
+                source_type=Case.SourceType.COMPLAINT,
+                status=case_status,
+                created_by=self.admin_user,
+            )
+            for index, case_status in enumerate(statuses)
+        ]
+
+    def _walk(self, url):
+        seen = []
+        pages = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            data = response.data["data"]
+            self.assertNotIn("count", data)
+            pages.append(data)
+            seen.extend(item["id"] for item in data["results"])
+            url = data["next"]
+        return seen, pages
+
+    def test_cursor_walk_with_tied_sort_key_visits_each_case_once(self):
+        seen, pages = self._walk("/api/v1/cases/cases/?pagination=cursor&sort=status&page_size=2")
+
+        expected = [
+            case.id
+            for case in sorted(self.cases, key=lambda case: (case.status, case.id))
+        ]
+        self.assertEqual(seen, expected)
+        self.assertEqual(len(pages), 3)
+        self.assertIsNone(pages[0]["previous"])
+
+        previous = self.client.get(pages[1]["previous"])
+        self.assertEqual([item["id"] for item in previous.data["data"]["results"]], expected[:2])
+
+    def test_cursor_mode_respects_filters_and_optional_total(self):
+        response = self.client.get("/api/v1/cases/cases/?pagination=cursor&status=submitted&page_size=2&include_total=true")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.data["data"]
+        self.assertEqual(data["count"], 3)
+        self.assertEqual(len(data["results"]), 2)
+        self.assertEqual(data["results"][0]["id"], self.cases[3].id)
+
+    def test_invalid_cursor_is_rejected(self):
+        response = self.client.get("/api/v1/cases/cases/?cursor=not-a-cursor")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data["error"]["code"], "VALIDATION_ERROR")
+
+
+class CaseDossierTests(APITestCase):
+    def setUp(self):
+        self.admin_user = get_user_model().objects.create_superuser(
+            username="admin_dossier",
+            email="admin_dossier@example.com",
+            password="StrongPass123!",
+            phone="09120019001",
+            national_id="1900000001",
+            full_name="Admin Dossier",
+        )
+        token = Token.objects.create(user=self.admin_user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+        self.case = Case.objects.create(
+            title="Dossier case",
+            level=Case.Level.LEVEL_2,
+            source_type=Case.SourceType.COMPLAINT,
+            created_by=self.admin_user,
+        )
+        self.url = f"/api/v1/cases/cases/{self.case.id}/"
+
+    def test_detail_is_served_from_dossier_with_conditional_get(self):
+        first = self.client.get(self.url)
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+        self.assertEqual(first.data["data"]["case_number"], self.case.case_number)
+        etag = first["ETag"]
+        self.assertEqual(etag, CaseDossier.objects.get(case=self.case).etag)
+
+        with CaptureQueriesContext(connection) as queries:
+            cached = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(cached.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(cached["ETag"], etag)
+        dossier_reads = [query["sql"] for query in queries.captured_queries if '"cases_casedossier"' in query["sql"]]
+        self.assertEqual(len(dossier_reads), 1)
+        self.assertFalse([query for query in queries.captured_queries if '"cases_caseparticipant"' in query["sql"]])
+
+        self.assertEqual(self.client.get("/api/v1/cases/cases/999999/").status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_source_changes_mark_dossier_stale_until_rebuilt(self):
+        etag = self.client.get(self.url)["ETag"]
+        CaseParticipant.objects.create(
+            case=self.case,
+            participant_kind=CaseParticipant.ParticipantKind.CIVILIAN,
+            role_in_case=CaseParticipant.RoleInCase.WITNESS,
+            full_name="Late Witness",
+        )
+        TimelineEvent.objects.create(
+            actor=self.admin_user, event_type="case.note", case_reference=self.case.case_number, summary="Note"
+        )
+        dossier = CaseDossier.objects.get(case=self.case)
+        self.assertEqual(dossier.pending_changes, 2)
+        self.assertIsNotNone(dossier.stale_since)
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual([p["full_name"] for p in response.data["data"]["participants"]], ["Late Witness"])
+        dossier.refresh_from_db()
+        self.assertEqual((dossier.pending_changes, dossier.stale_since), (0, None))
+
+        self.case.title = "Renamed"
+        self.case.save()
+        CaseDossier.objects.filter(case=self.case).update(stale_since=timezone.now() - timedelta(hours=1))
+        output = StringIO()
+        call_command("rebuild_case_dossiers", stdout=output)
+        self.assertIn("Rebuilt 1 case dossier(s).", output.getvalue())
+        self.assertEqual(CaseDossier.objects.get(case=self.case).document["detail"]["title"], "Renamed")
+
+    @override_settings(CASE_DOSSIER_ASYNC_REBUILD=True, CASE_DOSSIER_DEBOUNCE_SECONDS=30)
+    def test_burst_of_changes_schedules_one_debounced_rebuild(self):
+        self.client.get(self.url)
+        with mock.patch("apps.cases.tasks.rebuild_case_dossier_task.apply_async") as apply_async:
+            with self.captureOnCommitCallbacks(execute=True):
+                for index in range(3):
+                    CaseParticipant.objects.create(
+                        case=self.case,
+                        participant_kind=CaseParticipant.ParticipantKind.CIVILIAN,
+                        role_in_case=CaseParticipant.RoleInCase.WITNESS,
+                        full_name=f"Witness {index}",
+                    )
+        apply_async.assert_called_once_with((self.case.id,), countdown=30)
+        self.assertEqual(CaseDossier.objects.get(case=self.case).pending_changes, 3)
+
+    @override_settings(CASE_DOSSIER_ASYNC_REBUILD=True)
+    def test_write_succeeds_when_the_rebuild_cannot_be_queued(self):
+        self.client.get(self.url)
+        cache.delete(dossier_module.REBUILD_CACHE_KEY.format(case_id=self.case.id))
+        with mock.patch(
+            "apps.cases.tasks.rebuild_case_dossier_task.apply_async", side_effect=ConnectionError("broker down")
+        ), self.assertLogs("apps.cases.dossier", "WARNING"):
+            with self.captureOnCommitCallbacks(execute=True):
+                self.case.title = "Renamed while the broker is down"
+                self.case.save()
+
+        self.assertEqual(self.client.get(self.url).data["data"]["title"], "Renamed while the broker is down")
+
+    def test_write_during_the_first_build_leaves_the_dossier_stale(self):
+        build = dossier_module.build_dossier_document
+
+        def build_while_an_event_arrives(case_id):
+            document = build(case_id)
+            TimelineEvent.objects.create(
+                actor=self.admin_user, event_type="case.note", case_reference=self.case.case_number, summary="Late"
+            )
+            return document
+
+        with mock.patch.object(dossier_module, "build_dossier_document", side_effect=build_while_an_event_arrives):
+            self.assertEqual(self.client.get(self.url).data["data"]["timeline_summaries"], [])
+        self.assertTrue(CaseDossier.objects.get(case=self.case).pending_changes)
+
+        summaries = self.client.get(self.url).data["data"]["timeline_summaries"]
+        self.assertEqual([event["summary"] for event in summaries], ["Late"])
+
+
+class CaseFullTextSearchTests(APITestCase):
+    def setUp(self):
+        self.admin_user = get_user_model().objects.create_superuser(
+            username="admin_search",
+            email="admin_search@example.com",
+            password="StrongPass123!",
+            phone="09120007001",
+            national_id="7000000001",
+            full_name="Admin Search",
+        )
+        token = Token.objects.create(user=self.admin_user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+
+    def _create_case(self, title, summary=""):
+        return Case.objects.create(
+            title=title,
+            summary=summary,
+            level=Case.Level.LEVEL_2,
+            source_type=Case.SourceType.COMPLAINT,
+            created_by=self.admin_user,
+        )
+
+    def _search_ids(self, term, extra=""):
+        response = self.client.get(f"/api/v1/cases/cases/?search={term}{extra}")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [item["id"] for item in response.data["data"]["results"]]
+
+    def test_search_ranks_title_matches_above_summary_matches(self):
+        title_match = self._create_case("Burglary at warehouse", "Night shift report.")
+        summary_only = self._create_case("Parking dispute", "A burglary was mentioned in passing.")
+        self._create_case("Traffic accident", "No injuries.")
+
+        self.assertEqual(self._search_ids("burglary"), [title_match.id, summary_only.id])
+        self.assertEqual(self._search_ids("burgl"), [title_match.id, summary_only.id])
+
+    def test_search_index_follows_updates_and_deletes(self):
+        case = self._create_case("Stolen bicycle")
+        self.assertEqual(self._search_ids("bicycle"), [case.id])
+
+        case.title = "Recovered motorcycle"
+        case.save()
+        self.assertEqual(self._search_ids("bicycle"), [])
+        self.assertEqual(self._search_ids("motorcycle"), [case.id])
+
+        case.delete()
+        self.assertEqual(self._search_ids("motorcycle"), [])
+
+    def test_search_matches_case_number_fragment(self):
+        case = self._create_case("Unrelated title")
+        fragment = case.case_number[7:12]
+
+        self.assertEqual(self._search_ids(fragment), [case.id])
+
+    @skipUnless(connection.vendor == "postgresql", "case_number trigram index exists on PostgreSQL only")
+    def test_case_number_match_uses_trigram_index(self):
+        from apps.cases.search import apply_case_search
+
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+        plan = apply_case_search(Case.objects.all(), "2026").explain()
+        self.assertIn("cases_case_case_number_upper_trgm", plan)
+        self.assertIn("cases_case_search_vector_gin", plan)
+
+    def test_explicit_sort_overrides_rank(self):
+        older = self._create_case("Fraud ring", "fraud fraud fraud")
+        newer = self._create_case("Minor fraud")
+
+        self.assertEqual(self._search_ids("fraud", "&sort=created_at"), [older.id, newer.id])
+
+
+class CaseImportTests(APITestCase):
+    def setUp(self):
+        self.admin_user = get_user_model().objects.create_superuser(
+            username="admin_import",
+            email="admin_import@example.com",
+            password="StrongPass123!",
+            phone="09120008001",
+            national_id="8000000001",
+            full_name="Admin Import",
+        )
+        self.complainant = get_user_model().objects.create_user(
+            username="citizen_import",
+            email="citizen_import@example.com",
+            password="StrongPass123!",
+            phone="09120008002",
+            national_id="8000000002",
+            full_name="Citizen Import",
+        )
+        token = Token.objects.create(user=self.admin_user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+
+    def _scene_row(self, index, **overrides):
+        row = {
+            "kind": "scene_case",
+            "title": f"Legacy warehouse fire {index}",
+            "summary": "Imported from the old registry.",
+            "level": Case.Level.LEVEL_2,
+            "scene_occurred_at": "2025-11-02T21:30:00Z",
+            "witnesses": [
+                {"full_name": f"Witness {index}", "phone": "09125550100", "national_id": f"81{index:08d}"},
+            ],
+        }
+        row.update(overrides)
+        return row
+
+    def _upload(self, rows, name="legacy.jsonl", **data):
+        content = "\n".join(json.dumps(row) for row in rows).encode()
+        payload = {"file": SimpleUploadedFile(name, content, content_type="application/x-ndjson"), **data}
+        return self.client.post("/api/v1/cases/imports/", payload, format="multipart")
+
+    def test_jsonl_import_creates_rows_in_bulk_and_reports_bad_rows(self):
+        rows = [
+            self._scene_row(1),
+            self._scene_row(2, level="unknown"),
+            {"kind": "complaint", "description": "Noise at night", "complainant_national_id": "8000000002"},
+            {"kind": "complaint", "description": "Lost wallet", "complainant_national_id": "8999999999"},
+            self._scene_row(3, status=Case.Status.CLOSED, closed_at="2025-12-01T10:00:00Z"),
+            self._scene_row(4, witnesses=[]),
+        ]
+        response = self._upload(rows)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        report = response.data["data"]
+        self.assertEqual(report["rows"], 6)
+        self.assertEqual(report["failed"], 3)
+        self.assertEqual(report["created"], {"cases": 2, "complaints": 1, "participants": 4})
+        self.assertEqual(
+            {error["line"]: sorted(error["errors"]) for error in report["errors"]},
+            {2: ["level"], 4: ["complainant_national_id"], 6: ["witnesses"]},
+        )
+
+        cases = Case.objects.order_by("id")
+        self.assertEqual([case.title for case in cases], ["Legacy warehouse fire 1", "Legacy warehouse fire 3"])
+        first, closed = cases
+        self.assertEqual(first.status, Case.Status.UNDER_REVIEW)
+        self.assertEqual(first.priority, Case.Priority.MEDIUM)
+        self.assertIsNotNone(first.under_review_at)
+        self.assertEqual(closed.status, Case.Status.CLOSED)
+        self.assertIsNotNone(closed.closed_at)
+        self.assertEqual(SceneCaseReport.objects.filter(reported_by=self.admin_user).count(), 2)
+        self.assertEqual(
+            CaseParticipant.objects.filter(case=first, role_in_case=CaseParticipant.RoleInCase.WITNESS).count(), 1
+        )
+        complaint = Complaint.objects.get()
+        self.assertEqual(complaint.complainant, self.complainant)
+        self.assertEqual(complaint.status, Complaint.Status.SUBMITTED)
+        self.assertEqual(TimelineEvent.objects.filter(payload_summary__imported=True).count(), 3)
+
+        # bulk_create skips signals: the import keeps the search index and counters current itself.
+        search = self.client.get("/api/v1/cases/cases/?search=warehouse")
+        self.assertEqual(len(search.data["data"]["results"]), 2)
+        self.assertEqual(StatCounter.objects.get(scope="cases", dimension="all", value="").count, 2)
+        self.assertEqual(StatCounter.objects.get(scope="cases", dimension="status", value="closed").count, 1)
+
+    def test_complaints_imported_against_an_existing_case_mark_its_dossier_stale(self):
+        case = Case.objects.create(
+            title="Existing complaint case",
+            level=Case.Level.LEVEL_2,
+            source_type=Case.SourceType.COMPLAINT,
+            created_by=self.admin_user,
+        )
+        url = f"/api/v1/cases/cases/{case.id}/"
+        etag = self.client.get(url)["ETag"]
+
+        response = self._upload(
+            [{"kind": "complaint", "description": "Follow-up report", "case_number": case.case_number}]
+        )
+        self.assertEqual(response.data["data"]["created"]["complaints"], 1)
+        self.assertEqual(CaseDossier.objects.get(case=case).pending_changes, 1)
+
+        detail = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(detail.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [event["event_type"] for event in detail.data["data"]["timeline_summaries"]],
+            ["cases.complaint.submitted"],
+        )
+
+    def test_dry_run_validates_without_writing(self):
+        response = self._upload([self._scene_row(1), self._scene_row(2, title="")], dry_run="true")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        report = response.data["data"]
+        self.assertTrue(report["dry_run"])
+        self.assertEqual(report["created"]["cases"], 1)
+        self.assertEqual(report["failed"], 1)
+        self.assertFalse(Case.objects.exists())
+
+    def test_bad_encoding_late_in_the_file_is_rejected_before_any_chunk_is_written(self):
+        content = "\n".join(json.dumps(self._scene_row(index)) for index in range(1, 6)).encode() + b"\n\xff\xfe\n"
+        payload = {"file": SimpleUploadedFile("legacy.jsonl", content, content_type="application/x-ndjson")}
+        with self.settings(CASE_IMPORT_BATCH_SIZE=2):
+            response = self.client.post("/api/v1/cases/imports/", payload, format="multipart")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data["error"]["details"], {"file": ["File must be UTF-8 encoded."]})
+        self.assertFalse(Case.objects.exists())
+
+    def test_import_requires_a_file(self):
+        response = self.client.post("/api/v1/cases/imports/", {}, format="multipart")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_seeded_import_permission_lets_a_non_superuser_role_import(self):
+        captain = Role.objects.create(key="captain", name="Captain")
+        migration = import_module("apps.access.migrations.0015_add_case_import_permission")
+        migration.create_permission(django_apps, None)  # as when the roles exist before migrating
+        self.assertTrue(
+            RolePermission.objects.filter(role=captain, permission__code="cases.imports.create").exists()
+        )
+        officer = get_user_model().objects.create_user(
+            username="captain_import",
+            email="captain_import@example.com",
+            password="StrongPass123!",
+            phone="09120008003",
+            national_id="8000000003",
+            full_name="Captain Import",
+        )
+        UserRoleAssignment.objects.create(user=officer, role=captain, assigned_by=self.admin_user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {Token.objects.create(user=officer).key}")
+
+        response = self._upload([self._scene_row(1)])
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["data"]["created"]["cases"], 1)
+
+        RolePermission.objects.filter(role=captain).delete()
+        self.assertEqual(self._upload([self._scene_row(2)]).status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_command_imports_csv_in_chunks(self):
+        header = "kind,title,level,scene_occurred_at,witnesses,description\n"
+        lines = [
+            f'scene_case,CSV case {index},3,2025-10-01T08:00:00Z,"{json.dumps(self._scene_row(index)["witnesses"]).replace(chr(34), chr(34) * 2)}",\n'
+            for index in range(1, 6)
+        ]
+        lines.append("complaint,,,,,Imported complaint\n")
+        lines.append("complaint,,,,,\n")
+        with tempfile.NamedTemporaryFile("w", suffix=".csv", delete=False, encoding="utf-8") as handle:
+            handle.write(header + "".join(lines))
+        self.addCleanup(os.remove, handle.name)
+
+        output = StringIO()
+        call_command("import_cases", handle.name, actor="admin_import", batch_size=2, stdout=output)
+
+        self.assertEqual(Case.objects.filter(title__startswith="CSV case").count(), 5)
+        self.assertEqual(Complaint.objects.count(), 1)
+        self.assertIn("line 8", output.getvalue())
+        self.assertIn("5 case(s), 1 complaint(s), 10 participant(s); 1 failed.", output.getvalue())
@@ -1,11 +1,17 @@
 from django.urls import path
 
 from apps.cases.views import (
+    CaseBatchStatusTransitionAPIView,
     CaseDetailAPIView,
+    CaseImportAPIView,
     CaseListAPIView,
     CaseStatusTransitionAPIView,
     CaseSuspectAddAPIView,
     ComplaintCadetReviewAPIView,
+    ComplaintQueueClaimAPIView,
+    ComplaintQueueHeartbeatAPIView,
+    ComplaintQueueReleaseAPIView,
+    ComplaintQueueStatsAPIView,
     ComplaintResubmitAPIView,
     ComplaintSubmitAPIView,
     SceneCaseApproveAPIView,
@@ -15,6 +21,7 @@ from apps.cases.views import (
 urlpatterns = [
     path("cases/", CaseListAPIView.as_view(), name="cases-list"),
     path("cases/<int:case_id>/", CaseDetailAPIView.as_view(), name="cases-detail"),
+    path("imports/", CaseImportAPIView.as_view(), name="cases-import"),
     path("scene-cases/", SceneCaseCreateAPIView.as_view(), name="cases-scene-case-create"),
     path(
         "scene-cases/<int:case_id>/approve/",
@@ -27,6 +34,18 @@ urlpatterns = [
         ComplaintCadetReviewAPIView.as_view(),
         name="cases-complaint-review",
     ),
+    path("complaints/queue/claim/", ComplaintQueueClaimAPIView.as_view(), name="cases-complaint-queue-claim"),
+    path("complaints/queue/stats/", ComplaintQueueStatsAPIView.as_view(), name="cases-complaint-queue-stats"),
+    path(
+        "complaints/<int:complaint_id>/queue/heartbeat/",
+        ComplaintQueueHeartbeatAPIView.as_view(),
+        name="cases-complaint-queue-heartbeat",
+    ),
+    path(
+        "complaints/<int:complaint_id>/queue/release/",
+        ComplaintQueueReleaseAPIView.as_view(),
+        name="cases-complaint-queue-release",
+    ),
     path(
         "complaints/<int:complaint_id>/resubmit/",
         ComplaintResubmitAPIView.as_view(),
@@ -37,6 +56,11 @@ urlpatterns = [
         CaseSuspectAddAPIView.as_view(),
         name="cases-suspect-add",
     ),
+    path(
+        "cases/transition-status/",
+        CaseBatchStatusTransitionAPIView.as_view(),
+        name="cases-status-transition-batch",
+    ),
     path(
         "cases/<int:case_id>/transition-status/",
         CaseStatusTransitionAPIView.as_view(),
@@ -1,6 +1,6 @@
 from django.core.exceptions import ValidationError
-from django.db import IntegrityError
-from django.db.models import Q
+from django.db import IntegrityError, transaction
+from django.http import Http404
 from django.shortcuts import get_object_or_404
 from rest_framework import status
 from rest_framework.authentication import TokenAuthentication
@@ -9,9 +9,10 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.views import APIView
 
 from apps.access.permissions import HasRBACPermissions
-from apps.cases.models import Case, CaseParticipant, Complaint, ComplaintReview
+from apps.cases.dossier import dossier_response, get_case_dossier
+from apps.cases.models import Case, CaseParticipant, Complaint, ComplaintReview, ReviewLeaseHeld
 from apps.cases.serializers import (
-    CaseDetailSerializer,
+    CaseBatchStatusTransitionSerializer,
     CaseListSerializer,
     CaseParticipantSerializer,
     CaseStatusTransitionSerializer,
@@ -25,7 +26,17 @@ from apps.cases.serializers import (
     SceneCaseSerializer,
     SuspectAddSerializer,
 )
+from apps.cases.imports import IMPORT_FORMATS, detect_format, import_cases
+from apps.cases.queue import (
+    claim_next_complaint,
+    complaint_queue_metrics,
+    has_live_lease,
+    heartbeat_complaint_lease,
+    release_complaint_lease,
+)
+from apps.cases.search import apply_case_search
 from apps.cases.services import (
+    CASE_TRANSITION_EVENTS,
     can_cadet_review_complaint,
     can_approve_scene_case,
     can_create_scene_case,
@@ -35,9 +46,12 @@ from apps.cases.services import (
     create_case_for_complaint_if_missing,
     create_scene_case_with_witnesses,
     transition_case_status,
+    transition_case_statuses,
+    transition_policy_error_code,
 )
 from apps.identity.services import error_response, success_response, validation_error_to_details
 from apps.notifications.services import log_timeline_event
+from config.pagination import KeysetPagination, cursor_pagination_requested
 
 
 class CaseListPagination(PageNumberPagination):
@@ -69,14 +83,13 @@ class CaseListAPIView(APIView):
         if level:
             queryset = queryset.filter(level=level)
 
-        # Search in title, summary, case_number
+        # Full-text search over case_number, title and summary (see apps.cases.search)
         search = request.query_params.get("search", "").strip()
         if search:
-            q = Q(title__icontains=search) | Q(summary__icontains=search) | Q(case_number__icontains=search)
-            queryset = queryset.filter(q)
+            queryset = apply_case_search(queryset, search)
 
-        # Sort
-        sort_by = request.query_params.get("sort", "-created_at")
+        # Sort: explicit sort wins; otherwise search results rank first, then newest
+        sort_by = request.query_params.get("sort", "").strip()
         allowed_sorts = {
             "created_at",
             "-created_at",
@@ -91,8 +104,19 @@ class CaseListAPIView(APIView):
             "priority",
             "-priority",
         }
-        if sort_by and sort_by.strip() in allowed_sorts:
-            queryset = queryset.order_by(sort_by.strip())
+        if sort_by not in allowed_sorts:
+            sort_by = ""
+        if sort_by:
+            queryset = queryset.order_by(sort_by)
+        elif search:
+            queryset = queryset.order_by("-search_rank", "-created_at", "-id")
+
+        if cursor_pagination_requested(request):
+            # Keyset pages follow a model field, so ranked search results are paged by recency.
+            paginator = KeysetPagination(ordering=[sort_by or "-created_at"])
+            page = paginator.paginate_queryset(queryset, request, view=self)
+            serializer = CaseListSerializer(page, many=True)
+            return success_response(paginator.get_payload(serializer.data), status_code=status.HTTP_200_OK)
 
         paginator = CaseListPagination()
         page = paginator.paginate_queryset(queryset, request, view=self)
@@ -114,18 +138,10 @@ class CaseDetailAPIView(APIView):
     required_permission_codes = ["cases.cases.view"]
 
     def get(self, request, case_id):
-        case = get_object_or_404(
-            Case.objects.select_related(
-                "created_by",
-                "assigned_to",
-                "scene_report_detail",
-                "scene_report_detail__reported_by",
-                "scene_report_detail__superior_approved_by",
-            ).prefetch_related("participants"),
-            id=case_id,
-        )
-        serializer = CaseDetailSerializer(case)
-        return success_response(serializer.data, status_code=status.HTTP_200_OK)
+        dossier = get_case_dossier(case_id)
+        if dossier is None:
+            raise Http404("No Case matches the given query.")
+        return dossier_response(request, dossier, dossier.document["detail"])
 
 
 class SceneCaseCreateAPIView(APIView):
@@ -298,6 +314,13 @@ class ComplaintCadetReviewAPIView(APIView):
                 details={"status": complaint.status},
                 status_code=status.HTTP_409_CONFLICT,
             )
+        if has_live_lease(complaint) and complaint.review_claimed_by_id != request.user.id:
+            return error_response(
+                code="LEASE_HELD",
+                message="Complaint is claimed by another reviewer.",
+                details={"review_lease_expires_at": complaint.review_lease_expires_at.isoformat()},
+                status_code=status.HTTP_409_CONFLICT,
+            )
 
         serializer = ComplaintReviewCreateSerializer(data=request.data)
         if not serializer.is_valid():
@@ -312,16 +335,25 @@ class ComplaintCadetReviewAPIView(APIView):
         rejection_reason = serializer.validated_data.get("rejection_reason", "")
 
         try:
-            created_case = None
-            if decision == ComplaintReview.Decision.APPROVED:
-                created_case, _ = create_case_for_complaint_if_missing(complaint, request.user)
-                complaint.refresh_from_db()
-
-            review = ComplaintReview.objects.create(
-                complaint=complaint,
-                reviewer=request.user,
-                decision=decision,
-                rejection_reason=rejection_reason,
+            # One transaction, so a review refused on the locked row also drops the case made for it.
+            with transaction.atomic():
+                created_case = None
+                if decision == ComplaintReview.Decision.APPROVED:
+                    created_case, _ = create_case_for_complaint_if_missing(complaint, request.user)
+                    complaint.refresh_from_db()
+
+                review = ComplaintReview.objects.create(
+                    complaint=complaint,
+                    reviewer=request.user,
+                    decision=decision,
+                    rejection_reason=rejection_reason,
+                )
+        except ReviewLeaseHeld as exc:
+            return error_response(
+                code="LEASE_HELD",
+                message="Complaint is claimed by another reviewer.",
+                details={"review_lease_expires_at": exc.expires_at.isoformat()},
+                status_code=status.HTTP_409_CONFLICT,
             )
         except ValidationError as exc:
             return error_response(
@@ -381,6 +413,83 @@ class ComplaintCadetReviewAPIView(APIView):
         return success_response(response_payload, status_code=status.HTTP_200_OK)
 
 
+class ComplaintQueueClaimAPIView(APIView):
+    """Lease the oldest complaint waiting for cadet review (see apps.cases.queue)."""
+
+    authentication_classes = [TokenAuthentication]
+    permission_classes = [IsAuthenticated, HasRBACPermissions]
+    required_permission_codes = ["cases.complaints.review"]
+
+    def post(self, request):
+        allowed, message = can_cadet_review_complaint(request.user)
+        if not allowed:
+            return error_response(
+                code="ROLE_POLICY_VIOLATION",
+                message=message,
+                details={},
+                status_code=status.HTTP_403_FORBIDDEN,
+            )
+
+        complaint = claim_next_complaint(request.user)
+        if complaint is None:
+            return success_response({"complaint": None}, status_code=status.HTTP_200_OK)
+        complaint = (
+            Complaint.objects.select_related("complainant", "case", "validation_counter").get(pk=complaint.pk)
+        )
+        return success_response({"complaint": ComplaintSerializer(complaint).data}, status_code=status.HTTP_200_OK)
+
+
+class ComplaintQueueHeartbeatAPIView(APIView):
+    """Extend the caller's review lease on a complaint."""
+
+    authentication_classes = [TokenAuthentication]
+    permission_classes = [IsAuthenticated, HasRBACPermissions]
+    required_permission_codes = ["cases.complaints.review"]
+
+    def post(self, request, complaint_id):
+        expires_at = heartbeat_complaint_lease(request.user, complaint_id)
+        if expires_at is None:
+            return error_response(
+                code="LEASE_LOST",
+                message="You no longer hold the review lease for this complaint.",
+                details={},
+                status_code=status.HTTP_409_CONFLICT,
+            )
+        return success_response(
+            {"complaint_id": complaint_id, "review_lease_expires_at": expires_at},
+            status_code=status.HTTP_200_OK,
+        )
+
+
+class ComplaintQueueReleaseAPIView(APIView):
+    """Return a leased complaint to the queue without reviewing it."""
+
+    authentication_classes = [TokenAuthentication]
+    permission_classes = [IsAuthenticated, HasRBACPermissions]
+    required_permission_codes = ["cases.complaints.review"]
+
+    def post(self, request, complaint_id):
+        if not release_complaint_lease(request.user, complaint_id):
+            return error_response(
+                code="LEASE_LOST",
+                message="You no longer hold the review lease for this complaint.",
+                details={},
+                status_code=status.HTTP_409_CONFLICT,
+            )
+        return success_response({"complaint_id": complaint_id, "released": True}, status_code=status.HTTP_200_OK)
+
+
+class ComplaintQueueStatsAPIView(APIView):
+    """Review queue depth, live/expired leases and oldest waiting age in seconds."""
+
+    authentication_classes = [TokenAuthentication]
+    permission_classes = [IsAuthenticated, HasRBACPermissions]
+    required_permission_codes = ["cases.complaints.review"]
+
+    def get(self, request):
+        return success_response(complaint_queue_metrics(), status_code=status.HTTP_200_OK)
+
+
 class ComplaintResubmitAPIView(APIView):
     authentication_classes = [TokenAuthentication]
     permission_classes = [IsAuthenticated, HasRBACPermissions]
@@ -536,14 +645,13 @@ class CaseStatusTransitionAPIView(APIView):
         new_status = serializer.validated_data["new_status"]
         allowed, message = can_transition_case_status(request.user, case, new_status)
         if not allowed:
+            code = transition_policy_error_code(message)
             return error_response(
-                code="ROLE_POLICY_VIOLATION"
-                if "Only " in (message or "")
-                else "WORKFLOW_POLICY_VIOLATION",
+                code=code,
                 message=message,
                 details={},
                 status_code=status.HTTP_403_FORBIDDEN
-                if "Only " in (message or "")
+                if code == "ROLE_POLICY_VIOLATION"
                 else status.HTTP_409_CONFLICT,
             )
 
@@ -560,22 +668,11 @@ class CaseStatusTransitionAPIView(APIView):
                 status_code=status.HTTP_409_CONFLICT,
             )
 
-        event_type_map = {
-            Case.Status.SUSPECT_ASSESSMENT: "cases.case.suspect_assessment",
-            Case.Status.REFERRAL_READY: "cases.case.referral",
-            Case.Status.IN_TRIAL: "cases.case.trial_started",
-            Case.Status.CLOSED: "cases.case.verdict",
-        }
-        summary_map = {
-            Case.Status.SUSPECT_ASSESSMENT: "Case moved to suspect assessment.",
-            Case.Status.REFERRAL_READY: "Case referred to judiciary.",
-            Case.Status.IN_TRIAL: "Case trial started.",
-            Case.Status.CLOSED: "Case verdict recorded, case closed.",
-        }
+        event_type, summary = CASE_TRANSITION_EVENTS[new_status]
         log_timeline_event(
-            event_type=event_type_map[new_status],
+            event_type=event_type,
             actor=request.user,
-            summary=summary_map[new_status],
+            summary=summary,
             target_type="cases.case",
             target_id=str(updated_case.id),
             case_reference=updated_case.case_number,
@@ -586,3 +683,78 @@ class CaseStatusTransitionAPIView(APIView):
             ComplaintCaseSerializer(updated_case).data,
             status_code=status.HTTP_200_OK,
         )
+
+
+class CaseImportAPIView(APIView):
+    """
+    Bulk import legacy complaints and scene reports (see apps.cases.imports).
+    Multipart upload: file=<.jsonl or .csv>, optional format=jsonl|csv, dry_run=true.
+    Rows that fail validation are listed in the report; the other rows are imported.
+    """
+
+    authentication_classes = [TokenAuthentication]
+    permission_classes = [IsAuthenticated, HasRBACPermissions]
+    required_permission_codes = ["cases.imports.create"]
+
+    def post(self, request):
+        upload = request.FILES.get("file")
+        if upload is None:
+            return error_response(
+                code="VALIDATION_ERROR",
+                message="Request validation failed.",
+                details={"file": ["Upload a JSONL or CSV file."]},
+                status_code=status.HTTP_400_BAD_REQUEST,
+            )
+        file_format = detect_format(upload.name, request.data.get("format", ""))
+        if file_format not in IMPORT_FORMATS:
+            return error_response(
+                code="VALIDATION_ERROR",
+                message="Request validation failed.",
+                details={"format": [f"Expected one of: {', '.join(IMPORT_FORMATS)}."]},
+                status_code=status.HTTP_400_BAD_REQUEST,
+            )
+
+        dry_run = str(request.data.get("dry_run", "")).lower() in {"1", "true", "yes"}
+        try:
+            report = import_cases(upload, actor=request.user, file_format=file_format, dry_run=dry_run)
+        except UnicodeDecodeError:
+            return error_response(
+                code="VALIDATION_ERROR",
+                message="Request validation failed.",
+                details={"file": ["File must be UTF-8 encoded."]},
+                status_code=status.HTTP_400_BAD_REQUEST,
+            )
+        report["dry_run"] = dry_run
+        return success_response(report, status_code=status.HTTP_200_OK)
+
+
+class CaseBatchStatusTransitionAPIView(APIView):
+    """
+    Move many cases in one request: {"transitions": [{"case_id", "new_status"}, ...]}.
+    Every item is checked like the single-case endpoint; the response lists one result per
+    item and the items that pass are applied even when others fail.
+    """
+
+    authentication_classes = [TokenAuthentication]
+    permission_classes = [IsAuthenticated, HasRBACPermissions]
+    required_permission_codes = ["cases.case.transition_status"]
+
+    def post(self, request):
+        serializer = CaseBatchStatusTransitionSerializer(data=request.data)
+        if not serializer.is_valid():
+            return error_response(
+                code="VALIDATION_ERROR",
+                message="Request validation failed.",
+                details=serializer.errors,
+                status_code=status.HTTP_400_BAD_REQUEST,
+            )
+
+        results = transition_case_statuses(
+            actor=request.user,
+            transitions=serializer.validated_data["transitions"],
+        )
+        applied = sum(1 for result in results if result["ok"])
+        return success_response(
+            {"applied": applied, "failed": len(results) - applied, "results": results},
+            status_code=status.HTTP_200_OK,
+        )
@@ -4,8 +4,11 @@ from .models import (
     BiologicalMedicalEvidence,
     BiologicalMedicalMediaReference,
     Evidence,
+    EvidenceBlob,
     EvidenceLink,
+    EvidenceMediaDerivative,
     EvidenceReview,
+    EvidenceUploadSession,
     IdentificationEvidence,
     OtherEvidence,
     VehicleEvidence,
@@ -26,7 +29,7 @@ class EvidenceAdmin(admin.ModelAdmin):
 class WitnessTestimonyAttachmentInline(admin.TabularInline):
     model = WitnessTestimonyAttachment
     extra = 0
-    fields = ("file", "media_type", "duration_seconds", "width", "height", "file_size", "mime_type", "caption")
+    fields = ("file", "media_type", "duration_seconds", "width", "height", "file_size", "mime_type", "sha256", "caption")
 
 
 @admin.register(WitnessTestimony)
@@ -42,7 +45,7 @@ class WitnessTestimonyAdmin(admin.ModelAdmin):
 class BiologicalMedicalMediaReferenceInline(admin.TabularInline):
     model = BiologicalMedicalMediaReference
     extra = 0
-    fields = ("file", "media_type", "width", "height", "file_size", "mime_type", "caption")
+    fields = ("file", "media_type", "width", "height", "file_size", "mime_type", "sha256", "caption")
 
 
 class EvidenceReviewInline(admin.TabularInline):
@@ -100,3 +103,27 @@ class OtherEvidenceAdmin(admin.ModelAdmin):
     search_fields = ("title", "description")
     raw_id_fields = ("registrar", "case")
     date_hierarchy = "registered_at"
+
+
+@admin.register(EvidenceUploadSession)
+class EvidenceUploadSessionAdmin(admin.ModelAdmin):
+    list_display = ("id", "media_kind", "evidence", "filename", "received_bytes", "total_size", "status", "expires_at")
+    list_filter = ("status", "media_kind")
+    raw_id_fields = ("evidence", "created_by")
+    readonly_fields = ("received_bytes", "attachment_id")
+
+
+@admin.register(EvidenceBlob)
+class EvidenceBlobAdmin(admin.ModelAdmin):
+    list_display = ("sha256", "storage_name", "size", "mime_type", "ref_count", "orphaned_at")
+    list_filter = ("mime_type",)
+    search_fields = ("sha256", "storage_name")
+    readonly_fields = ("sha256", "storage_name", "size", "ref_count", "orphaned_at")
+
+
+@admin.register(EvidenceMediaDerivative)
+class EvidenceMediaDerivativeAdmin(admin.ModelAdmin):
+    list_display = ("source_sha256", "kind", "status", "width", "height", "file_size", "attempts", "updated_at")
+    list_filter = ("kind", "status")
+    search_fields = ("source_sha256", "file")
+    readonly_fields = ("source_sha256", "kind", "file", "sha256", "file_size", "width", "height", "attempts", "error")
@@ -0,0 +1,34 @@
+"""Scheduled task: delete evidence blobs no attachment has referenced for the grace period."""
+from django.core.management.base import BaseCommand
+
+from apps.evidence.storage.blobs import collect_orphaned_blobs, reconcile_blob_references, verify_blobs
+
+
+class Command(BaseCommand):
+    help = (
+        "Garbage-collect orphaned evidence blobs (scheduler task); --reconcile recounts references "
+        "from attachment rows first, --verify re-hashes every stored blob."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dry-run", action="store_true", help="Only report what would change.")
+        parser.add_argument("--reconcile", action="store_true", help="Recount blob references from attachment rows.")
+        parser.add_argument("--verify", action="store_true", help="Check every blob file against its SHA-256.")
+
+    def handle(self, *args, **options):
+        dry_run = options["dry_run"]
+        if options["reconcile"]:
+            corrected = reconcile_blob_references(dry_run=dry_run)
+            verb = "Would correct" if dry_run else "Corrected"
+            self.stdout.write(f"{verb} {corrected} blob reference count(s).")
+        if options["verify"]:
+            problems = 0
+            for blob, problem in verify_blobs():
+                problems += 1
+                self.stdout.write(self.style.ERROR(f"{blob.sha256} ({blob.storage_name}): {problem}"))
+            self.stdout.write(f"Verified blobs; {problems} problem(s).")
+        collected = collect_orphaned_blobs(dry_run=dry_run)
+        if dry_run:
+            self.stdout.write(self.style.WARNING(f"Would delete {collected} orphaned blob(s)."))
+        else:
+            self.stdout.write(self.style.SUCCESS(f"Deleted {collected} orphaned blob(s)."))
@@ -0,0 +1,25 @@
+"""Scheduled task: render evidence thumbnails and poster frames still pending."""
+from django.core.management.base import BaseCommand
+
+from apps.evidence.services.derivatives import generate_pending_derivatives
+
+
+class Command(BaseCommand):
+    help = (
+        "Render pending evidence media derivatives (scheduler task, catches lost worker jobs); "
+        "--retry-failed requeues derivatives that ran out of attempts."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--limit", type=int, default=None, help="Process at most this many source files.")
+        parser.add_argument("--retry-failed", action="store_true", help="Reset failed derivatives to pending first.")
+        parser.add_argument("--dry-run", action="store_true", help="Only report how many files are pending.")
+
+    def handle(self, *args, **options):
+        processed = generate_pending_derivatives(
+            limit=options["limit"], retry_failed=options["retry_failed"], dry_run=options["dry_run"]
+        )
+        if options["dry_run"]:
+            self.stdout.write(self.style.WARNING(f"Would render derivatives for {processed} file(s)."))
+        else:
+            self.stdout.write(self.style.SUCCESS(f"Rendered derivatives for {processed} file(s)."))
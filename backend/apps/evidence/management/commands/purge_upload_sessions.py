@@ -0,0 +1,19 @@
+"""Scheduled task: remove expired evidence upload sessions and their stored chunks."""
+from django.core.management.base import BaseCommand
+
+from apps.evidence.services.uploads import purge_expired_uploads
+
+
+class Command(BaseCommand):
+    help = "Delete evidence upload sessions past EVIDENCE_UPLOAD_SESSION_TTL_SECONDS with their chunk files (scheduler task)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dry-run", action="store_true", help="Only count sessions that would be purged.")
+
+    def handle(self, *args, **options):
+        dry_run = options["dry_run"]
+        count = purge_expired_uploads(dry_run=dry_run)
+        if dry_run:
+            self.stdout.write(self.style.WARNING(f"Would purge {count} upload session(s)."))
+        else:
+            self.stdout.write(self.style.SUCCESS(f"Purged {count} upload session(s)."))
@@ -0,0 +1,87 @@
+# Generated by Django 6.0.9 on 2026-10-17 23:27
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('evidence', '0009_merge_0003_initial_evidence_0008_evidencelink'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EvidenceUploadChunk',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('offset', models.PositiveBigIntegerField()),
+                ('size', models.PositiveIntegerField()),
+                ('sha256', models.CharField(max_length=64)),
+                ('part_name', models.CharField(max_length=255)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'ordering': ['offset'],
+            },
+        ),
+        migrations.CreateModel(
+            name='EvidenceUploadSession',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('media_kind', models.CharField(choices=[('witness-testimony', 'Witness Testimony Attachment'), ('biological-medical', 'Biological/Medical Media Reference')], max_length=20)),
+                ('filename', models.CharField(max_length=255)),
+                ('total_size', models.PositiveBigIntegerField(help_text='Declared size in bytes')),
+                ('expected_sha256', models.CharField(blank=True, help_text='Optional whole-file checksum', max_length=64)),
+                ('media_type', models.CharField(blank=True, help_text='Derived from the content when blank', max_length=10)),
+                ('caption', models.CharField(blank=True, max_length=255)),
+                ('received_bytes', models.PositiveBigIntegerField(default=0, help_text='Offset of the next chunk')),
+                ('status', models.CharField(choices=[('open', 'Open'), ('assembling', 'Assembling'), ('completed', 'Completed'), ('failed', 'Failed')], default='open', max_length=20)),
+                ('attachment_id', models.PositiveBigIntegerField(blank=True, null=True)),
+                ('error', models.CharField(blank=True, max_length=255)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('expires_at', models.DateTimeField()),
+            ],
+            options={
+                'verbose_name': 'Evidence Upload Session',
+                'verbose_name_plural': 'Evidence Upload Sessions',
+            },
+        ),
+        migrations.AddField(
+            model_name='biologicalmedicalmediareference',
+            name='sha256',
+            field=models.CharField(blank=True, max_length=64),
+        ),
+        migrations.AddField(
+            model_name='witnesstestimonyattachment',
+            name='sha256',
+            field=models.CharField(blank=True, max_length=64),
+        ),
+        migrations.AddField(
+            model_name='evidenceuploadsession',
+            name='created_by',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='evidence_upload_sessions', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='evidenceuploadsession',
+            name='evidence',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='upload_sessions', to='evidence.evidence'),
+        ),
+        migrations.AddField(
+            model_name='evidenceuploadchunk',
+            name='session',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='chunks', to='evidence.evidenceuploadsession'),
+        ),
+        migrations.AddIndex(
+            model_name='evidenceuploadsession',
+            index=models.Index(fields=['status', 'expires_at'], name='evidence_upload_expiry_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='evidenceuploadchunk',
+            constraint=models.UniqueConstraint(fields=('session', 'offset'), name='evidence_upload_chunk_unique_offset'),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 6.0.9 on 2026-10-17 23:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('evidence', '0010_resumable_uploads'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EvidenceBlob',
+            fields=[
+                ('sha256', models.CharField(max_length=64, primary_key=True, serialize=False)),
+                ('storage_name', models.CharField(max_length=255, unique=True)),
+                ('size', models.PositiveBigIntegerField()),
+                ('mime_type', models.CharField(blank=True, max_length=100)),
+                ('ref_count', models.PositiveIntegerField(default=0)),
+                ('orphaned_at', models.DateTimeField(blank=True, help_text='When ref_count last dropped to zero', null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Evidence Blob',
+                'verbose_name_plural': 'Evidence Blobs',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='evidenceblob',
+            index=models.Index(fields=['orphaned_at'], name='evidence_blob_orphaned_idx'),
+        ),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 6.0.9 on 2026-10-17 23:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('evidence', '0011_evidence_blobs'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EvidenceMediaDerivative',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source_sha256', models.CharField(max_length=64)),
+                ('kind', models.CharField(choices=[('thumbnail', 'Thumbnail'), ('poster', 'Poster')], max_length=20)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('ready', 'Ready'), ('failed', 'Failed'), ('unsupported', 'Unsupported')], default='pending', max_length=20)),
+                ('file', models.FileField(blank=True, max_length=255, upload_to='')),
+                ('sha256', models.CharField(blank=True, help_text='Hash of the derivative file', max_length=64)),
+                ('mime_type', models.CharField(blank=True, max_length=100)),
+                ('file_size', models.PositiveBigIntegerField(blank=True, null=True)),
+                ('width', models.PositiveIntegerField(blank=True, null=True)),
+                ('height', models.PositiveIntegerField(blank=True, null=True)),
+                ('attempts', models.PositiveSmallIntegerField(default=0)),
+                ('error', models.CharField(blank=True, max_length=255)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Evidence Media Derivative',
+                'verbose_name_plural': 'Evidence Media Derivatives',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='evidencemediaderivative',
+            index=models.Index(fields=['status', 'updated_at'], name='evidence_derivative_status_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='evidencemediaderivative',
+            constraint=models.UniqueConstraint(fields=('source_sha256', 'kind'), name='evidence_derivative_unique_kind'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 6.0.9 on 2026-10-17 23:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('evidence', '0012_media_derivatives'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='evidencemediaderivative',
+            name='status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('rendering', 'Rendering'), ('ready', 'Ready'), ('failed', 'Failed'), ('unsupported', 'Unsupported')], default='pending', max_length=20),
+        ),
+    ]
@@ -118,6 +118,7 @@ class WitnessTestimonyAttachment(models.Model):
     height = models.PositiveIntegerField(null=True, blank=True)
     file_size = models.PositiveBigIntegerField(null=True, blank=True, help_text="Size in bytes")
     mime_type = models.CharField(max_length=100, blank=True)
+    sha256 = models.CharField(max_length=64, blank=True)
     caption = models.CharField(max_length=255, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
@@ -226,6 +227,7 @@ class BiologicalMedicalMediaReference(models.Model):
     height = models.PositiveIntegerField(null=True, blank=True)
     file_size = models.PositiveBigIntegerField(null=True, blank=True)
     mime_type = models.CharField(max_length=100, blank=True)
+    sha256 = models.CharField(max_length=64, blank=True)
     caption = models.CharField(max_length=255, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
@@ -451,3 +453,138 @@ class EvidenceLink(models.Model):
 
     def __str__(self):
         return f"{self.source.title} → {self.target.title}"
+
+
+class EvidenceUploadSession(models.Model):
+    """
+    Resumable chunked upload of one witness testimony attachment or biological/medical media
+    reference (see apps.evidence.services.uploads). Chunks are stored as separate files until
+    the session is completed and they are assembled into the attachment's file.
+    """
+
+    class MediaKind(models.TextChoices):
+        WITNESS_TESTIMONY = "witness-testimony", "Witness Testimony Attachment"
+        BIOLOGICAL_MEDICAL = "biological-medical", "Biological/Medical Media Reference"
+
+    class Status(models.TextChoices):
+        OPEN = "open", "Open"
+        ASSEMBLING = "assembling", "Assembling"
+        COMPLETED = "completed", "Completed"
+        FAILED = "failed", "Failed"
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    media_kind = models.CharField(max_length=20, choices=MediaKind.choices)
+    evidence = models.ForeignKey(Evidence, on_delete=models.CASCADE, related_name="upload_sessions")
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="evidence_upload_sessions",
+    )
+    filename = models.CharField(max_length=255)
+    total_size = models.PositiveBigIntegerField(help_text="Declared size in bytes")
+    expected_sha256 = models.CharField(max_length=64, blank=True, help_text="Optional whole-file checksum")
+    media_type = models.CharField(max_length=10, blank=True, help_text="Derived from the content when blank")
+    caption = models.CharField(max_length=255, blank=True)
+    received_bytes = models.PositiveBigIntegerField(default=0, help_text="Offset of the next chunk")
+    status = models.CharField(max_length=20, choices=Status.choices, default=Status.OPEN)
+    attachment_id = models.PositiveBigIntegerField(null=True, blank=True)
+    error = models.CharField(max_length=255, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    expires_at = models.DateTimeField()
+
+    class Meta:
+        verbose_name = "Evidence Upload Session"
+        verbose_name_plural = "Evidence Upload Sessions"
+        indexes = [models.Index(fields=["status", "expires_at"], name="evidence_upload_expiry_idx")]
+
+    def __str__(self):
+        return f"Upload {self.id} ({self.media_kind}, {self.received_bytes}/{self.total_size})"
+
+
+class EvidenceUploadChunk(models.Model):
+    """One received chunk of an upload session: its byte offset, size, checksum and stored part file."""
+
+    session = models.ForeignKey(EvidenceUploadSession, on_delete=models.CASCADE, related_name="chunks")
+    offset = models.PositiveBigIntegerField()
+    size = models.PositiveIntegerField()
+    sha256 = models.CharField(max_length=64)
+    part_name = models.CharField(max_length=255)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["offset"]
+        constraints = [
+            models.UniqueConstraint(fields=["session", "offset"], name="evidence_upload_chunk_unique_offset"),
+        ]
+
+    def __str__(self):
+        return f"Chunk {self.offset}+{self.size} of upload {self.session_id}"
+
+
+class EvidenceBlob(models.Model):
+    """
+    One stored copy of an attachment file, keyed by the SHA-256 of its content. Attachment
+    rows with the same sha256 share the file; ref_count is the number of such rows
+    (apps.evidence.storage.blobs).
+    """
+
+    sha256 = models.CharField(max_length=64, primary_key=True)
+    storage_name = models.CharField(max_length=255, unique=True)
+    size = models.PositiveBigIntegerField()
+    mime_type = models.CharField(max_length=100, blank=True)
+    ref_count = models.PositiveIntegerField(default=0)
+    orphaned_at = models.DateTimeField(null=True, blank=True, help_text="When ref_count last dropped to zero")
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = "Evidence Blob"
+        verbose_name_plural = "Evidence Blobs"
+        indexes = [models.Index(fields=["orphaned_at"], name="evidence_blob_orphaned_idx")]
+
+    def __str__(self):
+        return f"Blob {self.sha256[:12]} ({self.size} bytes, {self.ref_count} refs)"
+
+
+class EvidenceMediaDerivative(models.Model):
+    """
+    Downscaled rendition of an image or video blob (thumbnail, poster frame), keyed by the
+    source content hash so every attachment sharing that content shares it
+    (apps.evidence.services.derivatives).
+    """
+
+    class Kind(models.TextChoices):
+        THUMBNAIL = "thumbnail", "Thumbnail"
+        POSTER = "poster", "Poster"
+
+    class Status(models.TextChoices):
+        PENDING = "pending", "Pending"
+        RENDERING = "rendering", "Rendering"
+        READY = "ready", "Ready"
+        FAILED = "failed", "Failed"
+        UNSUPPORTED = "unsupported", "Unsupported"
+
+    source_sha256 = models.CharField(max_length=64)
+    kind = models.CharField(max_length=20, choices=Kind.choices)
+    status = models.CharField(max_length=20, choices=Status.choices, default=Status.PENDING)
+    file = models.FileField(max_length=255, blank=True, storage=get_evidence_media_storage())
+    sha256 = models.CharField(max_length=64, blank=True, help_text="Hash of the derivative file")
+    mime_type = models.CharField(max_length=100, blank=True)
+    file_size = models.PositiveBigIntegerField(null=True, blank=True)
+    width = models.PositiveIntegerField(null=True, blank=True)
+    height = models.PositiveIntegerField(null=True, blank=True)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    error = models.CharField(max_length=255, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Evidence Media Derivative"
+        verbose_name_plural = "Evidence Media Derivatives"
+        constraints = [
+            models.UniqueConstraint(fields=["source_sha256", "kind"], name="evidence_derivative_unique_kind"),
+        ]
+        indexes = [models.Index(fields=["status", "updated_at"], name="evidence_derivative_status_idx")]
+
+    def __str__(self):
+        return f"{self.get_kind_display()} of {self.source_sha256[:12]} ({self.status})"
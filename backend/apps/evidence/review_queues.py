@@ -0,0 +1,25 @@
+from django.db.models import Q
+
+from apps.evidence.models import BiologicalMedicalEvidence
+from apps.evidence.serializers import EvidenceListSerializer
+from apps.reviewqueue.services import ReviewQueue, register_queue
+from apps.wanted.ranking import crime_level_di_expression
+
+CORONER_QUEUE = "evidence.coroner"
+
+register_queue(
+    ReviewQueue(
+        CORONER_QUEUE,
+        model=BiologicalMedicalEvidence,
+        pending=Q(
+            coroner_status__in=[
+                BiologicalMedicalEvidence.CoronerStatus.PENDING,
+                BiologicalMedicalEvidence.CoronerStatus.SUBMITTED,
+            ]
+        ),
+        permission_codes=["evidence.biological_medical.review"],
+        priority=crime_level_di_expression("case__level"),
+        select_related=("case", "registrar"),
+        serializer=EvidenceListSerializer,
+    )
+)
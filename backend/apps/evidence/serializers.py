@@ -6,11 +6,13 @@ from apps.evidence.models import (
     Evidence,
     EvidenceLink,
     EvidenceReview,
+    EvidenceUploadSession,
     IdentificationEvidence,
     OtherEvidence,
     VehicleEvidence,
     WitnessTestimony,
 )
+from apps.evidence.services.polymorphic import evidence_media, evidence_reviews, subtype_details
 
 
 class EvidenceNodeSerializer(serializers.ModelSerializer):
@@ -108,6 +110,29 @@ class EvidenceListSerializer(serializers.ModelSerializer):
         ]
 
 
+class EvidenceDetailSerializer(EvidenceListSerializer):
+    """
+    List item with subtype fields, media and coroner reviews. Expects instances from
+    apps.evidence.services.polymorphic.load_typed_evidence (no per-row queries).
+    """
+
+    details = serializers.SerializerMethodField()
+    media = serializers.SerializerMethodField()
+    reviews = serializers.SerializerMethodField()
+
+    def get_details(self, obj):
+        return subtype_details(obj)
+
+    def get_media(self, obj):
+        return evidence_media(obj)
+
+    def get_reviews(self, obj):
+        return evidence_reviews(obj)
+
+    class Meta(EvidenceListSerializer.Meta):
+        fields = EvidenceListSerializer.Meta.fields + ["details", "media", "reviews"]
+
+
 class WitnessTestimonyCreateSerializer(serializers.Serializer):
     title = serializers.CharField(max_length=200)
     description = serializers.CharField(required=False, allow_blank=True)
@@ -142,3 +167,36 @@ class OtherEvidenceCreateSerializer(serializers.Serializer):
     title = serializers.CharField(max_length=200)
     description = serializers.CharField(required=False, allow_blank=True)
     registered_at = serializers.DateTimeField()
+
+
+class EvidenceUploadStartSerializer(serializers.Serializer):
+    media_kind = serializers.ChoiceField(choices=EvidenceUploadSession.MediaKind.choices)
+    evidence_id = serializers.IntegerField()
+    filename = serializers.CharField(max_length=255)
+    total_size = serializers.IntegerField(min_value=1)
+    sha256 = serializers.RegexField(r"^[0-9a-fA-F]{64}$", required=False, allow_blank=True)
+    media_type = serializers.CharField(required=False, allow_blank=True, max_length=10)
+    caption = serializers.CharField(required=False, allow_blank=True, max_length=255)
+
+
+class EvidenceUploadSessionSerializer(serializers.ModelSerializer):
+    offset = serializers.IntegerField(source="received_bytes", read_only=True)
+
+    class Meta:
+        model = EvidenceUploadSession
+        fields = [
+            "id",
+            "media_kind",
+            "evidence",
+            "filename",
+            "total_size",
+            "offset",
+            "status",
+            "media_type",
+            "caption",
+            "attachment_id",
+            "error",
+            "created_at",
+            "expires_at",
+        ]
+        read_only_fields = fields
@@ -0,0 +1,273 @@
+"""
+HTTP delivery of evidence media: validators, conditional requests and byte ranges.
+
+media_response(request, attachment) is used by both media endpoints (token-authenticated
+and signed-URL). Every response carries:
+- ETag: the attachment's content SHA-256 as a strong validator (blobs never change in
+  place; replacing the file changes the hash). Legacy rows without a hash get none.
+- Last-Modified: the attachment's created_at.
+- Accept-Ranges: bytes, and Cache-Control: private, no-cache (browsers may keep a copy but
+  must revalidate it, which costs a 304).
+
+If-None-Match / If-Modified-Since (and If-Match / If-Unmodified-Since) are evaluated with
+django.utils.cache.get_conditional_response before the file is opened.
+
+EVIDENCE_MEDIA_DELIVERY selects who sends the bytes once access has been checked:
+- "x-accel-redirect": an empty response with X-Accel-Redirect:
+  EVIDENCE_MEDIA_ACCEL_REDIRECT_PREFIX + <storage name>. nginx serves the file from an
+  internal location with sendfile and handles Range itself, e.g.
+
+      location /protected-evidence/ {
+          internal;
+          alias /srv/app/media/;   # MEDIA_ROOT
+          etag off;                # keep the content-hash ETag set by Django
+          add_header ETag $upstream_http_etag;
+      }
+
+- "x-sendfile": the same with X-Sendfile: <absolute path> (Apache mod_xsendfile, lighttpd).
+  Needs a storage with local paths; otherwise the Python mode is used.
+- "python" (default, no proxy): the worker streams the file. Whole files and single
+  ranges go out as a FileResponse over the open file, so a server with wsgi.file_wrapper
+  (gunicorn) sends them with os.sendfile from the range offset; several ranges are cut
+  from an mmap of the file into multipart/byteranges. A Range header (honoured only while
+  If-Range, if sent, still matches) yields 206, an unsatisfiable one 416, and more than
+  EVIDENCE_MEDIA_MAX_RANGES ranges the whole file.
+"""
+import mmap
+import re
+import uuid
+from calendar import timegm
+from io import UnsupportedOperation
+from urllib.parse import quote
+
+from django.conf import settings
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_http_date_safe
+
+READ_CHUNK_SIZE = 64 * 1024
+RANGE_SPEC = re.compile(r"^(\d*)-(\d*)$")
+
+
+def media_etag(attachment):
+    return f'"{attachment.sha256}"' if attachment.sha256 else None
+
+
+def media_last_modified(attachment):
+    return timegm(attachment.created_at.utctimetuple()) if attachment.created_at else None
+
+
+def parse_range_header(header, size):
+    """
+    [(start, end), ...] (inclusive) for a "bytes=" Range header; [] when no range is
+    satisfiable and None when the header is absent, malformed or asks for too many ranges
+    (in which case the whole file is served).
+    """
+    if not header:
+        return None
+    unit, _, specs = header.partition("=")
+    if unit.strip().lower() != "bytes" or not specs.strip():
+        return None
+    specs = [spec.strip() for spec in specs.split(",") if spec.strip()]
+    if len(specs) > settings.EVIDENCE_MEDIA_MAX_RANGES:
+        return None
+    ranges = []
+    for spec in specs:
+        match = RANGE_SPEC.match(spec)
+        if match is None or match.groups() == ("", ""):
+            return None
+        first, last = match.groups()
+        if first == "":
+            start, end = max(size - int(last), 0), size - 1  # suffix: the last N bytes
+        else:
+            start = int(first)
+            end = min(int(last), size - 1) if last else size - 1
+            if last and int(last) < start:
+                return None
+        if start < size and start <= end:
+            ranges.append((start, end))
+    return ranges
+
+
+def _if_range_matches(request, etag, last_modified):
+    value = request.headers.get("If-Range")
+    if not value:
+        return True
+    if value.startswith('"') or value.startswith("W/"):
+        return etag is not None and value == etag  # strong comparison; weak tags never match
+    since = parse_http_date_safe(value)
+    return since is not None and last_modified is not None and last_modified <= since
+
+
+class _RangeFile:
+    """
+    File-like view of bytes [start, end] of an open file for FileResponse. read() stops at
+    the end of the range; fileno() exposes the descriptor, positioned at start, so
+    wsgi.file_wrapper implementations can sendfile() exactly Content-Length bytes from it.
+    """
+
+    def __init__(self, handle, start, end):
+        handle.seek(start)
+        self.handle = handle
+        self.remaining = end - start + 1
+
+    def read(self, size=-1):
+        if self.remaining <= 0:
+            return b""
+        size = self.remaining if size is None or size < 0 else min(size, self.remaining)
+        data = self.handle.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def fileno(self):
+        return self.handle.fileno()
+
+    def close(self):
+        self.handle.close()
+
+
+class _FileSlices:
+    """Streams byte ranges of an open file (with part headers); closing closes the file."""
+
+    def __init__(self, handle, parts, trailer=b""):
+        self.handle = handle
+        self.parts = parts  # [(header bytes, start, end)]
+        self.trailer = trailer
+
+    def _mapped(self):
+        try:
+            return mmap.mmap(self.handle.fileno(), 0, access=mmap.ACCESS_READ)
+        except (AttributeError, OSError, UnsupportedOperation, ValueError):
+            return None  # not a local file (remote storage, in-memory)
+
+    def __iter__(self):
+        mapped = self._mapped()
+        try:
+            for header, start, end in self.parts:
+                yield header
+                if mapped is not None:
+                    for offset in range(start, end + 1, READ_CHUNK_SIZE):
+                        yield mapped[offset:min(offset + READ_CHUNK_SIZE, end + 1)]
+                    continue
+                self.handle.seek(start)
+                remaining = end - start + 1
+                while remaining > 0:
+                    data = self.handle.read(min(READ_CHUNK_SIZE, remaining))
+                    if not data:
+                        break
+                    remaining -= len(data)
+                    yield data
+            yield self.trailer
+        finally:
+            if mapped is not None:
+                mapped.close()
+
+    def close(self):
+        self.handle.close()
+
+
+def _open(attachment):
+    if not attachment.file or not attachment.file.name:
+        return None
+    try:
+        return attachment.file.open("rb")
+    except (OSError, ValueError):
+        return None
+
+
+def _offload_response(attachment, content_type):
+    """Internal-redirect response for the front proxy, or None when the mode cannot be used."""
+    mode = settings.EVIDENCE_MEDIA_DELIVERY
+    name = attachment.file.name if attachment.file else ""
+    if not name or mode not in ("x-accel-redirect", "x-sendfile"):
+        return None
+    response = HttpResponse(content_type=content_type)
+    if mode == "x-accel-redirect":
+        prefix = settings.EVIDENCE_MEDIA_ACCEL_REDIRECT_PREFIX.rstrip("/")
+        response["X-Accel-Redirect"] = f"{prefix}/{quote(name)}"
+        return response
+    try:
+        response["X-Sendfile"] = attachment.file.path
+    except NotImplementedError:
+        return None  # remote storage: no local path to hand over
+    return response
+
+
+def media_response(request, attachment):
+    """Response for GET/HEAD of the attachment's file, or None when the file is missing."""
+    etag = media_etag(attachment)
+    last_modified = media_last_modified(attachment)
+    validators = HttpResponse()
+    validators["Cache-Control"] = "private, no-cache"
+    if etag:
+        validators["ETag"] = etag
+    if last_modified is not None:
+        validators["Last-Modified"] = http_date(last_modified)
+    conditional = get_conditional_response(request, etag=etag, last_modified=last_modified, response=validators)
+    if conditional is not validators:
+        return conditional  # 304 Not Modified or 412 Precondition Failed
+
+    content_type = attachment.mime_type or "application/octet-stream"
+    response = _offload_response(attachment, content_type)
+    if response is not None:
+        return _with_validators(response, validators)
+
+    handle = _open(attachment)
+    if handle is None:
+        return None
+    size = attachment.file_size
+    if size is None:
+        try:
+            size = attachment.file.size
+        except (OSError, ValueError):
+            size = None
+
+    ranges = None
+    if size is not None and _if_range_matches(request, etag, last_modified):
+        ranges = parse_range_header(request.headers.get("Range"), size)
+
+    if ranges is None:
+        response = FileResponse(handle, as_attachment=False)
+        if attachment.mime_type:
+            response["Content-Type"] = attachment.mime_type
+        if size is not None:
+            response["Content-Length"] = size
+    elif not ranges:
+        handle.close()
+        response = HttpResponse(status=416)
+        response["Content-Range"] = f"bytes */{size}"
+    elif len(ranges) == 1:
+        start, end = ranges[0]
+        response = FileResponse(_RangeFile(handle, start, end), status=206, content_type=content_type)
+        response["Content-Range"] = f"bytes {start}-{end}/{size}"
+        response["Content-Length"] = end - start + 1
+    else:
+        boundary = uuid.uuid4().hex
+        parts = [
+            (
+                (
+                    f"\r\n--{boundary}\r\nContent-Type: {content_type}\r\n"
+                    f"Content-Range: bytes {start}-{end}/{size}\r\n\r\n"
+                ).encode("ascii"),
+                start,
+                end,
+            )
+            for start, end in ranges
+        ]
+        trailer = f"\r\n--{boundary}--\r\n".encode("ascii")
+        response = StreamingHttpResponse(
+            _FileSlices(handle, parts, trailer),
+            status=206,
+            content_type=f"multipart/byteranges; boundary={boundary}",
+        )
+        response["Content-Length"] = sum(len(header) + end - start + 1 for header, start, end in parts) + len(trailer)
+
+    return _with_validators(response, validators)
+
+
+def _with_validators(response, validators):
+    response["Accept-Ranges"] = "bytes"
+    for header in ("Cache-Control", "ETag", "Last-Modified"):
+        if header in validators:
+            response[header] = validators[header]
+    return response
@@ -0,0 +1,307 @@
+"""
+Derivative media for evidence attachments: downscaled thumbnails and poster frames.
+
+Lists and the detective board only need small previews, so each image or video content
+gets two JPEG renditions (EvidenceMediaDerivative kinds), bounded by
+EVIDENCE_THUMBNAIL_MAX_SIZE and EVIDENCE_POSTER_MAX_SIZE pixels on the longer side. Video
+renditions are cut from a frame EVIDENCE_POSTER_FRAME_SECONDS in (ffmpeg).
+
+Derivatives belong to the content, not to an attachment row: they are keyed by the source
+SHA-256 and stored next to the blob with names that carry the hash, kind and size
+(evidence/blobs/<ab>/<sha256>.thumbnail-320.jpg), so identical content is rendered once and
+a changed rendition gets a new name and ETag.
+
+- request_derivatives(attachment): called from the evidence post_save signal when a row
+  starts referencing content; creates the pending rows and, with EVIDENCE_DERIVATIVES_ASYNC,
+  enqueues generate_media_derivatives_task after commit.
+- generate_derivatives(source_sha256): renders the pending rows (Celery task, the
+  generate_evidence_derivatives scheduler command, or on read when workers are off). A row
+  is claimed first (pending -> rendering, compare-and-swap), so concurrent workers never
+  write the same file. The claim's timestamp identifies it: a worker only records results
+  while its own claim stands. A claim older than EVIDENCE_DERIVATIVE_RENDER_LEASE_SECONDS (a
+  crashed worker) goes back to pending in generate_pending_derivatives.
+- get_ready_derivative(attachment, kind): used by the media endpoints for ?variant=.
+
+Pillow and ffmpeg are optional: without them the rows are marked unsupported and clients
+fall back to the original.
+"""
+import hashlib
+import io
+import logging
+import shutil
+import subprocess
+import tempfile
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import transaction
+from django.utils import timezone
+
+from apps.evidence.models import EvidenceBlob, EvidenceMediaDerivative
+from apps.evidence.storage import get_evidence_media_storage
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # Pillow not installed: derivatives are marked unsupported
+    Image = ImageOps = None
+
+logger = logging.getLogger(__name__)
+
+DERIVABLE_PREFIXES = ("image/", "video/")
+DERIVATIVE_MIME_TYPE = "image/jpeg"
+
+
+class DerivativeUnsupported(Exception):
+    """The source cannot be rendered here (media type, or Pillow/ffmpeg missing)."""
+
+
+def is_derivable(mime_type):
+    return bool(mime_type) and mime_type.startswith(DERIVABLE_PREFIXES)
+
+
+def derivative_max_size(kind):
+    if kind == EvidenceMediaDerivative.Kind.THUMBNAIL:
+        return settings.EVIDENCE_THUMBNAIL_MAX_SIZE
+    return settings.EVIDENCE_POSTER_MAX_SIZE
+
+
+def derivative_storage_name(source_sha256, kind):
+    return f"evidence/blobs/{source_sha256[:2]}/{source_sha256}.{kind}-{derivative_max_size(kind)}.jpg"
+
+
+def request_derivatives(attachment) -> bool:
+    """Create missing derivative rows for the attachment's content; True when any were added."""
+    if not attachment.sha256 or not is_derivable(attachment.mime_type):
+        return False
+    existing = set(
+        EvidenceMediaDerivative.objects.filter(source_sha256=attachment.sha256).values_list("kind", flat=True)
+    )
+    missing = [kind for kind in EvidenceMediaDerivative.Kind.values if kind not in existing]
+    if not missing:
+        return False
+    EvidenceMediaDerivative.objects.bulk_create(
+        [EvidenceMediaDerivative(source_sha256=attachment.sha256, kind=kind) for kind in missing],
+        ignore_conflicts=True,
+    )
+    if settings.EVIDENCE_DERIVATIVES_ASYNC:
+        _schedule_generation(attachment.sha256)
+    return True
+
+
+def _enqueue_generation(source_sha256):
+    from apps.evidence.tasks import generate_media_derivatives_task
+
+    try:
+        generate_media_derivatives_task.delay(source_sha256)
+    except Exception:
+        # The upload has committed; the rows stay pending for generate_evidence_derivatives.
+        logger.warning("Derivatives could not be queued for %s.", source_sha256, exc_info=True)
+
+
+def _schedule_generation(source_sha256):
+    transaction.on_commit(lambda: _enqueue_generation(source_sha256))
+
+
+def _source(source_sha256):
+    """(storage name, MIME type) of the stored content, or None when no blob holds it."""
+    blob = EvidenceBlob.objects.filter(pk=source_sha256).only("storage_name", "mime_type").first()
+    if blob is None:
+        return None
+    return blob.storage_name, blob.mime_type
+
+
+def _open_image(handle):
+    image = Image.open(handle)
+    image.draft("RGB", (settings.EVIDENCE_POSTER_MAX_SIZE, settings.EVIDENCE_POSTER_MAX_SIZE))  # JPEG: decode downscaled
+    image = ImageOps.exif_transpose(image)
+    return image.convert("RGB")
+
+
+def _grab_frame(storage, name):
+    """PNG bytes of a poster frame, or of the first frame for clips shorter than the offset."""
+    ffmpeg = shutil.which(settings.EVIDENCE_FFMPEG_BINARY)
+    if ffmpeg is None:
+        raise DerivativeUnsupported("ffmpeg is not available.")
+    with tempfile.NamedTemporaryFile(suffix=".media") as local:
+        try:
+            path = storage.path(name)
+        except NotImplementedError:  # remote storage: ffmpeg needs a local file
+            with storage.open(name, "rb") as source:
+                shutil.copyfileobj(source, local)
+            local.flush()
+            path = local.name
+        for offset in (settings.EVIDENCE_POSTER_FRAME_SECONDS, 0):
+            result = subprocess.run(
+                [ffmpeg, "-nostdin", "-v", "error", "-ss", str(offset), "-i", path,
+                 "-frames:v", "1", "-f", "image2pipe", "-vcodec", "png", "-"],
+                capture_output=True,
+                timeout=settings.EVIDENCE_DERIVATIVE_TIMEOUT_SECONDS,
+                check=False,
+            )
+            if result.stdout:
+                return result.stdout
+    raise ValueError(result.stderr.decode(errors="replace").strip()[:200] or "No video frame could be decoded.")
+
+
+def _load_source_image(storage, name, mime_type):
+    if Image is None:
+        raise DerivativeUnsupported("Pillow is not installed.")
+    if mime_type.startswith("image/"):
+        with storage.open(name, "rb") as handle:
+            return _open_image(handle)
+    if mime_type.startswith("video/"):
+        return _open_image(io.BytesIO(_grab_frame(storage, name)))
+    raise DerivativeUnsupported(f"No derivatives for {mime_type or 'unknown'} media.")
+
+
+def _render(image, kind):
+    rendition = image.copy()
+    size = derivative_max_size(kind)
+    rendition.thumbnail((size, size))
+    buffer = io.BytesIO()
+    rendition.save(
+        buffer, "JPEG", quality=settings.EVIDENCE_DERIVATIVE_JPEG_QUALITY, optimize=True, progressive=True
+    )
+    return buffer.getvalue(), rendition.size
+
+
+def _finish(rows, status, error=""):
+    rows.update(status=status, error=error[:255], updated_at=timezone.now())
+
+
+def _claim(derivatives, claimed_at):
+    """The derivatives this worker moved from pending to rendering; others are left alone."""
+    return [
+        derivative
+        for derivative in derivatives
+        if EvidenceMediaDerivative.objects.filter(
+            pk=derivative.pk, status=EvidenceMediaDerivative.Status.PENDING
+        ).update(status=EvidenceMediaDerivative.Status.RENDERING, updated_at=claimed_at)
+    ]
+
+
+def generate_derivatives(source_sha256) -> int:
+    """Render the pending derivatives of one content hash; returns how many became ready."""
+    claimed_at = timezone.now()
+    derivatives = _claim(
+        EvidenceMediaDerivative.objects.filter(
+            source_sha256=source_sha256, status=EvidenceMediaDerivative.Status.PENDING
+        ),
+        claimed_at,
+    )
+    if not derivatives:
+        return 0
+    claimed = EvidenceMediaDerivative.objects.filter(
+        pk__in=[derivative.pk for derivative in derivatives],
+        status=EvidenceMediaDerivative.Status.RENDERING,
+        updated_at=claimed_at,
+    )
+    source = _source(source_sha256)
+    if source is None:
+        _finish(claimed, EvidenceMediaDerivative.Status.FAILED, "Source content is not stored.")
+        return 0
+    name, mime_type = source
+    storage = get_evidence_media_storage()
+    try:
+        image = _load_source_image(storage, name, mime_type)
+    except DerivativeUnsupported as exc:
+        _finish(claimed, EvidenceMediaDerivative.Status.UNSUPPORTED, str(exc))
+        return 0
+    except Exception as exc:  # corrupt media, decoder errors, ffmpeg timeouts
+        logger.warning("Derivatives for %s failed.", source_sha256, exc_info=True)
+        _record_failure(derivatives, claimed, str(exc) or type(exc).__name__)
+        return 0
+
+    ready = 0
+    for derivative in derivatives:
+        data, (width, height) = _render(image, derivative.kind)
+        storage_name = derivative_storage_name(source_sha256, derivative.kind)
+        if storage.exists(storage_name):  # left by a worker whose claim expired; this claim owns the name now
+            storage.delete(storage_name)
+        storage_name = storage.save(storage_name, ContentFile(data))
+        updated = claimed.filter(pk=derivative.pk).update(
+            status=EvidenceMediaDerivative.Status.READY,
+            file=storage_name,
+            sha256=hashlib.sha256(data).hexdigest(),
+            mime_type=DERIVATIVE_MIME_TYPE,
+            file_size=len(data),
+            width=width,
+            height=height,
+            error="",
+            updated_at=timezone.now(),
+        )
+        if not updated and not EvidenceMediaDerivative.objects.filter(file=storage_name).exists():
+            storage.delete(storage_name)  # row discarded or reclaimed meanwhile: do not leave the file behind
+        ready += updated
+    return ready
+
+
+def _record_failure(derivatives, claimed, error):
+    """Count a failed attempt on the claimed rows; they go back to pending until the attempt limit."""
+    for derivative in derivatives:
+        attempts = derivative.attempts + 1
+        status = (
+            EvidenceMediaDerivative.Status.FAILED
+            if attempts >= settings.EVIDENCE_DERIVATIVE_MAX_ATTEMPTS
+            else EvidenceMediaDerivative.Status.PENDING
+        )
+        claimed.filter(pk=derivative.pk).update(
+            status=status, attempts=attempts, error=error[:255], updated_at=timezone.now()
+        )
+
+
+def generate_pending_derivatives(*, limit=None, retry_failed=False, dry_run=False) -> int:
+    """Render pending derivatives (scheduler fallback for lost tasks); returns hashes processed."""
+    if not dry_run:
+        lease_expired = timezone.now() - timedelta(seconds=settings.EVIDENCE_DERIVATIVE_RENDER_LEASE_SECONDS)
+        EvidenceMediaDerivative.objects.filter(
+            status=EvidenceMediaDerivative.Status.RENDERING, updated_at__lt=lease_expired
+        ).update(status=EvidenceMediaDerivative.Status.PENDING, updated_at=timezone.now())
+    if retry_failed and not dry_run:
+        EvidenceMediaDerivative.objects.filter(status=EvidenceMediaDerivative.Status.FAILED).update(
+            status=EvidenceMediaDerivative.Status.PENDING, attempts=0
+        )
+    hashes = (
+        EvidenceMediaDerivative.objects.filter(status=EvidenceMediaDerivative.Status.PENDING)
+        .order_by("source_sha256")
+        .values_list("source_sha256", flat=True)
+        .distinct()
+    )
+    hashes = list(hashes[:limit] if limit else hashes)
+    if not dry_run:
+        for source_sha256 in hashes:
+            generate_derivatives(source_sha256)
+    return len(hashes)
+
+
+def get_ready_derivative(attachment, kind):
+    """
+    (derivative, status) for the attachment's content. The derivative is None unless ready;
+    without workers (EVIDENCE_DERIVATIVES_ASYNC off) a pending one is rendered on this read.
+    """
+    if not attachment.sha256 or not is_derivable(attachment.mime_type):
+        return None, EvidenceMediaDerivative.Status.UNSUPPORTED
+    rows = EvidenceMediaDerivative.objects.filter(source_sha256=attachment.sha256, kind=kind)
+    derivative = rows.first()
+    if derivative is None:
+        request_derivatives(attachment)  # content stored before derivatives existed
+    if not settings.EVIDENCE_DERIVATIVES_ASYNC and (
+        derivative is None or derivative.status == EvidenceMediaDerivative.Status.PENDING
+    ):
+        generate_derivatives(attachment.sha256)
+        derivative = rows.first()
+    if derivative is None:
+        return None, EvidenceMediaDerivative.Status.PENDING
+    if derivative.status != EvidenceMediaDerivative.Status.READY:
+        return None, derivative.status
+    return derivative, derivative.status
+
+
+def discard_derivatives(source_sha256, storage=None):
+    """Delete the derivative rows and files of content that is no longer stored."""
+    storage = storage or get_evidence_media_storage()
+    rows = EvidenceMediaDerivative.objects.filter(source_sha256=source_sha256)
+    for name in rows.exclude(file="").values_list("file", flat=True):
+        storage.delete(name)
+    rows.delete()
@@ -3,18 +3,50 @@ Evidence media service: storage abstraction and metadata persistence.
 """
 import hashlib
 import hmac
+import mimetypes
 import time
 from base64 import urlsafe_b64decode, urlsafe_b64encode
 
 from django.conf import settings
 
 
+# (offset, signature, MIME type) checked against the first bytes of a file, in order.
+MIME_SIGNATURES = (
+    (0, b"\xff\xd8\xff", "image/jpeg"),
+    (0, b"\x89PNG\r\n\x1a\n", "image/png"),
+    (0, b"GIF87a", "image/gif"),
+    (0, b"GIF89a", "image/gif"),
+    (8, b"WEBP", "image/webp"),
+    (8, b"WAVE", "audio/wav"),
+    (8, b"AVI ", "video/x-msvideo"),
+    (4, b"ftypqt", "video/quicktime"),
+    (4, b"ftypM4A", "audio/mp4"),
+    (4, b"ftyp", "video/mp4"),
+    (0, b"\x1aE\xdf\xa3", "video/webm"),
+    (0, b"OggS", "audio/ogg"),
+    (0, b"ID3", "audio/mpeg"),
+    (0, b"\xff\xfb", "audio/mpeg"),
+    (0, b"fLaC", "audio/flac"),
+    (0, b"%PDF-", "application/pdf"),
+)
+
+
+def sniff_mime_type(head: bytes, filename: str = "") -> str:
+    """MIME type from the leading bytes of a file, falling back to its extension."""
+    for offset, signature, mime_type in MIME_SIGNATURES:
+        if head[offset:offset + len(signature)] == signature:
+            return mime_type
+    guessed, _ = mimetypes.guess_type(filename or "")
+    return guessed or "application/octet-stream"
+
+
 def persist_attachment_metadata(attachment):
     """
     Persist file metadata (file_size) from the uploaded file to the model.
-    Call after file is saved. Uses update() to avoid signal recursion.
+    Call after file is saved. Uses update() to avoid signal recursion. Attachments that
+    already carry a size (resumable uploads measure it while assembling) are left alone.
     """
-    if not attachment.file or not attachment.file.name:
+    if not attachment.file or not attachment.file.name or attachment.file_size is not None:
         return
     try:
         size = attachment.file.size
@@ -47,8 +79,7 @@ def verify_signed_token(token: str) -> tuple[str, int] | None:
     """
     try:
         payload_b64, signature = token.rsplit(".", 1)
-        payload_b64 = payload_b64 + "=" * (4 - len(payload_b64) % 4)
-        payload = urlsafe_b64decode(payload_b64).decode()
+        payload = urlsafe_b64decode(payload_b64 + "=" * (-len(payload_b64) % 4)).decode()
         media_type, media_id_str, expiry_str = payload.split(":", 2)
         expiry = int(expiry_str)
         if expiry < time.time():
@@ -0,0 +1,150 @@
+"""
+Typed loading of Evidence rows (multi-table inheritance) in a fixed number of queries.
+
+Evidence rows come back as base instances; reading subtype fields through the parent link
+(evidence.vehicleevidence) costs a query per row. load_typed_evidence(rows) takes the
+already fetched base rows and, per evidence_type present, reads only that subtype's table
+in one query (pk__in, no join back to evidence_evidence). The subtype instances are built
+from the base values plus those columns, keep the base row's select_related objects, and
+get their attachments, media references and reviews prefetched in one query per relation:
+
+    base rows (1) + one per subtype present (<= 5) + media/reviews of the present subtypes (<= 3)
+
+Rows whose subtype row is missing are returned as the base instance. subtype_details,
+evidence_media and evidence_reviews turn a loaded instance into plain data for the
+evidence list and the judiciary referral package without further queries.
+"""
+from collections import defaultdict
+
+from django.db.models import Prefetch, prefetch_related_objects
+
+from apps.evidence.models import (
+    BiologicalMedicalEvidence,
+    BiologicalMedicalMediaReference,
+    Evidence,
+    EvidenceReview,
+    IdentificationEvidence,
+    OtherEvidence,
+    VehicleEvidence,
+    WitnessTestimony,
+    WitnessTestimonyAttachment,
+)
+from apps.evidence.services.derivatives import is_derivable
+
+EVIDENCE_SUBTYPES = {
+    Evidence.EvidenceType.WITNESS_TESTIMONY: WitnessTestimony,
+    Evidence.EvidenceType.BIOLOGICAL_MEDICAL: BiologicalMedicalEvidence,
+    Evidence.EvidenceType.VEHICLE: VehicleEvidence,
+    Evidence.EvidenceType.IDENTIFICATION: IdentificationEvidence,
+    Evidence.EvidenceType.OTHER: OtherEvidence,
+}
+# Subtype -> (media kind as used by the evidence media endpoints, related name of its files).
+SUBTYPE_MEDIA = {
+    WitnessTestimony: ("witness-testimony", "attachments"),
+    BiologicalMedicalEvidence: ("biological-medical", "media_references"),
+}
+SUBTYPE_PREFETCHES = {
+    WitnessTestimony: (Prefetch("attachments", queryset=WitnessTestimonyAttachment.objects.order_by("id")),),
+    BiologicalMedicalEvidence: (
+        Prefetch("media_references", queryset=BiologicalMedicalMediaReference.objects.order_by("id")),
+        Prefetch("reviews", queryset=EvidenceReview.objects.select_related("reviewed_by").order_by("reviewed_at", "id")),
+    ),
+}
+
+
+def _local_attnames(model):
+    """Columns stored in the subtype's own table (the parent link included)."""
+    return [field.attname for field in model._meta.local_concrete_fields]
+
+
+def _typed_instance(model, base, values):
+    fields = model._meta.concrete_fields
+    row = [values[field.attname] if field.attname in values else getattr(base, field.attname) for field in fields]
+    instance = model.from_db(base._state.db, [field.attname for field in fields], row)
+    instance._state.fields_cache.update(base._state.fields_cache)  # registrar, case, ... from select_related
+    return instance
+
+
+def load_typed_evidence(rows):
+    """
+    Subtype instances for base Evidence rows (a queryset, page or list of fully loaded rows),
+    in the same order, with media and reviews prefetched.
+    """
+    rows = list(rows)
+    by_type = defaultdict(list)
+    for row in rows:
+        model = EVIDENCE_SUBTYPES.get(row.evidence_type)
+        if model is not None and not isinstance(row, model):
+            by_type[model].append(row)
+
+    typed = {}
+    for model, bases in by_type.items():
+        columns = model.objects.filter(pk__in=[base.pk for base in bases]).order_by().values(*_local_attnames(model))
+        columns = {values[model._meta.pk.attname]: values for values in columns}
+        for base in bases:
+            if base.pk in columns:
+                typed[base.pk] = _typed_instance(model, base, columns[base.pk])
+
+    loaded = [typed.get(row.pk, row) for row in rows]
+    for model, prefetches in SUBTYPE_PREFETCHES.items():
+        instances = [instance for instance in loaded if type(instance) is model]
+        if instances:
+            prefetch_related_objects(instances, *prefetches)
+    return loaded
+
+
+def subtype_details(evidence):
+    """Fields the evidence's subtype adds to Evidence; {} for a base row."""
+    model = type(evidence)
+    if model is Evidence:
+        return {}
+    return {
+        field.attname: getattr(evidence, field.attname)
+        for field in model._meta.local_concrete_fields
+        if not field.primary_key
+    }
+
+
+def media_url(kind, media_id, variant=None):
+    url = f"/api/v1/evidence/media/{kind}/{media_id}/"
+    return f"{url}?variant={variant}" if variant else url
+
+
+def evidence_media(evidence):
+    """Attachment / media reference metadata with protected URLs (prefetched by the loader)."""
+    kind, related_name = SUBTYPE_MEDIA.get(type(evidence), (None, None))
+    if kind is None:
+        return []
+    return [
+        {
+            "id": media.pk,
+            "kind": kind,
+            "media_type": media.media_type,
+            "mime_type": media.mime_type,
+            "file_size": media.file_size,
+            "width": media.width,
+            "height": media.height,
+            "caption": media.caption,
+            "created_at": media.created_at,
+            "url": media_url(kind, media.pk),
+            "thumbnail_url": media_url(kind, media.pk, "thumbnail") if is_derivable(media.mime_type) else None,
+        }
+        for media in getattr(evidence, related_name).all()
+    ]
+
+
+def evidence_reviews(evidence):
+    """Coroner reviews of biological/medical evidence, oldest first (prefetched by the loader)."""
+    if type(evidence) is not BiologicalMedicalEvidence:
+        return []
+    return [
+        {
+            "id": review.pk,
+            "decision": review.decision,
+            "follow_up_notes": review.follow_up_notes,
+            "reviewed_by": review.reviewed_by_id,
+            "reviewed_by_display": review.reviewed_by.full_name if review.reviewed_by else "",
+            "reviewed_at": review.reviewed_at,
+        }
+        for review in evidence.reviews.all()
+    ]
@@ -0,0 +1,417 @@
+"""
+Resumable chunked uploads for evidence media.
+
+A client uploading a witness testimony attachment or a biological/medical media reference
+opens an EvidenceUploadSession with the file name and total size, then sends the bytes as
+a sequence of chunks:
+
+    POST   /api/v1/evidence/uploads/                      -> {"upload": {"id", "offset", ...}}
+    PUT    /api/v1/evidence/uploads/<id>/chunks/          Upload-Offset: <n>, X-Chunk-SHA256: <hex>
+    GET    /api/v1/evidence/uploads/<id>/                 current offset, to resume after a drop
+    POST   /api/v1/evidence/uploads/<id>/complete/        assemble and create the attachment
+    DELETE /api/v1/evidence/uploads/<id>/                 abandon
+
+A chunk body is read from the request stream EVIDENCE_UPLOAD_READ_SIZE bytes at a time
+into a spooled temporary file (hashed on the way), checked against its X-Chunk-SHA256 and
+stored as its own part file; nothing ever holds a whole chunk, let alone a whole file, in
+memory. A chunk is accepted only at the session's current offset (a compare-and-swap on
+received_bytes), so concurrent or replayed requests cannot interleave; resending a chunk
+that was already stored at that offset with the same checksum is acknowledged again.
+
+Completion streams the part files, in offset order, straight into a new blob file on
+get_evidence_media_storage(). The size, SHA-256 and the MIME type (sniffed from the first
+bytes) are computed in that same pass, so the attachment is saved with its metadata and
+the file is never re-opened. Files are content-addressed (apps.evidence.storage.blobs):
+if the content was already stored the new copy is dropped. A client that declares the
+file's sha256 up front is attached to the stored content at session start, before sending
+any bytes, but only when knowing the hash proves nothing new (_may_reuse_blob): the content
+is already attached to evidence of the same case, or the caller uploaded it in full before.
+Anyone else sends the bytes, so a leaked hash cannot be turned into the file. Part files are
+deleted once the session is completed or abandoned; open sessions expire after EVIDENCE_UPLOAD_SESSION_TTL_SECONDS
+(purge_upload_sessions).
+"""
+import hashlib
+import io
+import os
+import re
+import uuid
+from datetime import timedelta
+from tempfile import SpooledTemporaryFile
+
+from django.conf import settings
+from django.core.files import File
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+from rest_framework import status
+
+from apps.evidence.models import (
+    BiologicalMedicalEvidence,
+    BiologicalMedicalMediaReference,
+    EvidenceUploadChunk,
+    EvidenceUploadSession,
+    WitnessTestimony,
+    WitnessTestimonyAttachment,
+)
+from apps.evidence.services.media import sniff_mime_type
+from apps.evidence.storage import get_evidence_media_storage
+from apps.evidence.storage.blobs import adopt_blob, blob_storage_name, find_blob, new_blob_storage_name
+
+SHA256_PATTERN = re.compile(r"^[0-9a-f]{64}$")
+SNIFF_BYTES = 64
+
+# Media kind -> (evidence subtype, attachment model, attachment FK to the evidence).
+UPLOAD_TARGETS = {
+    EvidenceUploadSession.MediaKind.WITNESS_TESTIMONY: (
+        WitnessTestimony,
+        WitnessTestimonyAttachment,
+        "witness_testimony_id",
+    ),
+    EvidenceUploadSession.MediaKind.BIOLOGICAL_MEDICAL: (
+        BiologicalMedicalEvidence,
+        BiologicalMedicalMediaReference,
+        "biological_medical_evidence_id",
+    ),
+}
+
+
+class UploadError(Exception):
+    """A request the upload protocol rejects; carries the error_response code and status."""
+
+    def __init__(self, code, message, status_code=status.HTTP_400_BAD_REQUEST, details=None):
+        super().__init__(message)
+        self.code = code
+        self.message = message
+        self.status_code = status_code
+        self.details = details
+
+
+def _part_name(session, offset):
+    return f"evidence/uploads/{session.id}/{offset:016d}-{uuid.uuid4().hex[:8]}.part"
+
+
+def _media_type_choices(media_kind):
+    return {choice for choice, _ in UPLOAD_TARGETS[media_kind][1].MediaType.choices}
+
+
+def _media_type_for(mime_type, media_kind):
+    """image/..., video/... or audio/... mapped to the attachment model's media_type, or None."""
+    media_type = (mime_type or "").split("/", 1)[0]
+    return media_type if media_type in _media_type_choices(media_kind) else None
+
+
+def _may_reuse_blob(user, evidence, sha256):
+    """
+    Whether a declared hash may stand in for the bytes: the content is attached to evidence of
+    the same case already, or the caller completed a full upload of it (checked against the hash;
+    sessions completed by this shortcut received no bytes and do not count).
+    """
+    return (
+        WitnessTestimonyAttachment.objects.filter(sha256=sha256, witness_testimony__case_id=evidence.case_id).exists()
+        or BiologicalMedicalMediaReference.objects.filter(
+            sha256=sha256, biological_medical_evidence__case_id=evidence.case_id
+        ).exists()
+        or EvidenceUploadSession.objects.filter(
+            created_by=user,
+            expected_sha256=sha256,
+            status=EvidenceUploadSession.Status.COMPLETED,
+            received_bytes=F("total_size"),
+        ).exists()
+    )
+
+
+def start_upload(*, user, media_kind, evidence_id, filename, total_size, sha256="", media_type="", caption=""):
+    """
+    Open an upload session for media of `media_kind` on the given evidence. When the declared
+    sha256 and size match a stored blob the caller may reuse (_may_reuse_blob), the attachment
+    is created on it straight away and the session is returned completed: no bytes need to be sent.
+    """
+    if media_kind not in UPLOAD_TARGETS:
+        raise UploadError("VALIDATION_ERROR", "media_kind must be witness-testimony or biological-medical.")
+    if total_size > settings.EVIDENCE_UPLOAD_MAX_SIZE:
+        raise UploadError(
+            "UPLOAD_TOO_LARGE",
+            "File exceeds the maximum upload size.",
+            status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            {"max_size": settings.EVIDENCE_UPLOAD_MAX_SIZE},
+        )
+    if media_type and media_type not in _media_type_choices(media_kind):
+        raise UploadError("VALIDATION_ERROR", f"media_type {media_type!r} is not allowed for {media_kind}.")
+    evidence_model = UPLOAD_TARGETS[media_kind][0]
+    evidence = evidence_model.objects.filter(pk=evidence_id).only("pk", "case_id").first()
+    if evidence is None:
+        raise UploadError("NOT_FOUND", "Evidence not found for this media kind.", status.HTTP_404_NOT_FOUND)
+    session = EvidenceUploadSession.objects.create(
+        media_kind=media_kind,
+        evidence_id=evidence.pk,
+        created_by=user,
+        filename=os.path.basename(filename),
+        total_size=total_size,
+        expected_sha256=sha256.lower(),
+        media_type=media_type,
+        caption=caption,
+        expires_at=timezone.now() + timedelta(seconds=settings.EVIDENCE_UPLOAD_SESSION_TTL_SECONDS),
+    )
+    blob = find_blob(session.expected_sha256, total_size) if session.expected_sha256 else None
+    if blob is not None and _may_reuse_blob(user, evidence, session.expected_sha256):
+        duplicate_media_type = media_type or _media_type_for(blob.mime_type, media_kind)
+        if duplicate_media_type is not None:
+            _attach_blob(session, blob, duplicate_media_type)
+    return session
+
+
+def _spool_chunk(stream, limit):
+    """Copy the request stream into a spooled temp file; returns (file, size, sha256 hex)."""
+    spool = SpooledTemporaryFile(max_size=settings.EVIDENCE_UPLOAD_READ_SIZE * 4)
+    digest = hashlib.sha256()
+    size = 0
+    while data := stream.read(settings.EVIDENCE_UPLOAD_READ_SIZE):
+        size += len(data)
+        if size > limit:
+            spool.close()
+            raise UploadError(
+                "CHUNK_TOO_LARGE",
+                "Chunk exceeds the maximum chunk size or the declared file size.",
+                status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                {"max_size": limit},
+            )
+        digest.update(data)
+        spool.write(data)
+    spool.seek(0)
+    return spool, size, digest.hexdigest()
+
+
+def receive_chunk(session, *, offset, stream, sha256):
+    """
+    Store the chunk at `offset` and advance the session. Returns (session, created): created is
+    False when the same chunk had already been stored (a retried request).
+    """
+    sha256 = (sha256 or "").lower()
+    if not SHA256_PATTERN.match(sha256):
+        raise UploadError("VALIDATION_ERROR", "X-Chunk-SHA256 header with the chunk's hex SHA-256 is required.")
+    if session.status != EvidenceUploadSession.Status.OPEN:
+        raise UploadError("UPLOAD_CLOSED", f"Upload is {session.status}.", status.HTTP_409_CONFLICT)
+
+    if offset < session.received_bytes:
+        stored = session.chunks.filter(offset=offset, sha256=sha256).first()
+        if stored is not None:
+            return session, False
+    if offset != session.received_bytes:
+        raise UploadError(
+            "UPLOAD_OFFSET_MISMATCH",
+            "Chunk offset does not match the upload offset.",
+            status.HTTP_409_CONFLICT,
+            {"offset": session.received_bytes},
+        )
+
+    limit = min(settings.EVIDENCE_UPLOAD_MAX_CHUNK_SIZE, session.total_size - offset)
+    spool, size, digest = _spool_chunk(stream, limit)
+    with spool:
+        if not size:
+            raise UploadError("VALIDATION_ERROR", "Chunk body is empty.")
+        if digest != sha256:
+            raise UploadError("CHECKSUM_MISMATCH", "Chunk SHA-256 does not match its content.", details={"sha256": digest})
+        storage = get_evidence_media_storage()
+        part_name = storage.save(_part_name(session, offset), File(spool))
+
+    try:
+        with transaction.atomic():
+            advanced = EvidenceUploadSession.objects.filter(
+                pk=session.pk,
+                status=EvidenceUploadSession.Status.OPEN,
+                received_bytes=offset,
+            ).update(received_bytes=offset + size, updated_at=timezone.now())
+            if not advanced:
+                raise IntegrityError("upload offset moved")
+            EvidenceUploadChunk.objects.create(
+                session=session, offset=offset, size=size, sha256=digest, part_name=part_name
+            )
+    except IntegrityError:
+        storage.delete(part_name)
+        session.refresh_from_db()
+        raise UploadError(
+            "UPLOAD_OFFSET_MISMATCH",
+            "Another chunk was stored at this offset.",
+            status.HTTP_409_CONFLICT,
+            {"offset": session.received_bytes},
+        )
+    session.received_bytes = offset + size
+    return session, True
+
+
+class _AssemblyReader:
+    """
+    File-like view over the session's part files in offset order. Reading it is the single
+    pass over the upload: it feeds the SHA-256, the byte count and the MIME sniffing buffer.
+    """
+
+    def __init__(self, storage, part_names, size):
+        self._storage = storage
+        self._parts = iter(part_names)
+        self._current = None
+        self._position = 0
+        self.size = size  # declared; storages may use it to choose single or multipart writes
+        self.digest = hashlib.sha256()
+        self.head = b""
+
+    @property
+    def bytes_read(self):
+        return self._position
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if offset == 0 and whence == io.SEEK_SET and self._position == 0:
+            return 0
+        raise io.UnsupportedOperation("upload assembly stream is not seekable")
+
+    def tell(self):
+        return self._position
+
+    def read(self, size=-1):
+        pieces = []
+        wanted = size if size is not None and size >= 0 else None
+        while wanted is None or wanted > 0:
+            if self._current is None:
+                name = next(self._parts, None)
+                if name is None:
+                    break
+                self._current = self._storage.open(name, "rb")
+            data = self._current.read(-1 if wanted is None else wanted)
+            if not data:
+                self._current.close()
+                self._current = None
+                continue
+            pieces.append(data)
+            if wanted is not None:
+                wanted -= len(data)
+        data = b"".join(pieces)
+        self._position += len(data)
+        self.digest.update(data)
+        if len(self.head) < SNIFF_BYTES:
+            self.head = (self.head + data)[:SNIFF_BYTES]
+        return data
+
+    def close(self):
+        if self._current is not None:
+            self._current.close()
+            self._current = None
+
+
+def _fail(session, message):
+    EvidenceUploadSession.objects.filter(pk=session.pk).update(
+        status=EvidenceUploadSession.Status.FAILED, error=message[:255], updated_at=timezone.now()
+    )
+    discard_parts(session)
+
+
+def complete_upload(session):
+    """Assemble the chunks into a new attachment; returns the attachment."""
+    if session.status == EvidenceUploadSession.Status.COMPLETED:
+        return get_upload_attachment(session)
+    if session.received_bytes != session.total_size:
+        raise UploadError(
+            "UPLOAD_INCOMPLETE",
+            "Not all bytes have been uploaded.",
+            status.HTTP_409_CONFLICT,
+            {"offset": session.received_bytes, "total_size": session.total_size},
+        )
+    claimed = EvidenceUploadSession.objects.filter(
+        pk=session.pk,
+        status=EvidenceUploadSession.Status.OPEN,
+        received_bytes=session.total_size,
+    ).update(status=EvidenceUploadSession.Status.ASSEMBLING, updated_at=timezone.now())
+    if not claimed:
+        raise UploadError("UPLOAD_CLOSED", "Upload is already being completed.", status.HTTP_409_CONFLICT)
+
+    storage = get_evidence_media_storage()
+    part_names = list(session.chunks.order_by("offset").values_list("part_name", flat=True))
+    reader = _AssemblyReader(storage, part_names, session.total_size)
+    if session.expected_sha256:
+        target_name = blob_storage_name(session.expected_sha256, session.filename)
+    else:
+        target_name = new_blob_storage_name(session.filename)
+    try:
+        stored_name = storage.save(target_name, File(reader, name=session.filename))
+    except OSError as exc:
+        _fail(session, f"Assembly failed: {exc}")
+        raise UploadError("UPLOAD_FAILED", "Upload could not be assembled.", status.HTTP_500_INTERNAL_SERVER_ERROR)
+    finally:
+        reader.close()
+
+    sha256 = reader.digest.hexdigest()
+    mime_type = sniff_mime_type(reader.head, session.filename)
+    media_type = session.media_type or _media_type_for(mime_type, session.media_kind)
+    problem = None
+    if reader.bytes_read != session.total_size:
+        problem = ("UPLOAD_FAILED", "Assembled size does not match the declared size.")
+    elif session.expected_sha256 and sha256 != session.expected_sha256:
+        problem = ("CHECKSUM_MISMATCH", "File SHA-256 does not match the declared checksum.")
+    elif media_type is None:
+        problem = ("VALIDATION_ERROR", f"Content type {mime_type} is not allowed for {session.media_kind}.")
+    if problem is not None:
+        code, message = problem
+        storage.delete(stored_name)
+        _fail(session, message)
+        raise UploadError(code, message, details={"sha256": sha256, "mime_type": mime_type})
+
+    blob = adopt_blob(sha256=sha256, storage_name=stored_name, size=reader.bytes_read, mime_type=mime_type)
+    attachment = _attach_blob(session, blob, media_type)
+    discard_parts(session)
+    return attachment
+
+
+def _attach_blob(session, blob, media_type):
+    """
+    Create the session's attachment on a stored blob and mark the session completed. The
+    session keeps its received_bytes: a deduplicated session sent none, so it is no proof of
+    possession for _may_reuse_blob.
+    """
+    _, attachment_model, evidence_field = UPLOAD_TARGETS[session.media_kind]
+    with transaction.atomic():
+        attachment = attachment_model.objects.create(
+            **{evidence_field: session.evidence_id},
+            file=blob.storage_name,
+            media_type=media_type,
+            mime_type=blob.mime_type,
+            file_size=blob.size,
+            sha256=blob.sha256,
+            caption=session.caption,
+        )
+        EvidenceUploadSession.objects.filter(pk=session.pk).update(
+            status=EvidenceUploadSession.Status.COMPLETED,
+            attachment_id=attachment.pk,
+            updated_at=timezone.now(),
+        )
+    session.status = EvidenceUploadSession.Status.COMPLETED
+    session.attachment_id = attachment.pk
+    return attachment
+
+
+def get_upload_attachment(session):
+    if session.attachment_id is None:
+        return None
+    return UPLOAD_TARGETS[session.media_kind][1].objects.filter(pk=session.attachment_id).first()
+
+
+def discard_parts(session):
+    """Delete the session's part files and chunk rows."""
+    storage = get_evidence_media_storage()
+    for part_name in session.chunks.values_list("part_name", flat=True):
+        storage.delete(part_name)
+    session.chunks.all().delete()
+
+
+def abort_upload(session):
+    discard_parts(session)
+    session.delete()
+
+
+def purge_expired_uploads(*, dry_run=False, now=None) -> int:
+    """Remove sessions past their expiry with any part files left; completed attachments stay."""
+    expired = EvidenceUploadSession.objects.filter(expires_at__lte=now or timezone.now())
+    if dry_run:
+        return expired.count()
+    count = 0
+    for session in expired.iterator():
+        abort_upload(session)
+        count += 1
+    return count
@@ -1,11 +1,14 @@
 """
-Evidence signals for metadata persistence, storage lifecycle, and notification events.
+Evidence signals for metadata persistence, blob storage and reference counts, media
+derivatives, and notification events.
 """
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
 
 from apps.evidence.models import BiologicalMedicalMediaReference, Evidence, WitnessTestimonyAttachment
+from apps.evidence.services.derivatives import request_derivatives
 from apps.evidence.services.media import persist_attachment_metadata
+from apps.evidence.storage.blobs import BlobMissing, acquire_blob, ingest_blob, release_blob
 from apps.notifications.services import log_timeline_event
 
 
@@ -35,6 +38,60 @@ def evidence_registered_notification(sender, instance, created, **kwargs):
     )
 
 
+@receiver(pre_save, sender=WitnessTestimonyAttachment)
+@receiver(pre_save, sender=BiologicalMedicalMediaReference)
+def store_attachment_as_blob(sender, instance, raw=False, **kwargs):
+    """
+    Route a newly assigned file through the blob layer: identical content is stored once and
+    the attachment points at the shared file. Records the previous hash for post_save.
+    """
+    instance._previous_sha256 = None
+    if raw or not instance.file or getattr(instance.file, "_committed", True):
+        return
+    if instance.pk is not None:
+        instance._previous_sha256 = sender.objects.filter(pk=instance.pk).values_list("sha256", flat=True).first()
+    blob = ingest_blob(instance.file.file, instance.file.name)
+    instance.file.name = blob.storage_name
+    instance.file._committed = True
+    instance.sha256 = blob.sha256
+    instance.file_size = blob.size
+    if not instance.mime_type:
+        instance.mime_type = blob.mime_type
+
+
+def _acquire(instance):
+    if not acquire_blob(instance.sha256):
+        # Collected between lookup and save: fail rather than keep a row without a file.
+        raise BlobMissing(f"Blob {instance.sha256} was deleted before {instance._meta.label} {instance.pk} acquired it.")
+
+
+@receiver(post_save, sender=WitnessTestimonyAttachment)
+@receiver(post_save, sender=BiologicalMedicalMediaReference)
+def count_attachment_blob_reference(sender, instance, created, raw=False, **kwargs):
+    """Count the blob reference and queue thumbnails/poster frames for content new to the row."""
+    if raw:
+        return
+    previous = getattr(instance, "_previous_sha256", None)
+    instance._previous_sha256 = None
+    if created:
+        if instance.sha256:
+            _acquire(instance)
+            request_derivatives(instance)
+    elif previous is not None and previous != instance.sha256:
+        if instance.sha256:
+            _acquire(instance)
+            request_derivatives(instance)
+        if previous:
+            release_blob(previous)
+
+
+@receiver(post_delete, sender=WitnessTestimonyAttachment)
+@receiver(post_delete, sender=BiologicalMedicalMediaReference)
+def release_attachment_blob_reference(sender, instance, **kwargs):
+    if instance.sha256:
+        release_blob(instance.sha256)
+
+
 @receiver(post_save, sender=WitnessTestimonyAttachment)
 def witness_attachment_metadata(sender, instance, created, **kwargs):
     if instance.file and instance.file.name:
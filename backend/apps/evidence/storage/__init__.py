@@ -4,6 +4,7 @@ Evidence media storage abstraction.
 Provides a pluggable storage backend for evidence files.
 Default implementation uses Django's default file storage.
 Override EVIDENCE_MEDIA_STORAGE in settings to use a custom backend (e.g. S3).
+Attachment files are stored once per content as blobs (see apps.evidence.storage.blobs).
 """
 from django.conf import settings
 from django.core.files.storage import default_storage
@@ -0,0 +1,209 @@
+"""
+Content-addressed blob layer for evidence attachment files.
+
+Every WitnessTestimonyAttachment and BiologicalMedicalMediaReference file is stored once
+per distinct content. An EvidenceBlob row, keyed by the SHA-256 of the content, records
+where the file lives (storage_name, opaque: evidence/blobs/<ab>/<key><ext>) and how many
+attachment rows point at it (ref_count). Attachments keep the blob's name in their
+FileField and its hash in sha256, so streaming, signed URLs and exports work unchanged.
+
+- ingest_blob(content): hash an uploaded file first and only write it when no blob has
+  that hash yet (admin uploads and code that assigns a File to an attachment go through
+  the evidence pre_save signal, which calls this).
+- adopt_blob(...): register a file that was already written while hashing (resumable
+  upload assembly). If the content is a duplicate the new copy is deleted.
+- find_blob(sha256, size): lets a client that declares its checksum skip the transfer; an
+  orphaned blob it returns starts a new grace period so it survives until acquired.
+
+apps.evidence.signals keeps ref_count in step with attachment rows (acquire on insert,
+release on delete or when a row's file is replaced). A blob whose count drops to zero gets
+orphaned_at; collect_orphaned_blobs deletes it after EVIDENCE_BLOB_GC_GRACE_SECONDS, once
+no attachment row references the hash, together with its thumbnails and poster frames
+(apps.evidence.services.derivatives). reconcile_blob_references recounts from the rows,
+and verify_blobs re-hashes stored files against their key.
+"""
+import hashlib
+import os
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Case, F, Value, When
+from django.utils import timezone
+
+from apps.evidence.models import BiologicalMedicalMediaReference, EvidenceBlob, WitnessTestimonyAttachment
+from apps.evidence.services.derivatives import discard_derivatives
+from apps.evidence.services.media import sniff_mime_type
+from apps.evidence.storage import get_evidence_media_storage
+
+ATTACHMENT_MODELS = (WitnessTestimonyAttachment, BiologicalMedicalMediaReference)
+SNIFF_BYTES = 64
+
+
+def blob_storage_name(key, filename=""):
+    """Storage name for a new blob: the SHA-256 when known before writing, else a random key."""
+    extension = os.path.splitext(filename or "")[1].lower()
+    return f"evidence/blobs/{key[:2]}/{key}{extension}"
+
+
+def new_blob_storage_name(filename=""):
+    return blob_storage_name(uuid.uuid4().hex, filename)
+
+
+class BlobMissing(Exception):
+    """An attachment row points at content whose blob no longer exists."""
+
+
+def find_blob(sha256, size=None):
+    """
+    The blob holding content with this hash (and size, when given), or None. An orphaned blob
+    gets a new grace period, so collect_orphaned_blobs cannot delete it before the caller's
+    attachment row acquires it; one the collector deleted first is not returned.
+    """
+    blob = EvidenceBlob.objects.filter(pk=sha256).first()
+    if blob is None or (size is not None and blob.size != size):
+        return None
+    if blob.ref_count == 0:
+        renewed = EvidenceBlob.objects.filter(pk=sha256, ref_count=0).update(orphaned_at=timezone.now())
+        if not renewed:
+            blob = EvidenceBlob.objects.filter(pk=sha256).first()  # acquired meanwhile, or collected
+    return blob
+
+
+def hash_file(content):
+    """(sha256 hex, size, leading bytes) of a Django File, read in chunks."""
+    digest = hashlib.sha256()
+    size = 0
+    head = b""
+    for chunk in content.chunks():
+        digest.update(chunk)
+        size += len(chunk)
+        if len(head) < SNIFF_BYTES:
+            head = (head + chunk)[:SNIFF_BYTES]
+    return digest.hexdigest(), size, head
+
+
+def ingest_blob(content, filename=""):
+    """Store `content` (a Django File) unless a blob with its hash exists; returns the blob."""
+    sha256, size, head = hash_file(content)
+    blob = find_blob(sha256, size)
+    if blob is not None:
+        return blob
+    storage = get_evidence_media_storage()
+    if hasattr(content, "seek"):
+        content.seek(0)
+    storage_name = storage.save(blob_storage_name(sha256, filename), content)
+    return adopt_blob(
+        sha256=sha256,
+        storage_name=storage_name,
+        size=size,
+        mime_type=sniff_mime_type(head, filename),
+    )
+
+
+def adopt_blob(*, sha256, storage_name, size, mime_type=""):
+    """
+    Register an already stored file as the blob for sha256. When that content is already a
+    blob, the new copy is deleted and the existing blob returned.
+    """
+    try:
+        with transaction.atomic():
+            return EvidenceBlob.objects.create(
+                sha256=sha256,
+                storage_name=storage_name,
+                size=size,
+                mime_type=mime_type,
+                orphaned_at=timezone.now(),  # until the first attachment row acquires it
+            )
+    except IntegrityError:
+        existing = EvidenceBlob.objects.get(pk=sha256)
+        if existing.storage_name != storage_name:
+            get_evidence_media_storage().delete(storage_name)
+        return existing
+
+
+def acquire_blob(sha256) -> bool:
+    """
+    Count one more attachment row referencing sha256; False when there is no such blob
+    (the evidence signals raise BlobMissing then).
+    """
+    return bool(EvidenceBlob.objects.filter(pk=sha256).update(ref_count=F("ref_count") + 1, orphaned_at=None))
+
+
+def release_blob(sha256) -> bool:
+    """Count one attachment row fewer; the blob is marked orphaned when none remain."""
+    return bool(
+        EvidenceBlob.objects.filter(pk=sha256, ref_count__gt=0).update(
+            ref_count=F("ref_count") - 1,
+            orphaned_at=Case(When(ref_count=1, then=Value(timezone.now())), default=F("orphaned_at")),
+        )
+    )
+
+
+def referenced_hashes(hashes):
+    """The subset of `hashes` that some attachment row still references."""
+    referenced = set()
+    for model in ATTACHMENT_MODELS:
+        referenced.update(model.objects.filter(sha256__in=hashes).values_list("sha256", flat=True))
+    return referenced
+
+
+def collect_orphaned_blobs(*, grace_seconds=None, dry_run=False, now=None) -> int:
+    """Delete blobs unreferenced for longer than the grace period, with their files."""
+    grace = settings.EVIDENCE_BLOB_GC_GRACE_SECONDS if grace_seconds is None else grace_seconds
+    cutoff = (now or timezone.now()) - timedelta(seconds=grace)
+    candidates = EvidenceBlob.objects.filter(ref_count=0, orphaned_at__lte=cutoff)
+    storage = get_evidence_media_storage()
+    collected = 0
+    for blob in candidates.iterator():
+        if referenced_hashes([blob.sha256]):
+            continue  # the counter drifted; reconcile_blob_references will correct it
+        if dry_run:
+            collected += 1
+            continue
+        deleted, _ = EvidenceBlob.objects.filter(pk=blob.pk, ref_count=0, orphaned_at__lte=cutoff).delete()
+        if deleted:
+            storage.delete(blob.storage_name)
+            discard_derivatives(blob.sha256, storage)
+            collected += 1
+    return collected
+
+
+def reconcile_blob_references(*, dry_run=False) -> int:
+    """Recount ref_count from attachment rows; returns the number of blobs corrected."""
+    counts = {}
+    for model in ATTACHMENT_MODELS:
+        for sha256 in model.objects.exclude(sha256="").values_list("sha256", flat=True).iterator():
+            counts[sha256] = counts.get(sha256, 0) + 1
+    corrected = 0
+    now = timezone.now()
+    for blob in EvidenceBlob.objects.only("sha256", "ref_count", "orphaned_at").iterator():
+        actual = counts.get(blob.sha256, 0)
+        if blob.ref_count == actual:
+            continue
+        corrected += 1
+        if not dry_run:
+            EvidenceBlob.objects.filter(pk=blob.pk).update(
+                ref_count=actual,
+                orphaned_at=None if actual else (blob.orphaned_at or now),
+            )
+    return corrected
+
+
+def verify_blobs(chunk_size=None):
+    """Yield (blob, problem) for every stored file that is missing or no longer matches its hash."""
+    storage = get_evidence_media_storage()
+    chunk_size = chunk_size or settings.EVIDENCE_UPLOAD_READ_SIZE
+    for blob in EvidenceBlob.objects.order_by("sha256").iterator():
+        try:
+            handle = storage.open(blob.storage_name, "rb")
+        except (OSError, ValueError):
+            yield blob, "missing"
+            continue
+        digest = hashlib.sha256()
+        with handle:
+            while chunk := handle.read(chunk_size):
+                digest.update(chunk)
+        if digest.hexdigest() != blob.sha256:
+            yield blob, "checksum mismatch"
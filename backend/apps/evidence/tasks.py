@@ -0,0 +1,10 @@
+"""Celery tasks for the evidence app."""
+from celery import shared_task
+
+from apps.evidence.services.derivatives import generate_derivatives
+
+
+@shared_task(name="apps.evidence.tasks.generate_media_derivatives")
+def generate_media_derivatives_task(source_sha256):
+    """Thumbnails and poster frames enqueued by apps.evidence.services.derivatives.request_derivatives."""
+    generate_derivatives(source_sha256)
@@ -1,9 +1,44 @@
+import hashlib
+import os
+import shutil
+import tempfile
+from datetime import timedelta
+from io import BytesIO, StringIO
+from unittest import mock, skipUnless
+
 from django.contrib.auth import get_user_model
-from django.test import TestCase
+from django.core.files.base import ContentFile
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.utils import timezone
+from django.utils.http import http_date
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
 
 from apps.cases.models import Case
-from apps.evidence.models import Evidence
+from apps.evidence.services import derivatives
+from apps.evidence.services.polymorphic import evidence_media, evidence_reviews, load_typed_evidence, subtype_details
+from apps.evidence.services.media import generate_signed_token
+from apps.evidence.models import (
+    BiologicalMedicalEvidence,
+    BiologicalMedicalMediaReference,
+    Evidence,
+    EvidenceBlob,
+    EvidenceMediaDerivative,
+    EvidenceReview,
+    IdentificationEvidence,
+    OtherEvidence,
+    VehicleEvidence,
+    EvidenceUploadChunk,
+    EvidenceUploadSession,
+    WitnessTestimony,
+    WitnessTestimonyAttachment,
+)
+from apps.evidence.storage import get_evidence_media_storage
+from apps.evidence.storage.blobs import BlobMissing, collect_orphaned_blobs, find_blob, ingest_blob
 
 
 class EvidenceModelInvariantTests(TestCase):
@@ -49,4 +84,555 @@ class EvidenceModelInvariantTests(TestCase):
                 registered_at=timezone.now(),
                 case=None,
                 registrar=self.user,
-            )
\ No newline at end of file
+            )
+
+
+class EvidenceMediaTestCase(APITestCase):
+    """Runs against a temporary MEDIA_ROOT as a superuser who owns ``self.case``."""
+
+    case_source_type = Case.SourceType.COMPLAINT
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        settings_override = self.settings(MEDIA_ROOT=self.media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.user = self._log_in("evidence_user", number=1)
+        self.case = Case.objects.create(
+            title="Evidence case", level=Case.Level.LEVEL_2, source_type=self.case_source_type, created_by=self.user
+        )
+
+    def _log_in(self, username, number):
+        user = get_user_model().objects.create_superuser(
+            username=username,
+            email=f"{username}@example.com",
+            password="StrongPass123!",
+            phone=f"091200200{number:02d}",
+            national_id=f"20000000{number:02d}",
+            full_name=username.replace("_", " ").title(),
+        )
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {Token.objects.create(user=user).key}")
+        return user
+
+
+@override_settings(EVIDENCE_UPLOAD_MAX_CHUNK_SIZE=4096)
+class EvidenceResumableUploadTests(EvidenceMediaTestCase):
+    case_source_type = Case.SourceType.SCENE_REPORT
+
+    def setUp(self):
+        super().setUp()
+        self.sample = BiologicalMedicalEvidence.objects.create(
+            title="Blood", case=self.case, registered_at=timezone.now(), registrar=self.user
+        )
+        self.content = b"\x89PNG\r\n\x1a\n" + bytes(range(256)) * 40
+
+    def _start(self, **extra):
+        payload = {
+            "media_kind": "biological-medical",
+            "evidence_id": self.sample.id,
+            "filename": "sample.png",
+            "total_size": len(self.content),
+            **extra,
+        }
+        response = self.client.post("/api/v1/evidence/uploads/", payload, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        return response.data["data"]["upload"]["id"]
+
+    def _put(self, upload_id, offset, chunk, sha256=None):
+        return self.client.put(
+            f"/api/v1/evidence/uploads/{upload_id}/chunks/",
+            data=chunk,
+            content_type="application/octet-stream",
+            HTTP_UPLOAD_OFFSET=str(offset),
+            HTTP_X_CHUNK_SHA256=sha256 or hashlib.sha256(chunk).hexdigest(),
+        )
+
+    def test_chunks_resume_and_assemble_with_metadata_from_one_pass(self):
+        upload_id = self._start(sha256=hashlib.sha256(self.content).hexdigest())
+        chunks = [self.content[i:i + 4096] for i in range(0, len(self.content), 4096)]
+        self.assertEqual(len(chunks), 3)
+
+        self.assertEqual(self._put(upload_id, 0, chunks[0]).status_code, status.HTTP_201_CREATED)
+        retried = self._put(upload_id, 0, chunks[0])
+        self.assertEqual(retried.status_code, status.HTTP_200_OK)
+        self.assertEqual(retried["Upload-Offset"], "4096")
+
+        corrupt = self._put(upload_id, 4096, chunks[1], sha256="0" * 64)
+        self.assertEqual(corrupt.data["error"]["code"], "CHECKSUM_MISMATCH")
+        skipped = self._put(upload_id, 8192, chunks[2])
+        self.assertEqual(skipped.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(skipped.data["error"]["details"], {"offset": ["4096"]})
+        early = self.client.post(f"/api/v1/evidence/uploads/{upload_id}/complete/")
+        self.assertEqual(early.data["error"]["code"], "UPLOAD_INCOMPLETE")
+
+        # Resume from the offset the server reports.
+        offset = self.client.get(f"/api/v1/evidence/uploads/{upload_id}/").data["data"]["upload"]["offset"]
+        for index in range(offset // 4096, len(chunks)):
+            self.assertEqual(self._put(upload_id, index * 4096, chunks[index]).status_code, status.HTTP_201_CREATED)
+
+        completed = self.client.post(f"/api/v1/evidence/uploads/{upload_id}/complete/")
+        self.assertEqual(completed.status_code, status.HTTP_201_CREATED)
+        attachment = completed.data["data"]["attachment"]
+        self.assertEqual(
+            (attachment["media_type"], attachment["mime_type"], attachment["file_size"], attachment["sha256"]),
+            ("image", "image/png", len(self.content), hashlib.sha256(self.content).hexdigest()),
+        )
+        media = BiologicalMedicalMediaReference.objects.get(pk=attachment["id"])
+        with media.file.open("rb") as handle:
+            self.assertEqual(handle.read(), self.content)
+        self.assertFalse(EvidenceUploadChunk.objects.exists())
+        self.assertFalse(os.listdir(os.path.join(self.media_root, "evidence", "uploads", upload_id)))
+
+        again = self.client.post(f"/api/v1/evidence/uploads/{upload_id}/complete/")
+        self.assertEqual(again.data["data"]["attachment"]["id"], media.id)
+        self.assertEqual(self._put(upload_id, 0, chunks[0]).data["error"]["code"], "UPLOAD_CLOSED")
+
+    def test_declared_checksum_mismatch_fails_and_expired_sessions_are_purged(self):
+        upload_id = self._start(sha256="a" * 64)
+        self._put(upload_id, 0, self.content[:4096])
+        self._put(upload_id, 4096, self.content[4096:8192])
+        self._put(upload_id, 8192, self.content[8192:])
+        failed = self.client.post(f"/api/v1/evidence/uploads/{upload_id}/complete/")
+        self.assertEqual(failed.data["error"]["code"], "CHECKSUM_MISMATCH")
+        self.assertEqual(EvidenceUploadSession.objects.get(pk=upload_id).status, EvidenceUploadSession.Status.FAILED)
+        self.assertFalse(BiologicalMedicalMediaReference.objects.exists())
+
+        stale_id = self._start()
+        self._put(stale_id, 0, self.content[:4096])
+        EvidenceUploadSession.objects.update(expires_at=timezone.now() - timedelta(seconds=1))
+        output = StringIO()
+        call_command("purge_upload_sessions", stdout=output)
+        self.assertIn("Purged 2 upload session(s).", output.getvalue())
+        self.assertFalse(EvidenceUploadChunk.objects.exists())
+        self.assertFalse(os.listdir(os.path.join(self.media_root, "evidence", "uploads", stale_id)))
+
+    def _upload(self, **extra):
+        upload_id = self._start(**extra)
+        for offset in range(0, len(self.content), 4096):
+            self._put(upload_id, offset, self.content[offset:offset + 4096])
+        return self.client.post(f"/api/v1/evidence/uploads/{upload_id}/complete/").data["data"]["attachment"]
+
+    def _log_in_outsider(self):
+        return self._log_in("outsider", number=2)
+
+    def test_identical_content_is_stored_once_and_collected_when_unreferenced(self):
+        sha256 = hashlib.sha256(self.content).hexdigest()
+        first = self._upload()
+        second = self._upload()  # same bytes without a declared checksum: assembled, then deduplicated
+        declared = self.client.post(
+            "/api/v1/evidence/uploads/",
+            {
+                "media_kind": "biological-medical",
+                "evidence_id": self.sample.id,
+                "filename": "copy.png",
+                "total_size": len(self.content),
+                "sha256": sha256,
+            },
+            format="json",
+        ).data["data"]
+        self.assertTrue(declared["deduplicated"])
+        self.assertEqual(declared["upload"]["status"], EvidenceUploadSession.Status.COMPLETED)
+        self.assertFalse(EvidenceUploadChunk.objects.exists())
+
+        testimony = WitnessTestimony.objects.create(
+            title="Witness", case=self.sample.case, registered_at=timezone.now(), registrar=self.user
+        )
+        direct = WitnessTestimonyAttachment.objects.create(
+            witness_testimony=testimony,
+            file=ContentFile(self.content, name="still.png"),
+            media_type=WitnessTestimonyAttachment.MediaType.IMAGE,
+        )
+        blob = EvidenceBlob.objects.get()
+        self.assertEqual((blob.sha256, blob.ref_count, blob.size), (sha256, 4, len(self.content)))
+        names = {media.file.name for media in BiologicalMedicalMediaReference.objects.all()} | {direct.file.name}
+        self.assertEqual(names, {blob.storage_name})
+        self.assertEqual(direct.sha256, sha256)
+        blob_files = os.listdir(os.path.join(self.media_root, os.path.dirname(blob.storage_name)))
+        self.assertEqual(blob_files, [os.path.basename(blob.storage_name)])
+
+        BiologicalMedicalMediaReference.objects.filter(pk__in=[first["id"], second["id"]]).delete()
+        testimony.delete()
+        self.assertEqual(EvidenceBlob.objects.get().ref_count, 1)
+        output = StringIO()
+        call_command("collect_evidence_blobs", stdout=output)
+        self.assertIn("Deleted 0 orphaned blob(s).", output.getvalue())
+
+        BiologicalMedicalMediaReference.objects.all().delete()
+        blob.refresh_from_db()
+        self.assertEqual(blob.ref_count, 0)
+        self.assertIsNotNone(blob.orphaned_at)
+        with self.settings(EVIDENCE_BLOB_GC_GRACE_SECONDS=0):
+            call_command("collect_evidence_blobs", "--reconcile", "--verify", stdout=output)
+        self.assertIn("Deleted 1 orphaned blob(s).", output.getvalue())
+        self.assertFalse(EvidenceBlob.objects.exists())
+        self.assertFalse(os.path.exists(os.path.join(self.media_root, blob.storage_name)))
+
+    def test_orphaned_blob_found_for_reuse_survives_collection_until_acquired(self):
+        sha256 = hashlib.sha256(self.content).hexdigest()
+        first = self._upload(sha256=sha256)  # a full upload: the caller may reuse the content later
+        BiologicalMedicalMediaReference.objects.filter(pk=first["id"]).delete()
+        EvidenceBlob.objects.filter(pk=sha256).update(orphaned_at=timezone.now() - timedelta(hours=1))
+
+        self.assertIsNotNone(find_blob(sha256, len(self.content)))
+        self.assertEqual(collect_orphaned_blobs(grace_seconds=60), 0)
+        reused = self.client.post(
+            "/api/v1/evidence/uploads/",
+            {
+                "media_kind": "biological-medical",
+                "evidence_id": self.sample.id,
+                "filename": "again.png",
+                "total_size": len(self.content),
+                "sha256": sha256,
+            },
+            format="json",
+        ).data["data"]
+        self.assertTrue(reused["deduplicated"])
+        self.assertEqual(EvidenceBlob.objects.get(pk=sha256).ref_count, 1)
+
+        def ingest_then_collect(content, filename=""):
+            blob = ingest_blob(content, filename)
+            EvidenceBlob.objects.filter(pk=blob.pk).delete()  # the collector wins the race
+            return blob
+
+        with mock.patch("apps.evidence.signals.ingest_blob", side_effect=ingest_then_collect):
+            with self.assertRaises(BlobMissing):
+                BiologicalMedicalMediaReference.objects.create(
+                    biological_medical_evidence=self.sample, file=ContentFile(b"\x89PNG\r\n\x1a\nlate", name="late.png")
+                )
+
+    def test_declared_hash_alone_does_not_attach_content_from_another_case(self):
+        sha256 = hashlib.sha256(self.content).hexdigest()
+        self._upload()
+        outsider = self._log_in_outsider()
+        other_case = Case.objects.create(
+            title="Other case", level=Case.Level.LEVEL_2, source_type=Case.SourceType.SCENE_REPORT, created_by=outsider
+        )
+        self.sample = BiologicalMedicalEvidence.objects.create(
+            title="Swab", case=other_case, registered_at=timezone.now(), registrar=outsider
+        )
+
+        upload_id = self._start(sha256=sha256)
+        session = EvidenceUploadSession.objects.get(pk=upload_id)
+        self.assertEqual(session.status, EvidenceUploadSession.Status.OPEN)
+        self.assertFalse(BiologicalMedicalMediaReference.objects.filter(biological_medical_evidence=self.sample).exists())
+
+        for offset in range(0, len(self.content), 4096):
+            self._put(upload_id, offset, self.content[offset:offset + 4096])
+        completed = self.client.post(f"/api/v1/evidence/uploads/{upload_id}/complete/")
+        self.assertEqual(completed.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(EvidenceBlob.objects.get().ref_count, 2)
+
+        # Having sent the bytes once, the outsider may reuse them by hash on other evidence.
+        self.sample = BiologicalMedicalEvidence.objects.create(
+            title="Second swab", case=Case.objects.create(
+                title="Third case", level=Case.Level.LEVEL_2, source_type=Case.SourceType.SCENE_REPORT,
+                created_by=outsider,
+            ),
+            registered_at=timezone.now(), registrar=outsider,
+        )
+        reused = EvidenceUploadSession.objects.get(pk=self._start(sha256=sha256))
+        self.assertEqual(reused.status, EvidenceUploadSession.Status.COMPLETED)
+
+    def test_deduplicated_session_is_no_proof_of_possession_on_another_case(self):
+        sha256 = hashlib.sha256(self.content).hexdigest()
+        self._upload()
+        outsider = self._log_in_outsider()
+
+        # Same case as the stored file: the hash is enough, and no bytes are recorded as received.
+        shortcut = EvidenceUploadSession.objects.get(pk=self._start(sha256=sha256))
+        self.assertEqual((shortcut.status, shortcut.received_bytes), (EvidenceUploadSession.Status.COMPLETED, 0))
+
+        self.sample = BiologicalMedicalEvidence.objects.create(
+            title="Swab",
+            case=Case.objects.create(
+                title="Other case", level=Case.Level.LEVEL_2, source_type=Case.SourceType.SCENE_REPORT,
+                created_by=outsider,
+            ),
+            registered_at=timezone.now(),
+            registrar=outsider,
+        )
+        chained = EvidenceUploadSession.objects.get(pk=self._start(sha256=sha256))
+        self.assertEqual(chained.status, EvidenceUploadSession.Status.OPEN)
+        self.assertFalse(BiologicalMedicalMediaReference.objects.filter(biological_medical_evidence=self.sample).exists())
+
+
+class EvidenceMediaDeliveryTests(EvidenceMediaTestCase):
+    def setUp(self):
+        super().setUp()
+        testimony = WitnessTestimony.objects.create(
+            title="Witness", case=self.case, registered_at=timezone.now(), registrar=self.user
+        )
+        self.content = bytes(range(256)) * 8
+        self.attachment = WitnessTestimonyAttachment.objects.create(
+            witness_testimony=testimony,
+            file=ContentFile(self.content, name="clip.mp4"),
+            media_type=WitnessTestimonyAttachment.MediaType.VIDEO,
+            mime_type="video/mp4",
+        )
+        self.url = f"/api/v1/evidence/media/witness-testimony/{self.attachment.id}/"
+        self.etag = f'"{hashlib.sha256(self.content).hexdigest()}"'
+
+    def test_full_response_carries_validators_and_revalidates_with_304(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(b"".join(response.streaming_content), self.content)
+        self.assertEqual(response["ETag"], self.etag)
+        self.assertEqual(response["Accept-Ranges"], "bytes")
+        self.assertEqual(response["Cache-Control"], "private, no-cache")
+
+        cached = self.client.get(self.url, HTTP_IF_NONE_MATCH=self.etag)
+        self.assertEqual(cached.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(cached["ETag"], self.etag)
+        later = http_date((timezone.now() + timedelta(minutes=1)).timestamp())
+        self.assertEqual(self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=later).status_code, 304)
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH='"other"').status_code, 200)
+
+    def test_single_multi_and_unsatisfiable_ranges(self):
+        single = self.client.get(self.url, HTTP_RANGE="bytes=10-19")
+        self.assertEqual(single.status_code, status.HTTP_206_PARTIAL_CONTENT)
+        self.assertEqual(b"".join(single.streaming_content), self.content[10:20])
+        self.assertEqual(single["Content-Range"], f"bytes 10-19/{len(self.content)}")
+        self.assertEqual(single["Content-Length"], "10")
+
+        suffix = self.client.get(self.url, HTTP_RANGE="bytes=-5")
+        self.assertEqual(b"".join(suffix.streaming_content), self.content[-5:])
+
+        multi = self.client.get(self.url, HTTP_RANGE="bytes=0-3, 100-")
+        self.assertEqual(multi.status_code, status.HTTP_206_PARTIAL_CONTENT)
+        self.assertTrue(multi["Content-Type"].startswith("multipart/byteranges; boundary="))
+        body = b"".join(multi.streaming_content)
+        self.assertEqual(int(multi["Content-Length"]), len(body))
+        self.assertIn(b"Content-Range: bytes 0-3/2048\r\n\r\n" + self.content[:4], body)
+        self.assertIn(b"Content-Range: bytes 100-2047/2048\r\n\r\n" + self.content[100:], body)
+
+        unsatisfiable = self.client.get(self.url, HTTP_RANGE="bytes=5000-")
+        self.assertEqual(unsatisfiable.status_code, 416)
+        self.assertEqual(unsatisfiable["Content-Range"], "bytes */2048")
+
+        stale = self.client.get(self.url, HTTP_RANGE="bytes=0-9", HTTP_IF_RANGE='"outdated"')
+        self.assertEqual(stale.status_code, status.HTTP_200_OK)
+
+    def test_signed_token_access_supports_ranges_and_conditional_requests(self):
+        self.client.credentials()
+        token = generate_signed_token("witness-testimony", self.attachment.id)
+        url = f"/api/v1/evidence/media/access/?token={token}"
+        partial = self.client.get(url, HTTP_RANGE="bytes=2047-", HTTP_IF_RANGE=self.etag)
+        self.assertEqual(partial.status_code, status.HTTP_206_PARTIAL_CONTENT)
+        self.assertEqual(b"".join(partial.streaming_content), self.content[-1:])
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=self.etag).status_code, 304)
+
+    def test_proxy_offload_returns_internal_redirect_without_body(self):
+        name = self.attachment.file.name
+        with self.settings(EVIDENCE_MEDIA_DELIVERY="x-accel-redirect"):
+            response = self.client.get(self.url, HTTP_RANGE="bytes=0-9")
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(response["X-Accel-Redirect"], f"/protected-evidence/{name}")
+            self.assertEqual(response.content, b"")
+            self.assertEqual(response["Content-Type"], "video/mp4")
+            self.assertEqual(response["ETag"], self.etag)
+            self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=self.etag).status_code, 304)
+
+            self.client.credentials()
+            token = generate_signed_token("witness-testimony", self.attachment.id)
+            signed = self.client.get(f"/api/v1/evidence/media/access/?token={token}")
+            self.assertEqual(signed["X-Accel-Redirect"], f"/protected-evidence/{name}")
+
+        with self.settings(EVIDENCE_MEDIA_DELIVERY="x-sendfile"):
+            signed = self.client.get(f"/api/v1/evidence/media/access/?token={token}")
+            self.assertEqual(signed["X-Sendfile"], self.attachment.file.path)
+            self.assertNotIn("X-Accel-Redirect", signed)
+
+
+@override_settings(EVIDENCE_DERIVATIVES_ASYNC=False)
+class EvidenceMediaDerivativeTests(EvidenceMediaTestCase):
+    def setUp(self):
+        super().setUp()
+        self.testimony = WitnessTestimony.objects.create(
+            title="Witness", case=self.case, registered_at=timezone.now(), registrar=self.user
+        )
+
+    def _attach(self, content, name, media_type=WitnessTestimonyAttachment.MediaType.IMAGE):
+        return WitnessTestimonyAttachment.objects.create(
+            witness_testimony=self.testimony, file=ContentFile(content, name=name), media_type=media_type
+        )
+
+    @skipUnless(derivatives.Image is not None, "Pillow is not installed")
+    def test_image_thumbnail_is_rendered_once_per_content_and_served(self):
+        buffer = BytesIO()
+        derivatives.Image.new("RGB", (1600, 900), (200, 30, 30)).save(buffer, "PNG")
+        first = self._attach(buffer.getvalue(), "scene.png")
+        second = self._attach(buffer.getvalue(), "copy.png")
+        self.assertEqual(EvidenceMediaDerivative.objects.filter(source_sha256=first.sha256).count(), 2)
+
+        response = self.client.get(f"/api/v1/evidence/media/witness-testimony/{second.id}/?variant=thumbnail")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "image/jpeg")
+        thumbnail = derivatives.Image.open(BytesIO(b"".join(response.streaming_content)))
+        self.assertEqual(thumbnail.size, (320, 180))
+        derivative = EvidenceMediaDerivative.objects.get(source_sha256=first.sha256, kind="thumbnail")
+        self.assertEqual(derivative.file.name, f"evidence/blobs/{first.sha256[:2]}/{first.sha256}.thumbnail-320.jpg")
+        self.assertEqual(response["ETag"], f'"{derivative.sha256}"')
+
+        token = generate_signed_token("witness-testimony", first.id)
+        poster = self.client.get(f"/api/v1/evidence/media/access/?token={token}&variant=poster")
+        self.assertEqual(poster.status_code, status.HTTP_200_OK)
+        self.assertEqual(derivatives.Image.open(BytesIO(b"".join(poster.streaming_content))).size, (1280, 720))
+
+    def test_unrenderable_media_is_reported_and_original_stays_available(self):
+        audio = self._attach(b"ID3" + bytes(64), "call.mp3", WitnessTestimonyAttachment.MediaType.AUDIO)
+        self.assertFalse(EvidenceMediaDerivative.objects.filter(source_sha256=audio.sha256).exists())
+        url = f"/api/v1/evidence/media/witness-testimony/{audio.id}/"
+        response = self.client.get(f"{url}?variant=thumbnail")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(response.data["error"]["code"], "DERIVATIVE_UNAVAILABLE")
+        self.assertEqual(self.client.get(f"{url}?variant=huge").status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_200_OK)
+
+        image = self._attach(b"\x89PNG\r\n\x1a\n" + bytes(64), "scene.png")
+        with mock.patch.object(derivatives, "Image", None):
+            response = self.client.get(f"/api/v1/evidence/media/witness-testimony/{image.id}/?variant=poster")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(
+            set(EvidenceMediaDerivative.objects.filter(source_sha256=image.sha256).values_list("status", flat=True)),
+            {EvidenceMediaDerivative.Status.UNSUPPORTED},
+        )
+
+    @override_settings(EVIDENCE_DERIVATIVES_ASYNC=True)
+    def test_upload_succeeds_when_derivatives_cannot_be_queued(self):
+        with mock.patch(
+            "apps.evidence.tasks.generate_media_derivatives_task.delay", side_effect=ConnectionError("broker down")
+        ), self.assertLogs("apps.evidence.services.derivatives", "WARNING"):
+            with self.captureOnCommitCallbacks(execute=True):
+                image = self._attach(b"\x89PNG\r\n\x1a\n" + bytes(64), "scene.png")
+
+        self.assertEqual(
+            set(EvidenceMediaDerivative.objects.filter(source_sha256=image.sha256).values_list("status", flat=True)),
+            {EvidenceMediaDerivative.Status.PENDING},
+        )
+
+    def test_rendering_claims_rows_so_workers_do_not_overwrite_each_other(self):
+        image = self._attach(b"\x89PNG\r\n\x1a\n" + bytes(64), "scene.png")
+        rows = EvidenceMediaDerivative.objects.filter(source_sha256=image.sha256)
+        storage = get_evidence_media_storage()
+        thumbnail_name = derivatives.derivative_storage_name(image.sha256, "thumbnail")
+
+        def render_while_claim_is_taken_over(source, kind):
+            # Another worker requeues and reclaims the thumbnail while this one renders it.
+            if kind == "thumbnail":
+                rows.filter(kind=kind).update(updated_at=timezone.now() + timedelta(seconds=1))
+            return b"jpeg", (32, 18)
+
+        with mock.patch.object(derivatives, "_load_source_image", return_value=object()), mock.patch.object(
+            derivatives, "_render", side_effect=render_while_claim_is_taken_over
+        ):
+            rows.filter(kind="poster").update(status=EvidenceMediaDerivative.Status.RENDERING)
+            self.assertEqual(derivatives.generate_derivatives(image.sha256), 0)
+            self.assertEqual(rows.get(kind="thumbnail").status, EvidenceMediaDerivative.Status.RENDERING)
+            self.assertFalse(storage.exists(thumbnail_name))  # the superseded worker leaves no file behind
+            poster = rows.get(kind="poster")  # claimed by another worker: not rendered here
+            self.assertEqual((poster.status, poster.file.name), (EvidenceMediaDerivative.Status.RENDERING, ""))
+
+            rows.filter(kind="poster").update(status=EvidenceMediaDerivative.Status.PENDING)
+            self.assertEqual(derivatives.generate_derivatives(image.sha256), 1)
+        self.assertEqual(rows.get(kind="poster").status, EvidenceMediaDerivative.Status.READY)
+
+        rows.filter(kind="thumbnail").update(updated_at=timezone.now() - timedelta(hours=1))
+        with mock.patch.object(derivatives, "generate_derivatives") as generate:
+            self.assertEqual(derivatives.generate_pending_derivatives(), 1)
+        generate.assert_called_once_with(image.sha256)
+        self.assertEqual(rows.get(kind="thumbnail").status, EvidenceMediaDerivative.Status.PENDING)
+
+
+class EvidencePolymorphicLoaderTests(EvidenceMediaTestCase):
+    def setUp(self):
+        super().setUp()
+        self.common = {"case": self.case, "registered_at": timezone.now(), "registrar": self.user}
+
+    def _add_one_of_each(self):
+        testimony = WitnessTestimony.objects.create(title="Witness", transcript="I saw it.", **self.common)
+        WitnessTestimonyAttachment.objects.create(
+            witness_testimony=testimony,
+            file=ContentFile(b"ID3" + os.urandom(32), name="statement.mp3"),
+            media_type=WitnessTestimonyAttachment.MediaType.AUDIO,
+        )
+        sample = BiologicalMedicalEvidence.objects.create(title="Blood", **self.common)
+        EvidenceReview.objects.create(
+            biological_medical_evidence=sample, decision=EvidenceReview.Decision.choices[0][0], reviewed_by=self.user
+        )
+        VehicleEvidence.objects.create(title="Car", model="Sedan", color="Black", plate="12A345", **self.common)
+        IdentificationEvidence.objects.create(title="ID card", attributes={"full_name": "Owner"}, **self.common)
+        OtherEvidence.objects.create(title="Glove", **self.common)
+        return testimony, sample
+
+    def test_loader_builds_typed_instances_with_one_query_per_subtype(self):
+        testimony, sample = self._add_one_of_each()
+        untyped = Evidence.objects.create(title="Legacy", evidence_type=Evidence.EvidenceType.OTHER, **self.common)
+        rows = Evidence.objects.filter(case=self.case).select_related("registrar").order_by("id")
+
+        # base rows, five subtype tables, attachments, media references and reviews
+        with self.assertNumQueries(9):
+            loaded = load_typed_evidence(rows)
+            for evidence in loaded:
+                subtype_details(evidence), evidence_media(evidence), evidence_reviews(evidence)
+                evidence.registrar.full_name
+
+        self.assertEqual(
+            [type(evidence) for evidence in loaded],
+            [WitnessTestimony, BiologicalMedicalEvidence, VehicleEvidence, IdentificationEvidence, OtherEvidence, Evidence],
+        )
+        self.assertEqual(loaded[0].transcript, "I saw it.")
+        self.assertEqual(subtype_details(loaded[2])["plate"], "12A345")
+        self.assertEqual(len(evidence_media(loaded[0])), 1)
+        self.assertEqual(len(evidence_reviews(loaded[1])), 1)
+        self.assertEqual(loaded[-1].pk, untyped.pk)
+
+        loaded[2].color = "Blue"
+        loaded[2].save()
+        self.assertEqual(VehicleEvidence.objects.get(pk=loaded[2].pk).color, "Blue")
+
+    def test_case_evidence_list_includes_subtype_details_media_and_reviews(self):
+        testimony, sample = self._add_one_of_each()
+        with CaptureQueriesContext(connection) as first:
+            response = self.client.get("/api/v1/evidence/cases/", {"case_id": self.case.id})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        items = {item["id"]: item for item in response.data["data"]["evidence"]}
+        self.assertEqual(len(items), 5)
+        self.assertEqual(items[testimony.id]["details"]["transcript"], "I saw it.")
+        media = items[testimony.id]["media"][0]
+        self.assertEqual(media["url"], f"/api/v1/evidence/media/witness-testimony/{media['id']}/")
+        self.assertIsNone(media["thumbnail_url"])
+        self.assertEqual(items[sample.id]["reviews"][0]["reviewed_by_display"], self.user.full_name)
+
+        self._add_one_of_each()
+        with self.assertNumQueries(len(first)):
+            response = self.client.get("/api/v1/evidence/cases/", {"case_id": self.case.id})
+        self.assertEqual(len(response.data["data"]["evidence"]), 10)
+
+    def test_media_and_reviews_added_after_a_read_reach_the_referral_package(self):
+        Case.objects.filter(pk=self.case.pk).update(status=Case.Status.IN_TRIAL)
+        testimony, sample = self._add_one_of_each()
+        url = f"/api/v1/judiciary/referral-package/{self.case.id}/"
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_200_OK)
+
+        attachment = WitnessTestimonyAttachment.objects.create(
+            witness_testimony=testimony,
+            file=ContentFile(b"ID3" + os.urandom(32), name="follow-up.mp3"),
+            media_type=WitnessTestimonyAttachment.MediaType.AUDIO,
+        )
+        reference = BiologicalMedicalMediaReference.objects.create(
+            biological_medical_evidence=sample, file=ContentFile(b"\x89PNG\r\n\x1a\n" + bytes(32), name="slide.png")
+        )
+        review = EvidenceReview.objects.create(
+            biological_medical_evidence=sample, decision=EvidenceReview.Decision.choices[0][0], reviewed_by=self.user
+        )
+
+        items = {item["id"]: item for item in self.client.get(url).data["data"]["evidence"]}
+        self.assertIn(attachment.id, [media["id"] for media in items[testimony.id]["media"]])
+        self.assertEqual([media["id"] for media in items[sample.id]["media"]], [reference.id])
+        self.assertIn(review.id, [item["id"] for item in items[sample.id]["reviews"]])
+
+        attachment.delete()
+        items = {item["id"]: item for item in self.client.get(url).data["data"]["evidence"]}
+        self.assertNotIn(attachment.id, [media["id"] for media in items[testimony.id]["media"]])
@@ -10,6 +10,10 @@ from apps.evidence.views import (
     EvidenceMediaAccessByTokenAPIView,
     EvidenceMediaSignedURLApiView,
     EvidenceMediaStreamAPIView,
+    EvidenceUploadChunkAPIView,
+    EvidenceUploadCompleteAPIView,
+    EvidenceUploadDetailAPIView,
+    EvidenceUploadStartAPIView,
 )
 
 urlpatterns = [
@@ -40,6 +44,18 @@ urlpatterns = [
         EvidenceMediaAccessByTokenAPIView.as_view(),
         name="evidence-media-access-by-token",
     ),
+    path("uploads/", EvidenceUploadStartAPIView.as_view(), name="evidence-uploads-start"),
+    path("uploads/<uuid:upload_id>/", EvidenceUploadDetailAPIView.as_view(), name="evidence-uploads-detail"),
+    path(
+        "uploads/<uuid:upload_id>/chunks/",
+        EvidenceUploadChunkAPIView.as_view(),
+        name="evidence-uploads-chunks",
+    ),
+    path(
+        "uploads/<uuid:upload_id>/complete/",
+        EvidenceUploadCompleteAPIView.as_view(),
+        name="evidence-uploads-complete",
+    ),
     path("links/", EvidenceLinkListCreateAPIView.as_view(), name="evidence-links-list-create"),
     path("links/<int:link_id>/", EvidenceLinkDetailAPIView.as_view(), name="evidence-links-detail"),
 ]
@@ -1,5 +1,6 @@
+import io
+
 from django.db.models import Q
-from django.http import FileResponse
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
 from rest_framework import status
@@ -13,7 +14,9 @@ from apps.evidence.models import (
     BiologicalMedicalMediaReference,
     Evidence,
     EvidenceLink,
+    EvidenceMediaDerivative,
     EvidenceReview,
+    EvidenceUploadSession,
     IdentificationEvidence,
     OtherEvidence,
     VehicleEvidence,
@@ -22,19 +25,37 @@ from apps.evidence.models import (
 )
 from apps.evidence.serializers import (
     BiologicalMedicalCreateSerializer,
+    EvidenceDetailSerializer,
     EvidenceLinkCreateSerializer,
     EvidenceLinkSerializer,
     EvidenceListSerializer,
     EvidenceReviewCreateSerializer,
     EvidenceReviewSerializer,
+    EvidenceUploadSessionSerializer,
+    EvidenceUploadStartSerializer,
     IdentificationEvidenceCreateSerializer,
     OtherEvidenceCreateSerializer,
     VehicleEvidenceCreateSerializer,
     WitnessTestimonyCreateSerializer,
 )
+from apps.evidence.review_queues import CORONER_QUEUE
+from apps.evidence.services.delivery import media_response
+from apps.evidence.services.derivatives import get_ready_derivative, is_derivable
 from apps.evidence.services.media import generate_signed_token, verify_signed_token
+from apps.evidence.services.polymorphic import load_typed_evidence, media_url
+from apps.evidence.services.uploads import (
+    UploadError,
+    abort_upload,
+    complete_upload,
+    get_upload_attachment,
+    receive_chunk,
+    start_upload,
+)
 from apps.identity.services import error_response, success_response
 from apps.notifications.services import log_timeline_event
+from apps.reviewqueue.services import blocking_lease, complete_review
+from apps.reviewqueue.views import lease_held_response
+from config.pagination import KeysetPagination, cursor_pagination_requested
 
 
 class BiologicalEvidenceCoronerDecisionAPIView(APIView):
@@ -51,6 +72,9 @@ class BiologicalEvidenceCoronerDecisionAPIView(APIView):
             BiologicalMedicalEvidence.objects.select_related("case"),
             pk=evidence_id,
         )
+        lease = blocking_lease(CORONER_QUEUE, request.user, evidence.pk)
+        if lease is not None:
+            return lease_held_response(lease)
 
         serializer = EvidenceReviewCreateSerializer(data=request.data)
         if not serializer.is_valid():
@@ -76,6 +100,7 @@ class BiologicalEvidenceCoronerDecisionAPIView(APIView):
         evidence.result_submitted_at = timezone.now()
         evidence.coroner_result = f"[{review.get_decision_display().upper()}] {follow_up_notes}".strip()
         evidence.save(update_fields=["coroner_status", "coroner", "result_submitted_at", "coroner_result", "updated_at"])
+        complete_review(CORONER_QUEUE, evidence, now=evidence.result_submitted_at)
 
         case_reference = evidence.case.case_number if evidence.case_id else ""
         log_timeline_event(
@@ -135,29 +160,50 @@ def _get_attachment_and_check_access(media_type: str, media_id: int, user=None):
         )
         case = attachment.biological_medical_evidence.case
     else:
-        return None, "Unknown media type."
+        return "Unknown media type.", None
     return attachment, case
 
 
-def _stream_file_response(attachment):
-    """Stream file from attachment, returning FileResponse or error."""
-    if not attachment.file or not attachment.file.name:
-        return None
-    try:
-        file_handle = attachment.file.open("rb")
-        response = FileResponse(file_handle, as_attachment=False)
-        if attachment.mime_type:
-            response["Content-Type"] = attachment.mime_type
-        if attachment.file_size:
-            response["Content-Length"] = attachment.file_size
+def _invalid_variant_response(variant):
+    return error_response(
+        code="VALIDATION_ERROR",
+        message=f"variant must be one of: {', '.join(EvidenceMediaDerivative.Kind.values)}.",
+        details={"variant": variant},
+        status_code=status.HTTP_400_BAD_REQUEST,
+    )
+
+
+def _media_response(request, attachment, not_found_message):
+    """The original file, or the thumbnail/poster named by ?variant= (404 until it is rendered)."""
+    variant = request.query_params.get("variant")
+    if variant:
+        if variant not in EvidenceMediaDerivative.Kind.values:
+            return _invalid_variant_response(variant)
+        derivative, derivative_status = get_ready_derivative(attachment, variant)
+        response = media_response(request, derivative) if derivative is not None else None
+        if response is None:
+            return error_response(
+                code="DERIVATIVE_UNAVAILABLE",
+                message="This media variant is not available; use the original.",
+                details={"variant": variant, "status": derivative_status},
+                status_code=status.HTTP_404_NOT_FOUND,
+            )
         return response
-    except (OSError, ValueError):
-        return None
+    response = media_response(request, attachment)
+    if response is None:
+        return error_response(
+            code="FILE_NOT_FOUND",
+            message=not_found_message,
+            status_code=status.HTTP_404_NOT_FOUND,
+        )
+    return response
 
 
 class EvidenceMediaStreamAPIView(APIView):
     """
     GET: Stream evidence media file. Requires authentication and cases.cases.view permission.
+    Supports Range (206, multipart/byteranges), ETag/Last-Modified and 304 revalidation.
+    ?variant=thumbnail|poster serves a downscaled JPEG of an image or video instead.
     """
 
     authentication_classes = [TokenAuthentication]
@@ -172,20 +218,14 @@ class EvidenceMediaStreamAPIView(APIView):
                 message=attachment or "Invalid media reference.",
                 status_code=status.HTTP_404_NOT_FOUND,
             )
-        response = _stream_file_response(attachment)
-        if response is None:
-            return error_response(
-                code="FILE_NOT_FOUND",
-                message="Media file not found or inaccessible.",
-                status_code=status.HTTP_404_NOT_FOUND,
-            )
-        return response
+        return _media_response(request, attachment, "Media file not found or inaccessible.")
 
 
 class EvidenceMediaSignedURLApiView(APIView):
     """
     POST: Get a signed URL for temporary media access.
-    Body: { "media_type": "witness-testimony"|"biological-medical", "media_id": <int> }
+    Body: { "media_type": "witness-testimony"|"biological-medical", "media_id": <int>,
+            "variant": "thumbnail"|"poster" (optional) }
     Returns: { "url": "...", "token": "...", "expires_in": 300 }
     """
 
@@ -224,9 +264,14 @@ class EvidenceMediaSignedURLApiView(APIView):
                 message=attachment or "Media not found.",
                 status_code=status.HTTP_404_NOT_FOUND,
             )
+        variant = request.data.get("variant")
+        if variant and variant not in EvidenceMediaDerivative.Kind.values:
+            return _invalid_variant_response(variant)
         token = generate_signed_token(media_type, media_id, expiry_seconds=SIGNED_URL_EXPIRY)
         base_url = request.build_absolute_uri("/").rstrip("/")
         url = f"{base_url}/api/v1/evidence/media/access/?token={token}"
+        if variant:
+            url = f"{url}&variant={variant}"
         return success_response({
             "url": url,
             "token": token,
@@ -237,7 +282,8 @@ class EvidenceMediaSignedURLApiView(APIView):
 class EvidenceMediaAccessByTokenAPIView(APIView):
     """
     GET: Access media by signed token. No auth required; token is the credential.
-    Use for img/video src when you have a short-lived signed URL.
+    Use for img/video src when you have a short-lived signed URL. Range and conditional
+    requests and ?variant= are handled as for the authenticated stream.
     """
 
     authentication_classes = []
@@ -266,23 +312,166 @@ class EvidenceMediaAccessByTokenAPIView(APIView):
                 message="Media not found.",
                 status_code=status.HTTP_404_NOT_FOUND,
             )
-        response = _stream_file_response(attachment)
-        if response is None:
+        return _media_response(request, attachment, "Media file not found.")
+
+
+# --- Resumable chunked media uploads (apps.evidence.services.uploads) ---
+
+
+def _upload_error_response(exc: UploadError):
+    return error_response(code=exc.code, message=exc.message, details=exc.details, status_code=exc.status_code)
+
+
+def _upload_session_or_404(request, upload_id):
+    return get_object_or_404(EvidenceUploadSession, pk=upload_id, created_by=request.user)
+
+
+def _uploaded_attachment_data(session, attachment):
+    return {
+        "id": attachment.pk,
+        "media_kind": session.media_kind,
+        "media_type": attachment.media_type,
+        "mime_type": attachment.mime_type,
+        "file_size": attachment.file_size,
+        "sha256": attachment.sha256,
+        "caption": attachment.caption,
+        "url": media_url(session.media_kind, attachment.pk),
+        "thumbnail_url": (
+            media_url(session.media_kind, attachment.pk, "thumbnail") if is_derivable(attachment.mime_type) else None
+        ),
+    }
+
+
+class EvidenceUploadStartAPIView(APIView):
+    """
+    POST: Open a resumable upload for a witness testimony attachment or biological/medical media.
+    Body: { "media_kind", "evidence_id", "filename", "total_size", "sha256"?, "media_type"?, "caption"? }
+    When sha256 matches content already stored, the attachment is created immediately
+    ("deduplicated": true) and no chunks need to be sent.
+    """
+
+    authentication_classes = [TokenAuthentication]
+    permission_classes = [IsAuthenticated, HasRBACPermissions]
+    required_permission_codes = ["evidence.create"]
+
+    def post(self, request):
+        serializer = EvidenceUploadStartSerializer(data=request.data)
+        if not serializer.is_valid():
             return error_response(
-                code="FILE_NOT_FOUND",
-                message="Media file not found.",
-                status_code=status.HTTP_404_NOT_FOUND,
+                code="VALIDATION_ERROR",
+                message="Request validation failed.",
+                details=serializer.errors,
+                status_code=status.HTTP_400_BAD_REQUEST,
+            )
+        try:
+            session = start_upload(user=request.user, **serializer.validated_data)
+        except UploadError as exc:
+            return _upload_error_response(exc)
+        data = {"upload": EvidenceUploadSessionSerializer(session).data, "deduplicated": False}
+        if session.status == EvidenceUploadSession.Status.COMPLETED:
+            data["deduplicated"] = True
+            data["attachment"] = _uploaded_attachment_data(session, get_upload_attachment(session))
+        return success_response(data, status_code=status.HTTP_201_CREATED)
+
+
+class EvidenceUploadDetailAPIView(APIView):
+    """
+    GET: Upload status and the offset to resume from.
+    DELETE: Abandon the upload and discard its chunks.
+    """
+
+    authentication_classes = [TokenAuthentication]
+    permission_classes = [IsAuthenticated, HasRBACPermissions]
+    required_permission_codes = ["evidence.create"]
+
+    def get(self, request, upload_id):
+        session = _upload_session_or_404(request, upload_id)
+        return success_response({"upload": EvidenceUploadSessionSerializer(session).data})
+
+    def delete(self, request, upload_id):
+        session = _upload_session_or_404(request, upload_id)
+        if session.status == EvidenceUploadSession.Status.ASSEMBLING:
+            return error_response(
+                code="UPLOAD_CLOSED",
+                message="Upload is being assembled.",
+                status_code=status.HTTP_409_CONFLICT,
+            )
+        abort_upload(session)
+        return success_response({"deleted": True}, status_code=status.HTTP_200_OK)
+
+
+class EvidenceUploadChunkAPIView(APIView):
+    """
+    PUT: Append one chunk. The raw request body is the chunk; headers:
+    Upload-Offset (byte offset, must equal the upload's offset) and X-Chunk-SHA256 (hex).
+    """
+
+    authentication_classes = [TokenAuthentication]
+    permission_classes = [IsAuthenticated, HasRBACPermissions]
+    required_permission_codes = ["evidence.create"]
+
+    def put(self, request, upload_id):
+        session = _upload_session_or_404(request, upload_id)
+        try:
+            offset = int(request.headers.get("Upload-Offset", ""))
+        except ValueError:
+            offset = -1
+        if offset < 0:
+            return error_response(
+                code="VALIDATION_ERROR",
+                message="Upload-Offset header must be a non-negative integer.",
+                status_code=status.HTTP_400_BAD_REQUEST,
+            )
+        try:
+            session, created = receive_chunk(
+                session,
+                offset=offset,
+                stream=request.stream or io.BytesIO(),
+                sha256=request.headers.get("X-Chunk-SHA256"),
             )
+        except UploadError as exc:
+            return _upload_error_response(exc)
+        response = success_response(
+            {"upload": EvidenceUploadSessionSerializer(session).data},
+            status_code=status.HTTP_201_CREATED if created else status.HTTP_200_OK,
+        )
+        response["Upload-Offset"] = str(session.received_bytes)
         return response
 
 
+class EvidenceUploadCompleteAPIView(APIView):
+    """
+    POST: Assemble the uploaded chunks into the attachment (size, SHA-256 and MIME type are
+    recorded in the same pass). Retrying a completed upload returns the same attachment.
+    """
+
+    authentication_classes = [TokenAuthentication]
+    permission_classes = [IsAuthenticated, HasRBACPermissions]
+    required_permission_codes = ["evidence.create"]
+
+    def post(self, request, upload_id):
+        session = _upload_session_or_404(request, upload_id)
+        try:
+            attachment = complete_upload(session)
+        except UploadError as exc:
+            return _upload_error_response(exc)
+        return success_response(
+            {
+                "upload": EvidenceUploadSessionSerializer(session).data,
+                "attachment": _uploaded_attachment_data(session, attachment),
+            },
+            status_code=status.HTTP_201_CREATED,
+        )
+
+
 # --- Case evidence list and create ---
 
 
 class CaseEvidenceListAPIView(APIView):
     """
     GET: List all evidence for a case. Query: ?case_id=<id>
-    Requires cases.cases.view.
+    Each item carries its subtype fields ("details"), media and coroner reviews, loaded with
+    one query per evidence type present. Requires cases.cases.view.
     """
 
     authentication_classes = [TokenAuthentication]
@@ -308,7 +497,12 @@ class CaseEvidenceListAPIView(APIView):
         from apps.cases.models import Case
         case = get_object_or_404(Case, pk=case_id)
         qs = Evidence.objects.filter(case=case).select_related("registrar", "case").order_by("-registered_at", "-created_at")
-        serializer = EvidenceListSerializer(qs, many=True)
+        if cursor_pagination_requested(request):
+            paginator = KeysetPagination(ordering=["-registered_at", "-created_at"])
+            page = paginator.paginate_queryset(qs, request, view=self)
+            serializer = EvidenceDetailSerializer(load_typed_evidence(page), many=True)
+            return success_response(paginator.get_payload(serializer.data, results_key="evidence"))
+        serializer = EvidenceDetailSerializer(load_typed_evidence(qs), many=True)
         return success_response({"evidence": serializer.data})
 
 
@@ -475,6 +669,11 @@ class EvidenceLinkListCreateAPIView(APIView):
             qs = qs.filter(source__case_id=case_id)
         if evidence_id:
             qs = qs.filter(Q(source_id=evidence_id) | Q(target_id=evidence_id))
+        if cursor_pagination_requested(request):
+            paginator = KeysetPagination(ordering=["-created_at"])
+            page = paginator.paginate_queryset(qs, request, view=self)
+            serializer = EvidenceLinkSerializer(page, many=True)
+            return success_response(paginator.get_payload(serializer.data, results_key="links"))
         serializer = EvidenceLinkSerializer(qs, many=True)
         return success_response({"links": serializer.data})
 
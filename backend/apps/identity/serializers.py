@@ -53,6 +53,9 @@ class UserAuthSerializer(serializers.ModelSerializer):
 
     def get_roles(self, obj):
         from apps.access.models import UserRoleAssignment
+        if "role_assignments" in getattr(obj, "_prefetched_objects_cache", {}):
+            # Lists prefetch role_assignments__role; avoid a query per user.
+            return [assignment.role.name for assignment in obj.role_assignments.all()]
         return list(
             UserRoleAssignment.objects.filter(user=obj)
             .select_related("role")
@@ -3,6 +3,8 @@ from django.core.exceptions import ValidationError
 from django.db import models
 from django.db.models import Q
 
+from config.tracking import TrackedFieldsMixin
+
 
 class ReasoningSubmission(models.Model):
     class Status(models.TextChoices):
@@ -125,7 +127,7 @@ class SuspectAssessmentScoreEntry(models.Model):
         return f"{self.assessment_id}:{self.role_key}={self.score}"
 
 
-class ArrestOrder(models.Model):
+class ArrestOrder(TrackedFieldsMixin, models.Model):
     """Order issued by sergeant to arrest a suspect. Sergeant-only context."""
 
     class Status(models.TextChoices):
@@ -168,7 +170,7 @@ class ArrestOrder(models.Model):
                 raise ValidationError({"participant": "Participant must have role suspect."})
 
 
-class InterrogationOrder(models.Model):
+class InterrogationOrder(TrackedFieldsMixin, models.Model):
     """Order issued by sergeant for interrogation of a suspect. Sergeant-only context."""
 
     class Status(models.TextChoices):
@@ -0,0 +1,27 @@
+from django.db.models import OuterRef, Q, Subquery
+
+from apps.cases.models import Case
+from apps.investigation.models import ReasoningSubmission
+from apps.investigation.serializers import ReasoningSubmissionSerializer
+from apps.investigation.services import can_review_reasoning
+from apps.reviewqueue.services import ReviewQueue, register_queue
+from apps.wanted.ranking import crime_level_di_expression
+
+REASONING_QUEUE = "investigation.reasoning"
+
+register_queue(
+    ReviewQueue(
+        REASONING_QUEUE,
+        model=ReasoningSubmission,
+        pending=Q(status=ReasoningSubmission.Status.PENDING),
+        permission_codes=["investigation.reasoning.approve"],
+        policy=can_review_reasoning,
+        exclude_for=lambda user: Q(submitted_by=user),
+        annotations={
+            "case_level": Subquery(Case.objects.filter(case_number=OuterRef("case_reference")).values("level")[:1]),
+        },
+        priority=crime_level_di_expression("case_level"),
+        select_related=("submitted_by",),
+        serializer=ReasoningSubmissionSerializer,
+    )
+)
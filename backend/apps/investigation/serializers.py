@@ -131,21 +131,19 @@ class SuspectAssessmentSerializer(serializers.ModelSerializer):
             "created_at",
         ]
 
+    @staticmethod
+    def _latest_score(obj, role_key):
+        # Read from score_entries.all() so the views' prefetch serves every assessment.
+        entries = [entry for entry in obj.score_entries.all() if entry.role_key == role_key]
+        if not entries:
+            return None
+        return max(entries, key=lambda entry: entry.created_at).score
+
     def get_detective_score(self, obj):
-        entry = (
-            obj.score_entries.filter(role_key=SuspectAssessmentScoreEntry.RoleKey.DETECTIVE)
-            .order_by("-created_at")
-            .first()
-        )
-        return entry.score if entry else None
+        return self._latest_score(obj, SuspectAssessmentScoreEntry.RoleKey.DETECTIVE)
 
     def get_sergeant_score(self, obj):
-        entry = (
-            obj.score_entries.filter(role_key=SuspectAssessmentScoreEntry.RoleKey.SERGEANT)
-            .order_by("-created_at")
-            .first()
-        )
-        return entry.score if entry else None
+        return self._latest_score(obj, SuspectAssessmentScoreEntry.RoleKey.SERGEANT)
 
     def get_participant_display(self, obj):
         p = obj.participant
@@ -42,9 +42,17 @@ def can_submit_reasoning(user):
     return False, "Only users with the detective role can submit reasoning."
 
 
+def can_review_reasoning(user):
+    """Sergeant role check shared by the approval endpoint and the reasoning review queue."""
+    if user_has_any_role_key(user, {ROLE_KEY_SERGEANT}):
+        return True, None
+    return False, "Only users with the sergeant role can approve or reject reasoning."
+
+
 def can_approve_reasoning(user, reasoning: ReasoningSubmission):
-    if not user_has_any_role_key(user, {ROLE_KEY_SERGEANT}):
-        return False, "Only users with the sergeant role can approve or reject reasoning."
+    allowed, message = can_review_reasoning(user)
+    if not allowed:
+        return False, message
     if reasoning.status != ReasoningSubmission.Status.PENDING:
         return False, "Only pending reasoning submissions can be approved or rejected."
     if reasoning.submitted_by_id == user.id:
@@ -15,6 +15,7 @@ from apps.investigation.models import (
     SuspectAssessment,
     SuspectAssessmentScoreEntry,
 )
+from apps.investigation.review_queues import REASONING_QUEUE
 from apps.investigation.serializers import (
     ArrestOrderCreateSerializer,
     ArrestOrderSerializer,
@@ -40,6 +41,9 @@ from apps.investigation.services import (
     can_submit_score_for_assessment,
 )
 from apps.notifications.services import log_timeline_event
+from apps.reviewqueue.services import blocking_lease, complete_review
+from apps.reviewqueue.views import lease_held_response
+from config.pagination import KeysetPagination, cursor_pagination_requested
 
 
 class ReasoningSubmissionListCreateAPIView(APIView):
@@ -51,7 +55,14 @@ class ReasoningSubmissionListCreateAPIView(APIView):
     }
 
     def get(self, request):
-        queryset = ReasoningSubmission.objects.select_related("submitted_by").order_by("-created_at")
+        queryset = ReasoningSubmission.objects.select_related(
+            "submitted_by", "approval", "approval__decided_by"
+        ).order_by("-created_at")
+        if cursor_pagination_requested(request):
+            paginator = KeysetPagination(ordering=["-created_at"])
+            page = paginator.paginate_queryset(queryset, request, view=self)
+            serializer = ReasoningSubmissionSerializer(page, many=True)
+            return success_response(paginator.get_payload(serializer.data), status_code=status.HTTP_200_OK)
         serializer = ReasoningSubmissionSerializer(queryset, many=True)
         return success_response({"results": serializer.data}, status_code=status.HTTP_200_OK)
 
@@ -123,6 +134,9 @@ class ReasoningApprovalCreateAPIView(APIView):
                 details={},
                 status_code=status.HTTP_403_FORBIDDEN,
             )
+        lease = blocking_lease(REASONING_QUEUE, request.user, reasoning.pk)
+        if lease is not None:
+            return lease_held_response(lease)
 
         serializer = ReasoningApprovalCreateSerializer(data=request.data)
         if not serializer.is_valid():
@@ -145,6 +159,7 @@ class ReasoningApprovalCreateAPIView(APIView):
         else:
             reasoning.status = ReasoningSubmission.Status.REJECTED
         reasoning.save(update_fields=["status", "updated_at"])
+        complete_review(REASONING_QUEUE, reasoning)
         timeline_event_type = "investigation.reasoning.approved"
         timeline_summary = "Detective reasoning approved by sergeant."
         if approval.decision == ReasoningApproval.Decision.REJECTED:
@@ -0,0 +1,258 @@
+"""
+Streaming referral dossier export for the judiciary.
+
+iter_dossier_zip and iter_dossier_ndjson are generators for a StreamingHttpResponse. They
+emit the case, its participants, every evidence item with its subtype fields, coroner
+reviews and media metadata, and the bytes of all attached media. Memory stays flat however
+many or however large the files are:
+- evidence is read DOSSIER_EXPORT_PAGE_SIZE items at a time (keyset on id), with one query
+  per page for the base rows, one per subtype present, one for reviews and one per
+  attachment model;
+- media is copied from get_evidence_media_storage() in DOSSIER_EXPORT_CHUNK_SIZE pieces and
+  each piece is handed to the client before the next is read.
+
+ZIP layout (written to a non-seekable sink, so entries carry data descriptors; media is
+stored, the JSON is deflated):
+
+    case.json
+    participants.ndjson
+    evidence/<id>.json                   base fields, "details", "reviews", "media"
+    media/<evidence id>/<kind>-<media id><ext>
+    manifest.json                        counts and media files that could not be read
+
+NDJSON: one {"type": ..., "data": ...} object per line in the same order. Each media file
+follows its evidence record as base64 "media_chunk" records keyed by the ZIP path.
+"""
+import base64
+import json
+import os
+import zipfile
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+
+from apps.cases.models import CaseParticipant
+from apps.evidence.models import BiologicalMedicalMediaReference, Evidence, EvidenceReview, WitnessTestimonyAttachment
+from apps.evidence.services.polymorphic import EVIDENCE_SUBTYPES
+from apps.evidence.storage import get_evidence_media_storage
+
+DOSSIER_FORMATS = ("zip", "ndjson")
+
+CASE_FIELDS = (
+    "id",
+    "case_number",
+    "title",
+    "summary",
+    "level",
+    "priority",
+    "source_type",
+    "status",
+    "created_at",
+    "submitted_at",
+    "investigation_started_at",
+    "suspect_assessed_at",
+    "referral_ready_at",
+    "trial_started_at",
+)
+PARTICIPANT_FIELDS = ("id", "participant_kind", "role_in_case", "full_name", "national_id", "phone", "notes")
+EVIDENCE_FIELDS = ("id", "title", "description", "evidence_type", "registered_at", "registrar_id", "created_at")
+REVIEW_FIELDS = ("id", "biological_medical_evidence_id", "decision", "follow_up_notes", "reviewed_by_id", "reviewed_at")
+MEDIA_FIELDS = ("id", "file", "media_type", "mime_type", "file_size", "caption", "created_at")
+
+# Media kind (as used by the evidence media endpoints) -> attachment model, evidence FK column.
+MEDIA_SOURCES = (
+    ("witness-testimony", WitnessTestimonyAttachment, "witness_testimony_id"),
+    ("biological-medical", BiologicalMedicalMediaReference, "biological_medical_evidence_id"),
+)
+
+
+def _dumps(value) -> bytes:
+    return json.dumps(value, cls=DjangoJSONEncoder, ensure_ascii=False).encode("utf-8")
+
+
+def _detail_fields(model):
+    """Columns the subtype adds to Evidence (its parent link excluded)."""
+    return [field.attname for field in model._meta.local_concrete_fields if not field.primary_key]
+
+
+def _media_path(evidence_id, kind, media) -> str:
+    extension = os.path.splitext(media["file"] or "")[1]
+    return f"media/{evidence_id}/{kind}-{media['id']}{extension}"
+
+
+def case_record(case) -> dict:
+    return {field: getattr(case, field) for field in CASE_FIELDS}
+
+
+def iter_participants(case):
+    queryset = CaseParticipant.objects.filter(case=case).order_by("id").values(*PARTICIPANT_FIELDS)
+    yield from queryset.iterator(chunk_size=settings.DOSSIER_EXPORT_PAGE_SIZE)
+
+
+def iter_evidence(case, page_size=None):
+    """Evidence records in id order, each with "details", "reviews" and "media" filled in."""
+    page_size = page_size or settings.DOSSIER_EXPORT_PAGE_SIZE
+    last_id = 0
+    while True:
+        rows = list(
+            Evidence.objects.filter(case=case, id__gt=last_id).order_by("id").values(*EVIDENCE_FIELDS)[:page_size]
+        )
+        if not rows:
+            return
+        last_id = rows[-1]["id"]
+        ids = [row["id"] for row in rows]
+
+        details = {}
+        for evidence_type, model in EVIDENCE_SUBTYPES.items():
+            typed_ids = [row["id"] for row in rows if row["evidence_type"] == evidence_type]
+            if typed_ids:
+                for values in model.objects.filter(pk__in=typed_ids).values("pk", *_detail_fields(model)):
+                    details[values.pop("pk")] = values
+
+        reviews = defaultdict(list)
+        review_rows = EvidenceReview.objects.filter(biological_medical_evidence_id__in=ids).order_by("reviewed_at", "id")
+        for review in review_rows.values(*REVIEW_FIELDS):
+            reviews[review["biological_medical_evidence_id"]].append(review)
+
+        media = defaultdict(list)
+        for kind, model, evidence_field in MEDIA_SOURCES:
+            media_rows = model.objects.filter(**{f"{evidence_field}__in": ids}).order_by("id")
+            for item in media_rows.values(evidence_field, *MEDIA_FIELDS):
+                evidence_id = item.pop(evidence_field)
+                item["kind"] = kind
+                item["path"] = _media_path(evidence_id, kind, item)
+                media[evidence_id].append(item)
+
+        for row in rows:
+            yield {
+                **row,
+                "details": details.get(row["id"], {}),
+                "reviews": reviews[row["id"]],
+                "media": media[row["id"]],
+            }
+
+
+def _open_media(storage, name):
+    if not name:
+        return None
+    try:
+        return storage.open(name, "rb")
+    except (OSError, ValueError):
+        return None
+
+
+def _read_chunks(handle, chunk_size):
+    with handle:
+        while chunk := handle.read(chunk_size):
+            yield chunk
+
+
+class _Manifest:
+    def __init__(self, case):
+        self.case_number = case.case_number
+        self.participants = 0
+        self.evidence = 0
+        self.media = 0
+        self.missing_media = []
+
+    def as_dict(self):
+        return {
+            "case_number": self.case_number,
+            "exported_at": timezone.now(),
+            "participants": self.participants,
+            "evidence": self.evidence,
+            "media": self.media,
+            "missing_media": self.missing_media,
+        }
+
+
+class _ZipSink:
+    """Write-only target for ZipFile. Without tell()/seek() ZipFile streams entries with data descriptors."""
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def iter_dossier_zip(case, *, chunk_size=None, page_size=None):
+    chunk_size = chunk_size or settings.DOSSIER_EXPORT_CHUNK_SIZE
+    storage = get_evidence_media_storage()
+    manifest = _Manifest(case)
+    sink = _ZipSink()
+    with zipfile.ZipFile(sink, mode="w", compression=zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("case.json", _dumps(case_record(case)))
+        with archive.open("participants.ndjson", "w") as entry:
+            for participant in iter_participants(case):
+                entry.write(_dumps(participant) + b"\n")
+                manifest.participants += 1
+        yield sink.drain()
+
+        for evidence in iter_evidence(case, page_size):
+            archive.writestr(f"evidence/{evidence['id']}.json", _dumps(evidence))
+            manifest.evidence += 1
+            for media in evidence["media"]:
+                handle = _open_media(storage, media["file"])
+                if handle is None:
+                    manifest.missing_media.append(media["path"])
+                    continue
+                info = zipfile.ZipInfo(media["path"], date_time=timezone.localtime(media["created_at"]).timetuple()[:6])
+                info.compress_type = zipfile.ZIP_STORED
+                info.file_size = media["file_size"] or 0
+                with archive.open(info, "w", force_zip64=not media["file_size"]) as entry:
+                    for chunk in _read_chunks(handle, chunk_size):
+                        entry.write(chunk)
+                        yield sink.drain()
+                manifest.media += 1
+            yield sink.drain()
+
+        archive.writestr("manifest.json", _dumps(manifest.as_dict()))
+    yield sink.drain()
+
+
+def _line(record_type, data) -> bytes:
+    return _dumps({"type": record_type, "data": data}) + b"\n"
+
+
+def iter_dossier_ndjson(case, *, chunk_size=None, page_size=None):
+    chunk_size = chunk_size or settings.DOSSIER_EXPORT_CHUNK_SIZE
+    storage = get_evidence_media_storage()
+    manifest = _Manifest(case)
+    yield _line("case", case_record(case))
+    for participant in iter_participants(case):
+        yield _line("participant", participant)
+        manifest.participants += 1
+
+    for evidence in iter_evidence(case, page_size):
+        yield _line("evidence", evidence)
+        manifest.evidence += 1
+        for media in evidence["media"]:
+            handle = _open_media(storage, media["file"])
+            if handle is None:
+                manifest.missing_media.append(media["path"])
+                continue
+            for sequence, chunk in enumerate(_read_chunks(handle, chunk_size)):
+                yield _line(
+                    "media_chunk",
+                    {"path": media["path"], "seq": sequence, "data": base64.b64encode(chunk).decode("ascii")},
+                )
+            manifest.media += 1
+    yield _line("manifest", manifest.as_dict())
+
+
+def iter_dossier(case, file_format="zip", **options):
+    if file_format == "ndjson":
+        return iter_dossier_ndjson(case, **options)
+    return iter_dossier_zip(case, **options)
@@ -3,24 +3,51 @@ from apps.cases.models import Case
 
 
 def build_referral_package(case: Case):
-    """Build referral package for judiciary: case summary, participants, evidence list."""
+    """Build referral package for judiciary: case summary, participants, evidence with subtype details, media and reviews, orders, verdict."""
     from apps.evidence.models import Evidence
+    from apps.evidence.services.polymorphic import (
+        evidence_media,
+        evidence_reviews,
+        load_typed_evidence,
+        subtype_details,
+    )
     from apps.cases.models import CaseParticipant
+    from apps.investigation.models import ArrestOrder, InterrogationOrder
+    from apps.judiciary.models import CaseVerdict
 
     participants = list(
         CaseParticipant.objects.filter(case=case).values(
             "id", "role_in_case", "full_name", "national_id", "phone", "notes"
         )
     )
-    evidence_qs = Evidence.objects.filter(case=case).values(
-        "id", "title", "evidence_type", "description", "registered_at"
+    evidence_items = [
+        {
+            "id": e.id,
+            "title": e.title,
+            "evidence_type": e.evidence_type,
+            "description": e.description,
+            "registered_at": e.registered_at.isoformat() if e.registered_at else None,
+            "details": subtype_details(e),
+            "media": evidence_media(e),
+            "reviews": evidence_reviews(e),
+        }
+        for e in load_typed_evidence(Evidence.objects.filter(case=case))
+    ]
+    arrest_orders = list(
+        ArrestOrder.objects.filter(case=case)
+        .order_by("issued_at", "id")
+        .values("id", "participant_id", "status", "reason", "issued_at")
+    )
+    interrogation_orders = list(
+        InterrogationOrder.objects.filter(case=case)
+        .order_by("ordered_at", "id")
+        .values("id", "participant_id", "status", "reason", "ordered_at", "scheduled_at")
+    )
+    verdict = (
+        CaseVerdict.objects.filter(case=case)
+        .values("verdict", "punishment_title", "punishment_description", "judge_id", "recorded_at")
+        .first()
     )
-    evidence_items = []
-    for e in evidence_qs:
-        e = dict(e)
-        if e.get("registered_at"):
-            e["registered_at"] = e["registered_at"].isoformat()
-        evidence_items.append(e)
     return {
         "case": {
             "id": case.id,
@@ -33,6 +60,8 @@ def build_referral_package(case: Case):
         },
         "participants": participants,
         "evidence": evidence_items,
+        "orders": {"arrest": arrest_orders, "interrogation": interrogation_orders},
+        "verdict": verdict,
     }
 
 
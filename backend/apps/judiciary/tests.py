@@ -1,10 +1,27 @@
+import base64
+import io
+import json
+import shutil
+import tempfile
+import zipfile
+
 from django.contrib.auth import get_user_model
+from django.core.files.base import ContentFile
+from django.utils import timezone
 from rest_framework import status
 from rest_framework.authtoken.models import Token
 from rest_framework.test import APITestCase
 
 from apps.access.models import Permission, Role, RolePermission, UserRoleAssignment
 from apps.cases.models import Case, CaseParticipant
+from apps.evidence.models import (
+    BiologicalMedicalEvidence,
+    BiologicalMedicalMediaReference,
+    EvidenceReview,
+    VehicleEvidence,
+    WitnessTestimony,
+    WitnessTestimonyAttachment,
+)
 from apps.judiciary.models import CaseVerdict
 
 
@@ -46,6 +63,64 @@ class JudiciaryReferralPackageTests(APITestCase):
         self.assertIn("participants", data)
         self.assertIn("evidence", data)
 
+    def test_dossier_export_streams_evidence_details_reviews_and_media(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        CaseParticipant.objects.create(
+            case=self.case,
+            participant_kind=CaseParticipant.ParticipantKind.CIVILIAN,
+            role_in_case=CaseParticipant.RoleInCase.SUSPECT,
+            full_name="Suspect D",
+            national_id="6000001001",
+            added_by=self.admin,
+        )
+        common = {"case": self.case, "registered_at": timezone.now(), "registrar": self.admin}
+        testimony = WitnessTestimony.objects.create(title="Witness", transcript="I saw it.", **common)
+        sample = BiologicalMedicalEvidence.objects.create(title="Blood", **common)
+        vehicle = VehicleEvidence.objects.create(title="Car", model="Sedan", color="Black", plate="12A345", **common)
+        EvidenceReview.objects.create(
+            biological_medical_evidence=sample, decision=EvidenceReview.Decision.choices[0][0], reviewed_by=self.admin
+        )
+        recording = bytes(range(256)) * 300
+        with self.settings(MEDIA_ROOT=media_root):
+            attachment = WitnessTestimonyAttachment.objects.create(
+                witness_testimony=testimony,
+                file=ContentFile(recording, name="statement.mp3"),
+                media_type=WitnessTestimonyAttachment.MediaType.AUDIO,
+                file_size=len(recording),
+            )
+            BiologicalMedicalMediaReference.objects.create(biological_medical_evidence=sample, file="gone/missing.jpg")
+
+            self.client.credentials(HTTP_AUTHORIZATION=f"Token {Token.objects.get(user=self.judge_user).key}")
+            url = f"/api/v1/judiciary/referral-package/{self.case.id}/dossier/"
+            with self.settings(DOSSIER_EXPORT_PAGE_SIZE=2, DOSSIER_EXPORT_CHUNK_SIZE=4096):
+                response = self.client.get(url)
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                self.assertTrue(response.streaming)
+                self.assertEqual(response["Content-Type"], "application/zip")
+                archive = zipfile.ZipFile(io.BytesIO(b"".join(response.streaming_content)))
+                ndjson = self.client.get(url, {"output": "ndjson"})
+                records = [json.loads(line) for line in b"".join(ndjson.streaming_content).splitlines()]
+
+        self.assertEqual(json.loads(archive.read("case.json"))["case_number"], self.case.case_number)
+        self.assertEqual(len(archive.read("participants.ndjson").splitlines()), 1)
+        self.assertEqual(json.loads(archive.read(f"evidence/{testimony.id}.json"))["details"]["transcript"], "I saw it.")
+        self.assertEqual(json.loads(archive.read(f"evidence/{vehicle.id}.json"))["details"]["plate"], "12A345")
+        self.assertEqual(len(json.loads(archive.read(f"evidence/{sample.id}.json"))["reviews"]), 1)
+        media_path = f"media/{testimony.id}/witness-testimony-{attachment.id}.mp3"
+        self.assertEqual(archive.read(media_path), recording)
+        manifest = json.loads(archive.read("manifest.json"))
+        self.assertEqual((manifest["evidence"], manifest["media"]), (3, 1))
+        self.assertEqual(len(manifest["missing_media"]), 1)
+
+        self.assertEqual([record["type"] for record in records[:2]], ["case", "participant"])
+        chunks = [record["data"] for record in records if record["type"] == "media_chunk"]
+        self.assertEqual(len(chunks), len(recording) // 4096 + 1)
+        self.assertEqual(b"".join(base64.b64decode(chunk["data"]) for chunk in chunks), recording)
+        self.assertEqual(records[-1]["type"], "manifest")
+
+        self.assertEqual(self.client.get(url, {"output": "pdf"}).status_code, status.HTTP_400_BAD_REQUEST)
+
 
 class JudiciaryVerdictTests(APITestCase):
     def setUp(self):
@@ -1,6 +1,6 @@
 from django.urls import path
 
-from apps.judiciary.views import CaseVerdictAPIView, ReferralPackageAPIView
+from apps.judiciary.views import CaseVerdictAPIView, ReferralDossierExportAPIView, ReferralPackageAPIView
 
 urlpatterns = [
     path(
@@ -8,6 +8,11 @@ urlpatterns = [
         ReferralPackageAPIView.as_view(),
         name="judiciary-referral-package",
     ),
+    path(
+        "referral-package/<int:case_id>/dossier/",
+        ReferralDossierExportAPIView.as_view(),
+        name="judiciary-referral-dossier",
+    ),
     path(
         "cases/<int:case_id>/verdict/",
         CaseVerdictAPIView.as_view(),
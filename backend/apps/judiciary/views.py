@@ -1,3 +1,5 @@
+from django.db import transaction
+from django.http import Http404, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
 from rest_framework import status
@@ -6,31 +8,71 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.views import APIView
 
 from apps.access.permissions import HasRBACPermissions
+from apps.cases.dossier import dossier_response, get_case_dossier
 from apps.cases.models import Case
 from apps.identity.services import error_response, success_response
+from apps.judiciary.dossier import DOSSIER_FORMATS, iter_dossier
 from apps.judiciary.models import CaseVerdict
 from apps.judiciary.serializers import CaseVerdictCreateSerializer, CaseVerdictSerializer
-from apps.judiciary.services import build_referral_package, can_record_verdict
+from apps.judiciary.services import can_record_verdict
+
+
+REFERRAL_STATUSES = (Case.Status.REFERRAL_READY, Case.Status.IN_TRIAL)
+
+
+def _referral_unavailable_response(case_status):
+    return error_response(
+        code="WORKFLOW_POLICY_VIOLATION",
+        message="Referral package is only available for cases in referral_ready or in_trial status.",
+        details={"status": case_status},
+        status_code=status.HTTP_409_CONFLICT,
+    )
 
 
 class ReferralPackageAPIView(APIView):
-    """Referral package endpoint: case summary, participants, evidence for judiciary."""
+    """Referral package endpoint: case summary, participants, evidence for judiciary (from the case dossier)."""
 
     authentication_classes = [TokenAuthentication]
     permission_classes = [IsAuthenticated, HasRBACPermissions]
     permission_codes_by_method = {"GET": ["judiciary.referral.view"]}
 
     def get(self, request, case_id):
-        case = get_object_or_404(Case.objects.all(), id=case_id)
-        if case.status not in (Case.Status.REFERRAL_READY, Case.Status.IN_TRIAL):
+        dossier = get_case_dossier(case_id)
+        if dossier is None:
+            raise Http404("No Case matches the given query.")
+        referral = dossier.document["referral"]
+        if referral["case"]["status"] not in REFERRAL_STATUSES:
+            return _referral_unavailable_response(referral["case"]["status"])
+        return dossier_response(request, dossier, referral)
+
+
+class ReferralDossierExportAPIView(APIView):
+    """
+    Streamed referral dossier: case, participants, evidence with subtype details, reviews and
+    media files in one response (see apps.judiciary.dossier). Query: ?output=zip|ndjson.
+    """
+
+    authentication_classes = [TokenAuthentication]
+    permission_classes = [IsAuthenticated, HasRBACPermissions]
+    permission_codes_by_method = {"GET": ["judiciary.referral.view"]}
+
+    def get(self, request, case_id):
+        output = request.query_params.get("output", "zip")
+        if output not in DOSSIER_FORMATS:
             return error_response(
-                code="WORKFLOW_POLICY_VIOLATION",
-                message="Referral package is only available for cases in referral_ready or in_trial status.",
-                details={"status": case.status},
-                status_code=status.HTTP_409_CONFLICT,
+                code="VALIDATION_ERROR",
+                message="output must be zip or ndjson.",
+                details={"output": output},
+                status_code=status.HTTP_400_BAD_REQUEST,
             )
-        data = build_referral_package(case)
-        return success_response(data, status_code=status.HTTP_200_OK)
+        case = get_object_or_404(Case.objects.all(), id=case_id)
+        if case.status not in REFERRAL_STATUSES:
+            return _referral_unavailable_response(case.status)
+
+        content_type = "application/zip" if output == "zip" else "application/x-ndjson"
+        response = StreamingHttpResponse(iter_dossier(case, output), content_type=content_type)
+        response["Content-Disposition"] = f'attachment; filename="{case.case_number}-dossier.{output}"'
+        return response
 
 
 class CaseVerdictAPIView(APIView):
@@ -89,15 +131,18 @@ class CaseVerdictAPIView(APIView):
                 details=serializer.errors,
                 status_code=status.HTTP_400_BAD_REQUEST,
             )
-        verdict = CaseVerdict.objects.create(
-            case=case,
-            judge=request.user,
-            verdict=serializer.validated_data["verdict"],
-            punishment_title=serializer.validated_data.get("punishment_title", ""),
-            punishment_description=serializer.validated_data.get("punishment_description", ""),
-        )
-        case.status = Case.Status.CLOSED
-        case.closed_at = timezone.now()
-        case.save(update_fields=["status", "closed_at", "updated_at"])
+        # Case.save checks the version the case was read with: a concurrent change rolls the
+        # verdict back and is answered with 409 CONCURRENT_UPDATE.
+        with transaction.atomic():
+            verdict = CaseVerdict.objects.create(
+                case=case,
+                judge=request.user,
+                verdict=serializer.validated_data["verdict"],
+                punishment_title=serializer.validated_data.get("punishment_title", ""),
+                punishment_description=serializer.validated_data.get("punishment_description", ""),
+            )
+            case.status = Case.Status.CLOSED
+            case.closed_at = timezone.now()
+            case.save(update_fields=["status", "closed_at", "updated_at"])
         response_serializer = CaseVerdictSerializer(verdict)
         return success_response(response_serializer.data, status_code=status.HTTP_201_CREATED)
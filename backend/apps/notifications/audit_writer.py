@@ -0,0 +1,292 @@
+"""
+Buffered audit-log writer.
+
+Request threads only put a plain dict on a bounded in-process queue; a daemon thread
+drains it and inserts rows with AuditLog.objects.bulk_create, every
+AUDIT_LOG_FLUSH_INTERVAL_MS or as soon as AUDIT_LOG_BATCH_SIZE events are waiting.
+
+Backpressure: when the queue (AUDIT_LOG_QUEUE_MAX_SIZE) is full, a request waits at most
+AUDIT_LOG_ENQUEUE_TIMEOUT_MS for room and then appends its event to the spool file
+(AUDIT_LOG_SPOOL_PATH) instead of dropping it. Batches that fail to insert are spooled
+as well, and whatever is still queued is flushed at interpreter exit. Spooled events are
+replayed by the `flush_audit_spool` management command (part of the scheduled tasks).
+
+Appends to the spool and the replay's rename of it hold the same lock (a thread lock plus
+an flock on "<spool>.lock" where fcntl exists), so no event is written to a file that is
+already being replayed.
+"""
+import atexit
+import json
+import logging
+import os
+import queue
+import threading
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+from glob import escape as glob_escape
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import close_old_connections
+
+from apps.notifications.models import AuditLog
+
+try:
+    import fcntl
+except ImportError:  # not POSIX: only threads of one process are serialised
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+_writer = None
+_writer_pid = None
+_writer_lock = threading.Lock()
+_spool_thread_locks = {}
+_spool_thread_locks_guard = threading.Lock()
+
+
+def _serialize_event(event: dict) -> str:
+    data = dict(event)
+    if isinstance(data.get("created_at"), datetime):
+        data["created_at"] = data["created_at"].isoformat()
+    return json.dumps(data, default=str)
+
+
+def _deserialize_event(line: str) -> dict:
+    data = json.loads(line)
+    if data.get("created_at"):
+        data["created_at"] = datetime.fromisoformat(data["created_at"])
+    return data
+
+
+@contextmanager
+def _file_lock(lock_path: Path):
+    """Exclusive flock on lock_path, shared by every process using the same spool."""
+    if fcntl is None:
+        yield
+        return
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(lock_path, "a") as lock_file:
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+
+def _spool_thread_lock(spool_path: Path) -> threading.Lock:
+    with _spool_thread_locks_guard:
+        return _spool_thread_locks.setdefault(os.path.abspath(spool_path), threading.Lock())
+
+
+@contextmanager
+def spool_lock(spool_path):
+    """Held while events are appended to the spool and while replay_spool renames it."""
+    spool_path = Path(spool_path)
+    with _spool_thread_lock(spool_path), _file_lock(spool_path.with_name(f"{spool_path.name}.lock")):
+        yield
+
+
+class AuditLogWriter:
+    def __init__(
+        self,
+        *,
+        batch_size: int,
+        flush_interval: float,
+        max_queue_size: int,
+        enqueue_timeout: float,
+        spool_path,
+        autostart: bool = True,
+    ):
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.enqueue_timeout = enqueue_timeout
+        self.spool_path = Path(spool_path)
+        self.autostart = autostart
+        self.queue = queue.Queue(maxsize=max(1, max_queue_size))
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._flush_lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._thread = None
+
+    def enqueue(self, event: dict):
+        """Queue one audit event; spool it if the queue stays full past the enqueue timeout."""
+        if self.autostart:
+            self.start()
+        try:
+            self.queue.put(event, timeout=self.enqueue_timeout)
+        except queue.Full:
+            logger.warning("Audit log queue is full; spooling event to %s.", self.spool_path)
+            self.spool([event])
+            return
+        if self.queue.qsize() >= self.batch_size:
+            self._wakeup.set()
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._start_lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stopping.clear()
+            self._thread = threading.Thread(target=self._run, name="audit-log-writer", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Stop the background thread and write out anything still queued."""
+        self._stopping.set()
+        self._wakeup.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=max(self.flush_interval, 1.0) * 5)
+        self.flush()
+
+    def _run(self):
+        while not self._stopping.is_set():
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("Audit log flush failed.")
+            finally:
+                close_old_connections()
+
+    def _drain(self, limit: int) -> list[dict]:
+        batch = []
+        while len(batch) < limit:
+            try:
+                batch.append(self.queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def flush(self) -> int:
+        """Write every queued event in batches; returns the number of rows inserted."""
+        written = 0
+        with self._flush_lock:
+            while True:
+                batch = self._drain(self.batch_size)
+                if not batch:
+                    break
+                written += self.write_batch(batch)
+        return written
+
+    def write_batch(self, events: list[dict]) -> int:
+        """bulk_create one batch; on failure the batch goes to the spool file."""
+        try:
+            insert_audit_events(events, batch_size=self.batch_size)
+        except Exception:
+            logger.exception("Audit log batch insert failed; spooling %s event(s).", len(events))
+            self.spool(events)
+            return 0
+        return len(events)
+
+    def spool(self, events: list[dict]):
+        lines = "".join(f"{_serialize_event(event)}\n" for event in events)
+        try:
+            self.spool_path.parent.mkdir(parents=True, exist_ok=True)
+            with spool_lock(self.spool_path), open(self.spool_path, "a", encoding="utf-8") as spool_file:
+                spool_file.write(lines)
+                spool_file.flush()
+                os.fsync(spool_file.fileno())
+        except OSError:
+            logger.exception("Could not spool %s audit event(s); they are lost.", len(events))
+
+
+def insert_audit_events(events: list[dict], batch_size: int | None = None):
+    """bulk_create AuditLog rows; actors deleted since the event was queued are stored as NULL."""
+    actor_ids = {event["actor_id"] for event in events if event.get("actor_id")}
+    existing = set()
+    if actor_ids:
+        existing = set(get_user_model().objects.filter(pk__in=actor_ids).values_list("pk", flat=True))
+    rows = []
+    for event in events:
+        data = dict(event)
+        if data.get("actor_id") not in existing:
+            data["actor_id"] = None
+        rows.append(AuditLog(**data))
+    AuditLog.objects.bulk_create(rows, batch_size=batch_size)
+
+
+def replay_spool(spool_path, batch_size: int = 500) -> int:
+    """
+    Insert spooled audit events and truncate the spool. Under the spool lock the file is
+    renamed, so events spooled during the replay land in a fresh file. Replay files left by
+    an interrupted run are replayed as well; events it had already inserted are inserted
+    again. Returns rows inserted.
+    """
+    spool_path = Path(spool_path)
+    replay_files = sorted(spool_path.parent.glob(f"{glob_escape(spool_path.name)}.replay-*"))
+    if not replay_files and not spool_path.exists():
+        return 0
+
+    # One replay at a time, so every replay file found here was abandoned by an earlier run.
+    with _file_lock(spool_path.with_name(f"{spool_path.name}.replay.lock")):
+        replay_files = sorted(spool_path.parent.glob(f"{glob_escape(spool_path.name)}.replay-*"))
+        with spool_lock(spool_path):
+            if spool_path.exists():
+                replaying = spool_path.with_name(f"{spool_path.name}.replay-{os.getpid()}-{uuid.uuid4().hex}")
+                os.replace(spool_path, replaying)
+                replay_files.append(replaying)
+        return sum(_replay_file(replay_file, spool_path, batch_size) for replay_file in replay_files)
+
+
+def _replay_file(replaying: Path, spool_path: Path, batch_size: int) -> int:
+    events = []
+    with open(replaying, encoding="utf-8") as spool_file:
+        for line in spool_file:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                events.append(_deserialize_event(line))
+            except (ValueError, TypeError):
+                logger.warning("Skipping unreadable audit spool line: %s", line[:200])
+
+    inserted = 0
+    failed = []
+    for start in range(0, len(events), batch_size):
+        batch = events[start:start + batch_size]
+        try:
+            insert_audit_events(batch, batch_size=batch_size)
+            inserted += len(batch)
+        except Exception:
+            logger.exception("Audit spool replay failed for %s event(s); keeping them spooled.", len(batch))
+            failed.extend(batch)
+
+    if failed:
+        with spool_lock(spool_path), open(spool_path, "a", encoding="utf-8") as spool_file:
+            spool_file.write("".join(f"{_serialize_event(event)}\n" for event in failed))
+    os.remove(replaying)
+    return inserted
+
+
+def get_audit_writer() -> AuditLogWriter:
+    """Process-wide writer, recreated after fork so each worker has its own thread."""
+    global _writer, _writer_pid
+    pid = os.getpid()
+    if _writer is not None and _writer_pid == pid:
+        return _writer
+    with _writer_lock:
+        if _writer is None or _writer_pid != pid:
+            _writer = AuditLogWriter(
+                batch_size=settings.AUDIT_LOG_BATCH_SIZE,
+                flush_interval=settings.AUDIT_LOG_FLUSH_INTERVAL_MS / 1000,
+                max_queue_size=settings.AUDIT_LOG_QUEUE_MAX_SIZE,
+                enqueue_timeout=settings.AUDIT_LOG_ENQUEUE_TIMEOUT_MS / 1000,
+                spool_path=settings.AUDIT_LOG_SPOOL_PATH,
+            )
+            _writer_pid = pid
+    return _writer
+
+
+@atexit.register
+def _flush_on_exit():
+    if _writer is not None and _writer_pid == os.getpid():
+        try:
+            _writer.stop()
+        except Exception:
+            logger.exception("Audit log flush at exit failed.")
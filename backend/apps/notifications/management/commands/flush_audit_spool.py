@@ -0,0 +1,28 @@
+"""Scheduled task: insert audit events that the buffered writer had to spool to disk."""
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from apps.notifications.audit_writer import get_audit_writer, replay_spool
+
+
+class Command(BaseCommand):
+    help = "Flush queued audit events and replay the audit spool file into AuditLog (scheduler task)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dry-run", action="store_true", help="Only report how many events are spooled.")
+
+    def handle(self, *args, **options):
+        spool_path = Path(settings.AUDIT_LOG_SPOOL_PATH)
+        if options["dry_run"]:
+            count = 0
+            if spool_path.exists():
+                with open(spool_path, encoding="utf-8") as spool_file:
+                    count = sum(1 for line in spool_file if line.strip())
+            self.stdout.write(self.style.WARNING(f"Would replay {count} spooled audit event(s)."))
+            return
+
+        flushed = get_audit_writer().flush() if settings.AUDIT_LOG_ASYNC else 0
+        replayed = replay_spool(spool_path, batch_size=settings.AUDIT_LOG_BATCH_SIZE)
+        self.stdout.write(self.style.SUCCESS(f"Flushed {flushed} queued and replayed {replayed} spooled audit event(s)."))
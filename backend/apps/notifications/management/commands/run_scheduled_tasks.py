@@ -1,13 +1,13 @@
-"""Run all scheduled tasks (notifications, most-wanted promotion, token expiry, payment reconciliation)."""
+"""Run all scheduled tasks (notifications, audit spool replay, most-wanted promotion, wanted ranking refresh, reward snapshots, token expiry, payment reconciliation, report counters)."""
 from django.core.management import call_command
 from django.core.management.base import BaseCommand
 
 
 class Command(BaseCommand):
-    help = "Run all scheduler tasks: notifications, wanted_promote, expire_tokens, payment_reconcile."
+    help = "Run all scheduler tasks: notifications, flush_audit_spool, wanted_promote, refresh_wanted_rankings, compute_reward_snapshots, expire_tokens, payment_reconcile, reconcile_stats."
 
     def add_arguments(self, parser):
-        parser.add_argument("--dry-run", action="store_true", help="Pass --dry-run to expire_tokens and payment_reconcile.")
+        parser.add_argument("--dry-run", action="store_true", help="Pass --dry-run to flush_audit_spool, refresh_wanted_rankings, compute_reward_snapshots, expire_tokens, payment_reconcile and reconcile_stats.")
 
     def handle(self, *args, **options):
         dry_run = options.get("dry_run", False)
@@ -16,13 +16,25 @@ class Command(BaseCommand):
         self.stdout.write("Running process_notifications...")
         call_command("process_notifications")
 
+        self.stdout.write("Running flush_audit_spool...")
+        call_command("flush_audit_spool", *extra)
+
         self.stdout.write("Running wanted_promote...")
         call_command("wanted_promote")
 
+        self.stdout.write("Running refresh_wanted_rankings...")
+        call_command("refresh_wanted_rankings", *extra)
+
+        self.stdout.write("Running compute_reward_snapshots...")
+        call_command("compute_reward_snapshots", *extra)
+
         self.stdout.write("Running expire_tokens...")
         call_command("expire_tokens", *extra)
 
         self.stdout.write("Running payment_reconcile...")
         call_command("payment_reconcile", *extra)
 
+        self.stdout.write("Running reconcile_stats...")
+        call_command("reconcile_stats", *extra)
+
         self.stdout.write(self.style.SUCCESS("All scheduled tasks completed."))
@@ -1,18 +1,16 @@
-from apps.notifications.services import log_request_audit_event, summarize_request_payload
+from apps.notifications.services import log_request_audit_event
 
 
 class AuditTrailMiddleware:
+    """Audit mutating API requests; the payload is summarised after the view so parsed data is reused."""
+
     def __init__(self, get_response):
         self.get_response = get_response
 
     def __call__(self, request):
-        try:
-            request._audit_payload_summary = summarize_request_payload(request)
-        except Exception:
-            request._audit_payload_summary = {}
         response = self.get_response(request)
         try:
-            log_request_audit_event(request, response, payload_summary=getattr(request, "_audit_payload_summary", {}))
+            log_request_audit_event(request, response)
         except Exception:
             pass
         return response
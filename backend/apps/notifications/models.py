@@ -1,5 +1,6 @@
 from django.conf import settings
 from django.db import models
+from django.utils import timezone
 
 
 class AuditLog(models.Model):
@@ -19,7 +20,8 @@ class AuditLog(models.Model):
     payload_summary = models.JSONField(default=dict, blank=True)
     ip_address = models.GenericIPAddressField(null=True, blank=True)
     user_agent = models.CharField(max_length=255, blank=True)
-    created_at = models.DateTimeField(auto_now_add=True)
+    # Set when the request is logged, not when the buffered writer inserts the row.
+    created_at = models.DateTimeField(default=timezone.now)
 
     class Meta:
         indexes = [
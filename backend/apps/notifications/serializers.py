@@ -1 +1,49 @@
+from django.contrib.auth import get_user_model
+from rest_framework import serializers
 
+from apps.notifications.models import AuditLog, TimelineEvent
+
+
+class NotificationActorSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = get_user_model()
+        fields = ["id", "username", "full_name"]
+
+
+class AuditLogSerializer(serializers.ModelSerializer):
+    actor = NotificationActorSerializer(read_only=True)
+
+    class Meta:
+        model = AuditLog
+        fields = [
+            "id",
+            "actor",
+            "action",
+            "request_method",
+            "request_path",
+            "target_type",
+            "target_id",
+            "status_code",
+            "payload_summary",
+            "ip_address",
+            "user_agent",
+            "created_at",
+        ]
+
+
+class TimelineEventSerializer(serializers.ModelSerializer):
+    actor = NotificationActorSerializer(read_only=True)
+
+    class Meta:
+        model = TimelineEvent
+        fields = [
+            "id",
+            "actor",
+            "event_type",
+            "case_reference",
+            "target_type",
+            "target_id",
+            "summary",
+            "payload_summary",
+            "created_at",
+        ]
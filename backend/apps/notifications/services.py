@@ -1,8 +1,15 @@
 
 import json
 
-from django.http import RawPostDataException
-
+from django.conf import settings
+from django.core.exceptions import RequestDataTooBig
+from django.core.files.uploadedfile import UploadedFile
+from django.http import QueryDict, RawPostDataException
+from django.utils import timezone
+from django.utils.datastructures import MultiValueDict
+from rest_framework.request import Empty
+
+from apps.notifications.audit_writer import get_audit_writer
 from apps.notifications.models import AuditLog, TimelineEvent
 
 SENSITIVE_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
@@ -37,40 +44,106 @@ def summarize_payload(data, depth: int = 0):
         return data
     if isinstance(data, (int, float, bool)) or data is None:
         return data
+    if isinstance(data, UploadedFile):
+        return {"file": data.name, "size": data.size, "content_type": data.content_type}
     return str(data)
 
 
-def summarize_request_payload(request):
+def _content_type(request) -> str:
+    return (request.META.get("CONTENT_TYPE") or "").split(";")[0].strip().lower()
+
+
+def _content_length(request) -> int:
     try:
-        raw_body = request.body if hasattr(request, "body") else b""
-    except RawPostDataException:
-        raw_body = getattr(request, "_body", b"")
-    if not raw_body:
+        return int(request.META.get("CONTENT_LENGTH") or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+def _flatten_multivalue(data):
+    if isinstance(data, MultiValueDict):
+        return {key: values[0] if len(values) == 1 else values for key, values in data.lists()}
+    return data
+
+
+def _summarize_parsed(data):
+    sanitized = summarize_payload(_flatten_multivalue(data))
+    if isinstance(sanitized, dict):
+        if not sanitized:
+            return {}
+        return {"keys": sorted(sanitized.keys()), "data": sanitized}
+    return {"data": sanitized}
+
+
+def _summarize_form(post, files):
+    data = _flatten_multivalue(post) if post is not None else {}
+    if files:
+        data = {**data, **_flatten_multivalue(files)}
+    return _summarize_parsed(data)
+
+
+def _unparsed_summary(size: int, content_type: str, truncated: bool = False):
+    if not size:
+        return {}
+    summary = {"size": size, "format": content_type or "unknown"}
+    if truncated:
+        summary["truncated"] = True
+    return summary
+
+
+def summarize_request_payload(request, response=None):
+    """
+    Summarise a request body for the audit trail after the view has run.
+
+    Data the view already parsed is reused: DRF's request.data (reached through
+    response.renderer_context) or a form Django already parsed. Otherwise only bodies
+    up to AUDIT_PAYLOAD_MAX_BYTES are read; multipart bodies are never read or parsed
+    here, and uploaded files are described by name, size and content type only.
+    """
+    renderer_context = getattr(response, "renderer_context", None) or {}
+    drf_request = renderer_context.get("request")
+    if drf_request is not None:
+        parsed = getattr(drf_request, "_full_data", Empty)
+        if parsed is not Empty and parsed:
+            return _summarize_parsed(parsed)
+
+    content_type = _content_type(request)
+    content_length = _content_length(request)
+    parsed_post = getattr(request, "_post", None)
+    if content_type.startswith("multipart/"):
+        if parsed_post:
+            return _summarize_form(parsed_post, getattr(request, "_files", None))
+        return _unparsed_summary(content_length, content_type)
+
+    raw_body = getattr(request, "_body", None)
+    if raw_body is None:
+        if parsed_post:
+            return _summarize_form(parsed_post, None)
+        if not content_length or getattr(request, "_read_started", False):
+            return _unparsed_summary(content_length, content_type)
+        if content_length > settings.AUDIT_PAYLOAD_MAX_BYTES:
+            return _unparsed_summary(content_length, content_type, truncated=True)
         try:
-            if hasattr(request, "POST"):
-                sanitized_post = summarize_payload(dict(request.POST))
-                if sanitized_post:
-                    return {"keys": sorted(sanitized_post.keys()), "data": sanitized_post}
-        except Exception:
-            pass
+            raw_body = request.body
+        except (RawPostDataException, RequestDataTooBig):
+            return _unparsed_summary(content_length, content_type)
+
+    if not raw_body:
         return {}
+    if len(raw_body) > settings.AUDIT_PAYLOAD_MAX_BYTES:
+        return _unparsed_summary(len(raw_body), content_type, truncated=True)
 
-    content_type = (request.META.get("CONTENT_TYPE") or "").split(";")[0].strip().lower()
     if content_type == "application/json":
         try:
-            parsed = json.loads(raw_body.decode("utf-8"))
+            parsed = json.loads(raw_body)
         except (UnicodeDecodeError, json.JSONDecodeError):
             return {"size": len(raw_body), "format": "unknown"}
-        sanitized = summarize_payload(parsed)
-        if isinstance(sanitized, dict):
-            return {"keys": sorted(sanitized.keys()), "data": sanitized}
-        return {"data": sanitized}
+        return _summarize_parsed(parsed)
 
-    if content_type in {"application/x-www-form-urlencoded", "multipart/form-data"}:
-        sanitized = summarize_payload(dict(request.POST))
-        return {"keys": sorted(sanitized.keys()), "data": sanitized}
+    if content_type == "application/x-www-form-urlencoded":
+        return _summarize_form(QueryDict(raw_body, encoding=request.encoding), None)
 
-    return {"size": len(raw_body), "format": content_type or "unknown"}
+    return _unparsed_summary(len(raw_body), content_type)
 
 
 def extract_target_from_path(path: str):
@@ -113,18 +186,27 @@ def log_audit_event(
     ip_address: str | None,
     user_agent: str,
 ):
-    return AuditLog.objects.create(
-        actor=actor,
-        action=action,
-        request_method=request_method,
-        request_path=request_path,
-        target_type=target_type,
-        target_id=target_id,
-        status_code=status_code,
-        payload_summary=payload_summary or {},
-        ip_address=ip_address,
-        user_agent=(user_agent or "")[:255],
-    )
+    """
+    Record an audit row. With AUDIT_LOG_ASYNC the event is handed to the buffered writer
+    (apps.notifications.audit_writer) and None is returned; otherwise the row is inserted now.
+    """
+    event = {
+        "actor_id": actor.pk if actor is not None else None,
+        "action": action,
+        "request_method": request_method,
+        "request_path": request_path,
+        "target_type": target_type,
+        "target_id": target_id,
+        "status_code": status_code,
+        "payload_summary": payload_summary or {},
+        "ip_address": ip_address,
+        "user_agent": (user_agent or "")[:255],
+        "created_at": timezone.now(),
+    }
+    if getattr(settings, "AUDIT_LOG_ASYNC", False):
+        get_audit_writer().enqueue(event)
+        return None
+    return AuditLog.objects.create(**event)
 
 
 def log_request_audit_event(request, response, payload_summary=None):
@@ -135,7 +217,7 @@ def log_request_audit_event(request, response, payload_summary=None):
         return None
 
     actor = request.user if getattr(request, "user", None) and request.user.is_authenticated else None
-    summary = payload_summary if payload_summary is not None else summarize_request_payload(request)
+    summary = payload_summary if payload_summary is not None else summarize_request_payload(request, response)
     target_type, target_id = extract_target_from_path(request.path)
     action = f"http.{method.lower()}"
     return log_audit_event(
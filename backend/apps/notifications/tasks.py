@@ -5,8 +5,16 @@ from django.core.management import call_command
 
 @shared_task(name="apps.notifications.tasks.run_all_scheduled_tasks")
 def run_all_scheduled_tasks():
-    """Run all scheduler tasks: notifications, most-wanted promotion, token expiry, payment reconciliation."""
+    """Run all scheduler tasks: notifications, audit spool replay, most-wanted promotion, wanted ranking refresh, reward snapshots, token expiry, payment reconciliation, report counter reconciliation, stale case dossiers, expired evidence uploads, orphaned evidence blobs, pending evidence derivatives."""
     call_command("process_notifications")
+    call_command("flush_audit_spool")
     call_command("wanted_promote")
+    call_command("refresh_wanted_rankings")
+    call_command("compute_reward_snapshots")
     call_command("expire_tokens")
     call_command("payment_reconcile")
+    call_command("reconcile_stats")
+    call_command("rebuild_case_dossiers")
+    call_command("purge_upload_sessions")
+    call_command("collect_evidence_blobs")
+    call_command("generate_evidence_derivatives")
@@ -1,13 +1,31 @@
 
+import tempfile
+from datetime import timedelta
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+
 from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import DatabaseError
+from django.test import RequestFactory, override_settings
+from django.utils import timezone
 from rest_framework import status
 from rest_framework.authtoken.models import Token
+from rest_framework.parsers import MultiPartParser
+from rest_framework.request import Request
+from rest_framework.response import Response
 from rest_framework.test import APITestCase
 
 from apps.access.models import Permission, Role, RolePermission, UserRoleAssignment
+from apps.notifications import audit_writer
+from apps.notifications.audit_writer import AuditLogWriter, replay_spool
 from apps.notifications.models import AuditLog, TimelineEvent
+from apps.notifications.services import summarize_request_payload
 
 
+@override_settings(AUDIT_LOG_ASYNC=False)
 class AuditTrailInfrastructureTests(APITestCase):
     def setUp(self):
         self.admin_user = get_user_model().objects.create_superuser(
@@ -151,6 +169,211 @@ class AuditTrailInfrastructureTests(APITestCase):
         self.assertEqual(audit.status_code, status.HTTP_200_OK)
 
 
+class BufferedAuditLogWriterTests(APITestCase):
+    def setUp(self):
+        self.admin_user = get_user_model().objects.create_superuser(
+            username="admin04",
+            email="admin04@example.com",
+            password="StrongPass123!",
+            phone="09120004001",
+            national_id="4000000001",
+            full_name="Admin User Four",
+        )
+        self.admin_token = Token.objects.create(user=self.admin_user)
+        spool_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(spool_dir.cleanup)
+        self.spool_path = Path(spool_dir.name) / "audit_spool.jsonl"
+
+    def _writer(self, **overrides):
+        options = {
+            "batch_size": 50,
+            "flush_interval": 1.0,
+            "max_queue_size": 100,
+            "enqueue_timeout": 0,
+            "spool_path": self.spool_path,
+            "autostart": False,
+        }
+        options.update(overrides)
+        return AuditLogWriter(**options)
+
+    def test_middleware_enqueues_and_flush_bulk_inserts_rows(self):
+        writer = self._writer()
+        role = Role.objects.create(key="lieutenant", name="Lieutenant")
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {self.admin_token.key}")
+
+        with override_settings(AUDIT_LOG_ASYNC=True), mock.patch(
+            "apps.notifications.services.get_audit_writer", return_value=writer
+        ):
+            for index in range(3):
+                response = self.client.patch(
+                    f"/api/v1/access/roles/{role.id}/",
+                    {"description": f"Revision {index}", "password": "secret"},
+                    format="json",
+                )
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        path = f"/api/v1/access/roles/{role.id}/"
+        self.assertFalse(AuditLog.objects.filter(request_path=path).exists())
+        self.assertEqual(writer.queue.qsize(), 3)
+
+        # One actor existence check plus one bulk INSERT for the whole batch.
+        with self.assertNumQueries(2):
+            self.assertEqual(writer.flush(), 3)
+
+        audits = list(AuditLog.objects.filter(request_path=path).order_by("created_at"))
+        self.assertEqual(len(audits), 3)
+        self.assertEqual(audits[0].actor_id, self.admin_user.id)
+        self.assertEqual(audits[0].target_id, str(role.id))
+        self.assertEqual(audits[2].payload_summary["data"]["description"], "Revision 2")
+        self.assertEqual(audits[2].payload_summary["data"]["password"], "[REDACTED]")
+
+    def test_full_queue_spools_events_and_replay_inserts_them(self):
+        writer = self._writer(max_queue_size=1)
+        with override_settings(AUDIT_LOG_ASYNC=True), mock.patch(
+            "apps.notifications.services.get_audit_writer", return_value=writer
+        ):
+            for _ in range(3):
+                self.client.post("/api/v1/identity/auth/login/", {"identifier": "nobody", "password": "x"}, format="json")
+
+        self.assertEqual(writer.queue.qsize(), 1)
+        self.assertEqual(len(self.spool_path.read_text(encoding="utf-8").splitlines()), 2)
+
+        with override_settings(AUDIT_LOG_SPOOL_PATH=str(self.spool_path)):
+            call_command("flush_audit_spool", stdout=StringIO())
+        writer.flush()
+
+        self.assertFalse(self.spool_path.exists())
+        self.assertEqual(AuditLog.objects.filter(request_path="/api/v1/identity/auth/login/").count(), 3)
+
+    def test_failed_batch_is_spooled_with_original_timestamp(self):
+        writer = self._writer()
+        writer.enqueue(
+            {
+                "actor_id": self.admin_user.id,
+                "action": "http.post",
+                "request_method": "POST",
+                "request_path": "/api/v1/cases/",
+                "target_type": "cases",
+                "target_id": "",
+                "status_code": 201,
+                "payload_summary": {},
+                "ip_address": "127.0.0.1",
+                "user_agent": "",
+                "created_at": timezone.now() - timedelta(minutes=5),
+            }
+        )
+        with mock.patch.object(AuditLog.objects, "bulk_create", side_effect=DatabaseError("unavailable")):
+            self.assertEqual(writer.flush(), 0)
+        self.assertTrue(self.spool_path.exists())
+
+        self.admin_user.delete()
+        with override_settings(AUDIT_LOG_SPOOL_PATH=str(self.spool_path)):
+            call_command("flush_audit_spool", stdout=StringIO())
+
+        audit = AuditLog.objects.get(request_path="/api/v1/cases/")
+        self.assertIsNone(audit.actor_id)
+        self.assertLess(audit.created_at, timezone.now() - timedelta(minutes=4))
+
+
+    def test_replay_renames_under_the_spool_lock_and_picks_up_abandoned_replay_files(self):
+        writer = self._writer()
+        event = {
+            "action": "http.post",
+            "request_method": "POST",
+            "request_path": "/api/v1/cases/",
+            "status_code": 201,
+            "created_at": timezone.now(),
+        }
+        writer.spool([event])
+        # A replay that died after renaming the spool leaves its file behind.
+        self.spool_path.rename(self.spool_path.with_name(f"{self.spool_path.name}.replay-999"))
+        writer.spool([event])
+
+        held_during_rename = []
+        real_replace = audit_writer.os.replace
+
+        def replace(source, target):
+            held_during_rename.append(audit_writer._spool_thread_lock(self.spool_path).locked())
+            real_replace(source, target)
+
+        with mock.patch.object(audit_writer.os, "replace", side_effect=replace):
+            self.assertEqual(replay_spool(self.spool_path), 2)
+
+        self.assertEqual(held_during_rename, [True])
+        self.assertEqual(AuditLog.objects.filter(request_path="/api/v1/cases/").count(), 2)
+        self.assertEqual(list(self.spool_path.parent.glob("*.replay-*")), [])
+        self.assertEqual(replay_spool(self.spool_path), 0)
+
+@override_settings(AUDIT_LOG_ASYNC=False)
+class AuditPayloadSummaryTests(APITestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    def test_multipart_register_is_summarised_from_parsed_form(self):
+        response = self.client.post(
+            "/api/v1/identity/auth/register/",
+            {
+                "username": "citizen05",
+                "email": "citizen05@example.com",
+                "phone": "09120005002",
+                "national_id": "5000000002",
+                "full_name": "Citizen Five",
+                "password": "StrongPass123!",
+                "password_confirm": "StrongPass123!",
+            },
+            format="multipart",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        audit = AuditLog.objects.filter(request_path="/api/v1/identity/auth/register/").latest("id")
+        self.assertEqual(audit.payload_summary["data"]["username"], "citizen05")
+        self.assertEqual(audit.payload_summary["data"]["password"], "[REDACTED]")
+        self.assertEqual(audit.payload_summary["data"]["national_id"], "[REDACTED]")
+
+    def test_unparsed_multipart_body_is_never_read(self):
+        upload = SimpleUploadedFile("scene.jpg", b"\xff\xd8" + b"x" * 4096, content_type="image/jpeg")
+        request = self.factory.post("/api/v1/evidence/", {"title": "Scene", "file": upload})
+
+        summary = summarize_request_payload(request)
+
+        self.assertEqual(summary["format"], "multipart/form-data")
+        self.assertGreater(summary["size"], 4096)
+        self.assertFalse(request._read_started)
+        self.assertFalse(hasattr(request, "_post"))
+
+    def test_drf_parsed_upload_is_described_without_file_content(self):
+        upload = SimpleUploadedFile("scene.jpg", b"\xff\xd8" + b"x" * 4096, content_type="image/jpeg")
+        drf_request = Request(
+            self.factory.post("/api/v1/evidence/", {"title": "Scene", "file": upload}),
+            parsers=[MultiPartParser()],
+        )
+        drf_request.data
+        response = Response({})
+        response.renderer_context = {"request": drf_request}
+
+        summary = summarize_request_payload(drf_request._request, response)
+
+        self.assertEqual(summary["keys"], ["file", "title"])
+        self.assertEqual(summary["data"]["title"], "Scene")
+        self.assertEqual(
+            summary["data"]["file"],
+            {"file": "scene.jpg", "size": 4098, "content_type": "image/jpeg"},
+        )
+
+    @override_settings(AUDIT_PAYLOAD_MAX_BYTES=128)
+    def test_json_body_over_cap_is_not_read(self):
+        request = self.factory.post(
+            "/api/v1/cases/",
+            data='{"description": "%s"}' % ("x" * 1000),
+            content_type="application/json",
+        )
+
+        summary = summarize_request_payload(request)
+
+        self.assertEqual(summary, {"size": 1019, "format": "application/json", "truncated": True})
+        self.assertFalse(request._read_started)
+
+
 class ScheduledTasksTests(APITestCase):
     """Tests for async/scheduler management commands (task 42)."""
 
@@ -174,3 +397,62 @@ class ScheduledTasksTests(APITestCase):
         out = StringIO()
         call_command("payment_reconcile", "--dry-run", stdout=out)
         self.assertIn("transaction", out.getvalue().lower())
+
+
+@override_settings(AUDIT_LOG_ASYNC=False)
+class AuditAndTimelineListTests(APITestCase):
+    def setUp(self):
+        self.admin_user = get_user_model().objects.create_superuser(
+            username="admin06",
+            email="admin06@example.com",
+            password="StrongPass123!",
+            phone="09120006101",
+            national_id="6000000101",
+            full_name="Admin User Six",
+        )
+        self.admin_token = Token.objects.create(user=self.admin_user)
+        self.viewer = get_user_model().objects.create_user(
+            username="viewer06",
+            email="viewer06@example.com",
+            password="StrongPass123!",
+            phone="09120006102",
+            national_id="6000000102",
+            full_name="Viewer Six",
+        )
+        self.viewer_token = Token.objects.create(user=self.viewer)
+
+    def test_audit_list_pages_by_cursor_newest_first(self):
+        for index in range(3):
+            AuditLog.objects.create(
+                action="http.post",
+                request_method="POST",
+                request_path=f"/api/v1/cases/{index}/",
+                target_type="cases",
+                target_id=str(index),
+            )
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {self.admin_token.key}")
+
+        first = self.client.get("/api/v1/notifications/audit-logs/?target_type=cases&page_size=2")
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+        self.assertEqual([item["target_id"] for item in first.data["data"]["results"]], ["2", "1"])
+
+        second = self.client.get(first.data["data"]["next"])
+        self.assertEqual([item["target_id"] for item in second.data["data"]["results"]], ["0"])
+        self.assertIsNone(second.data["data"]["next"])
+
+    def test_timeline_list_filters_by_case_reference_and_requires_permission(self):
+        TimelineEvent.objects.create(event_type="cases.case.created", case_reference="CASE-1", summary="one")
+        TimelineEvent.objects.create(event_type="cases.case.created", case_reference="CASE-2", summary="two")
+
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {self.viewer_token.key}")
+        denied = self.client.get("/api/v1/notifications/timeline-events/")
+        self.assertEqual(denied.status_code, status.HTTP_403_FORBIDDEN)
+
+        role = Role.objects.create(key="timeline_viewer", name="Timeline Viewer")
+        RolePermission.objects.create(role=role, permission=Permission.objects.get(code="notifications.timeline.view"))
+        UserRoleAssignment.objects.create(user=self.viewer, role=role, assigned_by=self.admin_user)
+
+        response = self.client.get("/api/v1/notifications/timeline-events/?case_reference=CASE-2&include_total=1")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["data"]["count"], 1)
+        self.assertEqual(response.data["data"]["results"][0]["summary"], "two")
@@ -1,4 +1,8 @@
 from django.urls import path
 
-urlpatterns = []
+from apps.notifications.views import AuditLogListAPIView, TimelineEventListAPIView
 
+urlpatterns = [
+    path("audit-logs/", AuditLogListAPIView.as_view(), name="notifications-audit-log-list"),
+    path("timeline-events/", TimelineEventListAPIView.as_view(), name="notifications-timeline-event-list"),
+]
@@ -1 +1,66 @@
+from rest_framework import status
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.views import APIView
 
+from apps.access.permissions import HasRBACPermissions
+from apps.identity.services import error_response, success_response
+from apps.notifications.models import AuditLog, TimelineEvent
+from apps.notifications.serializers import AuditLogSerializer, TimelineEventSerializer
+from config.pagination import KeysetPagination
+
+
+class AuditLogListAPIView(APIView):
+    """
+    GET: Audit trail, newest first, always cursor-paginated (see config.pagination).
+    Query: action, request_method, target_type, target_id, actor_id, page_size, cursor, include_total.
+    """
+
+    authentication_classes = [TokenAuthentication]
+    permission_classes = [IsAuthenticated, HasRBACPermissions]
+    required_permission_codes = ["notifications.audit.view"]
+
+    def get(self, request):
+        queryset = AuditLog.objects.select_related("actor")
+        for param in ("action", "target_type", "target_id"):
+            value = request.query_params.get(param)
+            if value:
+                queryset = queryset.filter(**{param: value})
+        request_method = request.query_params.get("request_method")
+        if request_method:
+            queryset = queryset.filter(request_method=request_method.upper())
+        actor_id = request.query_params.get("actor_id")
+        if actor_id:
+            if not actor_id.isdigit():
+                return error_response(
+                    code="VALIDATION_ERROR",
+                    message="actor_id must be an integer.",
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                )
+            queryset = queryset.filter(actor_id=int(actor_id))
+        paginator = KeysetPagination(ordering=["-created_at"])
+        page = paginator.paginate_queryset(queryset, request, view=self)
+        serializer = AuditLogSerializer(page, many=True)
+        return success_response(paginator.get_payload(serializer.data), status_code=status.HTTP_200_OK)
+
+
+class TimelineEventListAPIView(APIView):
+    """
+    GET: Workflow timeline events, newest first, always cursor-paginated (see config.pagination).
+    Query: event_type, case_reference, target_type, target_id, page_size, cursor, include_total.
+    """
+
+    authentication_classes = [TokenAuthentication]
+    permission_classes = [IsAuthenticated, HasRBACPermissions]
+    required_permission_codes = ["notifications.timeline.view"]
+
+    def get(self, request):
+        queryset = TimelineEvent.objects.select_related("actor")
+        for param in ("event_type", "case_reference", "target_type", "target_id"):
+            value = request.query_params.get(param)
+            if value:
+                queryset = queryset.filter(**{param: value})
+        paginator = KeysetPagination(ordering=["-created_at"])
+        page = paginator.paginate_queryset(queryset, request, view=self)
+        serializer = TimelineEventSerializer(page, many=True)
+        return success_response(paginator.get_payload(serializer.data), status_code=status.HTTP_200_OK)
@@ -0,0 +1,139 @@
+"""
+Response cache for report endpoints.
+
+An entry holds the payload, its ETag and the time it stops being fresh. Within
+REPORTS_CACHE_TTL seconds it is served as-is. For REPORTS_CACHE_STALE_TTL seconds after
+that it is still served while the one worker holding the recompute lock (cache.add)
+refreshes it. With no entry at all, other workers wait up to REPORTS_CACHE_LOCK_WAIT_MS
+for the lock holder instead of all recomputing at once (single flight).
+
+Responses carry ETag and Cache-Control (max-age + stale-while-revalidate) so browsers and
+CDNs can revalidate with If-None-Match and get a 304.
+"""
+import hashlib
+import json
+import logging
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils.cache import patch_vary_headers
+from django.utils.http import parse_etags
+from rest_framework import status
+from rest_framework.response import Response
+
+from apps.identity.services import success_response
+
+logger = logging.getLogger(__name__)
+
+CACHE_KEY_PREFIX = "reports:response:"
+LOCK_POLL_INTERVAL = 0.05
+
+
+def _ttl() -> int:
+    return getattr(settings, "REPORTS_CACHE_TTL", 60)
+
+
+def _stale_ttl() -> int:
+    return getattr(settings, "REPORTS_CACHE_STALE_TTL", 300)
+
+
+def compute_etag(data) -> str:
+    digest = hashlib.sha256(json.dumps(data, sort_keys=True, cls=DjangoJSONEncoder).encode("utf-8")).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+def _build_entry(data) -> dict:
+    return {"data": data, "etag": compute_etag(data), "fresh_until": time.time() + _ttl()}
+
+
+def _read(key):
+    try:
+        return cache.get(key)
+    except Exception:
+        logger.warning("Report cache read failed for %s.", key, exc_info=True)
+        return None
+
+
+def _store(key, data) -> dict:
+    entry = _build_entry(data)
+    try:
+        cache.set(key, entry, timeout=_ttl() + _stale_ttl())
+    except Exception:
+        logger.warning("Report cache write failed for %s.", key, exc_info=True)
+    return entry
+
+
+def _acquire_lock(lock_key) -> bool:
+    try:
+        return cache.add(lock_key, 1, timeout=getattr(settings, "REPORTS_CACHE_LOCK_TIMEOUT", 30))
+    except Exception:
+        logger.warning("Report cache lock failed for %s; recomputing.", lock_key, exc_info=True)
+        return True
+
+
+def _release_lock(lock_key):
+    try:
+        cache.delete(lock_key)
+    except Exception:
+        logger.warning("Report cache unlock failed for %s.", lock_key, exc_info=True)
+
+
+def get_report_entry(name: str, compute) -> dict:
+    """Return {"data", "etag", "fresh_until"} for the named report, recomputing at most once at a time."""
+    if _ttl() <= 0:
+        return _build_entry(compute())
+
+    key = f"{CACHE_KEY_PREFIX}{name}"
+    lock_key = f"{key}:lock"
+    entry = _read(key)
+    if entry is not None and entry["fresh_until"] > time.time():
+        return entry
+
+    if _acquire_lock(lock_key):
+        try:
+            return _store(key, compute())
+        finally:
+            _release_lock(lock_key)
+
+    if entry is not None:
+        return entry
+
+    deadline = time.monotonic() + getattr(settings, "REPORTS_CACHE_LOCK_WAIT_MS", 2000) / 1000
+    while time.monotonic() < deadline:
+        time.sleep(LOCK_POLL_INTERVAL)
+        entry = _read(key)
+        if entry is not None:
+            return entry
+    return _store(key, compute())
+
+
+def _etag_matches(request, etag: str) -> bool:
+    header = request.headers.get("If-None-Match")
+    if not header:
+        return False
+    candidates = parse_etags(header)
+    if "*" in candidates:
+        return True
+    return any(candidate.removeprefix("W/") == etag for candidate in candidates)
+
+
+def cached_report_response(request, name: str, compute, *, public: bool = False):
+    """
+    success_response for a cached report, or 304 when If-None-Match matches its ETag.
+    Authenticated reports are marked private so shared caches do not store them.
+    """
+    entry = get_report_entry(name, compute)
+    if _etag_matches(request, entry["etag"]):
+        response = Response(status=status.HTTP_304_NOT_MODIFIED)
+    else:
+        response = success_response(entry["data"], status_code=status.HTTP_200_OK)
+
+    max_age = max(0, int(entry["fresh_until"] - time.time()))
+    visibility = "public" if public else "private"
+    response["ETag"] = entry["etag"]
+    response["Cache-Control"] = f"{visibility}, max-age={max_age}, stale-while-revalidate={_stale_ttl()}"
+    if not public:
+        patch_vary_headers(response, ("Authorization",))
+    return response
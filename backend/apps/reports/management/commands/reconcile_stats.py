@@ -0,0 +1,23 @@
+"""Scheduled task: recount tracked models and correct drifted report counters."""
+from django.core.management.base import BaseCommand
+
+from apps.reports.stats import reconcile_stat_counters
+
+
+class Command(BaseCommand):
+    help = "Recount cases, wanted, reward tips, reasonings and users and fix drifted StatCounter rows (scheduler task)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dry-run", action="store_true", help="Only report counters that drifted.")
+
+    def handle(self, *args, **options):
+        dry_run = options["dry_run"]
+        drift = reconcile_stat_counters(dry_run=dry_run)
+        for item in drift:
+            self.stdout.write(
+                f"{item['scope']}.{item['dimension']}={item['value']}: stored {item['stored']}, actual {item['actual']}"
+            )
+        if dry_run:
+            self.stdout.write(self.style.WARNING(f"Would correct {len(drift)} stat counter(s)."))
+        else:
+            self.stdout.write(self.style.SUCCESS(f"Corrected {len(drift)} stat counter(s)."))
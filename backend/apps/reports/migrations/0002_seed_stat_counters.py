@@ -0,0 +1,47 @@
+from django.db import migrations
+from django.db.models import Count
+
+TRACKED = {
+    "cases": ("cases", "Case", ("status", "level", "source_type")),
+    "wanted": ("wanted", "Wanted", ("status",)),
+    "reward_tips": ("rewards", "RewardTip", ("status",)),
+    "reasonings": ("investigation", "ReasoningSubmission", ("status",)),
+    "users": ("identity", "User", ("is_active",)),
+}
+
+
+def _value(value):
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if value is None:
+        return ""
+    return str(value)
+
+
+def seed_stat_counters(apps, schema_editor):
+    StatCounter = apps.get_model("reports", "StatCounter")
+    counters = []
+    for scope, (app_label, model_name, fields) in TRACKED.items():
+        model = apps.get_model(app_label, model_name)
+        counters.append(StatCounter(scope=scope, dimension="all", value="", count=model.objects.count()))
+        for field in fields:
+            rows = model.objects.order_by().values(field).annotate(row_count=Count("pk")).values_list(field, "row_count")
+            for value, row_count in rows:
+                counters.append(StatCounter(scope=scope, dimension=field, value=_value(value), count=row_count))
+    StatCounter.objects.bulk_create(counters)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("reports", "0001_initial"),
+        ("cases", "0005_scenecasereport"),
+        ("wanted", "0001_initial"),
+        ("rewards", "0002_rewardtip"),
+        ("investigation", "0003_arrest_and_interrogation_orders"),
+        ("identity", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.RunPython(seed_stat_counters, migrations.RunPython.noop),
+    ]
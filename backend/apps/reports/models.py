@@ -1,2 +1,22 @@
 from django.db import models
 
+
+class StatCounter(models.Model):
+    """Materialised row count for one (scope, dimension, value); maintained by apps.reports.stats."""
+
+    scope = models.CharField(max_length=64)
+    dimension = models.CharField(max_length=64)
+    value = models.CharField(max_length=64, blank=True)
+    count = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["scope", "dimension", "value"],
+                name="reports_statcounter_unique_key",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.scope}.{self.dimension}={self.value}: {self.count}"
@@ -1,45 +1,60 @@
-"""Aggregated statistics for homepage and general reporting."""
-from django.db.models import Count
-
+"""Aggregated statistics for homepage and general reporting (read from StatCounter rows)."""
 from apps.cases.models import Case
-from apps.investigation.models import ReasoningSubmission
-from apps.rewards.models import RewardTip
+from apps.reports.stats import TOTAL_DIMENSION, load_counters
+from apps.rewards.models import LatestRankingSnapshot, RewardTip
 from apps.wanted.models import Wanted
 
 
-def get_case_counts():
-    """Total cases and by status."""
-    total = Case.objects.count()
-    by_status = dict(
-        Case.objects.values("status").annotate(count=Count("id")).values_list("status", "count")
-    )
-    return {"total": total, "by_status": by_status}
+def _total(scope_counters) -> int:
+    return scope_counters.get(TOTAL_DIMENSION, {}).get("", 0)
+
+
+def _by_value(scope_counters, dimension) -> dict:
+    return {value: count for value, count in scope_counters.get(dimension, {}).items() if count}
+
+
+def get_case_counts(counters=None):
+    """Total cases and by status, level and source type."""
+    counters = counters if counters is not None else load_counters(["cases"])
+    cases = counters.get("cases", {})
+    return {
+        "total": _total(cases),
+        "by_status": _by_value(cases, "status"),
+        "by_level": _by_value(cases, "level"),
+        "by_source_type": _by_value(cases, "source_type"),
+    }
 
 
-def get_case_stage_distribution():
+def get_case_stage_distribution(counters=None):
     """Count per stage (status) for distribution charts."""
-    return list(
-        Case.objects.values("status").annotate(count=Count("id")).order_by("-count")
-    )
+    counters = counters if counters is not None else load_counters(["cases"])
+    by_status = _by_value(counters.get("cases", {}), "status")
+    return [
+        {"status": value, "count": count}
+        for value, count in sorted(by_status.items(), key=lambda item: (-item[1], item[0]))
+    ]
 
 
-def get_approval_stats():
+def get_approval_stats(counters=None):
     """Reasoning approvals: approved vs rejected counts."""
-    approved = ReasoningSubmission.objects.filter(status="approved").count()
-    rejected = ReasoningSubmission.objects.filter(status="rejected").count()
-    pending = ReasoningSubmission.objects.filter(status="pending").count()
-    return {"reasoning_approved": approved, "reasoning_rejected": rejected, "reasoning_pending": pending}
-
-
-def get_wanted_rankings(limit=50):
-    """Wanted / most wanted counts and top by ranking (from RewardComputationSnapshot if available)."""
-    from apps.rewards.models import RewardComputationSnapshot
-    wanted_count = Wanted.objects.filter(status="wanted").count()
-    most_wanted_count = Wanted.objects.filter(status="most_wanted").count()
-    # Latest snapshot per national_id for ranking
+    counters = counters if counters is not None else load_counters(["reasonings"])
+    by_status = counters.get("reasonings", {}).get("status", {})
+    return {
+        "reasoning_approved": by_status.get("approved", 0),
+        "reasoning_rejected": by_status.get("rejected", 0),
+        "reasoning_pending": by_status.get("pending", 0),
+    }
+
+
+def get_wanted_rankings(limit=50, counters=None):
+    """Wanted / most wanted counts and top by ranking (one current row per national_id)."""
+    counters = counters if counters is not None else load_counters(["wanted"])
+    by_status = counters.get("wanted", {}).get("status", {})
+    wanted_count = by_status.get(Wanted.Status.WANTED, 0)
+    most_wanted_count = by_status.get(Wanted.Status.MOST_WANTED, 0)
     snapshots = (
-        RewardComputationSnapshot.objects.values("national_id", "full_name", "ranking_score", "reward_amount_rials")
-        .order_by("-ranking_score")[:limit]
+        LatestRankingSnapshot.objects.values("national_id", "full_name", "ranking_score", "reward_amount_rials")
+        .order_by("-ranking_score", "national_id")[:limit]
     )
     return {
         "wanted_count": wanted_count,
@@ -48,29 +63,30 @@ def get_wanted_rankings(limit=50):
     }
 
 
-def get_reward_outcomes():
+def get_reward_outcomes(counters=None):
     """Reward tip outcomes: approved, rejected, pending."""
-    approved = RewardTip.objects.filter(status="approved").count()
-    rejected = RewardTip.objects.filter(status="rejected").count()
-    pending = RewardTip.objects.filter(
-        status__in=[RewardTip.Status.PENDING_POLICE, RewardTip.Status.PENDING_DETECTIVE]
-    ).count()
-    return {"tips_approved": approved, "tips_rejected": rejected, "tips_pending": pending}
+    counters = counters if counters is not None else load_counters(["reward_tips"])
+    by_status = counters.get("reward_tips", {}).get("status", {})
+    return {
+        "tips_approved": by_status.get(RewardTip.Status.APPROVED, 0),
+        "tips_rejected": by_status.get(RewardTip.Status.REJECTED, 0),
+        "tips_pending": by_status.get(RewardTip.Status.PENDING_POLICE, 0)
+        + by_status.get(RewardTip.Status.PENDING_DETECTIVE, 0),
+    }
 
 
-def get_homepage_stats():
+def get_homepage_stats(counters=None):
     """Aggregated stats for homepage: case counts, active cases, staff count placeholder, etc."""
-    case_counts = get_case_counts()
-    active = Case.objects.exclude(
-        status__in=[Case.Status.CLOSED, Case.Status.FINAL_INVALID]
-    ).count()
-    closed = Case.objects.filter(status=Case.Status.CLOSED).count()
-    from django.contrib.auth import get_user_model
-    staff_count = get_user_model().objects.filter(is_active=True).count()
+    counters = counters if counters is not None else load_counters(["cases", "users"])
+    case_counts = get_case_counts(counters)
+    by_status = case_counts["by_status"]
+    closed = by_status.get(Case.Status.CLOSED, 0)
+    active = case_counts["total"] - closed - by_status.get(Case.Status.FINAL_INVALID, 0)
+    staff_count = counters.get("users", {}).get("is_active", {}).get("true", 0)
     return {
         "total_cases": case_counts["total"],
         "active_cases": active,
         "closed_cases": closed,
         "staff_count": staff_count,
-        "by_status": case_counts["by_status"],
+        "by_status": by_status,
     }
@@ -0,0 +1,49 @@
+"""Keep StatCounter rows in step with the models listed in apps.reports.stats.tracked_models."""
+from django.db.models.signals import post_delete, post_init, post_save, pre_save
+
+from apps.reports.stats import apply_counter_deltas, row_deltas, tracked_models
+
+SNAPSHOT_ATTR = "_stats_counted_values"
+
+
+def _current_values(instance, fields) -> dict:
+    return {field: getattr(instance, field) for field in fields}
+
+
+def _connect(scope, model, fields):
+    def remember_loaded_values(sender, instance, **kwargs):
+        loaded = instance.__dict__
+        if all(field in loaded for field in fields):
+            setattr(instance, SNAPSHOT_ATTR, {field: loaded[field] for field in fields})
+
+    def load_deferred_values(sender, instance, raw=False, **kwargs):
+        """Values not loaded with the instance (deferred fields) are read before they are overwritten."""
+        if raw or instance._state.adding or getattr(instance, SNAPSHOT_ATTR, None) is not None:
+            return
+        previous = sender._default_manager.filter(pk=instance.pk).values(*fields).first()
+        setattr(instance, SNAPSHOT_ATTR, previous)
+
+    def count_saved_row(sender, instance, created, raw=False, update_fields=None, **kwargs):
+        if raw:
+            return
+        previous = None if created else getattr(instance, SNAPSHOT_ATTR, None)
+        current = _current_values(instance, fields)
+        if previous is not None and update_fields is not None:
+            current = {field: current[field] if field in update_fields else previous[field] for field in fields}
+        if created or previous is not None:
+            apply_counter_deltas(scope, row_deltas(previous, current))
+        setattr(instance, SNAPSHOT_ATTR, current)
+
+    def count_deleted_row(sender, instance, **kwargs):
+        previous = getattr(instance, SNAPSHOT_ATTR, None) or _current_values(instance, fields)
+        apply_counter_deltas(scope, row_deltas(previous, None))
+
+    dispatch_uid = f"reports.stats.{scope}"
+    post_init.connect(remember_loaded_values, sender=model, weak=False, dispatch_uid=f"{dispatch_uid}.init")
+    pre_save.connect(load_deferred_values, sender=model, weak=False, dispatch_uid=f"{dispatch_uid}.pre_save")
+    post_save.connect(count_saved_row, sender=model, weak=False, dispatch_uid=f"{dispatch_uid}.post_save")
+    post_delete.connect(count_deleted_row, sender=model, weak=False, dispatch_uid=f"{dispatch_uid}.post_delete")
+
+
+for _scope, (_model, _fields) in tracked_models().items():
+    _connect(_scope, _model, _fields)
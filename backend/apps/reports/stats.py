@@ -0,0 +1,123 @@
+"""
+Materialised row counts for report endpoints.
+
+Every tracked model keeps one StatCounter per value of each tracked field, plus a
+("all", "") total. apps.reports.signals applies +1/-1 deltas inside the writing
+transaction, so a counter commits or rolls back together with the row it counts.
+Queryset .update() and bulk_create bypass signals: callers apply the delta themselves
+with apply_counter_deltas, and the scheduled `reconcile_stats` command corrects any drift.
+"""
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Count, F
+from django.utils import timezone
+
+from apps.cases.models import Case
+from apps.investigation.models import ReasoningSubmission
+from apps.reports.models import StatCounter
+from apps.rewards.models import RewardTip
+from apps.wanted.models import Wanted
+
+TOTAL_DIMENSION = "all"
+
+
+def tracked_models() -> dict:
+    """scope -> (model, tracked fields)."""
+    return {
+        "cases": (Case, ("status", "level", "source_type")),
+        "wanted": (Wanted, ("status",)),
+        "reward_tips": (RewardTip, ("status",)),
+        "reasonings": (ReasoningSubmission, ("status",)),
+        "users": (get_user_model(), ("is_active",)),
+    }
+
+
+def counter_value(value) -> str:
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if value is None:
+        return ""
+    return str(value)
+
+
+def counter_keys(values: dict) -> list[tuple[str, str]]:
+    """(dimension, value) keys counted for a row with the given tracked field values."""
+    keys = [(TOTAL_DIMENSION, "")]
+    keys.extend((field, counter_value(value)) for field, value in values.items())
+    return keys
+
+
+def apply_counter_deltas(scope: str, deltas: dict):
+    """Add {(dimension, value): delta} to the scope's counters; rows are locked in key order."""
+    now = timezone.now()
+    for (dimension, value), delta in sorted(deltas.items()):
+        if not delta:
+            continue
+        counters = StatCounter.objects.filter(scope=scope, dimension=dimension, value=value)
+        if not counters.update(count=F("count") + delta, updated_at=now):
+            StatCounter.objects.get_or_create(scope=scope, dimension=dimension, value=value)
+            counters.update(count=F("count") + delta, updated_at=now)
+
+
+def row_deltas(previous: dict | None, current: dict | None) -> dict:
+    """Counter deltas for a row moving from previous to current values (None = absent)."""
+    deltas = {}
+    if previous is not None:
+        for key in counter_keys(previous):
+            deltas[key] = deltas.get(key, 0) - 1
+    if current is not None:
+        for key in counter_keys(current):
+            deltas[key] = deltas.get(key, 0) + 1
+    return deltas
+
+
+def load_counters(scopes=None) -> dict:
+    """{scope: {dimension: {value: count}}} in one query over the counter table."""
+    counters = StatCounter.objects.all()
+    if scopes is not None:
+        counters = counters.filter(scope__in=list(scopes))
+    result = {}
+    for scope, dimension, value, count in counters.values_list("scope", "dimension", "value", "count"):
+        result.setdefault(scope, {}).setdefault(dimension, {})[value] = count
+    return result
+
+
+def _expected_counts() -> dict:
+    expected = {}
+    for scope, (model, fields) in tracked_models().items():
+        expected[(scope, TOTAL_DIMENSION, "")] = model.objects.count()
+        for field in fields:
+            rows = model.objects.order_by().values(field).annotate(row_count=Count("pk")).values_list(field, "row_count")
+            for value, row_count in rows:
+                expected[(scope, field, counter_value(value))] = row_count
+    return expected
+
+
+def reconcile_stat_counters(dry_run: bool = False) -> list[dict]:
+    """
+    Recount every tracked model and correct counters that drifted. Counter rows are
+    locked first so concurrent increments wait for the recount. Returns the drift found.
+    """
+    with transaction.atomic():
+        existing = {
+            (counter.scope, counter.dimension, counter.value): counter
+            for counter in StatCounter.objects.select_for_update().order_by("scope", "dimension", "value")
+        }
+        expected = _expected_counts()
+        drift = []
+        for key in sorted(set(existing) | set(expected)):
+            counter = existing.get(key)
+            stored = counter.count if counter is not None else 0
+            actual = expected.get(key, 0)
+            if stored == actual:
+                continue
+            scope, dimension, value = key
+            drift.append({"scope": scope, "dimension": dimension, "value": value, "stored": stored, "actual": actual})
+            if dry_run:
+                continue
+            if counter is None:
+                StatCounter.objects.create(scope=scope, dimension=dimension, value=value, count=actual)
+            else:
+                counter.count = actual
+                counter.save(update_fields=["count", "updated_at"])
+    return drift
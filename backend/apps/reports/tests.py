@@ -1,14 +1,29 @@
+from datetime import timedelta
+from io import StringIO
+
+from unittest import mock
+
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.utils import timezone
 from rest_framework import status
 from rest_framework.authtoken.models import Token
 from rest_framework.test import APITestCase
 
 from apps.access.models import Permission, Role, RolePermission, UserRoleAssignment
-from apps.cases.models import Case
+from apps.cases.models import Case, CaseParticipant
+from apps.reports.cache import CACHE_KEY_PREFIX, get_report_entry
+from apps.reports.models import StatCounter
+from apps.reports.services import get_case_counts, get_wanted_rankings
+from apps.reports.stats import reconcile_stat_counters
+from apps.wanted.models import Wanted
+from apps.wanted.services import promote_to_most_wanted
 
 
 class ReportsAPITests(APITestCase):
     def setUp(self):
+        cache.clear()
         self.admin = get_user_model().objects.create_superuser(
             username="admin_r", email="admin_r@example.com", password="StrongPass123!",
             phone="09120012001", national_id="1200000001", full_name="Admin R",
@@ -67,3 +82,145 @@ class ReportsAPITests(APITestCase):
         self.client.credentials(HTTP_AUTHORIZATION=f"Token {Token.objects.get(user=no_perm_user).key}")
         r = self.client.get("/api/v1/reports/homepage/", format="json")
         self.assertEqual(r.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class StatCounterTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.admin = get_user_model().objects.create_superuser(
+            username="admin_s", email="admin_s@example.com", password="StrongPass123!",
+            phone="09120013001", national_id="1300000001", full_name="Admin S",
+        )
+
+    def _create_case(self, **overrides):
+        fields = {
+            "title": "Counted case",
+            "level": Case.Level.LEVEL_2,
+            "source_type": Case.SourceType.COMPLAINT,
+            "status": Case.Status.SUBMITTED,
+            "created_by": self.admin,
+        }
+        fields.update(overrides)
+        return Case.objects.create(**fields)
+
+    def test_case_counters_follow_create_update_and_delete(self):
+        first = self._create_case()
+        second = self._create_case(level=Case.Level.CRITICAL, source_type=Case.SourceType.SCENE_REPORT)
+
+        second.status = Case.Status.UNDER_REVIEW
+        second.save()
+        first.delete()
+
+        with self.assertNumQueries(1):
+            counts = get_case_counts()
+        self.assertEqual(counts["total"], 1)
+        self.assertEqual(counts["by_status"], {"under_review": 1})
+        self.assertEqual(counts["by_level"], {"critical": 1})
+        self.assertEqual(counts["by_source_type"], {"scene_report": 1})
+
+    def test_save_with_update_fields_only_counts_saved_fields(self):
+        case = self._create_case()
+        case.status = Case.Status.UNDER_REVIEW
+        case.title = "Renamed"
+        case.save(update_fields=["title"])
+
+        self.assertEqual(get_case_counts()["by_status"], {"submitted": 1})
+        self.assertEqual(reconcile_stat_counters(dry_run=True), [])
+
+    def test_landing_stats_read_counters_only(self):
+        self._create_case()
+        self._create_case(status=Case.Status.CLOSED, closed_at=timezone.now())
+
+        with self.assertNumQueries(1):
+            r = self.client.get("/api/v1/reports/landing-stats/")
+
+        self.assertEqual(r.status_code, status.HTTP_200_OK)
+        self.assertEqual(r.data["data"]["total_cases"], 2)
+        self.assertEqual(r.data["data"]["closed_cases"], 1)
+        self.assertEqual(r.data["data"]["active_cases"], 1)
+        self.assertEqual(r.data["data"]["staff_count"], 1)
+
+    def test_promotion_moves_wanted_counters(self):
+        case = self._create_case()
+        participant = CaseParticipant.objects.create(
+            case=case,
+            participant_kind=CaseParticipant.ParticipantKind.CIVILIAN,
+            role_in_case=CaseParticipant.RoleInCase.SUSPECT,
+            full_name="Suspect S",
+            national_id="1300000099",
+            added_by=self.admin,
+        )
+        Wanted.objects.filter(participant=participant).update(marked_at=timezone.now() - timedelta(days=31))
+
+        self.assertEqual(promote_to_most_wanted(), 1)
+
+        rankings = get_wanted_rankings()
+        self.assertEqual(rankings["wanted_count"], 0)
+        self.assertEqual(rankings["most_wanted_count"], 1)
+
+    def test_reconcile_command_corrects_drift(self):
+        self._create_case()
+        StatCounter.objects.filter(scope="cases", dimension="status", value="submitted").update(count=7)
+        StatCounter.objects.filter(scope="cases", dimension="all").delete()
+
+        out = StringIO()
+        call_command("reconcile_stats", "--dry-run", stdout=out)
+        self.assertIn("Would correct 2 stat counter(s).", out.getvalue())
+        self.assertEqual(get_case_counts()["by_status"], {"submitted": 7})
+
+        call_command("reconcile_stats", stdout=StringIO())
+        counts = get_case_counts()
+        self.assertEqual(counts["total"], 1)
+        self.assertEqual(counts["by_status"], {"submitted": 1})
+
+
+class ReportResponseCacheTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.admin = get_user_model().objects.create_superuser(
+            username="admin_c", email="admin_c@example.com", password="StrongPass123!",
+            phone="09120014001", national_id="1400000001", full_name="Admin C",
+        )
+        self.token = Token.objects.create(user=self.admin)
+
+    def test_landing_stats_served_from_cache_with_etag(self):
+        first = self.client.get("/api/v1/reports/landing-stats/")
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+        self.assertIn("public", first["Cache-Control"])
+        self.assertIn("stale-while-revalidate=", first["Cache-Control"])
+        etag = first["ETag"]
+
+        Case.objects.create(
+            title="Cached", level=Case.Level.LEVEL_3, source_type=Case.SourceType.COMPLAINT, created_by=self.admin,
+        )
+        with self.assertNumQueries(0):
+            second = self.client.get("/api/v1/reports/landing-stats/")
+        self.assertEqual(second.data["data"], first.data["data"])
+        self.assertEqual(second["ETag"], etag)
+
+        not_modified = self.client.get("/api/v1/reports/landing-stats/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(not_modified.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(not_modified.content, b"")
+
+    def test_authenticated_reports_are_private_and_vary_on_authorization(self):
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {self.token.key}")
+        r = self.client.get("/api/v1/reports/general/")
+        self.assertEqual(r.status_code, status.HTTP_200_OK)
+        self.assertTrue(r["Cache-Control"].startswith("private"))
+        self.assertIn("Authorization", r["Vary"])
+
+    def test_stale_entry_served_while_another_worker_recomputes(self):
+        key = f"{CACHE_KEY_PREFIX}landing"
+        cache.set(key, {"data": {"total_cases": 3}, "etag": '"old"', "fresh_until": 0}, timeout=60)
+        cache.add(f"{key}:lock", 1, timeout=60)
+        compute = mock.Mock(return_value={"total_cases": 4})
+
+        entry = get_report_entry("landing", compute)
+
+        compute.assert_not_called()
+        self.assertEqual(entry["data"], {"total_cases": 3})
+
+        cache.delete(f"{key}:lock")
+        entry = get_report_entry("landing", compute)
+        compute.assert_called_once_with()
+        self.assertEqual(entry["data"], {"total_cases": 4})
@@ -0,0 +1,463 @@
+"""
+Query budgets for every GET endpoint under config.urls (see config.querycount and config.testing).
+
+List endpoints are requested with 1 and then 100 rows; the larger list may not run more
+statements than the smaller one, and both must stay within the list budget. Every other GET
+route has a fixed budget and must answer with its expected status, so the budget is measured
+on the real handler rather than an error path. A GET route missing from both tables fails
+test_every_get_route_has_a_query_budget, so new endpoints have to declare one.
+
+Serializers with method fields that read related rows are checked the same way over 1 and
+100 objects (SERIALIZER_BUDGET), with the related rows a list view would prefetch.
+"""
+import shutil
+import tempfile
+from datetime import timedelta
+from itertools import count
+
+from django.contrib.auth import get_user_model
+from django.core.files.base import ContentFile
+from django.urls import URLPattern, URLResolver, get_resolver
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
+
+from apps.access.models import Permission, Role, UserRoleAssignment
+from apps.cases.models import Case, CaseParticipant, Complaint, ComplaintValidationCounter, SceneCaseReport
+from apps.cases.serializers import CaseDetailSerializer, ComplaintSerializer, SceneCaseSerializer
+from apps.evidence.models import (
+    BiologicalMedicalEvidence,
+    Evidence,
+    EvidenceLink,
+    EvidenceReview,
+    EvidenceUploadSession,
+    WitnessTestimony,
+    WitnessTestimonyAttachment,
+)
+from apps.evidence.services.media import generate_signed_token
+from apps.identity.serializers import UserAuthSerializer
+from apps.judiciary.models import CaseVerdict
+from apps.investigation.models import (
+    ArrestOrder,
+    InterrogationOrder,
+    ReasoningApproval,
+    ReasoningSubmission,
+    SuspectAssessment,
+    SuspectAssessmentScoreEntry,
+)
+from apps.notifications.models import AuditLog, TimelineEvent
+from apps.payments.models import PaymentTransaction
+from apps.rewards.models import RewardTip, generate_reward_claim_id
+from config.testing import QueryBudgetTestMixin
+
+User = get_user_model()
+
+LIST_QUERY_BUDGET = 12
+SERIALIZER_BUDGET = 6
+
+# route -> (factory method, extra query params)
+LIST_ENDPOINTS = {
+    "api/v1/access/users/": ("add_users", {}),
+    "api/v1/access/permissions/": ("add_permissions", {}),
+    "api/v1/access/roles/": ("add_roles", {}),
+    "api/v1/access/users/<int:user_id>/roles/": ("add_role_assignments", {}),
+    "api/v1/cases/cases/": ("add_cases", {}),
+    "api/v1/evidence/cases/": ("add_evidence", {"case_id": "case"}),
+    "api/v1/evidence/biological/<int:evidence_id>/reviews/": ("add_biological_reviews", {}),
+    "api/v1/evidence/links/": ("add_links", {}),
+    "api/v1/investigation/reasonings/": ("add_reasonings", {}),
+    "api/v1/investigation/assessments/": ("add_assessments", {}),
+    "api/v1/investigation/arrest-orders/": ("add_arrest_orders", {}),
+    "api/v1/investigation/interrogation-orders/": ("add_interrogation_orders", {}),
+    "api/v1/wanted/": ("add_suspects", {}),
+    "api/v1/rewards/tips/": ("add_tips", {}),
+    "api/v1/notifications/audit-logs/": ("add_audit_logs", {}),
+    "api/v1/notifications/timeline-events/": ("add_timeline_events", {}),
+}
+
+# route -> (budget, expected status); path parameters are filled from the objects made in setUp
+# and query parameters come from _query_params.
+FIXED_ENDPOINTS = {
+    "api/v1/identity/auth/me/": (6, status.HTTP_200_OK),
+    "api/v1/access/permissions/<int:permission_id>/": (5, status.HTTP_200_OK),
+    "api/v1/access/roles/<int:role_id>/": (5, status.HTTP_200_OK),
+    "api/v1/access/me/authorization/": (7, status.HTTP_200_OK),
+    "api/v1/cases/cases/<int:case_id>/": (9, status.HTTP_200_OK),
+    "api/v1/cases/complaints/queue/stats/": (4, status.HTTP_200_OK),
+    "api/v1/evidence/media/<str:media_type>/<int:media_id>/": (6, status.HTTP_200_OK),
+    "api/v1/evidence/media/access/": (4, status.HTTP_200_OK),
+    "api/v1/evidence/links/<int:link_id>/": (6, status.HTTP_200_OK),
+    "api/v1/evidence/uploads/<uuid:upload_id>/": (5, status.HTTP_200_OK),
+    "api/v1/investigation/reasonings/<int:reasoning_id>/": (6, status.HTTP_200_OK),
+    "api/v1/investigation/assessments/<int:assessment_id>/": (7, status.HTTP_200_OK),
+    "api/v1/investigation/arrest-orders/<int:order_id>/": (6, status.HTTP_200_OK),
+    "api/v1/investigation/interrogation-orders/<int:order_id>/": (6, status.HTTP_200_OK),
+    "api/v1/judiciary/referral-package/<int:case_id>/": (16, status.HTTP_200_OK),
+    "api/v1/judiciary/referral-package/<int:case_id>/dossier/": (5, status.HTTP_200_OK),
+    "api/v1/judiciary/cases/<int:case_id>/verdict/": (7, status.HTTP_200_OK),
+    "api/v1/payments/callback/": (6, status.HTTP_302_FOUND),
+    "api/v1/payments/transactions/<int:transaction_id>/": (6, status.HTTP_200_OK),
+    "api/v1/reports/landing-stats/": (4, status.HTTP_200_OK),
+    "api/v1/reports/homepage/": (5, status.HTTP_200_OK),
+    "api/v1/reports/cases/": (5, status.HTTP_200_OK),
+    "api/v1/reports/approvals/": (5, status.HTTP_200_OK),
+    "api/v1/reports/wanted-rankings/": (6, status.HTTP_200_OK),
+    "api/v1/reports/reward-outcomes/": (5, status.HTTP_200_OK),
+    "api/v1/reports/general/": (7, status.HTTP_200_OK),
+    "api/v1/review-queues/": (3, status.HTTP_200_OK),
+    "api/v1/review-queues/<str:queue_key>/stats/": (6, status.HTTP_200_OK),
+}
+
+
+def get_routes():
+    """(route, view class) for every API route with a GET handler."""
+
+    def walk(patterns, prefix=""):
+        for pattern in patterns:
+            if isinstance(pattern, URLResolver):
+                yield from walk(pattern.url_patterns, prefix + str(pattern.pattern))
+            elif isinstance(pattern, URLPattern):
+                yield prefix + str(pattern.pattern), getattr(pattern.callback, "view_class", None)
+
+    return sorted(
+        route
+        for route, view_class in walk(get_resolver().url_patterns)
+        if route.startswith("api/") and view_class is not None and hasattr(view_class, "get")
+        and not route.startswith(("api/schema", "api/docs", "api/redoc"))
+    )
+
+
+class EndpointQueryBudgetTests(QueryBudgetTestMixin, APITestCase):
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        settings_override = self.settings(MEDIA_ROOT=media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.sequence = count(1)
+        self.admin = User.objects.create_superuser(
+            username="admin_qb", email="admin_qb@example.com", password="StrongPass123!",
+            phone="09120012001", national_id="1200000001", full_name="Admin QB",
+        )
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {Token.objects.create(user=self.admin).key}")
+        self.case = self._case()
+        self.suspect = self._suspect(self.case)
+        self.evidence = self._evidence(self.case)
+        self.biological = BiologicalMedicalEvidence.objects.create(
+            case=self.case, title="Sample", evidence_type=Evidence.EvidenceType.BIOLOGICAL_MEDICAL,
+            registered_at=timezone.now(), registrar=self.admin,
+        )
+        self.role = Role.objects.create(key="qb_role", name="QB Role")
+
+    def _next(self) -> int:
+        return next(self.sequence)
+
+    def _case(self):
+        return Case.objects.create(
+            title=f"Budget case {self._next()}",
+            summary="Query budget",
+            level=Case.Level.LEVEL_2,
+            source_type=Case.SourceType.COMPLAINT,
+            status=Case.Status.SUSPECT_ASSESSMENT,
+            created_by=self.admin,
+        )
+
+    def _suspect(self, case):
+        index = self._next()
+        return CaseParticipant.objects.create(
+            case=case,
+            participant_kind=CaseParticipant.ParticipantKind.CIVILIAN,
+            role_in_case=CaseParticipant.RoleInCase.SUSPECT,
+            full_name=f"Suspect {index}",
+            national_id=f"12{index:08d}",
+            added_by=self.admin,
+        )
+
+    def _evidence(self, case):
+        return Evidence.objects.create(
+            case=case, title=f"Item {self._next()}", evidence_type=Evidence.EvidenceType.OTHER,
+            registered_at=timezone.now(), registrar=self.admin,
+        )
+
+    def add_users(self, n):
+        for _ in range(n):
+            index = self._next()
+            User.objects.create_user(
+                username=f"qb_user_{index}", email=f"qb_user_{index}@example.com", password="StrongPass123!",
+                phone=f"0913{index:07d}", national_id=f"13{index:08d}", full_name=f"User {index}",
+            )
+
+    def add_permissions(self, n):
+        for _ in range(n):
+            index = self._next()
+            Permission.objects.create(code=f"qb.item{index}.view", name=f"QB {index}", resource=f"qb{index}", action="view")
+
+    def add_roles(self, n):
+        for _ in range(n):
+            index = self._next()
+            Role.objects.create(key=f"qb_role_{index}", name=f"QB Role {index}")
+
+    def add_role_assignments(self, n):
+        for _ in range(n):
+            index = self._next()
+            role = Role.objects.create(key=f"qb_assigned_{index}", name=f"Assigned {index}")
+            UserRoleAssignment.objects.create(user=self.admin, role=role, assigned_by=self.admin)
+
+    def add_cases(self, n):
+        for _ in range(n):
+            self._case()
+
+    def add_evidence(self, n):
+        for _ in range(n):
+            self._evidence(self.case)
+
+    def add_biological_reviews(self, n):
+        for _ in range(n):
+            EvidenceReview.objects.create(
+                biological_medical_evidence=self.biological,
+                decision=EvidenceReview.Decision.choices[0][0],
+                reviewed_by=self.admin,
+            )
+
+    def add_links(self, n):
+        for _ in range(n):
+            EvidenceLink.objects.create(
+                source=self._evidence(self.case), target=self._evidence(self.case), created_by=self.admin
+            )
+
+    def add_reasonings(self, n):
+        for index in range(n):
+            reasoning = ReasoningSubmission.objects.create(
+                title=f"Reasoning {self._next()}", narrative="Narrative", submitted_by=self.admin,
+            )
+            if index % 2:
+                ReasoningApproval.objects.create(
+                    reasoning=reasoning, decided_by=self.admin, decision=ReasoningApproval.Decision.APPROVED,
+                )
+
+    def add_assessments(self, n):
+        for _ in range(n):
+            case = self._case()
+            assessment = SuspectAssessment.objects.create(case=case, participant=self._suspect(case))
+            SuspectAssessmentScoreEntry.objects.create(
+                assessment=assessment, scored_by=self.admin,
+                role_key=SuspectAssessmentScoreEntry.RoleKey.DETECTIVE, score=5,
+            )
+
+    def add_arrest_orders(self, n):
+        for _ in range(n):
+            ArrestOrder.objects.create(case=self.case, participant=self.suspect, issued_by=self.admin)
+
+    def add_interrogation_orders(self, n):
+        for _ in range(n):
+            InterrogationOrder.objects.create(case=self.case, participant=self.suspect, ordered_by=self.admin)
+
+    def add_suspects(self, n):
+        for _ in range(n):
+            self._suspect(self._case())
+
+    def add_tips(self, n):
+        for _ in range(n):
+            RewardTip.objects.create(
+                submitted_by=self.admin,
+                content="Tip",
+                case_reference=self.case.case_number,
+                reward_claim_id=generate_reward_claim_id(),
+            )
+
+    def add_audit_logs(self, n):
+        AuditLog.objects.bulk_create(
+            [
+                AuditLog(actor=self.admin, action="qb.read", request_method="GET", request_path="/qb/", status_code=200)
+                for _ in range(n)
+            ]
+        )
+
+    def add_timeline_events(self, n):
+        for _ in range(n):
+            TimelineEvent.objects.create(
+                actor=self.admin, event_type="qb.event", case_reference=self.case.case_number, summary="Event",
+            )
+
+    def _path_kwargs(self):
+        arrest = ArrestOrder.objects.create(case=self.case, participant=self.suspect, issued_by=self.admin)
+        interrogation = InterrogationOrder.objects.create(case=self.case, participant=self.suspect, ordered_by=self.admin)
+        assessment = SuspectAssessment.objects.create(case=self.case, participant=self.suspect)
+        link = EvidenceLink.objects.create(source=self.evidence, target=self.biological, created_by=self.admin)
+        transaction = self._transaction()
+        trial = self._case()
+        trial.status = Case.Status.IN_TRIAL
+        trial.save(update_fields=["status"])
+        self._suspect(trial)
+        CaseVerdict.objects.create(case=trial, judge=self.admin, verdict=CaseVerdict.Verdict.GUILTY)
+        testimony = WitnessTestimony.objects.create(
+            case=trial, title="Witness", registered_at=timezone.now(), registrar=self.admin,
+        )
+        self.attachment = WitnessTestimonyAttachment.objects.create(
+            witness_testimony=testimony,
+            file=ContentFile(b"RIFF" + bytes(252), name="statement.wav"),
+            media_type=WitnessTestimonyAttachment.MediaType.AUDIO,
+            mime_type="audio/wav",
+        )
+        return {
+            "user_id": self.admin.id,
+            "permission_id": Permission.objects.create(code="qb.detail.view", name="QB", resource="qb", action="detail").id,
+            "role_id": self.role.id,
+            "case_id": {"judiciary": trial.id, "cases": self.case.id},
+            "evidence_id": self.biological.id,
+            "media_type": "witness-testimony",
+            "media_id": self.attachment.id,
+            "link_id": link.id,
+            "reasoning_id": ReasoningSubmission.objects.create(title="R", narrative="N", submitted_by=self.admin).id,
+            "assessment_id": assessment.id,
+            "order_id": {"arrest-orders": arrest.id, "interrogation-orders": interrogation.id},
+            "transaction_id": transaction.id,
+            "queue_key": "evidence.coroner",
+            "upload_id": EvidenceUploadSession.objects.create(
+                media_kind=EvidenceUploadSession.MediaKind.BIOLOGICAL_MEDICAL,
+                evidence=self.biological,
+                created_by=self.admin,
+                filename="sample.jpg",
+                total_size=1024,
+                expires_at=timezone.now() + timedelta(hours=1),
+            ).id,
+        }
+
+    def _transaction(self):
+        return PaymentTransaction.objects.create(
+            case=self.case, participant=self.suspect, amount_rials=1_000_000, gateway_name="mock", created_by=self.admin,
+        )
+
+    def _query_params(self):
+        """route -> query parameters, or a callable for routes that consume them (one per request)."""
+        return {
+            "api/v1/evidence/media/access/": {"token": generate_signed_token("witness-testimony", self.attachment.id)},
+            "api/v1/payments/callback/": lambda: {
+                "transaction_id": str(self._transaction().id), "ref": f"MOCK-{self._next()}",
+            },
+        }
+
+    def _path(self, route, kwargs):
+        path = route
+        for converter in ("int", "str", "uuid"):
+            while f"<{converter}:" in path:
+                start = path.index(f"<{converter}:")
+                end = path.index(">", start)
+                name = path[start + len(converter) + 2:end]
+                value = kwargs[name]
+                if isinstance(value, dict):
+                    value = next(v for key, v in value.items() if f"/{key}/" in route)
+                path = f"{path[:start]}{value}{path[end + 1:]}"
+        return f"/{path}"
+
+    def test_every_get_route_has_a_query_budget(self):
+        declared = set(LIST_ENDPOINTS) | set(FIXED_ENDPOINTS)
+        self.assertEqual(sorted(set(get_routes()) - declared), [], "GET routes without a query budget")
+        self.assertEqual(sorted(declared - set(get_routes())), [], "Query budgets for routes that no longer exist")
+
+    def test_list_endpoints_do_not_scale_queries_with_rows(self):
+        kwargs = self._path_kwargs()
+        for route, (factory, params) in LIST_ENDPOINTS.items():
+            params = {key: getattr(self, value).pk for key, value in params.items()}
+            with self.subTest(route=route):
+                self.assertListQueriesFlat(
+                    self._path(route, kwargs), getattr(self, factory), budget=LIST_QUERY_BUDGET, **params
+                )
+
+    def test_fixed_endpoints_stay_within_budget(self):
+        kwargs = self._path_kwargs()
+        query_params = self._query_params()
+        for route, (budget, expected_status) in FIXED_ENDPOINTS.items():
+            path = self._path(route, kwargs)
+            params = query_params.get(route, {})
+            with self.subTest(route=route):
+                self.record_get(path, **(params() if callable(params) else params))  # warm per-user caches
+                response, recorder = self.record_get(path, **(params() if callable(params) else params))
+                self.assertEqual(response.status_code, expected_status, f"GET {path}")
+                if recorder.count > budget:
+                    self.fail(f"GET {path} exceeded its query budget of {budget}: {recorder.describe()}")
+
+    def add_scene_cases(self, n):
+        for _ in range(n):
+            case = Case.objects.create(
+                title=f"Scene {self._next()}", level=Case.Level.LEVEL_2, source_type=Case.SourceType.SCENE_REPORT,
+                created_by=self.admin,
+            )
+            SceneCaseReport.objects.create(case=case, reported_by=self.admin, scene_occurred_at=timezone.now())
+            for _ in range(3):
+                index = self._next()
+                CaseParticipant.objects.create(
+                    case=case, participant_kind=CaseParticipant.ParticipantKind.CIVILIAN,
+                    role_in_case=CaseParticipant.RoleInCase.WITNESS, full_name=f"Witness {index}",
+                    national_id=f"14{index:08d}", added_by=self.admin,
+                )
+            self._suspect(case)
+
+    def add_complaints(self, n):
+        for index in range(n):
+            complaint = Complaint.objects.create(case=self.case, complainant=self.admin, description="Complaint")
+            if index % 2:
+                ComplaintValidationCounter.objects.create(complaint=complaint, invalid_attempt_count=1)
+
+    def add_users_with_roles(self, n):
+        self.add_users(n)
+        index = self._next()
+        roles = [self.role, Role.objects.create(key=f"qb_extra_{index}", name=f"QB Extra {index}")]
+        UserRoleAssignment.objects.bulk_create(
+            [
+                UserRoleAssignment(user=user, role=role, assigned_by=self.admin)
+                for user in User.objects.filter(username__startswith="qb_user_", role_assignments__isnull=True)
+                for role in roles
+            ]
+        )
+
+    def add_case_history(self, n):
+        self.add_timeline_events(n)
+        for _ in range(n):
+            self._suspect(self.case)
+
+    def test_serializers_do_not_scale_queries_with_rows(self):
+        serializers = {
+            "SceneCaseSerializer": (
+                "add_scene_cases",
+                lambda: SceneCaseSerializer(
+                    Case.objects.filter(source_type=Case.SourceType.SCENE_REPORT)
+                    .select_related("created_by", "scene_report_detail__reported_by",
+                                    "scene_report_detail__superior_approved_by")
+                    .prefetch_related("participants"),
+                    many=True,
+                ).data,
+            ),
+            "ComplaintSerializer": (
+                "add_complaints",
+                lambda: ComplaintSerializer(
+                    Complaint.objects.select_related("complainant", "case", "validation_counter"), many=True
+                ).data,
+            ),
+            "UserAuthSerializer": (
+                "add_users_with_roles",
+                lambda: UserAuthSerializer(
+                    User.objects.prefetch_related("role_assignments__role"), many=True
+                ).data,
+            ),
+            # One case with many participants and timeline events (built once per dossier refresh).
+            "CaseDetailSerializer": ("add_case_history", lambda: CaseDetailSerializer(self.case).data),
+        }
+        for label, (factory, run) in serializers.items():
+            with self.subTest(serializer=label):
+                self.assertQueriesFlat(run, getattr(self, factory), budget=SERIALIZER_BUDGET, label=label)
+
+    def test_current_user_does_not_scale_queries_with_roles(self):
+        self.assertListQueriesFlat("/api/v1/identity/auth/me/", self.add_role_assignments, budget=6)
+
+    def test_debug_header_reports_query_count(self):
+        with self.settings(QUERY_COUNT_HEADERS=True):
+            response = self.client.get("/api/v1/cases/cases/")
+        self.assertGreater(int(response["X-Query-Count"]), 0)
+        self.assertIn("X-Query-Duplicates", response)
+        self.assertIn("X-Query-Time-Ms", response)
+        with self.settings(QUERY_COUNT_HEADERS=False):
+            response = self.client.get("/api/v1/cases/cases/")
+        self.assertNotIn("X-Query-Count", response)
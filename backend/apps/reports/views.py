@@ -1,10 +1,9 @@
-from rest_framework import status
 from rest_framework.authentication import TokenAuthentication
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.views import APIView
 
 from apps.access.permissions import HasRBACPermissions
-from apps.identity.services import success_response
+from apps.reports.cache import cached_report_response
 from apps.reports.services import (
     get_approval_stats,
     get_case_counts,
@@ -13,6 +12,37 @@ from apps.reports.services import (
     get_reward_outcomes,
     get_wanted_rankings,
 )
+from apps.reports.stats import load_counters
+
+
+def build_landing_stats():
+    data = get_homepage_stats()
+    return {
+        "closed_cases": data.get("closed_cases", 0),
+        "staff_count": data.get("staff_count", 0),
+        "active_cases": data.get("active_cases", 0),
+        "total_cases": data.get("total_cases", 0),
+    }
+
+
+def build_case_counts_report():
+    counters = load_counters(["cases"])
+    return {
+        "counts": get_case_counts(counters),
+        "stage_distribution": get_case_stage_distribution(counters),
+    }
+
+
+def build_general_report():
+    counters = load_counters()
+    return {
+        "homepage": get_homepage_stats(counters),
+        "case_counts": get_case_counts(counters),
+        "stage_distribution": get_case_stage_distribution(counters),
+        "approvals": get_approval_stats(counters),
+        "wanted_rankings": get_wanted_rankings(limit=20, counters=counters),
+        "reward_outcomes": get_reward_outcomes(counters),
+    }
 
 
 class LandingStatsAPIView(APIView):
@@ -22,13 +52,7 @@ class LandingStatsAPIView(APIView):
     permission_classes = [AllowAny]
 
     def get(self, request):
-        data = get_homepage_stats()
-        return success_response({
-            "closed_cases": data.get("closed_cases", 0),
-            "staff_count": data.get("staff_count", 0),
-            "active_cases": data.get("active_cases", 0),
-            "total_cases": data.get("total_cases", 0),
-        }, status_code=status.HTTP_200_OK)
+        return cached_report_response(request, "landing", build_landing_stats, public=True)
 
 
 class HomepageStatsAPIView(APIView):
@@ -39,8 +63,7 @@ class HomepageStatsAPIView(APIView):
     permission_codes_by_method = {"GET": ["reports.view"]}
 
     def get(self, request):
-        data = get_homepage_stats()
-        return success_response(data, status_code=status.HTTP_200_OK)
+        return cached_report_response(request, "homepage", get_homepage_stats)
 
 
 class CaseCountsAPIView(APIView):
@@ -51,11 +74,7 @@ class CaseCountsAPIView(APIView):
     permission_codes_by_method = {"GET": ["reports.view"]}
 
     def get(self, request):
-        data = {
-            "counts": get_case_counts(),
-            "stage_distribution": get_case_stage_distribution(),
-        }
-        return success_response(data, status_code=status.HTTP_200_OK)
+        return cached_report_response(request, "case-counts", build_case_counts_report)
 
 
 class ApprovalsStatsAPIView(APIView):
@@ -66,8 +85,7 @@ class ApprovalsStatsAPIView(APIView):
     permission_codes_by_method = {"GET": ["reports.view"]}
 
     def get(self, request):
-        data = get_approval_stats()
-        return success_response(data, status_code=status.HTTP_200_OK)
+        return cached_report_response(request, "approvals", get_approval_stats)
 
 
 class WantedRankingsAPIView(APIView):
@@ -79,8 +97,11 @@ class WantedRankingsAPIView(APIView):
 
     def get(self, request):
         limit = min(int(request.query_params.get("limit", 50)), 100)
-        data = get_wanted_rankings(limit=limit)
-        return success_response(data, status_code=status.HTTP_200_OK)
+        return cached_report_response(
+            request,
+            f"wanted-rankings:{limit}",
+            lambda: get_wanted_rankings(limit=limit),
+        )
 
 
 class RewardOutcomesAPIView(APIView):
@@ -91,8 +112,7 @@ class RewardOutcomesAPIView(APIView):
     permission_codes_by_method = {"GET": ["reports.view"]}
 
     def get(self, request):
-        data = get_reward_outcomes()
-        return success_response(data, status_code=status.HTTP_200_OK)
+        return cached_report_response(request, "reward-outcomes", get_reward_outcomes)
 
 
 class GeneralReportAPIView(APIView):
@@ -103,12 +123,4 @@ class GeneralReportAPIView(APIView):
     permission_codes_by_method = {"GET": ["reports.view"]}
 
     def get(self, request):
-        data = {
-            "homepage": get_homepage_stats(),
-            "case_counts": get_case_counts(),
-            "stage_distribution": get_case_stage_distribution(),
-            "approvals": get_approval_stats(),
-            "wanted_rankings": get_wanted_rankings(limit=20),
-            "reward_outcomes": get_reward_outcomes(),
-        }
-        return success_response(data, status_code=status.HTTP_200_OK)
+        return cached_report_response(request, "general", build_general_report)
@@ -0,0 +1,13 @@
+from django.contrib import admin
+from apps.reviewqueue.models import ReviewLease, ReviewQueueMetric
+
+
+@admin.register(ReviewLease)
+class ReviewLeaseAdmin(admin.ModelAdmin):
+    list_display = ["id", "queue", "object_id", "holder", "claimed_at", "expires_at"]
+    list_filter = ["queue"]
+
+
+@admin.register(ReviewQueueMetric)
+class ReviewQueueMetricAdmin(admin.ModelAdmin):
+    list_display = ["queue", "claims", "total_wait_ms", "completions", "total_service_ms", "updated_at"]
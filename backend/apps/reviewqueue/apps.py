@@ -0,0 +1,11 @@
+from django.apps import AppConfig
+from django.utils.module_loading import autodiscover_modules
+
+
+class ReviewQueueConfig(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "apps.reviewqueue"
+
+    def ready(self):
+        # Each app declares its queues in <app>/review_queues.py (see apps.reviewqueue.services).
+        autodiscover_modules("review_queues")
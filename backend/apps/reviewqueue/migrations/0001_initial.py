@@ -0,0 +1,47 @@
+# Generated by Django 6.0.9 on 2026-10-17 23:15
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReviewQueueMetric',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('queue', models.CharField(max_length=64, unique=True)),
+                ('claims', models.PositiveBigIntegerField(default=0)),
+                ('total_wait_ms', models.PositiveBigIntegerField(default=0)),
+                ('max_wait_ms', models.PositiveBigIntegerField(default=0)),
+                ('completions', models.PositiveBigIntegerField(default=0)),
+                ('total_service_ms', models.PositiveBigIntegerField(default=0)),
+                ('max_service_ms', models.PositiveBigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ReviewLease',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('queue', models.CharField(max_length=64)),
+                ('object_id', models.PositiveBigIntegerField()),
+                ('claimed_at', models.DateTimeField()),
+                ('heartbeat_at', models.DateTimeField()),
+                ('expires_at', models.DateTimeField()),
+                ('holder', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='review_leases', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['queue', 'expires_at'], name='reviewqueue_lease_expiry_idx'), models.Index(fields=['queue', 'holder', 'expires_at'], name='reviewqueue_lease_holder_idx')],
+                'constraints': [models.UniqueConstraint(fields=('queue', 'object_id'), name='reviewqueue_lease_unique_item')],
+            },
+        ),
+    ]
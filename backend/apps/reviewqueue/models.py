@@ -0,0 +1,54 @@
+from django.conf import settings
+from django.db import models
+
+
+class ReviewLease(models.Model):
+    """
+    One reviewer's claim on one item of a registered review queue (apps.reviewqueue.services).
+
+    At most one row exists per (queue, object_id). A row whose expires_at has passed no
+    longer counts as a claim and is replaced by the next claimer.
+    """
+
+    queue = models.CharField(max_length=64)
+    object_id = models.PositiveBigIntegerField()
+    holder = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="review_leases",
+    )
+    claimed_at = models.DateTimeField()
+    heartbeat_at = models.DateTimeField()
+    expires_at = models.DateTimeField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["queue", "object_id"], name="reviewqueue_lease_unique_item"),
+        ]
+        indexes = [
+            models.Index(fields=["queue", "expires_at"], name="reviewqueue_lease_expiry_idx"),
+            models.Index(fields=["queue", "holder", "expires_at"], name="reviewqueue_lease_holder_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.queue}:{self.object_id} leased to {self.holder_id}"
+
+
+class ReviewQueueMetric(models.Model):
+    """
+    Running latency totals per queue, updated with F() expressions.
+
+    wait = item created -> first claimed; service = claimed -> review decision.
+    """
+
+    queue = models.CharField(max_length=64, unique=True)
+    claims = models.PositiveBigIntegerField(default=0)
+    total_wait_ms = models.PositiveBigIntegerField(default=0)
+    max_wait_ms = models.PositiveBigIntegerField(default=0)
+    completions = models.PositiveBigIntegerField(default=0)
+    total_service_ms = models.PositiveBigIntegerField(default=0)
+    max_service_ms = models.PositiveBigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.queue}: {self.claims} claims, {self.completions} completions"
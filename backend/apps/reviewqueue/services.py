@@ -0,0 +1,254 @@
+"""
+Lease-based review queues.
+
+A review workflow registers its pending items as a queue in <app>/review_queues.py
+(collected by ReviewQueueConfig.ready):
+
+    register_queue(ReviewQueue(
+        "rewards.tip.officer",
+        model=RewardTip,
+        pending=Q(status=RewardTip.Status.PENDING_POLICE),
+        permission_codes=["rewards.tip.review"],
+        policy=can_review_tip_as_officer,
+        serializer=RewardTipSerializer,
+    ))
+
+Reviewers call claim-next instead of picking from a list. The highest-priority, oldest
+pending item without a live lease is selected with SELECT ... FOR UPDATE SKIP LOCKED, so
+concurrent claimers each lock a different row and never wait on one another, and a
+ReviewLease row is written for it. The unique (queue, object_id) constraint is what makes
+a claim exclusive, which also covers backends without row locks (SQLite): a lost insert is
+retried on the next item. Leases live in their own table, so a model needs no schema change
+to be registered.
+
+A lease lasts the queue's lease_seconds (REVIEW_QUEUE_LEASE_SECONDS by default). Heartbeats
+extend it and an expired lease makes the item claimable again. The decision endpoint calls
+complete(), which ends the lease and adds the item's wait (created -> claimed) and service
+(claimed -> decided) times to the queue's ReviewQueueMetric row.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Min, Q, Value
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from apps.reviewqueue.models import ReviewLease, ReviewQueueMetric
+
+_QUEUES = {}
+
+
+class ReviewQueue:
+    """
+    A registered queue of items of `model` matching `pending`.
+
+    - permission_codes / policy: who may claim (policy(user) -> (allowed, message)).
+    - exclude_for(user) -> Q: pending items this user may not take (e.g. their own submission).
+    - annotations / priority: ordering expression, higher first; ties go to the oldest
+      created_field, then pk.
+    - select_related / serializer: how a claimed item is loaded and returned.
+    """
+
+    def __init__(
+        self,
+        key,
+        *,
+        model,
+        pending,
+        permission_codes=(),
+        policy=None,
+        exclude_for=None,
+        annotations=None,
+        priority=None,
+        created_field="created_at",
+        select_related=(),
+        serializer=None,
+        lease_seconds=None,
+    ):
+        self.key = key
+        self.model = model
+        self.pending = pending
+        self.permission_codes = list(permission_codes)
+        self.policy = policy
+        self.exclude_for = exclude_for
+        self.annotations = annotations or {}
+        self.priority = priority
+        self.created_field = created_field
+        self.select_related = tuple(select_related)
+        self.serializer = serializer
+        self.lease_seconds = lease_seconds
+
+    def __repr__(self):
+        return f"<ReviewQueue {self.key} ({self.model._meta.label})>"
+
+    def lease_duration(self) -> timedelta:
+        return timedelta(seconds=self.lease_seconds or settings.REVIEW_QUEUE_LEASE_SECONDS)
+
+    def can_claim(self, user):
+        if self.policy is None:
+            return True, None
+        return self.policy(user)
+
+    def pending_items(self):
+        return self.model._default_manager.filter(self.pending)
+
+    def live_leases(self, now=None):
+        return ReviewLease.objects.filter(queue=self.key, expires_at__gt=now or timezone.now())
+
+    def claimable(self, user=None, now=None):
+        """Pending items without a live lease, in claim order."""
+        now = now or timezone.now()
+        items = self.pending_items().exclude(pk__in=self.live_leases(now).values("object_id"))
+        if user is not None and self.exclude_for is not None:
+            items = items.exclude(self.exclude_for(user))
+        ordering = [self.created_field, "pk"]
+        if self.annotations:
+            items = items.annotate(**self.annotations)
+        if self.priority is not None:
+            items = items.annotate(queue_priority=self.priority)
+            ordering.insert(0, "-queue_priority")
+        return items.order_by(*ordering)
+
+    def load(self, object_id):
+        """The pending item with select_related applied, or None."""
+        return self.pending_items().select_related(*self.select_related).filter(pk=object_id).first()
+
+    def serialize(self, item):
+        if self.serializer is None:
+            return {"id": item.pk}
+        return self.serializer(item).data
+
+    def claim_next(self, user):
+        """Lease the next item to user (or return the lease they already hold); None when empty."""
+        now = timezone.now()
+        held = self.live_leases(now).filter(holder=user).order_by("claimed_at", "id").first()
+        if held is not None:
+            if self.pending_items().filter(pk=held.object_id).exists():
+                return held
+            held.delete()  # decided outside the queue
+
+        for _ in range(settings.OPTIMISTIC_RETRY_ATTEMPTS):
+            with transaction.atomic():
+                item = self.claimable(user, now).select_for_update(skip_locked=True, of=("self",)).first()
+                if item is None:
+                    return None
+                ReviewLease.objects.filter(queue=self.key, object_id=item.pk, expires_at__lte=now).delete()
+                try:
+                    with transaction.atomic():
+                        lease = ReviewLease.objects.create(
+                            queue=self.key,
+                            object_id=item.pk,
+                            holder=user,
+                            claimed_at=now,
+                            heartbeat_at=now,
+                            expires_at=now + self.lease_duration(),
+                        )
+                except IntegrityError:
+                    continue  # another reviewer leased it between our read and insert
+                self._record({"claims": 1})
+                return lease
+        return None
+
+    def heartbeat(self, user, object_id):
+        """Extend user's live lease; returns the new expiry, or None when the lease was lost."""
+        now = timezone.now()
+        expires_at = now + self.lease_duration()
+        updated = self.live_leases(now).filter(holder=user, object_id=object_id).update(
+            heartbeat_at=now,
+            expires_at=expires_at,
+        )
+        return expires_at if updated else None
+
+    def release(self, user, object_id) -> bool:
+        """Give a leased item back to the queue undecided."""
+        deleted, _ = self.live_leases().filter(holder=user, object_id=object_id).delete()
+        return bool(deleted)
+
+    def blocking_lease(self, user, object_id):
+        """The live lease another reviewer holds on the item, if any."""
+        return self.live_leases().filter(object_id=object_id).exclude(holder=user).first()
+
+    def complete(self, item, now=None):
+        """End the lease on a decided item and record its wait and service times."""
+        now = now or timezone.now()
+        lease = ReviewLease.objects.filter(queue=self.key, object_id=item.pk).first()
+        claimed_at = lease.claimed_at if lease is not None else now
+        if lease is not None:
+            lease.delete()
+        created_at = getattr(item, self.created_field)
+        wait_ms = max(0, int((claimed_at - created_at).total_seconds() * 1000))
+        service_ms = max(0, int((now - claimed_at).total_seconds() * 1000))
+        self._record(
+            {"completions": 1, "total_wait_ms": wait_ms, "total_service_ms": service_ms},
+            maxima={"max_wait_ms": wait_ms, "max_service_ms": service_ms},
+        )
+
+    def _record(self, increments, maxima=None):
+        maxima = maxima or {}
+        values = {name: F(name) + amount for name, amount in increments.items()}
+        values.update({name: Greatest(F(name), Value(amount)) for name, amount in maxima.items()})
+        values["updated_at"] = timezone.now()
+        if ReviewQueueMetric.objects.filter(queue=self.key).update(**values):
+            return
+        try:
+            with transaction.atomic():
+                ReviewQueueMetric.objects.create(queue=self.key, **increments, **maxima)
+        except IntegrityError:
+            ReviewQueueMetric.objects.filter(queue=self.key).update(**values)
+
+    def metrics(self, now=None) -> dict:
+        """Depth, live/expired leases, oldest waiting age and wait/service latencies (seconds)."""
+        now = now or timezone.now()
+        leased = Q(pk__in=self.live_leases(now).values("object_id"))
+        totals = self.pending_items().aggregate(
+            depth=Count("pk", filter=~leased),
+            leased=Count("pk", filter=leased),
+            oldest_created_at=Min(self.created_field, filter=~leased),
+        )
+        oldest = totals.pop("oldest_created_at")
+        metric = ReviewQueueMetric.objects.filter(queue=self.key).first() or ReviewQueueMetric(queue=self.key)
+        completions = metric.completions
+        return {
+            "queue": self.key,
+            **totals,
+            "expired_leases": ReviewLease.objects.filter(queue=self.key, expires_at__lte=now).count(),
+            "oldest_age_seconds": int((now - oldest).total_seconds()) if oldest else 0,
+            "lease_seconds": int(self.lease_duration().total_seconds()),
+            "claims": metric.claims,
+            "completions": completions,
+            "avg_wait_seconds": round(metric.total_wait_ms / completions / 1000, 3) if completions else 0,
+            "max_wait_seconds": round(metric.max_wait_ms / 1000, 3),
+            "avg_service_seconds": round(metric.total_service_ms / completions / 1000, 3) if completions else 0,
+            "max_service_seconds": round(metric.max_service_ms / 1000, 3),
+        }
+
+
+def register_queue(queue: ReviewQueue) -> ReviewQueue:
+    registered = _QUEUES.get(queue.key)
+    if registered is not None and registered.model is not queue.model:
+        raise ImproperlyConfigured(f"Review queue {queue.key!r} is already registered for {registered.model}.")
+    _QUEUES[queue.key] = queue
+    return queue
+
+
+def get_queue(key) -> ReviewQueue | None:
+    return _QUEUES.get(key)
+
+
+def registered_queues() -> list[ReviewQueue]:
+    return [_QUEUES[key] for key in sorted(_QUEUES)]
+
+
+def complete_review(key, item, now=None):
+    """Shortcut for decision views: end the lease on item in queue `key` (no-op when unregistered)."""
+    queue = get_queue(key)
+    if queue is not None:
+        queue.complete(item, now)
+
+
+def blocking_lease(key, user, object_id):
+    """Shortcut for decision views: the live lease another reviewer holds on the item, if any."""
+    queue = get_queue(key)
+    return queue.blocking_lease(user, object_id) if queue is not None else None
@@ -0,0 +1,126 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
+
+from apps.access.models import Permission, Role, RolePermission, UserRoleAssignment
+from apps.cases.models import Case
+from apps.reviewqueue.models import ReviewLease
+from apps.reviewqueue.services import get_queue
+from apps.rewards.models import RewardTip, generate_reward_claim_id
+
+
+class ReviewQueueTests(APITestCase):
+    claim_url = "/api/v1/review-queues/rewards.tip.officer/claim/"
+    stats_url = "/api/v1/review-queues/rewards.tip.officer/stats/"
+
+    def setUp(self):
+        User = get_user_model()
+        self.admin = User.objects.create_superuser(
+            username="admin_q", email="admin_q@example.com", password="StrongPass123!",
+            phone="09120017001", national_id="1700000001", full_name="Admin Q",
+        )
+        self.submitter = User.objects.create_user(
+            username="base_q", email="base_q@example.com", password="StrongPass123!",
+            phone="09120017002", national_id="1700000002", full_name="Base Q",
+        )
+        permission, _ = Permission.objects.get_or_create(
+            code="rewards.tip.review", defaults={"name": "Review", "resource": "rewards.tip", "action": "review"}
+        )
+        self.tokens = {}
+        for index, role_key in enumerate(["officer", "officer", "detective"], start=3):
+            role, _ = Role.objects.get_or_create(key=role_key, defaults={"name": role_key})
+            RolePermission.objects.get_or_create(role=role, permission=permission)
+            user = User.objects.create_user(
+                username=f"{role_key}_q{index}", email=f"{role_key}_q{index}@example.com", password="StrongPass123!",
+                phone=f"0912001700{index}", national_id=f"170000000{index}", full_name=f"Reviewer {index}",
+            )
+            UserRoleAssignment.objects.create(user=user, role=role, assigned_by=self.admin)
+            self.tokens[index] = Token.objects.create(user=user)
+        self.officer_token, self.second_officer_token, self.detective_token = self.tokens.values()
+
+    def _tip(self, level=None):
+        case_reference = ""
+        if level is not None:
+            case_reference = Case.objects.create(
+                title=f"Case {level}", level=level, source_type=Case.SourceType.COMPLAINT, created_by=self.admin,
+            ).case_number
+        return RewardTip.objects.create(
+            submitted_by=self.submitter,
+            content="Tip",
+            case_reference=case_reference,
+            reward_claim_id=generate_reward_claim_id(),
+        )
+
+    def _post(self, token, url, payload=None):
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+        return self.client.post(url, payload or {}, format="json")
+
+    def _get(self, token, url):
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+        return self.client.get(url)
+
+    def test_claims_follow_case_level_and_lease_each_tip_to_one_reviewer(self):
+        unlinked = self._tip()
+        low = self._tip(Case.Level.LEVEL_3)
+        critical = self._tip(Case.Level.CRITICAL)
+
+        first = self._post(self.officer_token, self.claim_url)
+        second = self._post(self.second_officer_token, self.claim_url)
+        again = self._post(self.officer_token, self.claim_url)
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+        self.assertEqual(first.data["data"]["item"]["id"], critical.id)
+        self.assertEqual(second.data["data"]["item"]["id"], low.id)
+        self.assertEqual(again.data["data"]["item"]["id"], critical.id)
+
+        blocked = self._post(self.second_officer_token, f"/api/v1/rewards/tips/{critical.id}/review/", {"approved": True})
+        self.assertEqual(blocked.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(blocked.data["error"]["code"], "LEASE_HELD")
+
+        stats = self._get(self.officer_token, self.stats_url).data["data"]
+        self.assertEqual((stats["depth"], stats["leased"], stats["claims"]), (1, 2, 2))
+
+        decided = self._post(self.officer_token, f"/api/v1/rewards/tips/{critical.id}/review/", {"approved": True})
+        self.assertEqual(decided.status_code, status.HTTP_200_OK)
+        self.assertFalse(ReviewLease.objects.filter(queue="rewards.tip.officer", object_id=critical.id).exists())
+        stats = self._get(self.officer_token, self.stats_url).data["data"]
+        self.assertEqual((stats["depth"], stats["leased"], stats["completions"]), (1, 1, 1))
+
+        # The approved tip moved on to the detective stage queue.
+        detective_claim = self._post(self.detective_token, "/api/v1/review-queues/rewards.tip.detective/claim/")
+        self.assertEqual(detective_claim.data["data"]["item"]["id"], critical.id)
+        self.assertEqual(self._post(self.officer_token, self.claim_url).data["data"]["item"]["id"], unlinked.id)
+
+    def test_expired_lease_is_reclaimed_and_heartbeat_release_need_the_lease(self):
+        tip = self._tip(Case.Level.LEVEL_1)
+        self._post(self.officer_token, self.claim_url)
+        ReviewLease.objects.filter(object_id=tip.id).update(expires_at=timezone.now() - timedelta(seconds=1))
+
+        reclaimed = self._post(self.second_officer_token, self.claim_url)
+        self.assertEqual(reclaimed.data["data"]["item"]["id"], tip.id)
+        self.assertEqual(get_queue("rewards.tip.officer").metrics()["expired_leases"], 0)
+
+        heartbeat_url = f"/api/v1/review-queues/rewards.tip.officer/items/{tip.id}/heartbeat/"
+        release_url = f"/api/v1/review-queues/rewards.tip.officer/items/{tip.id}/release/"
+        self.assertEqual(self._post(self.officer_token, heartbeat_url).data["error"]["code"], "LEASE_LOST")
+        self.assertEqual(self._post(self.second_officer_token, heartbeat_url).status_code, status.HTTP_200_OK)
+        self.assertEqual(self._post(self.second_officer_token, release_url).status_code, status.HTTP_200_OK)
+        self.assertEqual(self._post(self.officer_token, self.claim_url).data["data"]["item"]["id"], tip.id)
+
+    def test_claim_checks_queue_policy_and_unknown_queues(self):
+        self._tip()
+        denied = self._post(self.detective_token, self.claim_url)
+        self.assertEqual(denied.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(denied.data["error"]["code"], "ROLE_POLICY_VIOLATION")
+        empty = self._post(self.detective_token, "/api/v1/review-queues/rewards.tip.detective/claim/")
+        self.assertIsNone(empty.data["data"]["item"])
+        missing = self._post(self.officer_token, "/api/v1/review-queues/no.such.queue/claim/")
+        self.assertEqual(missing.status_code, status.HTTP_404_NOT_FOUND)
+        queues = self._get(self.officer_token, "/api/v1/review-queues/").data["data"]["queues"]
+        self.assertEqual(
+            [queue["key"] for queue in queues],
+            ["evidence.coroner", "investigation.reasoning", "rewards.tip.detective", "rewards.tip.officer"],
+        )
@@ -0,0 +1,25 @@
+from django.urls import path
+
+from apps.reviewqueue.views import (
+    ReviewQueueClaimAPIView,
+    ReviewQueueHeartbeatAPIView,
+    ReviewQueueListAPIView,
+    ReviewQueueReleaseAPIView,
+    ReviewQueueStatsAPIView,
+)
+
+urlpatterns = [
+    path("", ReviewQueueListAPIView.as_view(), name="review-queue-list"),
+    path("<str:queue_key>/claim/", ReviewQueueClaimAPIView.as_view(), name="review-queue-claim"),
+    path("<str:queue_key>/stats/", ReviewQueueStatsAPIView.as_view(), name="review-queue-stats"),
+    path(
+        "<str:queue_key>/items/<int:object_id>/heartbeat/",
+        ReviewQueueHeartbeatAPIView.as_view(),
+        name="review-queue-heartbeat",
+    ),
+    path(
+        "<str:queue_key>/items/<int:object_id>/release/",
+        ReviewQueueReleaseAPIView.as_view(),
+        name="review-queue-release",
+    ),
+]
@@ -0,0 +1,122 @@
+from rest_framework import status
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.exceptions import NotFound
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.views import APIView
+
+from apps.access.permissions import HasRBACPermissions
+from apps.identity.services import error_response, success_response
+from apps.reviewqueue.services import get_queue, registered_queues
+
+
+def lease_held_response(lease):
+    """409 for a decision on an item another reviewer has claimed (used by the review views)."""
+    return error_response(
+        code="LEASE_HELD",
+        message="Item is claimed by another reviewer.",
+        details={"lease_expires_at": lease.expires_at.isoformat()},
+        status_code=status.HTTP_409_CONFLICT,
+    )
+
+
+def _lease_lost_response():
+    return error_response(
+        code="LEASE_LOST",
+        message="You no longer hold the review lease for this item.",
+        details={},
+        status_code=status.HTTP_409_CONFLICT,
+    )
+
+
+class ReviewQueueAPIView(APIView):
+    """Base for per-queue endpoints: the queue's own permission codes are required."""
+
+    authentication_classes = [TokenAuthentication]
+    permission_classes = [IsAuthenticated, HasRBACPermissions]
+
+    @property
+    def queue(self):
+        return get_queue(self.kwargs.get("queue_key"))
+
+    @property
+    def required_permission_codes(self):
+        return self.queue.permission_codes if self.queue is not None else []
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if self.queue is None:
+            raise NotFound("Unknown review queue.")
+
+
+class ReviewQueueListAPIView(APIView):
+    """Registered review queues (key and model); no per-queue permission needed to list them."""
+
+    authentication_classes = [TokenAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        queues = [
+            {"key": queue.key, "model": queue.model._meta.label, "lease_seconds": int(queue.lease_duration().total_seconds())}
+            for queue in registered_queues()
+        ]
+        return success_response({"queues": queues}, status_code=status.HTTP_200_OK)
+
+
+class ReviewQueueClaimAPIView(ReviewQueueAPIView):
+    """Lease the next item of the queue to the caller (see apps.reviewqueue.services)."""
+
+    def post(self, request, queue_key):
+        queue = self.queue
+        allowed, message = queue.can_claim(request.user)
+        if not allowed:
+            return error_response(
+                code="ROLE_POLICY_VIOLATION",
+                message=message,
+                details={},
+                status_code=status.HTTP_403_FORBIDDEN,
+            )
+
+        lease = queue.claim_next(request.user)
+        item = queue.load(lease.object_id) if lease is not None else None
+        if item is None:
+            return success_response({"queue": queue.key, "item": None}, status_code=status.HTTP_200_OK)
+        return success_response(
+            {
+                "queue": queue.key,
+                "item": queue.serialize(item),
+                "lease_expires_at": lease.expires_at,
+            },
+            status_code=status.HTTP_200_OK,
+        )
+
+
+class ReviewQueueHeartbeatAPIView(ReviewQueueAPIView):
+    """Extend the caller's lease on an item."""
+
+    def post(self, request, queue_key, object_id):
+        expires_at = self.queue.heartbeat(request.user, object_id)
+        if expires_at is None:
+            return _lease_lost_response()
+        return success_response(
+            {"queue": queue_key, "object_id": object_id, "lease_expires_at": expires_at},
+            status_code=status.HTTP_200_OK,
+        )
+
+
+class ReviewQueueReleaseAPIView(ReviewQueueAPIView):
+    """Return a leased item to the queue without deciding it."""
+
+    def post(self, request, queue_key, object_id):
+        if not self.queue.release(request.user, object_id):
+            return _lease_lost_response()
+        return success_response(
+            {"queue": queue_key, "object_id": object_id, "released": True},
+            status_code=status.HTTP_200_OK,
+        )
+
+
+class ReviewQueueStatsAPIView(ReviewQueueAPIView):
+    """Queue depth, live/expired leases, oldest waiting age and wait/service latencies."""
+
+    def get(self, request, queue_key):
+        return success_response(self.queue.metrics(), status_code=status.HTTP_200_OK)
@@ -0,0 +1,19 @@
+"""Scheduled task: persist ranking/reward snapshots for everyone in Wanted."""
+from django.core.management.base import BaseCommand
+
+from apps.rewards.services import compute_and_persist_snapshots, ranking_aggregates
+
+
+class Command(BaseCommand):
+    help = "Compute max(Lj)*max(Di) ranking and reward per national_id in one aggregate query and store snapshots (scheduler task)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dry-run", action="store_true", help="Only count the persons that would get a snapshot.")
+
+    def handle(self, *args, **options):
+        if options["dry_run"]:
+            count = sum(1 for _ in ranking_aggregates())
+            self.stdout.write(self.style.WARNING(f"Would store {count} reward snapshot(s)."))
+            return
+        created = compute_and_persist_snapshots()
+        self.stdout.write(self.style.SUCCESS(f"Stored {created} reward snapshot(s)."))
@@ -0,0 +1,62 @@
+# Generated by Django 6.0.9 on 2026-10-17 22:56
+
+from django.db import migrations, models
+
+
+def seed_latest_rankings(apps, schema_editor):
+    """Newest existing snapshot per national_id becomes its latest ranking row."""
+    RewardComputationSnapshot = apps.get_model("rewards", "RewardComputationSnapshot")
+    LatestRankingSnapshot = apps.get_model("rewards", "LatestRankingSnapshot")
+    latest = {}
+    for snapshot in RewardComputationSnapshot.objects.order_by("national_id", "-computed_at", "-id").iterator():
+        latest.setdefault(snapshot.national_id, snapshot)
+    LatestRankingSnapshot.objects.bulk_create(
+        [
+            LatestRankingSnapshot(
+                national_id=snapshot.national_id,
+                full_name=snapshot.full_name,
+                max_days_lj=snapshot.max_days_lj,
+                max_crime_level_di=snapshot.max_crime_level_di,
+                ranking_score=snapshot.ranking_score,
+                reward_amount_rials=snapshot.reward_amount_rials,
+                computed_at=snapshot.computed_at,
+            )
+            for snapshot in latest.values()
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rewards', '0002_rewardtip'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LatestRankingSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('national_id', models.CharField(max_length=32, unique=True)),
+                ('full_name', models.CharField(blank=True, max_length=255)),
+                ('max_days_lj', models.PositiveIntegerField()),
+                ('max_crime_level_di', models.PositiveSmallIntegerField()),
+                ('ranking_score', models.PositiveIntegerField()),
+                ('reward_amount_rials', models.BigIntegerField()),
+                ('computed_at', models.DateTimeField(help_text='Start of the run that last wrote this row.')),
+            ],
+            options={
+                'ordering': ['-ranking_score', 'national_id'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='latestrankingsnapshot',
+            index=models.Index(fields=['-ranking_score', 'national_id'], name='rewards_latest_rank_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='latestrankingsnapshot',
+            index=models.Index(fields=['computed_at'], name='rewards_latest_computed_idx'),
+        ),
+        migrations.RunPython(seed_latest_rankings, migrations.RunPython.noop),
+    ]
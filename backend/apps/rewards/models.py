@@ -3,6 +3,8 @@ import uuid
 from django.conf import settings
 from django.db import models
 
+from config.tracking import TrackedFieldsMixin
+
 
 def generate_reward_claim_id():
     return f"RWD-{uuid.uuid4().hex[:12].upper()}"
@@ -29,7 +31,29 @@ class RewardComputationSnapshot(models.Model):
         return f"{self.national_id}: score={self.ranking_score} reward={self.reward_amount_rials}"
 
 
-class RewardTip(models.Model):
+class LatestRankingSnapshot(models.Model):
+    """Current ranking per national_id, upserted by each snapshot run; serves top-N reports."""
+
+    national_id = models.CharField(max_length=32, unique=True)
+    full_name = models.CharField(max_length=255, blank=True)
+    max_days_lj = models.PositiveIntegerField()
+    max_crime_level_di = models.PositiveSmallIntegerField()
+    ranking_score = models.PositiveIntegerField()
+    reward_amount_rials = models.BigIntegerField()
+    computed_at = models.DateTimeField(help_text="Start of the run that last wrote this row.")
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["-ranking_score", "national_id"], name="rewards_latest_rank_idx"),
+            models.Index(fields=["computed_at"], name="rewards_latest_computed_idx"),
+        ]
+        ordering = ["-ranking_score", "national_id"]
+
+    def __str__(self):
+        return f"{self.national_id}: score={self.ranking_score} (latest)"
+
+
+class RewardTip(TrackedFieldsMixin, models.Model):
     """Tip submission by base user; police officer review then detective final review; unique claim ID on approval."""
 
     class Status(models.TextChoices):
@@ -0,0 +1,35 @@
+from django.db.models import OuterRef, Q, Subquery
+
+from apps.cases.models import Case
+from apps.reviewqueue.services import ReviewQueue, register_queue
+from apps.rewards.models import RewardTip
+from apps.rewards.serializers import RewardTipSerializer
+from apps.rewards.services import can_review_tip_as_detective, can_review_tip_as_officer
+from apps.wanted.ranking import crime_level_di_expression
+
+# Tip review is two-stage; each stage is its own queue. Tip status -> queue key.
+TIP_REVIEW_QUEUES = {
+    RewardTip.Status.PENDING_POLICE: "rewards.tip.officer",
+    RewardTip.Status.PENDING_DETECTIVE: "rewards.tip.detective",
+}
+_TIP_POLICIES = {
+    RewardTip.Status.PENDING_POLICE: can_review_tip_as_officer,
+    RewardTip.Status.PENDING_DETECTIVE: can_review_tip_as_detective,
+}
+
+for tip_status, queue_key in TIP_REVIEW_QUEUES.items():
+    register_queue(
+        ReviewQueue(
+            queue_key,
+            model=RewardTip,
+            pending=Q(status=tip_status),
+            permission_codes=["rewards.tip.review"],
+            policy=_TIP_POLICIES[tip_status],
+            annotations={
+                "case_level": Subquery(Case.objects.filter(case_number=OuterRef("case_reference")).values("level")[:1]),
+            },
+            priority=crime_level_di_expression("case_level"),
+            select_related=("submitted_by",),
+            serializer=RewardTipSerializer,
+        )
+    )
@@ -5,25 +5,30 @@ Reward tip workflow: base user submit -> police officer review -> detective fina
 """
 from datetime import timedelta
 
+from django.conf import settings
+from django.db import models, transaction
+from django.db.models import ExpressionWrapper, F, Max, Value, When
+from django.db.models.functions import Cast, Coalesce, Concat, Trim
 from django.utils import timezone
 
 from apps.access.services import user_has_any_role_key
-from apps.cases.models import Case
-from apps.rewards.models import RewardComputationSnapshot, RewardTip, generate_reward_claim_id
+from apps.rewards.models import (
+    LatestRankingSnapshot,
+    RewardComputationSnapshot,
+    RewardTip,
+    generate_reward_claim_id,
+)
 from apps.wanted.models import Wanted
+from apps.wanted.ranking import CRIME_LEVEL_DI, crime_level_di_expression
 
 REWARD_MULTIPLIER_RIALS = 20_000_000
+SNAPSHOT_BATCH_SIZE = 1000
+RANKING_VALUE_FIELDS = ("full_name", "max_days_lj", "max_crime_level_di", "ranking_score", "reward_amount_rials")
 
 
 def level_to_di(level: str) -> int:
     """Map case level to Di (1-4): Level 3 -> 1, Level 2 -> 2, Level 1 -> 3, Critical -> 4."""
-    mapping = {
-        Case.Level.LEVEL_3: 1,
-        Case.Level.LEVEL_2: 2,
-        Case.Level.LEVEL_1: 3,
-        Case.Level.CRITICAL: 4,
-    }
-    return mapping.get(level, 0)
+    return CRIME_LEVEL_DI.get(level, 0)
 
 
 def days_under_surveillance(wanted: Wanted) -> int:
@@ -56,31 +61,109 @@ def compute_ranking_and_reward_for_person(wanted_entries):
     }
 
 
-def compute_and_persist_snapshots():
+def ranking_aggregates(now=None):
     """
-    Compute ranking/reward for all persons in Wanted (by national_id), persist snapshots.
-    Returns list of created snapshots.
+    One GROUP BY query over Wanted: per person (national_id, or _participant_<id> when it is
+    blank) the max Di via CASE on case level and the max surveillance interval
+    (coalesce(closed_at, now) - marked_at). Yields the same dicts as
+    compute_ranking_and_reward_for_person.
     """
-    # All wanted entries with participant and case
-    qs = Wanted.objects.select_related("participant", "case").order_by("participant__national_id")
-    by_national_id = {}
-    for w in qs:
-        nid = (w.participant.national_id or "").strip() or f"_participant_{w.participant_id}"
-        by_national_id.setdefault(nid, []).append(w)
-    created = []
-    for nid, entries in by_national_id.items():
-        data = compute_ranking_and_reward_for_person(entries)
-        if not data:
-            continue
-        snapshot = RewardComputationSnapshot.objects.create(
-            national_id=data["national_id"] or nid,
-            full_name=data["full_name"],
-            max_days_lj=data["max_days_lj"],
-            max_crime_level_di=data["max_crime_level_di"],
-            ranking_score=data["ranking_score"],
-            reward_amount_rials=data["reward_amount_rials"],
+    now = now or timezone.now()
+    di = crime_level_di_expression()
+    surveillance = ExpressionWrapper(
+        Coalesce("case__closed_at", Value(now, output_field=models.DateTimeField())) - F("marked_at"),
+        output_field=models.DurationField(),
+    )
+    rows = (
+        Wanted.objects.order_by()
+        .annotate(stripped_national_id=Trim("participant__national_id"))
+        .annotate(
+            person_key=models.Case(
+                When(
+                    stripped_national_id="",
+                    then=Concat(Value("_participant_"), Cast("participant_id", models.CharField())),
+                ),
+                default=F("stripped_national_id"),
+                output_field=models.CharField(),
+            )
+        )
+        .values("person_key")
+        .annotate(
+            max_crime_level_di=Max(di),
+            max_surveillance=Max(surveillance),
+            full_name=Max("participant__full_name"),
         )
-        created.append(snapshot)
+        .order_by("person_key")
+    )
+    for row in rows.iterator(chunk_size=SNAPSHOT_BATCH_SIZE):
+        interval = row["max_surveillance"]
+        max_lj = max(0, interval.days) if interval is not None else 0
+        ranking_score = max_lj * row["max_crime_level_di"]
+        yield {
+            "national_id": row["person_key"],
+            "full_name": row["full_name"] or "",
+            "max_days_lj": max_lj,
+            "max_crime_level_di": row["max_crime_level_di"],
+            "ranking_score": ranking_score,
+            "reward_amount_rials": ranking_score * REWARD_MULTIPLIER_RIALS,
+        }
+
+
+def prune_reward_snapshots(now=None) -> int:
+    """Delete snapshots older than REWARD_SNAPSHOT_RETENTION_DAYS (0 keeps everything)."""
+    retention_days = getattr(settings, "REWARD_SNAPSHOT_RETENTION_DAYS", 90)
+    if retention_days <= 0:
+        return 0
+    cutoff = (now or timezone.now()) - timedelta(days=retention_days)
+    deleted, _ = RewardComputationSnapshot.objects.filter(computed_at__lt=cutoff).delete()
+    return deleted
+
+
+def _persist_batch(rows, computed_at):
+    """Upsert latest rankings for one batch; returns how many history snapshots were added."""
+    previous = {
+        latest.national_id: latest
+        for latest in LatestRankingSnapshot.objects.filter(national_id__in=[row["national_id"] for row in rows])
+    }
+    changed = [
+        row
+        for row in rows
+        if row["national_id"] not in previous
+        or any(getattr(previous[row["national_id"]], field) != row[field] for field in RANKING_VALUE_FIELDS)
+    ]
+    LatestRankingSnapshot.objects.bulk_create(
+        [LatestRankingSnapshot(computed_at=computed_at, **row) for row in rows],
+        update_conflicts=True,
+        unique_fields=["national_id"],
+        update_fields=[*RANKING_VALUE_FIELDS, "computed_at"],
+    )
+    RewardComputationSnapshot.objects.bulk_create([RewardComputationSnapshot(**row) for row in changed])
+    return len(changed)
+
+
+def compute_and_persist_snapshots():
+    """
+    Compute ranking/reward for all persons in Wanted (by national_id) and upsert one
+    LatestRankingSnapshot row each; persons no longer wanted lose theirs. History
+    (RewardComputationSnapshot) only gets a row when a person's values changed, and is
+    pruned past REWARD_SNAPSHOT_RETENTION_DAYS. Each batch commits on its own, so no
+    transaction stays open across the whole population; rows of persons no longer wanted
+    are removed once every batch is stored. Returns the number of history snapshots created.
+    """
+    computed_at = timezone.now()
+    created = 0
+    batch = []
+    for data in ranking_aggregates(now=computed_at):
+        batch.append(data)
+        if len(batch) >= SNAPSHOT_BATCH_SIZE:
+            with transaction.atomic():
+                created += _persist_batch(batch, computed_at)
+            batch = []
+    if batch:
+        with transaction.atomic():
+            created += _persist_batch(batch, computed_at)
+    LatestRankingSnapshot.objects.filter(computed_at__lt=computed_at).delete()
+    prune_reward_snapshots()
     return created
 
 
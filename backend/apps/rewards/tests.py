@@ -1,15 +1,20 @@
+from datetime import timedelta
+
 from django.contrib.auth import get_user_model
+from django.test import override_settings
 from django.utils import timezone
 from rest_framework.test import APITestCase
 
 from apps.cases.models import Case, CaseParticipant
-from apps.rewards.models import RewardComputationSnapshot, RewardTip
+from apps.reports.services import get_wanted_rankings
+from apps.rewards.models import LatestRankingSnapshot, RewardComputationSnapshot, RewardTip
 from apps.rewards.services import (
     REWARD_MULTIPLIER_RIALS,
     compute_and_persist_snapshots,
     compute_ranking_and_reward_for_person,
     days_under_surveillance,
     level_to_di,
+    ranking_aggregates,
 )
 from apps.wanted.models import Wanted
 
@@ -61,12 +66,89 @@ class RankingRewardFormulaTests(APITestCase):
 
     def test_compute_and_persist_snapshots(self):
         created = compute_and_persist_snapshots()
-        self.assertGreaterEqual(len(created), 1)
+        self.assertGreaterEqual(created, 1)
         snap = RewardComputationSnapshot.objects.filter(national_id="8000001001").first()
         self.assertIsNotNone(snap)
         self.assertEqual(snap.ranking_score, snap.max_days_lj * snap.max_crime_level_di)
         self.assertEqual(snap.reward_amount_rials, snap.ranking_score * REWARD_MULTIPLIER_RIALS)
 
+    def _suspect(self, level, national_id, days_ago, closed_days_ago=None, full_name="Suspect"):
+        case = Case.objects.create(
+            title=f"Case {level} {national_id}",
+            summary="",
+            level=level,
+            source_type=Case.SourceType.COMPLAINT,
+            status=Case.Status.SUSPECT_ASSESSMENT,
+            created_by=self.admin,
+        )
+        if closed_days_ago is not None:
+            Case.objects.filter(pk=case.pk).update(
+                status=Case.Status.CLOSED, closed_at=timezone.now() - timedelta(days=closed_days_ago)
+            )
+        participant = CaseParticipant.objects.create(
+            case=case,
+            participant_kind=CaseParticipant.ParticipantKind.CIVILIAN,
+            role_in_case=CaseParticipant.RoleInCase.SUSPECT,
+            full_name=full_name,
+            national_id=national_id,
+            added_by=self.admin,
+        )
+        Wanted.objects.filter(case=case, participant=participant).update(
+            marked_at=timezone.now() - timedelta(days=days_ago, hours=1)
+        )
+        return participant
+
+    def test_aggregate_matches_per_person_formula(self):
+        self._suspect(Case.Level.CRITICAL, "8000001002", days_ago=3)
+        self._suspect(Case.Level.LEVEL_3, "8000001002", days_ago=40, closed_days_ago=10)
+        anonymous = self._suspect(Case.Level.LEVEL_1, "", days_ago=7, full_name="Unknown")
+
+        by_person = {}
+        for wanted in Wanted.objects.select_related("participant", "case"):
+            key = wanted.participant.national_id.strip() or f"_participant_{wanted.participant_id}"
+            by_person.setdefault(key, []).append(wanted)
+        expected = {
+            key: compute_ranking_and_reward_for_person(entries)["ranking_score"]
+            for key, entries in by_person.items()
+        }
+
+        rows = {row["national_id"]: row for row in ranking_aggregates()}
+        self.assertEqual({key: row["ranking_score"] for key, row in rows.items()}, expected)
+        self.assertEqual(rows["8000001002"]["max_days_lj"], 30)
+        self.assertEqual(rows["8000001002"]["max_crime_level_di"], 4)
+        self.assertEqual(rows[f"_participant_{anonymous.id}"]["full_name"], "Unknown")
+
+    @override_settings(REWARD_SNAPSHOT_RETENTION_DAYS=30)
+    def test_compute_prunes_snapshots_past_retention(self):
+        old = RewardComputationSnapshot.objects.create(
+            national_id="8000001001", max_days_lj=1, max_crime_level_di=1, ranking_score=1, reward_amount_rials=1,
+        )
+        RewardComputationSnapshot.objects.filter(pk=old.pk).update(computed_at=timezone.now() - timedelta(days=31))
+        compute_and_persist_snapshots()
+        self.assertFalse(RewardComputationSnapshot.objects.filter(pk=old.pk).exists())
+        self.assertTrue(RewardComputationSnapshot.objects.filter(national_id="8000001001").exists())
+
+    def test_latest_ranking_is_upserted_once_per_person(self):
+        second = self._suspect(Case.Level.CRITICAL, "8000001003", days_ago=5)
+        first_run = compute_and_persist_snapshots()
+        self.assertEqual(first_run, 2)
+        self.assertEqual(compute_and_persist_snapshots(), 0)
+        self.assertEqual(LatestRankingSnapshot.objects.count(), 2)
+        self.assertEqual(RewardComputationSnapshot.objects.count(), 2)
+
+        Case.objects.filter(pk=second.case_id).update(level=Case.Level.LEVEL_3)
+        self.assertEqual(compute_and_persist_snapshots(), 1)
+        self.assertEqual(RewardComputationSnapshot.objects.filter(national_id="8000001003").count(), 2)
+        latest = LatestRankingSnapshot.objects.get(national_id="8000001003")
+        self.assertEqual(latest.ranking_score, 5)
+
+        top = get_wanted_rankings(limit=10)["top_ranked"]
+        self.assertEqual([row["national_id"] for row in top], ["8000001003", "8000001001"])
+
+        Wanted.objects.filter(participant=second).delete()
+        compute_and_persist_snapshots()
+        self.assertFalse(LatestRankingSnapshot.objects.filter(national_id="8000001003").exists())
+
 
 class RewardTipWorkflowTests(APITestCase):
     def setUp(self):
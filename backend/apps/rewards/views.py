@@ -7,9 +7,13 @@ from rest_framework.views import APIView
 
 from apps.access.permissions import HasRBACPermissions
 from apps.identity.services import error_response, success_response
+from apps.reviewqueue.services import blocking_lease, complete_review
+from apps.reviewqueue.views import lease_held_response
 from apps.rewards.models import RewardTip, generate_reward_claim_id
+from apps.rewards.review_queues import TIP_REVIEW_QUEUES
 from apps.rewards.serializers import RewardTipCreateSerializer, RewardTipReviewSerializer, RewardTipSerializer
 from apps.rewards.services import can_review_tip_as_detective, can_review_tip_as_officer, can_verify_reward_claim
+from config.pagination import KeysetPagination, cursor_pagination_requested
 
 
 class RewardTipListCreateAPIView(APIView):
@@ -25,6 +29,11 @@ class RewardTipListCreateAPIView(APIView):
         status_filter = request.query_params.get("status")
         if status_filter:
             queryset = queryset.filter(status=status_filter)
+        if cursor_pagination_requested(request):
+            paginator = KeysetPagination(ordering=["-created_at"])
+            page = paginator.paginate_queryset(queryset, request, view=self)
+            serializer = RewardTipSerializer(page, many=True)
+            return success_response(paginator.get_payload(serializer.data), status_code=status.HTTP_200_OK)
         serializer = RewardTipSerializer(queryset, many=True)
         return success_response({"results": serializer.data}, status_code=status.HTTP_200_OK)
 
@@ -59,6 +68,10 @@ class RewardTipReviewAPIView(APIView):
                 status_code=status.HTTP_400_BAD_REQUEST,
             )
         approved = serializer.validated_data["approved"]
+        queue_key = TIP_REVIEW_QUEUES.get(tip.status)
+        lease = blocking_lease(queue_key, request.user, tip.pk)
+        if lease is not None:
+            return lease_held_response(lease)
 
         if tip.status == RewardTip.Status.PENDING_POLICE:
             allowed, msg = can_review_tip_as_officer(request.user)
@@ -105,6 +118,7 @@ class RewardTipReviewAPIView(APIView):
                 details={"status": tip.status},
                 status_code=status.HTTP_409_CONFLICT,
             )
+        complete_review(queue_key, tip)
         return success_response(RewardTipSerializer(tip).data, status_code=status.HTTP_200_OK)
 
 
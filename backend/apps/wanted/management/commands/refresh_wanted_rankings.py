@@ -0,0 +1,20 @@
+"""Scheduled task: move stored wanted rankings forward as days under surveillance accrue."""
+from django.core.management.base import BaseCommand
+
+from apps.wanted.ranking import refresh_wanted_rankings
+
+
+class Command(BaseCommand):
+    help = "Recompute stored ranking_score for wanted entries whose ranking_refresh_at has passed (scheduler task)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dry-run", action="store_true", help="Only count entries that are due.")
+        parser.add_argument("--batch-size", type=int, default=500, help="Rows updated per bulk_update.")
+
+    def handle(self, *args, **options):
+        dry_run = options["dry_run"]
+        count = refresh_wanted_rankings(batch_size=options["batch_size"], dry_run=dry_run)
+        if dry_run:
+            self.stdout.write(self.style.WARNING(f"Would refresh {count} wanted ranking(s)."))
+        else:
+            self.stdout.write(self.style.SUCCESS(f"Refreshed {count} wanted ranking(s)."))
@@ -0,0 +1,72 @@
+# Generated by Django 6.0.9 on 2026-10-17 22:53
+
+from datetime import timedelta
+
+from django.db import migrations, models
+from django.utils import timezone
+
+CRIME_LEVEL_DI = {"3": 1, "2": 2, "1": 3, "critical": 4}
+RANKING_FIELDS = ["crime_level_di", "days_under_surveillance", "ranking_score", "ranking_refresh_at"]
+
+
+def backfill_ranking(apps, schema_editor):
+    Wanted = apps.get_model("wanted", "Wanted")
+    now = timezone.now()
+    batch = []
+    for wanted in Wanted.objects.select_related("case").iterator(chunk_size=500):
+        end = wanted.case.closed_at or now
+        days = max(0, (end - wanted.marked_at).days) if end > wanted.marked_at else 0
+        wanted.crime_level_di = CRIME_LEVEL_DI.get(wanted.case.level, 0)
+        wanted.days_under_surveillance = days
+        wanted.ranking_score = days * wanted.crime_level_di
+        wanted.ranking_refresh_at = None if wanted.case.closed_at else wanted.marked_at + timedelta(days=days + 1)
+        batch.append(wanted)
+        if len(batch) >= 500:
+            Wanted.objects.bulk_update(batch, RANKING_FIELDS)
+            batch = []
+    if batch:
+        Wanted.objects.bulk_update(batch, RANKING_FIELDS)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cases', '0007_case_search_index'),
+        ('wanted', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='wanted',
+            name='crime_level_di',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='wanted',
+            name='days_under_surveillance',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='wanted',
+            name='ranking_refresh_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='wanted',
+            name='ranking_score',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='wanted',
+            index=models.Index(fields=['-ranking_score', '-marked_at', '-id'], name='wanted_ranking_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='wanted',
+            index=models.Index(fields=['status', '-ranking_score', '-marked_at', '-id'], name='wanted_status_ranking_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='wanted',
+            index=models.Index(fields=['ranking_refresh_at'], name='wanted_ranking_refresh_idx'),
+        ),
+        migrations.RunPython(backfill_ranking, migrations.RunPython.noop),
+    ]
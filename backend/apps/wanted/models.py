@@ -2,6 +2,8 @@ from django.conf import settings
 from django.db import models
 from django.utils import timezone
 
+from apps.wanted.ranking import RANKING_FIELDS, compute_ranking
+
 
 class Wanted(models.Model):
     """Wanted lifecycle: on suspect mark -> Wanted; scheduled promotion to Most Wanted after one month."""
@@ -23,6 +25,11 @@ class Wanted(models.Model):
     marked_at = models.DateTimeField(default=timezone.now)
     status = models.CharField(max_length=20, choices=Status.choices, default=Status.WANTED)
     promoted_at = models.DateTimeField(null=True, blank=True)
+    # Stored ranking (Lj * Di), kept current by apps.wanted.ranking.
+    crime_level_di = models.PositiveSmallIntegerField(default=0)
+    days_under_surveillance = models.PositiveIntegerField(default=0)
+    ranking_score = models.PositiveIntegerField(default=0)
+    ranking_refresh_at = models.DateTimeField(null=True, blank=True)
 
     class Meta:
         constraints = [
@@ -34,8 +41,24 @@ class Wanted(models.Model):
         indexes = [
             models.Index(fields=["status"]),
             models.Index(fields=["marked_at"]),
+            models.Index(fields=["-ranking_score", "-marked_at", "-id"], name="wanted_ranking_idx"),
+            models.Index(fields=["status", "-ranking_score", "-marked_at", "-id"], name="wanted_status_ranking_idx"),
+            models.Index(fields=["ranking_refresh_at"], name="wanted_ranking_refresh_idx"),
         ]
         ordering = ["-marked_at"]
 
+    def refresh_ranking(self, now=None):
+        case = self.case
+        for field, value in compute_ranking(self.marked_at, case.level, case.closed_at, now=now).items():
+            setattr(self, field, value)
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None or {"marked_at", "case", "case_id"}.intersection(update_fields):
+            self.refresh_ranking()
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, *RANKING_FIELDS}
+        super().save(*args, **kwargs)
+
     def __str__(self):
         return f"Wanted case={self.case_id} participant={self.participant_id} ({self.status})"
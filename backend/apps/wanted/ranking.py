@@ -0,0 +1,104 @@
+"""
+Stored ranking for Wanted rows: Lj (days under surveillance) * Di (crime level 1-4).
+
+Each row keeps crime_level_di, days_under_surveillance and ranking_score so the wanted
+list can be ordered and paged from an index. The inputs change in three ways:
+- the row itself is saved (Wanted.save recomputes),
+- its case changes level or is closed (post_save on Case, apps.wanted.signals),
+- time passes: Lj grows by one at marked_at + n days. ranking_refresh_at stores that
+  moment and `refresh_wanted_rankings` (scheduled) updates only the rows that reached it.
+  Rows of closed cases have a fixed Lj and ranking_refresh_at = NULL.
+"""
+from datetime import timedelta
+
+from django.db import models, transaction
+from django.db.models import Value, When
+from django.utils import timezone
+
+from apps.cases.models import Case
+
+# Case level -> Di: Level 3 -> 1, Level 2 -> 2, Level 1 -> 3, Critical -> 4.
+CRIME_LEVEL_DI = {
+    Case.Level.LEVEL_3: 1,
+    Case.Level.LEVEL_2: 2,
+    Case.Level.LEVEL_1: 3,
+    Case.Level.CRITICAL: 4,
+}
+RANKING_FIELDS = ("crime_level_di", "days_under_surveillance", "ranking_score", "ranking_refresh_at")
+CASE_RANKING_FIELDS = {"level", "closed_at"}
+
+
+def crime_level_di_expression(level_field: str = "case__level"):
+    """SQL CASE mapping the case level at level_field to Di (0 when unknown)."""
+    return models.Case(
+        *[When(**{level_field: level}, then=Value(di)) for level, di in CRIME_LEVEL_DI.items()],
+        default=Value(0),
+        output_field=models.IntegerField(),
+    )
+
+
+def compute_ranking(marked_at, level, closed_at, now=None) -> dict:
+    """Ranking columns for one wanted entry at `now`."""
+    now = now or timezone.now()
+    end = closed_at or now
+    days = max(0, (end - marked_at).days) if end > marked_at else 0
+    di = CRIME_LEVEL_DI.get(level, 0)
+    return {
+        "crime_level_di": di,
+        "days_under_surveillance": days,
+        "ranking_score": days * di,
+        "ranking_refresh_at": None if closed_at else marked_at + timedelta(days=days + 1),
+    }
+
+
+def _apply(wanted, case, now) -> bool:
+    """Set ranking columns on wanted; returns True when any of them changed."""
+    values = compute_ranking(wanted.marked_at, case.level, case.closed_at, now=now)
+    changed = any(getattr(wanted, field) != value for field, value in values.items())
+    for field, value in values.items():
+        setattr(wanted, field, value)
+    return changed
+
+
+def refresh_case_rankings(case, now=None) -> int:
+    """Recompute the wanted rows of one case (after its level or closed_at changed)."""
+    from apps.wanted.models import Wanted
+
+    now = now or timezone.now()
+    rows = [
+        wanted
+        for wanted in Wanted.objects.filter(case_id=case.pk).only("id", "marked_at", *RANKING_FIELDS)
+        if _apply(wanted, case, now)
+    ]
+    if rows:
+        Wanted.objects.bulk_update(rows, RANKING_FIELDS)
+    return len(rows)
+
+
+def refresh_wanted_rankings(now=None, batch_size=500, dry_run=False) -> int:
+    """Update rows whose ranking_refresh_at has passed; returns how many are (or would be) updated."""
+    from apps.wanted.models import Wanted
+
+    now = now or timezone.now()
+    due = Wanted.objects.filter(ranking_refresh_at__lte=now)
+    if dry_run:
+        return due.count()
+
+    updated = 0
+    last_id = 0
+    while True:
+        batch = list(
+            due.filter(id__gt=last_id)
+            .select_related("case")
+            .only("id", "marked_at", *RANKING_FIELDS, "case__level", "case__closed_at")
+            .order_by("id")[:batch_size]
+        )
+        if not batch:
+            break
+        last_id = batch[-1].id
+        for wanted in batch:
+            _apply(wanted, wanted.case, now)
+        with transaction.atomic():
+            Wanted.objects.bulk_update(batch, RANKING_FIELDS)
+        updated += len(batch)
+    return updated
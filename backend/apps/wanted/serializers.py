@@ -5,6 +5,7 @@ from apps.wanted.models import Wanted
 
 class WantedSerializer(serializers.ModelSerializer):
     case_number = serializers.CharField(source="case.case_number", read_only=True)
+    case_level = serializers.CharField(source="case.level", read_only=True)
     participant_display = serializers.SerializerMethodField()
 
     class Meta:
@@ -13,11 +14,15 @@ class WantedSerializer(serializers.ModelSerializer):
             "id",
             "case",
             "case_number",
+            "case_level",
             "participant",
             "participant_display",
             "marked_at",
             "status",
             "promoted_at",
+            "crime_level_di",
+            "days_under_surveillance",
+            "ranking_score",
         ]
 
     def get_participant_display(self, obj):
@@ -1,15 +1,24 @@
 from datetime import timedelta
 
+from django.db import transaction
 from django.utils import timezone
 
+from apps.reports.stats import apply_counter_deltas
 from apps.wanted.models import Wanted
 
 
 def promote_to_most_wanted():
     """Promote Wanted to Most Wanted when marked_at is more than one month ago. Idempotent."""
     threshold = timezone.now() - timedelta(days=30)
-    updated = Wanted.objects.filter(
-        status=Wanted.Status.WANTED,
-        marked_at__lte=threshold,
-    ).update(status=Wanted.Status.MOST_WANTED, promoted_at=timezone.now())
+    with transaction.atomic():
+        updated = Wanted.objects.filter(
+            status=Wanted.Status.WANTED,
+            marked_at__lte=threshold,
+        ).update(status=Wanted.Status.MOST_WANTED, promoted_at=timezone.now())
+        if updated:
+            # Queryset update skips the stats signals; move the counts in the same transaction.
+            apply_counter_deltas(
+                "wanted",
+                {("status", Wanted.Status.WANTED): -updated, ("status", Wanted.Status.MOST_WANTED): updated},
+            )
     return updated
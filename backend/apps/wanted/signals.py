@@ -1,8 +1,9 @@
 from django.db.models.signals import post_save
 from django.dispatch import receiver
 
-from apps.cases.models import CaseParticipant
+from apps.cases.models import Case, CaseParticipant
 from apps.wanted.models import Wanted
+from apps.wanted.ranking import CASE_RANKING_FIELDS, refresh_case_rankings
 
 
 @receiver(post_save, sender=CaseParticipant)
@@ -17,3 +18,13 @@ def on_suspect_marked(sender, instance, created, **kwargs):
         participant=instance,
         defaults={"status": Wanted.Status.WANTED},
     )
+
+
+@receiver(post_save, sender=Case)
+def on_case_ranking_inputs_changed(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    """Case level or closure feeds Di / Lj of its wanted entries."""
+    if created or raw:
+        return
+    if update_fields is not None and not CASE_RANKING_FIELDS.intersection(update_fields):
+        return
+    refresh_case_rankings(instance)
@@ -1,3 +1,5 @@
+from datetime import timedelta
+
 from django.contrib.auth import get_user_model
 from django.utils import timezone
 from rest_framework import status
@@ -7,6 +9,7 @@ from rest_framework.test import APITestCase
 from apps.access.models import Permission, Role, RolePermission, UserRoleAssignment
 from apps.cases.models import Case, CaseParticipant
 from apps.wanted.models import Wanted
+from apps.wanted.ranking import refresh_wanted_rankings
 from apps.wanted.services import promote_to_most_wanted
 
 
@@ -86,3 +89,92 @@ class WantedLifecycleTests(APITestCase):
         w.refresh_from_db()
         self.assertEqual(w.status, Wanted.Status.MOST_WANTED)
         self.assertIsNotNone(w.promoted_at)
+
+
+class WantedRankingListTests(APITestCase):
+    def setUp(self):
+        self.admin = get_user_model().objects.create_superuser(
+            username="admin_wr", email="admin_wr@example.com", password="StrongPass123!",
+            phone="09120007101", national_id="7000000101", full_name="Admin WR",
+        )
+        self.token = Token.objects.create(user=self.admin)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {self.token.key}")
+
+    def _wanted(self, level, days_ago, national_id):
+        case = Case.objects.create(
+            title=f"Ranked case {national_id}",
+            summary="Summary",
+            level=level,
+            source_type=Case.SourceType.COMPLAINT,
+            status=Case.Status.SUSPECT_ASSESSMENT,
+            created_by=self.admin,
+        )
+        participant = CaseParticipant.objects.create(
+            case=case,
+            participant_kind=CaseParticipant.ParticipantKind.CIVILIAN,
+            role_in_case=CaseParticipant.RoleInCase.SUSPECT,
+            full_name=f"Suspect {national_id}",
+            national_id=national_id,
+            added_by=self.admin,
+        )
+        wanted = Wanted.objects.get(case=case, participant=participant)
+        wanted.marked_at = timezone.now() - timedelta(days=days_ago, hours=1)
+        wanted.save(update_fields=["marked_at"])
+        return wanted
+
+    def test_score_is_stored_on_save(self):
+        wanted = self._wanted(Case.Level.CRITICAL, 10, "7000002001")
+        wanted.refresh_from_db()
+        self.assertEqual(wanted.crime_level_di, 4)
+        self.assertEqual(wanted.days_under_surveillance, 10)
+        self.assertEqual(wanted.ranking_score, 40)
+        self.assertEqual(wanted.ranking_refresh_at, wanted.marked_at + timedelta(days=11))
+
+    def test_case_level_change_and_closure_update_score(self):
+        wanted = self._wanted(Case.Level.LEVEL_3, 5, "7000002002")
+        case = wanted.case
+        case.level = Case.Level.LEVEL_1
+        case.save()
+        wanted.refresh_from_db()
+        self.assertEqual(wanted.ranking_score, 15)
+
+        Case.objects.filter(pk=case.pk).update(status=Case.Status.CLOSED, closed_at=timezone.now())
+        case.refresh_from_db()
+        case.save(update_fields=["closed_at"])
+        wanted.refresh_from_db()
+        self.assertIsNone(wanted.ranking_refresh_at)
+
+    def test_refresh_only_touches_due_rows(self):
+        due = self._wanted(Case.Level.LEVEL_2, 3, "7000002003")
+        fresh = self._wanted(Case.Level.LEVEL_2, 1, "7000002004")
+        later = timezone.now() + timedelta(days=1)
+        self.assertEqual(refresh_wanted_rankings(now=later, dry_run=True), 2)
+        Wanted.objects.filter(pk=fresh.pk).update(ranking_refresh_at=later + timedelta(hours=1))
+        self.assertEqual(refresh_wanted_rankings(now=later), 1)
+        due.refresh_from_db()
+        self.assertEqual(due.days_under_surveillance, 4)
+        self.assertEqual(due.ranking_score, 8)
+        self.assertGreater(due.ranking_refresh_at, later)
+
+    def test_list_is_ranked_filtered_and_paginated(self):
+        low = self._wanted(Case.Level.LEVEL_3, 2, "7000002005")
+        high = self._wanted(Case.Level.CRITICAL, 20, "7000002006")
+        middle = self._wanted(Case.Level.LEVEL_2, 10, "7000002007")
+
+        r = self.client.get("/api/v1/wanted/?page_size=2", format="json")
+        self.assertEqual(r.status_code, status.HTTP_200_OK)
+        data = r.data["data"]
+        self.assertEqual([row["id"] for row in data["results"]], [high.id, middle.id])
+        self.assertEqual(data["results"][0]["ranking_score"], 80)
+        self.assertIsNotNone(data["next"])
+
+        r2 = self.client.get(data["next"], format="json")
+        self.assertEqual([row["id"] for row in r2.data["data"]["results"]], [low.id])
+        self.assertIsNone(r2.data["data"]["next"])
+
+        r3 = self.client.get(f"/api/v1/wanted/?level={Case.Level.LEVEL_2}", format="json")
+        self.assertEqual([row["id"] for row in r3.data["data"]["results"]], [middle.id])
+
+        Wanted.objects.filter(pk=low.pk).update(status=Wanted.Status.MOST_WANTED)
+        r4 = self.client.get("/api/v1/wanted/?status=most_wanted", format="json")
+        self.assertEqual([row["id"] for row in r4.data["data"]["results"]], [low.id])
@@ -4,22 +4,41 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.views import APIView
 
 from apps.access.permissions import HasRBACPermissions
+from apps.cases.models import Case
 from apps.identity.services import success_response
 from apps.wanted.models import Wanted
 from apps.wanted.serializers import WantedSerializer
+from config.pagination import KeysetPagination
+
+WANTED_LIST_ORDERINGS = {
+    "ranking": ["-ranking_score", "-marked_at"],
+    "-marked_at": ["-marked_at"],
+    "marked_at": ["marked_at"],
+}
 
 
 class WantedListAPIView(APIView):
-    """List wanted persons (optionally filter by status=wanted or most_wanted)."""
+    """
+    List wanted persons, highest stored ranking (Lj * Di) first, keyset-paginated.
+    Filters: status=wanted|most_wanted, level=<case level>. sort=ranking|-marked_at|marked_at.
+    """
 
     authentication_classes = [TokenAuthentication]
     permission_classes = [IsAuthenticated, HasRBACPermissions]
     permission_codes_by_method = {"GET": ["wanted.view"]}
 
     def get(self, request):
-        queryset = Wanted.objects.select_related("case", "participant").order_by("-marked_at")
+        queryset = Wanted.objects.select_related("case", "participant")
         status_filter = request.query_params.get("status")
-        if status_filter in ("wanted", "most_wanted"):
+        if status_filter in Wanted.Status.values:
             queryset = queryset.filter(status=status_filter)
-        serializer = WantedSerializer(queryset, many=True)
-        return success_response({"results": serializer.data}, status_code=status.HTTP_200_OK)
+        level = request.query_params.get("level")
+        if level in Case.Level.values:
+            queryset = queryset.filter(case__level=level)
+
+        sort_by = request.query_params.get("sort", "ranking")
+        ordering = WANTED_LIST_ORDERINGS.get(sort_by, WANTED_LIST_ORDERINGS["ranking"])
+        paginator = KeysetPagination(ordering=ordering)
+        page = paginator.paginate_queryset(queryset, request, view=self)
+        serializer = WantedSerializer(page, many=True)
+        return success_response(paginator.get_payload(serializer.data), status_code=status.HTTP_200_OK)
@@ -0,0 +1,84 @@
+"""
+Optimistic concurrency for workflow models.
+
+VersionedModelMixin adds compare-and-swap to save(): every UPDATE is issued as
+`UPDATE ... SET ..., version = %s + 1 WHERE id = %s AND version = %s` with the version
+the instance was loaded with. If another writer got there first no row matches and
+ConcurrentUpdateError is raised instead of overwriting their change. Like any error raised
+by save(), it marks the enclosing atomic block for rollback. Inserts, signals and
+update_fields behave as usual; "version" is added to update_fields automatically.
+
+Writes that bypass save() (queryset.update(), bulk_update) must bump the column themselves,
+e.g. update(version=F("version") + 1).
+
+retry_on_conflict re-runs a unit of work (which re-reads its rows) when it hits a conflict,
+with exponential backoff and jitter, up to OPTIMISTIC_RETRY_ATTEMPTS times. Each attempt
+must run in its own transaction so a conflicting attempt is rolled back as a whole.
+"""
+import random
+import time
+
+from django.conf import settings
+
+EXPECTED_VERSION_ATTR = "_expected_version"
+
+
+class ConcurrentUpdateError(Exception):
+    """The row changed (its version moved on) since the instance was loaded."""
+
+    def __init__(self, instance):
+        self.instance = instance
+        super().__init__(
+            f"{instance._meta.label} {instance.pk} was modified concurrently (expected version "
+            f"{getattr(instance, EXPECTED_VERSION_ATTR, None)})."
+        )
+
+
+class VersionedModelMixin:
+    """Mix into a model with a `version` PositiveIntegerField; put it before TrackedFieldsMixin."""
+
+    def save(self, *args, **kwargs):
+        if self._state.adding or kwargs.get("force_insert"):
+            super().save(*args, **kwargs)
+            return
+
+        expected = self.version
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None:
+            if not update_fields:
+                return
+            kwargs["update_fields"] = {*update_fields, "version"}
+        self.version = expected + 1
+        setattr(self, EXPECTED_VERSION_ATTR, expected)
+        try:
+            super().save(*args, **kwargs)
+        except Exception:
+            self.version = expected
+            raise
+        finally:
+            setattr(self, EXPECTED_VERSION_ATTR, None)
+
+    def _do_update(self, base_qs, using, pk_val, values, update_fields, forced_update, *args):
+        expected = getattr(self, EXPECTED_VERSION_ATTR, None)
+        if expected is None:
+            return super()._do_update(base_qs, using, pk_val, values, update_fields, forced_update, *args)
+        updated = super()._do_update(
+            base_qs.filter(version=expected), using, pk_val, values, update_fields, forced_update, *args
+        )
+        if not updated and base_qs.filter(pk=pk_val).exists():
+            raise ConcurrentUpdateError(self)
+        return updated
+
+
+def retry_on_conflict(func, *args, attempts=None, base_delay_ms=None, **kwargs):
+    """Call func(*args, **kwargs), retrying with backoff while it raises ConcurrentUpdateError."""
+    attempts = attempts or settings.OPTIMISTIC_RETRY_ATTEMPTS
+    base_delay_ms = settings.OPTIMISTIC_RETRY_BASE_DELAY_MS if base_delay_ms is None else base_delay_ms
+    for attempt in range(attempts):
+        try:
+            return func(*args, **kwargs)
+        except ConcurrentUpdateError:
+            if attempt == attempts - 1:
+                raise
+            # Full jitter: spread competing writers out instead of retrying in lockstep.
+            time.sleep(random.uniform(0, base_delay_ms * (2**attempt)) / 1000)
@@ -1,5 +1,9 @@
+from rest_framework import status
+from rest_framework.response import Response
 from rest_framework.views import exception_handler
 
+from config.concurrency import ConcurrentUpdateError
+
 
 def _normalize_error_details(details):
     """Ensure details is a dict with string/list values for consistent API response format."""
@@ -18,6 +22,20 @@ def _normalize_error_details(details):
 
 
 def standard_exception_handler(exc, context):
+    if isinstance(exc, ConcurrentUpdateError):
+        # A version check failed after any automatic retries; the caller should reload.
+        return Response(
+            {
+                "success": False,
+                "error": {
+                    "code": "CONCURRENT_UPDATE",
+                    "message": "The record was changed by another request. Reload and try again.",
+                    "details": {},
+                },
+            },
+            status=status.HTTP_409_CONFLICT,
+        )
+
     response = exception_handler(exc, context)
     if response is None:
         return None
@@ -0,0 +1,168 @@
+"""
+Keyset (cursor) pagination for list endpoints.
+
+Opt-in per request with ?pagination=cursor (a ?cursor= token implies it). Pages are read
+with WHERE (sort key, id) < (last seen) instead of OFFSET, and no COUNT is run unless the
+client asks for one with ?include_total=true. The primary key is always appended to the
+ordering as a tie-break, so rows sharing a sort value are never skipped or repeated.
+"""
+import base64
+import binascii
+import json
+from datetime import date, datetime, time
+from decimal import Decimal
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+from uuid import UUID
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import Q
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import BasePagination
+
+CURSOR_QUERY_PARAM = "cursor"
+PAGINATION_MODE_QUERY_PARAM = "pagination"
+INCLUDE_TOTAL_QUERY_PARAM = "include_total"
+
+
+def cursor_pagination_requested(request) -> bool:
+    params = request.query_params
+    return params.get(PAGINATION_MODE_QUERY_PARAM) == "cursor" or CURSOR_QUERY_PARAM in params
+
+
+def _encode_value(value):
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, (Decimal, UUID)):
+        return str(value)
+    return value
+
+
+class KeysetPagination(BasePagination):
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    invalid_cursor_message = "Invalid cursor."
+
+    def __init__(self, ordering, page_size=None):
+        ordering = [field.strip() for field in ordering if field and field.strip()]
+        if not ordering:
+            ordering = ["-id"]
+        tie_break_names = {"id", "pk"}
+        if ordering[-1].lstrip("-") not in tie_break_names:
+            ordering.append("-id" if ordering[0].startswith("-") else "id")
+        self.ordering = tuple(ordering)
+        if page_size is not None:
+            self.page_size = page_size
+        self.page = []
+        self.total = None
+        self.has_next = False
+        self.has_previous = False
+
+    def get_page_size(self, request):
+        try:
+            requested = int(request.query_params.get(self.page_size_query_param, self.page_size))
+        except (TypeError, ValueError):
+            return self.page_size
+        if requested <= 0:
+            return self.page_size
+        return min(requested, self.max_page_size)
+
+    def _fields(self, model):
+        fields = []
+        for item in self.ordering:
+            name = item.lstrip("-")
+            field = model._meta.pk if name == "pk" else model._meta.get_field(name)
+            fields.append((field, item.startswith("-")))
+        return fields
+
+    def _decode_cursor(self, request, fields):
+        token = request.query_params.get(CURSOR_QUERY_PARAM)
+        if not token:
+            return None, False
+        try:
+            padded = token + "=" * (-len(token) % 4)
+            decoded = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8"))
+            raw_values = decoded["v"]
+            reverse = bool(decoded.get("r", False))
+            if not isinstance(raw_values, list) or len(raw_values) != len(fields):
+                raise ValueError("cursor does not match ordering")
+            values = [field.to_python(value) for (field, _), value in zip(fields, raw_values)]
+        except (ValueError, KeyError, TypeError, UnicodeError, binascii.Error, DjangoValidationError):
+            raise ValidationError({CURSOR_QUERY_PARAM: [self.invalid_cursor_message]})
+        return values, reverse
+
+    def _encode_cursor(self, obj, fields, reverse: bool) -> str:
+        values = [_encode_value(getattr(obj, field.attname)) for field, _ in fields]
+        payload = json.dumps({"v": values, "r": reverse}, separators=(",", ":"))
+        return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+    @staticmethod
+    def _after(fields, values, descending_flags) -> Q:
+        """Rows strictly after `values` in the given ordering: (a > x) OR (a = x AND b > y) OR ..."""
+        condition = Q()
+        for index, (field, _) in enumerate(fields):
+            lookup = "lt" if descending_flags[index] else "gt"
+            step = Q(**{f"{field.attname}__{lookup}": values[index]})
+            for previous_index in range(index):
+                step &= Q(**{fields[previous_index][0].attname: values[previous_index]})
+            condition |= step
+        return condition
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.fields = self._fields(queryset.model)
+        values, reverse = self._decode_cursor(request, self.fields)
+
+        descending_flags = [descending != reverse for _, descending in self.fields]
+        order_by = [
+            f"-{field.attname}" if descending else field.attname
+            for (field, _), descending in zip(self.fields, descending_flags)
+        ]
+        page_queryset = queryset.order_by(*order_by)
+        if values is not None:
+            page_queryset = page_queryset.filter(self._after(self.fields, values, descending_flags))
+
+        rows = list(page_queryset[: self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[: self.page_size]
+        if reverse:
+            rows.reverse()
+            self.has_next = values is not None
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = values is not None
+
+        if request.query_params.get(INCLUDE_TOTAL_QUERY_PARAM, "").lower() in {"1", "true", "yes"}:
+            self.total = queryset.count()
+        self.page = rows
+        return rows
+
+    def _link(self, cursor: str) -> str:
+        scheme, netloc, path, query, fragment = urlsplit(self.request.build_absolute_uri())
+        params = [(key, value) for key, value in parse_qsl(query, keep_blank_values=True) if key != CURSOR_QUERY_PARAM]
+        params.append((CURSOR_QUERY_PARAM, cursor))
+        return urlunsplit((scheme, netloc, path, urlencode(params), fragment))
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self._link(self._encode_cursor(self.page[-1], self.fields, reverse=False))
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self._link(self._encode_cursor(self.page[0], self.fields, reverse=True))
+
+    def get_payload(self, results, results_key: str = "results") -> dict:
+        payload = {
+            results_key: results,
+            "next": self.get_next_link(),
+            "previous": self.get_previous_link(),
+            "page_size": self.page_size,
+        }
+        if self.total is not None:
+            payload["count"] = self.total
+        return payload
+
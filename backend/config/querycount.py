@@ -0,0 +1,108 @@
+"""
+Per-request SQL instrumentation.
+
+QueryRecorder hooks every database connection with execute_wrapper and records each
+statement, its time and its template (the SQL text without parameters). A template run
+more than once in a request is the usual shape of an N+1, so those are reported as
+duplicates.
+
+QueryCountMiddleware records each request when QUERY_COUNT_HEADERS is on (default: DEBUG)
+and adds X-Query-Count, X-Query-Duplicates and X-Query-Time-Ms to the response. Requests
+above QUERY_COUNT_WARN_THRESHOLD statements are logged as warnings. The test helpers in
+config.testing use the same recorder to enforce query budgets.
+"""
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE_RE = re.compile(r"\s+")
+# IN (%s, %s, ...) lists of different lengths are still the same statement.
+_IN_LIST_RE = re.compile(r"IN \((?:%s, )*%s\)")
+
+
+def statement_template(sql: str) -> str:
+    return _IN_LIST_RE.sub("IN (...)", _WHITESPACE_RE.sub(" ", sql.strip()))
+
+
+class QueryRecorder:
+    """Context manager recording the SQL run on all configured connections."""
+
+    def __init__(self):
+        self.queries = []
+        self._stack = None
+
+    def __enter__(self):
+        self._stack = ExitStack()
+        for connection in connections.all():
+            self._stack.enter_context(connection.execute_wrapper(self))
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stack.close()
+        self._stack = None
+        return False
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append(
+                {
+                    "sql": sql,
+                    "alias": context["connection"].alias,
+                    "duration": time.perf_counter() - started,
+                }
+            )
+
+    @property
+    def count(self) -> int:
+        return len(self.queries)
+
+    @property
+    def total_time(self) -> float:
+        return sum(query["duration"] for query in self.queries)
+
+    def repeated(self) -> dict:
+        """{template: times run} for templates run more than once."""
+        counts = Counter(statement_template(query["sql"]) for query in self.queries)
+        return {template: count for template, count in counts.items() if count > 1}
+
+    @property
+    def duplicates(self) -> int:
+        return sum(count - 1 for count in self.repeated().values())
+
+    def describe(self, limit: int = 5) -> str:
+        lines = [f"{self.count} queries, {self.duplicates} duplicate(s), {self.total_time * 1000:.1f} ms"]
+        for template, count in sorted(self.repeated().items(), key=lambda item: -item[1])[:limit]:
+            lines.append(f"  x{count}: {template[:300]}")
+        return "\n".join(lines)
+
+
+class QueryCountMiddleware:
+    """Add X-Query-* headers (and warn on heavy requests) when QUERY_COUNT_HEADERS is on."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not getattr(settings, "QUERY_COUNT_HEADERS", False):
+            return self.get_response(request)
+
+        with QueryRecorder() as recorder:
+            response = self.get_response(request)
+        response["X-Query-Count"] = str(recorder.count)
+        response["X-Query-Duplicates"] = str(recorder.duplicates)
+        response["X-Query-Time-Ms"] = f"{recorder.total_time * 1000:.1f}"
+
+        threshold = getattr(settings, "QUERY_COUNT_WARN_THRESHOLD", 0)
+        if threshold and recorder.count > threshold:
+            logger.warning("%s %s ran %s", request.method, request.path, recorder.describe())
+        return response
@@ -32,6 +32,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     "corsheaders",
     "rest_framework",
     "rest_framework.authtoken",
@@ -47,15 +48,18 @@ INSTALLED_APPS = [
     "apps.payments.apps.PaymentsConfig",
     "apps.reports.apps.ReportsConfig",
     "apps.notifications.apps.NotificationsConfig",
+    "apps.reviewqueue.apps.ReviewQueueConfig",
 ]
 
 MIDDLEWARE = [
+    "config.querycount.QueryCountMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "apps.access.middleware.RBACRequestCacheMiddleware",
     "apps.notifications.middleware.AuditTrailMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
@@ -100,6 +104,85 @@ else:
         }
     }
 
+if os.getenv("CACHE_REDIS_URL"):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.getenv("CACHE_REDIS_URL"),
+            "KEY_PREFIX": os.getenv("CACHE_KEY_PREFIX", "police_ops"),
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "police-ops-default",
+        }
+    }
+
+# RBAC authorization cache: resolved role keys / permission codes per user.
+# Shared tier lives in CACHES["default"]; the in-process tier is short-lived so other
+# workers pick up invalidations quickly. Without CACHE_REDIS_URL the default cache is per
+# process, so the shared tier is capped at RBAC_LOCAL_CACHE_TIMEOUT as well.
+RBAC_CACHE_TIMEOUT = env_int("RBAC_CACHE_TIMEOUT", 300)
+RBAC_LOCAL_CACHE_TIMEOUT = env_int("RBAC_LOCAL_CACHE_TIMEOUT", 5)
+
+# Audit trail: AuditTrailMiddleware hands events to a buffered writer that bulk-inserts
+# them off the request path (see apps.notifications.audit_writer). Events that cannot be
+# queued or inserted are appended to the spool file and replayed by flush_audit_spool.
+AUDIT_LOG_ASYNC = env_bool("AUDIT_LOG_ASYNC", True)
+AUDIT_LOG_BATCH_SIZE = env_int("AUDIT_LOG_BATCH_SIZE", 200)
+AUDIT_LOG_FLUSH_INTERVAL_MS = env_int("AUDIT_LOG_FLUSH_INTERVAL_MS", 1000)
+AUDIT_LOG_QUEUE_MAX_SIZE = env_int("AUDIT_LOG_QUEUE_MAX_SIZE", 10000)
+AUDIT_LOG_ENQUEUE_TIMEOUT_MS = env_int("AUDIT_LOG_ENQUEUE_TIMEOUT_MS", 50)
+AUDIT_LOG_SPOOL_PATH = os.getenv("AUDIT_LOG_SPOOL_PATH", str(BASE_DIR / "var" / "audit_spool.jsonl"))
+# Largest unparsed request body the audit summariser will read; multipart is never read.
+AUDIT_PAYLOAD_MAX_BYTES = env_int("AUDIT_PAYLOAD_MAX_BYTES", 64 * 1024)
+
+# Report endpoint response cache (apps.reports.cache): fresh for REPORTS_CACHE_TTL seconds,
+# then served stale for up to REPORTS_CACHE_STALE_TTL while one worker recomputes.
+REPORTS_CACHE_TTL = env_int("REPORTS_CACHE_TTL", 60)
+REPORTS_CACHE_STALE_TTL = env_int("REPORTS_CACHE_STALE_TTL", 300)
+REPORTS_CACHE_LOCK_TIMEOUT = env_int("REPORTS_CACHE_LOCK_TIMEOUT", 30)
+REPORTS_CACHE_LOCK_WAIT_MS = env_int("REPORTS_CACHE_LOCK_WAIT_MS", 2000)
+
+# Per-request SQL instrumentation (config.querycount): X-Query-Count / X-Query-Duplicates /
+# X-Query-Time-Ms response headers, and a warning log above QUERY_COUNT_WARN_THRESHOLD.
+QUERY_COUNT_HEADERS = env_bool("QUERY_COUNT_HEADERS", DEBUG)
+QUERY_COUNT_WARN_THRESHOLD = env_int("QUERY_COUNT_WARN_THRESHOLD", 50)
+
+# Ranking/reward snapshots older than this are deleted by compute_reward_snapshots.
+REWARD_SNAPSHOT_RETENTION_DAYS = env_int("REWARD_SNAPSHOT_RETENTION_DAYS", 90)
+
+# Optimistic concurrency (config.concurrency): conflicting workflow writes are retried up to
+# OPTIMISTIC_RETRY_ATTEMPTS times with jittered exponential backoff from this base delay.
+OPTIMISTIC_RETRY_ATTEMPTS = env_int("OPTIMISTIC_RETRY_ATTEMPTS", 5)
+OPTIMISTIC_RETRY_BASE_DELAY_MS = env_int("OPTIMISTIC_RETRY_BASE_DELAY_MS", 10)
+
+# Complaint review work queue (apps.cases.queue): a claimed complaint is leased to one cadet
+# for this long; heartbeats extend the lease, an expired lease puts it back in the queue.
+COMPLAINT_REVIEW_LEASE_SECONDS = env_int("COMPLAINT_REVIEW_LEASE_SECONDS", 300)
+
+# Generic review queues (apps.reviewqueue): default lease for coroner, tip and reasoning
+# review claims; a queue may register its own lease_seconds.
+REVIEW_QUEUE_LEASE_SECONDS = env_int("REVIEW_QUEUE_LEASE_SECONDS", 300)
+
+# Case dossier documents (apps.cases.dossier): source writes mark the document stale; the
+# first change in a debounce window enqueues one Celery rebuild with that countdown.
+# Stale documents are also rebuilt on read and by the rebuild_case_dossiers scheduler task.
+CASE_DOSSIER_ASYNC_REBUILD = env_bool("CASE_DOSSIER_ASYNC_REBUILD", True)
+CASE_DOSSIER_DEBOUNCE_SECONDS = env_int("CASE_DOSSIER_DEBOUNCE_SECONDS", 5)
+
+# Streamed referral dossier export (apps.judiciary.dossier): evidence rows per query page and
+# bytes per media read; both bound the memory one export uses.
+DOSSIER_EXPORT_PAGE_SIZE = env_int("DOSSIER_EXPORT_PAGE_SIZE", 200)
+DOSSIER_EXPORT_CHUNK_SIZE = env_int("DOSSIER_EXPORT_CHUNK_SIZE", 64 * 1024)
+
+# Bulk case/complaint import (apps.cases.imports): rows per bulk_create chunk, and how many
+# per-row errors an import report lists (the failed count is always complete).
+CASE_IMPORT_BATCH_SIZE = env_int("CASE_IMPORT_BATCH_SIZE", 500)
+CASE_IMPORT_MAX_REPORTED_ERRORS = env_int("CASE_IMPORT_MAX_REPORTED_ERRORS", 1000)
+
 AUTH_PASSWORD_VALIDATORS = [
     {"NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator"},
     {"NAME": "django.contrib.auth.password_validation.MinimumLengthValidator"},
@@ -124,6 +207,43 @@ MEDIA_ROOT = BASE_DIR / "media"
 # EVIDENCE_MEDIA_STORAGE = "storages.backends.s3boto3.S3Boto3Storage"
 # Evidence media is served via protected API endpoints; avoid direct MEDIA_URL for evidence.
 
+# Resumable evidence media uploads (apps.evidence.services.uploads): largest file and chunk
+# accepted, bytes read from the request stream per iteration, and how long an unfinished
+# upload session (and its stored chunks) is kept.
+EVIDENCE_UPLOAD_MAX_SIZE = env_int("EVIDENCE_UPLOAD_MAX_SIZE", 4 * 1024 * 1024 * 1024)
+EVIDENCE_UPLOAD_MAX_CHUNK_SIZE = env_int("EVIDENCE_UPLOAD_MAX_CHUNK_SIZE", 8 * 1024 * 1024)
+EVIDENCE_UPLOAD_READ_SIZE = env_int("EVIDENCE_UPLOAD_READ_SIZE", 64 * 1024)
+EVIDENCE_UPLOAD_SESSION_TTL_SECONDS = env_int("EVIDENCE_UPLOAD_SESSION_TTL_SECONDS", 24 * 60 * 60)
+
+# Content-addressed evidence blobs (apps.evidence.storage.blobs): how long a blob no
+# attachment references is kept before collect_evidence_blobs deletes it.
+EVIDENCE_BLOB_GC_GRACE_SECONDS = env_int("EVIDENCE_BLOB_GC_GRACE_SECONDS", 24 * 60 * 60)
+
+# Evidence media delivery (apps.evidence.services.delivery): a Range header with more ranges
+# than this is answered with the whole file.
+EVIDENCE_MEDIA_MAX_RANGES = env_int("EVIDENCE_MEDIA_MAX_RANGES", 16)
+# Who sends evidence media bytes after the access check: "python" (the worker, via
+# wsgi.file_wrapper/sendfile where the server offers it), "x-accel-redirect" (nginx internal
+# location at EVIDENCE_MEDIA_ACCEL_REDIRECT_PREFIX aliased to MEDIA_ROOT) or "x-sendfile".
+EVIDENCE_MEDIA_DELIVERY = os.getenv("EVIDENCE_MEDIA_DELIVERY", "python")
+EVIDENCE_MEDIA_ACCEL_REDIRECT_PREFIX = os.getenv("EVIDENCE_MEDIA_ACCEL_REDIRECT_PREFIX", "/protected-evidence/")
+
+# Evidence media derivatives (apps.evidence.services.derivatives): JPEG thumbnails and poster
+# frames rendered by a Celery task after upload (EVIDENCE_DERIVATIVES_ASYNC) and by the
+# generate_evidence_derivatives scheduler task. Sizes bound the longer side in pixels; video
+# frames are taken EVIDENCE_POSTER_FRAME_SECONDS in with ffmpeg. Needs Pillow. A worker
+# claims a derivative while rendering it; a claim older than
+# EVIDENCE_DERIVATIVE_RENDER_LEASE_SECONDS is treated as a crashed worker and requeued.
+EVIDENCE_DERIVATIVES_ASYNC = env_bool("EVIDENCE_DERIVATIVES_ASYNC", True)
+EVIDENCE_THUMBNAIL_MAX_SIZE = env_int("EVIDENCE_THUMBNAIL_MAX_SIZE", 320)
+EVIDENCE_POSTER_MAX_SIZE = env_int("EVIDENCE_POSTER_MAX_SIZE", 1280)
+EVIDENCE_DERIVATIVE_JPEG_QUALITY = env_int("EVIDENCE_DERIVATIVE_JPEG_QUALITY", 80)
+EVIDENCE_POSTER_FRAME_SECONDS = env_int("EVIDENCE_POSTER_FRAME_SECONDS", 1)
+EVIDENCE_FFMPEG_BINARY = os.getenv("EVIDENCE_FFMPEG_BINARY", "ffmpeg")
+EVIDENCE_DERIVATIVE_TIMEOUT_SECONDS = env_int("EVIDENCE_DERIVATIVE_TIMEOUT_SECONDS", 60)
+EVIDENCE_DERIVATIVE_MAX_ATTEMPTS = env_int("EVIDENCE_DERIVATIVE_MAX_ATTEMPTS", 3)
+EVIDENCE_DERIVATIVE_RENDER_LEASE_SECONDS = env_int("EVIDENCE_DERIVATIVE_RENDER_LEASE_SECONDS", 600)
+
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 rest_default_permission = os.getenv(
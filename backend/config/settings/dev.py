@@ -1,5 +1,12 @@
 from .base import *
 
 DEBUG = env_bool("DJANGO_DEBUG", True)
+QUERY_COUNT_HEADERS = env_bool("QUERY_COUNT_HEADERS", DEBUG)
 ALLOWED_HOSTS = env_list("DJANGO_ALLOWED_HOSTS", "localhost,127.0.0.1,0.0.0.0")
 CORS_ALLOW_ALL_ORIGINS = env_bool("CORS_ALLOW_ALL_ORIGINS", True)
+# SQLite allows a single writer; keep audit inserts on the request thread unless asked.
+AUDIT_LOG_ASYNC = env_bool("AUDIT_LOG_ASYNC", False)
+# No Celery worker in local development; stale case dossiers are rebuilt on read.
+CASE_DOSSIER_ASYNC_REBUILD = env_bool("CASE_DOSSIER_ASYNC_REBUILD", False)
+# Without a worker, pending evidence thumbnails are rendered when first requested.
+EVIDENCE_DERIVATIVES_ASYNC = env_bool("EVIDENCE_DERIVATIVES_ASYNC", False)
@@ -0,0 +1,71 @@
+"""
+Query budget assertions for API tests (see config.querycount).
+
+    class CaseListQueryTests(QueryBudgetTestMixin, APITestCase):
+        def test_list(self):
+            self.assertListQueriesFlat("/api/v1/cases/cases/", self.make_cases, budget=8)
+
+assertMaxQueries fails when a block runs more statements than the budget and lists the
+repeated statement templates. assertListQueriesFlat requests a list with `small` and then
+with `large` items and fails unless both stay within the budget and the larger list runs
+no more statements than the smaller one (an N+1 shows up as the difference).
+assertQueriesFlat does the same for any callable, e.g. a serializer over a queryset.
+"""
+from contextlib import contextmanager
+
+from config.querycount import QueryRecorder
+
+
+class QueryBudgetTestMixin:
+    list_page_size = 100
+
+    @contextmanager
+    def assertMaxQueries(self, budget: int, label: str = ""):
+        with QueryRecorder() as recorder:
+            yield recorder
+        if recorder.count > budget:
+            self.fail(f"{label or 'Block'} exceeded its query budget of {budget}: {recorder.describe()}")
+
+    def record_get(self, path: str, **params):
+        params.setdefault("page_size", self.list_page_size)
+        with QueryRecorder() as recorder:
+            response = self.client.get(path, params)
+        return response, recorder
+
+    def assertListQueriesFlat(self, path: str, add_items, *, budget: int, small: int = 1, large: int = 100, **params):
+        """add_items(n) creates n more rows that appear in the list at `path`."""
+        add_items(small)
+        self.record_get(path, **params)  # warm per-user caches so both runs compare like with like
+        small_response, small_run = self.record_get(path, **params)
+        self.assertLess(small_response.status_code, 400, f"GET {path} failed: {small_response.status_code}")
+        add_items(large - small)
+        large_response, large_run = self.record_get(path, **params)
+        self.assertLess(large_response.status_code, 400, f"GET {path} failed: {large_response.status_code}")
+
+        if large_run.count > budget:
+            self.fail(f"GET {path} with {large} items exceeded its query budget of {budget}: {large_run.describe()}")
+        if large_run.count > small_run.count:
+            self.fail(
+                f"GET {path} queries grow with the list: {small_run.count} for {small} item(s), "
+                f"{large_run.count} for {large}.\n{large_run.describe()}"
+            )
+        return small_run, large_run
+
+    def assertQueriesFlat(self, run, add_items, *, budget: int, small: int = 1, large: int = 100, label: str = ""):
+        """run() is recorded after add_items(small) and again after add_items(large - small)."""
+        label = label or getattr(run, "__name__", "Block")
+        add_items(small)
+        with QueryRecorder() as small_run:
+            run()
+        add_items(large - small)
+        with QueryRecorder() as large_run:
+            run()
+
+        if large_run.count > budget:
+            self.fail(f"{label} with {large} items exceeded its query budget of {budget}: {large_run.describe()}")
+        if large_run.count > small_run.count:
+            self.fail(
+                f"{label} queries grow with the rows: {small_run.count} for {small} item(s), "
+                f"{large_run.count} for {large}.\n{large_run.describe()}"
+            )
+        return small_run, large_run
@@ -0,0 +1,103 @@
+"""
+Loaded-state tracking for workflow models.
+
+TrackedFieldsMixin remembers the column values an instance was loaded (or last saved)
+with, so change detection runs in memory instead of re-reading the row. A plain save()
+on a loaded instance writes only the columns that changed, plus auto_now fields; when
+nothing changed and there is no auto_now field, no UPDATE is issued at all. An explicit
+update_fields is always respected as given.
+"""
+import copy
+
+LOADED_VALUES_ATTR = "_loaded_values"
+
+
+def _frozen(value):
+    return copy.deepcopy(value) if isinstance(value, (dict, list)) else value
+
+
+class TrackedFieldsMixin:
+    """Mix into a models.Model subclass (before models.Model) to track loaded field values."""
+
+    def _tracked_fields(self):
+        return [field for field in self._meta.concrete_fields if not field.primary_key]
+
+    def _remember_loaded_values(self, fields=None):
+        loaded = getattr(self, LOADED_VALUES_ATTR, None) or {}
+        current = self.__dict__
+        for field in fields if fields is not None else self._tracked_fields():
+            if field.attname in current:
+                loaded[field.attname] = _frozen(current[field.attname])
+        setattr(self, LOADED_VALUES_ATTR, loaded)
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._remember_loaded_values()
+        return instance
+
+    def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        super().refresh_from_db(using=using, fields=fields, from_queryset=from_queryset)
+        if fields is None:
+            self._remember_loaded_values()
+        else:
+            names = set(fields)
+            self._remember_loaded_values(
+                [field for field in self._tracked_fields() if field.name in names or field.attname in names]
+            )
+
+    def is_tracked(self, field_name: str) -> bool:
+        """True when the value field_name was loaded with is known."""
+        field = self._meta.get_field(field_name)
+        return field.attname in (getattr(self, LOADED_VALUES_ATTR, None) or {})
+
+    def loaded_value(self, field_name: str, default=None):
+        """Value field_name had when the instance was loaded or last saved."""
+        field = self._meta.get_field(field_name)
+        return (getattr(self, LOADED_VALUES_ATTR, None) or {}).get(field.attname, default)
+
+    def has_changed(self, field_name: str) -> bool:
+        field = self._meta.get_field(field_name)
+        loaded = getattr(self, LOADED_VALUES_ATTR, None) or {}
+        if field.attname not in loaded:
+            return self._state.adding or field.attname in self.__dict__
+        return self.__dict__.get(field.attname, loaded[field.attname]) != loaded[field.attname]
+
+    def changed_fields(self) -> list[str]:
+        """Names of concrete fields whose value differs from the loaded one."""
+        loaded = getattr(self, LOADED_VALUES_ATTR, None) or {}
+        current = self.__dict__
+        changed = []
+        for field in self._tracked_fields():
+            if field.attname not in current:
+                continue
+            if field.attname not in loaded or current[field.attname] != loaded[field.attname]:
+                changed.append(field.name)
+        return changed
+
+    def save(self, *args, **kwargs):
+        tracked = getattr(self, LOADED_VALUES_ATTR, None) is not None
+        automatic = (
+            tracked
+            and not self._state.adding
+            and not args
+            and kwargs.get("update_fields") is None
+            and not kwargs.get("force_insert")
+        )
+        if automatic:
+            changed = self.changed_fields()
+            auto_now = [
+                field.name
+                for field in self._tracked_fields()
+                if getattr(field, "auto_now", False) and field.name not in changed
+            ]
+            kwargs["update_fields"] = changed + auto_now
+        super().save(*args, **kwargs)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None:
+            self._remember_loaded_values()
+        else:
+            names = set(update_fields)
+            self._remember_loaded_values(
+                [field for field in self._tracked_fields() if field.name in names or field.attname in names]
+            )
@@ -20,6 +20,7 @@ urlpatterns = [
     path("api/v1/payments/", include("apps.payments.urls")),
     path("api/v1/reports/", include("apps.reports.urls")),
     path("api/v1/notifications/", include("apps.notifications.urls")),
+    path("api/v1/review-queues/", include("apps.reviewqueue.urls")),
 ]
 
 if settings.DEBUG:
@@ -1,12 +1,13 @@
 "use client";
 
 import { useAuth } from "@/context/AuthContext";
-import { api } from "@/lib/api";
+import { api, type ApiError } from "@/lib/api";
 import { ErrorDisplay } from "@/features/error/ErrorDisplay";
 import { PageLoading } from "@/features/loading/LoadingSpinner";
 import { useEffect, useState } from "react";
 
 type WantedItem = { id: number; status?: string; case_reference?: string };
+type WantedListPage = { results?: WantedItem[]; next?: string | null };
 
 export default function WantedPage() {
   const { token } = useAuth();
@@ -16,16 +17,26 @@ export default function WantedPage() {
 
   useEffect(() => {
     if (!token) return;
-    api
-      .get<{ results?: WantedItem[] }>("/wanted/?status=most_wanted", token)
-      .then((res) => {
-        if (res.error) setError(res.error.message || "بارگذاری لیست ناموفق بود.");
-        else if (res.data) {
-          const list = (res.data as { results?: WantedItem[] }).results ?? (Array.isArray(res.data) ? res.data : []);
-          setItems(list);
+    // /wanted/ is keyset-paginated: follow `next` until every most-wanted entry is loaded.
+    const loadAll = async () => {
+      const all: WantedItem[] = [];
+      let path: string | null = "/wanted/?status=most_wanted&page_size=100";
+      while (path) {
+        const res: { data?: WantedListPage | WantedItem[]; error?: ApiError } = await api.get(path, token);
+        if (res.error) {
+          setError(res.error.message || "بارگذاری لیست ناموفق بود.");
+          return;
         }
-      })
-      .finally(() => setLoading(false));
+        if (Array.isArray(res.data)) {
+          all.push(...res.data);
+          break;
+        }
+        all.push(...(res.data?.results ?? []));
+        path = res.data?.next ?? null;
+      }
+      setItems(all);
+    };
+    loadAll().finally(() => setLoading(false));
   }, [token]);
 
   if (loading) return <PageLoading />;